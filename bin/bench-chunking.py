@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Large Document Benchmark for TraceRail Bootstrap
+
+This script compares the two ways `ExampleWorkflow` can process a large
+document: a single LLM call with the whole text inline, and the chunked
+map-reduce path, where the document is passed as a blob reference, split into
+token-aware chunks that are processed in parallel, and reduced in one more
+call.
+
+LLM calls go to a fake provider whose latency grows with the prompt size, so
+no API keys or Temporal service are needed. For each path it reports the
+throughput and the bytes of payloads the workflow history would record
+(workflow input plus every activity's input and result).
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from workers.blobstore import BlobStore, FileBlobStore, blob_ref, key_of
+from workers.chunking import chunk_text
+from workers.fakes import FakeProvider
+
+# Temporal rejects payloads over 2 MB and warns well before a 50 MB history.
+PAYLOAD_LIMIT_BYTES = 2 * 1024 * 1024
+
+
+def make_document(tokens: int, seed: int) -> str:
+    """Builds a synthetic document of roughly `tokens` tokens."""
+    rng = random.Random(seed)
+    words = ["order", "refund", "delivery", "invoice", "account", "password", "late", "broken", "thanks", "contract"]
+    paragraphs, size = [], 0
+    while size < tokens * 4:
+        sentences = [" ".join(rng.choice(words) for _ in range(rng.randint(6, 25))).capitalize() + "."
+                     for _ in range(rng.randint(2, 8))]
+        paragraphs.append(" ".join(sentences))
+        size += len(paragraphs[-1])
+    return "\n\n".join(paragraphs)
+
+
+def llm_result(response) -> dict:
+    """A result shaped like `llm_activity`'s for a fake response."""
+    return {
+        "answer": response.content,
+        "provider": response.provider,
+        "hedged": False,
+        "prompt_version": None,
+        "llm_response": {
+            "content": response.content,
+            "metadata": {"confidence": 0.9},
+            "usage": {"prompt_tokens": response.prompt_tokens, "completion_tokens": response.completion_tokens},
+        },
+        "routing_decision": {"decision": "automatic", "reason": "", "triggered_rules": []},
+    }
+
+
+def payload_size(*values) -> int:
+    return sum(len(json.dumps(value).encode("utf-8")) for value in values)
+
+
+async def single_call(provider: FakeProvider, text: str) -> tuple[int, int]:
+    """The inline path. Returns (history bytes, largest payload)."""
+    result = llm_result(await provider.complete(text))
+    # Workflow input, llm_activity in/out, routing_activity input (LLM response and text).
+    payloads = [text, text, result, [result["llm_response"], text]]
+    return payload_size(*payloads), max(payload_size(p) for p in payloads)
+
+
+async def map_reduce(provider: FakeProvider, store: BlobStore, text: str, max_tokens: int, fan_out: int) -> tuple[int, int]:
+    """The chunked path. Returns (history bytes, largest payload)."""
+    document_ref = blob_ref(store.put_text(text))
+    chunks = [
+        {"ref": blob_ref(store.put_text(chunk.text)), "tokens": chunk.tokens}
+        for chunk in chunk_text(store.get_text(key_of(document_ref)), max_tokens)
+    ]
+    semaphore = asyncio.Semaphore(fan_out)
+
+    async def process(chunk: dict) -> dict:
+        async with semaphore:
+            return llm_result(await provider.complete(store.get_text(key_of(chunk["ref"]))))
+
+    results = await asyncio.gather(*(process(chunk) for chunk in chunks))
+    reduced = llm_result(await provider.complete("\n\n".join(result["answer"] for result in results)))
+    payloads = [document_ref, document_ref, chunks]
+    payloads += [chunk["ref"] for chunk in chunks] + list(results)
+    payloads += [list(results), reduced, [reduced["llm_response"], document_ref]]
+    return payload_size(*payloads), max(payload_size(p) for p in payloads)
+
+
+async def run_path(name: str, documents: list[str], concurrency: int, process) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    sizes = []
+
+    async def run_one(text: str):
+        async with semaphore:
+            sizes.append(await process(text))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_one(text) for text in documents))
+    elapsed = time.perf_counter() - start
+    return {
+        "name": name,
+        "elapsed": elapsed,
+        "throughput": len(documents) / elapsed,
+        "history": sum(size for size, _ in sizes) / len(sizes),
+        "largest": max(largest for _, largest in sizes),
+    }
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    documents = [make_document(args.tokens, seed) for seed in range(args.documents)]
+    provider = FakeProvider(
+        "fake", latency_ms=args.latency_ms, jitter_ms=args.latency_ms / 5,
+        latency_per_1k_tokens_ms=args.ms_per_1k_tokens, seed=1,
+    )
+    print(f"   Documents: {args.documents} of ~{args.tokens} tokens ({len(documents[0]) / 1024:.0f} KiB)")
+    print(f"   Fake LLM: {args.latency_ms:.0f} ms + {args.ms_per_1k_tokens:.0f} ms per 1k prompt tokens")
+    print(f"   Chunks: {args.chunk_tokens} tokens, fan-out {args.fan_out}; {args.concurrency} documents in flight")
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = FileBlobStore(directory)
+        results = [
+            await run_path("single call", documents, args.concurrency, lambda text: single_call(provider, text)),
+            await run_path("map-reduce", documents, args.concurrency,
+                           lambda text: map_reduce(provider, store, text, args.chunk_tokens, args.fan_out)),
+        ]
+
+    print(f"\n{'Path':<14}{'Time':>9}{'Docs/s':>9}{'History/doc':>14}{'Largest payload':>18}")
+    for result in results:
+        flag = "  ⚠️  over limit" if result["largest"] > PAYLOAD_LIMIT_BYTES else ""
+        print(
+            f"{result['name']:<14}{result['elapsed']:>8.2f}s{result['throughput']:>9.2f}"
+            f"{result['history'] / 1024:>11.1f} KiB{result['largest'] / 1024:>15.1f} KiB{flag}"
+        )
+    single, chunked = results
+    print(f"\n📈 Map-reduce: {chunked['throughput'] / single['throughput']:.1f}x throughput, "
+          f"{single['history'] / chunked['history']:.1f}x smaller history")
+
+
+def main():
+    """Main benchmark function"""
+    parser = argparse.ArgumentParser(description="Compare single-call and chunked map-reduce processing of large documents.")
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--tokens", type=int, default=50_000, help="Approximate tokens per document.")
+    parser.add_argument("--chunk-tokens", type=int, default=2000)
+    parser.add_argument("--fan-out", type=int, default=8, help="Chunks in flight per document.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Documents in flight.")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Fixed latency of each LLM call.")
+    parser.add_argument("--ms-per-1k-tokens", type=float, default=40.0, help="Added latency per 1,000 prompt tokens.")
+    args = parser.parse_args()
+
+    print("📦 Large Document Benchmark")
+    print("=" * 50)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
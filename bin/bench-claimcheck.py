@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Claim-Check Codec Benchmark for TraceRail Bootstrap
+
+This script measures what the claim-check payload codec
+(`workers/claimcheck.py`) saves and costs. It builds the payloads an
+`ExampleWorkflow` records in its history (workflow input, activity arguments
+and results, workflow result) for a mix of document sizes, then reports:
+
+- history bytes per workflow with and without the codec, which is what the
+  history database grows by, and
+- the codec time to encode a workflow's payloads and to decode its whole
+  history, which a worker pays on every workflow task that replays history.
+
+It runs against the filesystem and SQLite blob stores in a temporary
+directory, and needs no Temporal service.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from temporalio.converter import DataConverter
+except ImportError:
+    print("⚠️  Dependencies not installed. Run 'poetry install' first.")
+    sys.exit(1)
+
+from workers.blobstore import FileBlobStore, SQLiteBlobStore
+from workers.claimcheck import CLAIM_CHECK_THRESHOLD, ClaimCheckCodec
+
+# (share of cases, document size range in bytes): mostly short messages, some attachments.
+SIZE_MIX = [(0.80, (500, 8_000)), (0.15, (20_000, 200_000)), (0.05, (500_000, 1_500_000))]
+
+
+def make_text(rng: random.Random, size: int) -> str:
+    words = ["order", "refund", "delivery", "invoice", "account", "password", "late", "broken", "thanks"]
+    text = []
+    length = 0
+    while length < size:
+        word = rng.choice(words)
+        text.append(word)
+        length += len(word) + 1
+    return " ".join(text)
+
+
+def workflow_values(rng: random.Random) -> list:
+    """The values an ExampleWorkflow run records in its history."""
+    share = rng.random()
+    for weight, (low, high) in SIZE_MIX:
+        if share < weight:
+            break
+        share -= weight
+    text = make_text(rng, rng.randint(low, high))
+    answer = make_text(rng, max(200, len(text) // 10))
+    llm_response = {"content": answer, "metadata": {"confidence": 0.9}, "usage": {"prompt_tokens": len(text) // 4}}
+    llm_result = {"answer": answer, "provider": "deepseek", "llm_response": llm_response,
+                  "routing_decision": {"decision": "automatic"}}
+    guardrails = {"passed": True, "failures": [], "content": answer, "pii": {}}
+    return [
+        text,                       # workflow input
+        text, llm_result,           # llm_activity
+        [answer], [guardrails],     # guardrails_activity
+        llm_response, text,         # routing_activity arguments
+        {"status": "COMPLETED_AUTOMATICALLY", "llm_output": answer, "guardrails": guardrails},
+    ]
+
+
+async def measure(codec: ClaimCheckCodec, histories: list[list]) -> dict:
+    inline_bytes, stored_bytes, encode_ms, decode_ms = [], [], [], []
+    for payloads in histories:
+        start = time.perf_counter()
+        encoded = await codec.encode(payloads)
+        encode_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        await codec.decode(encoded)
+        decode_ms.append((time.perf_counter() - start) * 1000)
+
+        inline_bytes.append(sum(payload.ByteSize() for payload in payloads))
+        stored_bytes.append(sum(payload.ByteSize() for payload in encoded))
+    return {"inline": inline_bytes, "stored": stored_bytes, "encode": encode_ms, "decode": decode_ms}
+
+
+def p99(values: list[float]) -> float:
+    return statistics.quantiles(values, n=100)[98] if len(values) > 1 else values[0]
+
+
+def main():
+    """Main benchmark function"""
+    parser = argparse.ArgumentParser(description="Measure history size and codec latency with the claim-check codec.")
+    parser.add_argument("--workflows", type=int, default=500)
+    parser.add_argument("--threshold", type=int, default=CLAIM_CHECK_THRESHOLD or 64 * 1024,
+                        help="Offload payloads larger than this many bytes.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print("🎟️  Claim-Check Codec Benchmark")
+    print("=" * 50)
+    rng = random.Random(args.seed)
+    converter = DataConverter.default.payload_converter
+    histories = [converter.to_payloads(workflow_values(rng)) for _ in range(args.workflows)]
+    print(f"   Workflows: {args.workflows}, threshold {args.threshold / 1024:.0f} KiB")
+
+    with tempfile.TemporaryDirectory() as directory:
+        stores = {
+            "filesystem": FileBlobStore(Path(directory) / "blobs"),
+            "sqlite": SQLiteBlobStore(Path(directory) / "blobs.sqlite3"),
+        }
+        for name, store in stores.items():
+            results = asyncio.run(measure(ClaimCheckCodec(store, args.threshold), histories))
+            store.close()
+            inline, stored = sum(results["inline"]), sum(results["stored"])
+            print(f"\n📦 {name} store")
+            print(f"   History without codec: {inline / args.workflows / 1024:>9.1f} KiB/workflow "
+                  f"(largest {max(results['inline']) / 1024:.0f} KiB)")
+            print(f"   History with codec:    {stored / args.workflows / 1024:>9.1f} KiB/workflow "
+                  f"(largest {max(results['stored']) / 1024:.0f} KiB), {inline / stored:.1f}x smaller")
+            print(f"   Encode: p50 {statistics.median(results['encode']):.2f} ms, p99 {p99(results['encode']):.2f} ms")
+            print(f"   Decode full history: p50 {statistics.median(results['decode']):.2f} ms, "
+                  f"p99 {p99(results['decode']):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+End-to-End Performance Benchmark for TraceRail Bootstrap
+
+This script runs `ExampleWorkflow` at scale against local stand-ins for every
+external service, so performance runs are reproducible in CI or on an
+isolated machine:
+
+- Temporal: an in-process test environment, the time-skipping test server by
+  default (`--env local` uses the dev server, `--address` an existing one);
+- the LLM: a `FakeLLMClient` (see `workers/fakes.py`), deterministic per
+  prompt, with configurable latency and token distributions;
+- routing rules: the DMN routing table in `dmn/`, evaluated in-process by
+  `workers/decision_tables.py` instead of tracerail-core's rules engine or
+  Flowable. The post rules are evaluated the same way as in production.
+
+Every activity is the real one, run by a real worker. Cases are generated
+from a seed: short messages, some with words the routing table sends to a
+human, some multi-part and, optionally, some large documents. The reviewer
+approves human-routed cases as soon as they wait (the `decision` signal is
+sent with the start), so each case measures the pipeline, not a person.
+
+The report covers throughput, end-to-end latency percentiles, outcomes and
+decisions, LLM calls and tokens, and the latency of each activity type. Save
+it with `--output` and compare a later run with `--baseline`; with
+`--max-regression` the script exits with an error when throughput or latency
+got worse by more than that fraction, or when the outcomes changed.
+
+Usage:
+    poetry run python bin/bench-e2e.py --cases 500 --output baseline.json
+    poetry run python bin/bench-e2e.py --cases 500 --baseline baseline.json --max-regression 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+# Read by the workers modules when they are imported: route with the local
+# DMN table and keep blobs and snapshots out of the working tree.
+_scratch = Path(tempfile.mkdtemp(prefix="tracerail-bench-e2e-"))
+os.environ.setdefault("ROUTING_RULES_FILE", "dmn/routing.dmn")
+os.environ.setdefault("BLOB_STORE_DIR", str(_scratch / "blobs"))
+os.environ.setdefault("RULES_SNAPSHOT_DIR", str(_scratch / "snapshots"))
+
+try:
+    import temporalio
+    from temporalio import activity
+    from temporalio.client import Client, WorkflowFailureError
+    from temporalio.testing import WorkflowEnvironment
+    from temporalio.worker import ActivityInboundInterceptor, ExecuteActivityInput, Interceptor, Worker
+
+    from workers import activities
+    from workers.activity_options import load_activity_options
+    from workers.chunking import LARGE_DOCUMENT_CHARS, document_input
+    from workers.claimcheck import data_converter
+    from workers.fakes import FakeLLMClient
+    from workers.models import ITEM_FAN_OUT
+    from workers.providers import close_clients, install_client
+    from workers.sandbox import workflow_runner
+    from workers.snapshots import close_snapshots
+    from workers.workflows import ExampleWorkflow
+except ImportError as e:
+    print(f"⚠️  Import error: {e}. Run 'poetry install' first.")
+    sys.exit(1)
+
+TASK_QUEUE = "bench-e2e"
+
+# "{n}" makes every text unique, so no LLM call is deduplicated.
+MESSAGES = [
+    "Where is my order {n}? It has not arrived yet.",
+    "Please send me the invoice for order {n}.",
+    "How do I return the jacket from order {n}?",
+    "I want to change the delivery address of order {n}.",
+    "My discount code did not work on order {n}.",
+    "URGENT: order {n} was charged twice, please fix it today.",
+    "This is a complaint about the damaged kettle in order {n}.",
+]
+
+# Report metrics compared against a baseline, and whether higher is better.
+COMPARED = {
+    "throughput_per_second": True,
+    "latency_ms.p50": False,
+    "latency_ms.p90": False,
+    "latency_ms.p99": False,
+}
+
+
+class ActivityTimer(Interceptor):
+    """Records how long each activity execution takes, by activity type."""
+
+    def __init__(self):
+        self.durations_ms: dict[str, list[float]] = defaultdict(list)
+
+    def intercept_activity(self, next: ActivityInboundInterceptor) -> ActivityInboundInterceptor:
+        return _TimedActivity(next, self.durations_ms)
+
+
+class _TimedActivity(ActivityInboundInterceptor):
+    def __init__(self, next: ActivityInboundInterceptor, durations_ms: dict[str, list[float]]):
+        super().__init__(next)
+        self.durations_ms = durations_ms
+
+    async def execute_activity(self, input: ExecuteActivityInput):
+        start = time.perf_counter()
+        try:
+            return await super().execute_activity(input)
+        finally:
+            self.durations_ms[activity.info().activity_type].append((time.perf_counter() - start) * 1000)
+
+
+def make_cases(count: int, seed: int, multi_part_ratio: float, large_ratio: float) -> list[list[str]]:
+    """Returns the texts of each case: one item, several for a multi-part case."""
+    rng = random.Random(seed)
+
+    def text(n: int) -> str:
+        if rng.random() < large_ratio:
+            paragraph = " ".join(rng.choice(MESSAGES).format(n=f"{n}-{i}") for i in range(8))
+            return "\n\n".join([paragraph] * (LARGE_DOCUMENT_CHARS // len(paragraph) + 2))
+        return rng.choice(MESSAGES).format(n=n)
+
+    cases = []
+    for case in range(count):
+        items = rng.randint(2, 5) if rng.random() < multi_part_ratio else 1
+        cases.append([text(case * 10 + item) for item in range(items)])
+    return cases
+
+
+def percentiles(values: list[float]) -> dict:
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def at(q: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))], 1)
+
+    return {"p50": at(0.5), "p90": at(0.9), "p99": at(0.99), "max": round(ordered[-1], 1),
+            "mean": round(statistics.fmean(ordered), 1)}
+
+
+async def run_cases(client: Client, cases: list[list[str]], concurrency: int, run_id: str) -> list[dict]:
+    """Runs the cases, `concurrency` at a time, and returns one record per case."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_case(index: int, texts: list[str]) -> dict:
+        inputs = [document_input(text) for text in texts]
+        args = [inputs[0]] if len(inputs) == 1 else [inputs, ITEM_FAN_OUT]
+        async with semaphore:
+            start = time.perf_counter()
+            handle = await client.start_workflow(
+                ExampleWorkflow.run, args=args, id=f"bench-e2e-{run_id}-{index}", task_queue=TASK_QUEUE,
+                # The reviewer approves as soon as a case waits for a human.
+                start_signal="decision", start_signal_args=["approve"],
+            )
+            try:
+                result = await handle.result()
+            except WorkflowFailureError as e:
+                return {"latency_ms": (time.perf_counter() - start) * 1000, "status": "ERROR", "error": str(e.cause)}
+        return {
+            "latency_ms": (time.perf_counter() - start) * 1000,
+            "status": result["status"].split(" ")[0],
+            "decision": (result.get("routing_info") or {}).get("decision"),
+            "post_action": (result.get("post_rules") or {}).get("action"),
+            "items": len(texts),
+        }
+
+    return list(await asyncio.gather(*(run_case(index, texts) for index, texts in enumerate(cases))))
+
+
+def build_report(args: argparse.Namespace, records: list[dict], wall_seconds: float, llm: FakeLLMClient,
+                 timer: ActivityTimer) -> dict:
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "scenario": {
+            "cases": args.cases, "concurrency": args.concurrency, "seed": args.seed, "env": args.address or args.env,
+            "multi_part_ratio": args.multi_part_ratio, "large_ratio": args.large_ratio,
+            "llm_latency_ms": args.llm_latency_ms, "llm_jitter_ms": args.llm_jitter_ms,
+            "llm_tail_ms": args.llm_tail_ms, "llm_tail_probability": args.llm_tail_probability,
+            "ms_per_output_token": args.ms_per_output_token, "completion_tokens": args.completion_tokens,
+            "llm_error_rate": args.llm_error_rate,
+        },
+        "environment": {"python": platform.python_version(), "temporalio": temporalio.__version__,
+                        "machine": platform.machine(), "cpus": os.cpu_count()},
+        "wall_seconds": round(wall_seconds, 2),
+        "throughput_per_second": round(len(records) / wall_seconds, 2),
+        "latency_ms": percentiles([record["latency_ms"] for record in records]),
+        "outcomes": dict(sorted(Counter(record["status"] for record in records).items())),
+        "decisions": dict(sorted(Counter(str(record.get("decision")) for record in records).items())),
+        "llm": {
+            "calls": llm.calls, "errors": llm.errors,
+            "prompt_tokens": llm.prompt_tokens_total, "completion_tokens": llm.completion_tokens_total,
+            "latency_ms": percentiles(llm.latencies_ms),
+        },
+        "activities": {
+            name: {"count": len(durations), **percentiles(durations)}
+            for name, durations in sorted(timer.durations_ms.items())
+        },
+    }
+
+
+def print_report(report: dict) -> None:
+    latency = report["latency_ms"]
+    print("\n📊 Results:")
+    print(f"   Cases: {sum(report['outcomes'].values())} in {report['wall_seconds']:.1f}s "
+          f"({report['throughput_per_second']:.1f} cases/s)")
+    print(f"   End-to-end latency: p50 {latency['p50']:.0f} ms   p90 {latency['p90']:.0f} ms   "
+          f"p99 {latency['p99']:.0f} ms   max {latency['max']:.0f} ms")
+    print(f"   Outcomes: {report['outcomes']}")
+    print(f"   Decisions: {report['decisions']}")
+    llm = report["llm"]
+    print(f"   LLM: {llm['calls']} calls, {llm['errors']} errors, "
+          f"{llm['prompt_tokens']:,} prompt + {llm['completion_tokens']:,} completion tokens")
+    print(f"\n{'Activity':<30}{'Count':>8}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, stats in report["activities"].items():
+        print(f"{name:<30}{stats['count']:>8}{stats['p50']:>10.1f}{stats['p99']:>10.1f}")
+
+
+def metric(report: dict, path: str) -> float | None:
+    value = report
+    for key in path.split("."):
+        value = value.get(key) if isinstance(value, dict) else None
+    return value
+
+
+def compare(report: dict, baseline: dict, max_regression: float | None) -> list[str]:
+    """Prints the change of each compared metric and returns the regressions."""
+    regressions = []
+    print(f"\n📈 Compared with the baseline of {baseline.get('created_at', '?')}:")
+    if baseline.get("scenario") != report["scenario"]:
+        print("   ⚠️  The scenarios differ; the comparison may not be meaningful.")
+    print(f"{'Metric':<26}{'Baseline':>12}{'Now':>12}{'Change':>10}")
+    for path, higher_is_better in COMPARED.items():
+        old, new = metric(baseline, path), metric(report, path)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        worse = -change if higher_is_better else change
+        flag = ""
+        if max_regression is not None and worse > max_regression:
+            flag = "  ❌"
+            regressions.append(f"{path} {change:+.1%}")
+        print(f"{path:<26}{old:>12.1f}{new:>12.1f}{change:>+10.1%}{flag}")
+    # The fake LLM is deterministic, so the same scenario must end the same way.
+    if baseline.get("scenario") == report["scenario"]:
+        for key in ("outcomes", "decisions"):
+            if baseline.get(key) != report[key]:
+                print(f"   ❌ {key} changed: {baseline.get(key)} -> {report[key]}")
+                regressions.append(f"{key} changed")
+    return regressions
+
+
+async def start_environment(args: argparse.Namespace) -> WorkflowEnvironment:
+    if args.address:
+        client = await Client.connect(args.address, namespace=args.namespace, data_converter=data_converter())
+        return WorkflowEnvironment.from_client(client)
+    if args.env == "local":
+        return await WorkflowEnvironment.start_local(data_converter=data_converter())
+    return await WorkflowEnvironment.start_time_skipping(data_converter=data_converter())
+
+
+async def run_benchmark(args: argparse.Namespace) -> dict:
+    llm = FakeLLMClient(
+        latency_ms=args.llm_latency_ms, jitter_ms=args.llm_jitter_ms,
+        tail_latency_ms=args.llm_tail_ms, tail_probability=args.llm_tail_probability,
+        ms_per_output_token=args.ms_per_output_token, completion_tokens=args.completion_tokens,
+        error_rate=args.llm_error_rate, seed=args.seed,
+    )
+    install_client(llm)
+    load_activity_options()
+    cases = make_cases(args.cases, args.seed, args.multi_part_ratio, args.large_ratio)
+    print(f"   Cases: {len(cases)} ({sum(len(texts) > 1 for texts in cases)} multi-part), "
+          f"{args.concurrency} in flight")
+    print(f"   Fake LLM: {args.llm_latency_ms:.0f} ms +/- {args.llm_jitter_ms:.0f} ms, "
+          f"{args.llm_tail_probability:.0%} at {args.llm_tail_ms:.0f} ms, {args.ms_per_output_token:g} ms per output token")
+
+    timer = ActivityTimer()
+    print(f"\n⏳ Starting the {'Temporal service at ' + args.address if args.address else args.env + ' environment'}...")
+    async with await start_environment(args) as env:
+        worker = Worker(
+            env.client,
+            task_queue=TASK_QUEUE,
+            workflows=[ExampleWorkflow],
+            workflow_runner=workflow_runner(),
+            activities=activities.ACTIVITIES,
+            interceptors=[timer],
+            max_concurrent_activities=args.max_concurrent_activities,
+        )
+        async with worker:
+            print("⏳ Running cases...")
+            start = time.perf_counter()
+            records = await run_cases(env.client, cases, args.concurrency, uuid.uuid4().hex[:8])
+            wall_seconds = time.perf_counter() - start
+    await close_clients()
+    await close_snapshots()
+    return build_report(args, records, wall_seconds, llm, timer)
+
+
+def main():
+    """Main benchmark function"""
+    parser = argparse.ArgumentParser(description="Run ExampleWorkflow end to end against local fakes and report its performance.")
+    parser.add_argument("--cases", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50, help="Cases in flight at the same time.")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--multi-part-ratio", type=float, default=0.1, help="Fraction of multi-part cases.")
+    parser.add_argument("--large-ratio", type=float, default=0.0, help="Fraction of items that are large documents.")
+    parser.add_argument("--env", choices=["time-skipping", "local"], default="time-skipping",
+                        help="The Temporal test environment to start.")
+    parser.add_argument("--address", help="Use the Temporal service at this address instead, e.g. localhost:7233.")
+    parser.add_argument("--namespace", default="default")
+    parser.add_argument("--max-concurrent-activities", type=int, default=200)
+    llm = parser.add_argument_group("fake LLM")
+    llm.add_argument("--llm-latency-ms", type=float, default=200.0)
+    llm.add_argument("--llm-jitter-ms", type=float, default=50.0)
+    llm.add_argument("--llm-tail-ms", type=float, default=2000.0)
+    llm.add_argument("--llm-tail-probability", type=float, default=0.01)
+    llm.add_argument("--ms-per-output-token", type=float, default=0.0, help="Decoding time per completion token.")
+    llm.add_argument("--completion-tokens", type=int, default=120, help="Median completion length.")
+    llm.add_argument("--llm-error-rate", type=float, default=0.0)
+    report = parser.add_argument_group("report")
+    report.add_argument("--output", type=Path, help="Write the report to this JSON file.")
+    report.add_argument("--baseline", type=Path, help="Compare with the report in this JSON file.")
+    report.add_argument("--max-regression", type=float,
+                        help="Fail if a metric got worse than the baseline by more than this fraction.")
+    args = parser.parse_args()
+
+    # Read first, so the baseline may be the file the report replaces.
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+
+    print("🚀 TraceRail End-to-End Performance Benchmark")
+    print("=" * 50)
+    try:
+        result = asyncio.run(run_benchmark(args))
+    finally:
+        shutil.rmtree(_scratch, ignore_errors=True)
+    print_report(result)
+
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2) + "\n")
+        print(f"\n💾 Report written to {args.output}")
+    if baseline is not None:
+        regressions = compare(result, baseline, args.max_regression)
+        if regressions:
+            print(f"\n❌ Regressed: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Result Collection Benchmark for TraceRail Bootstrap
+
+This script compares two ways of gathering the results of many closed
+workflows: waiting on every workflow handle individually, and the bulk
+`ResultCollector` in `cli/collect_results.py`, which lists closed runs through
+visibility and fetches only their close events.
+
+Requires a running Temporal service with closed 'ExampleWorkflow' executions.
+To seed them, start a batch first, e.g. `make batch-start INPUT=docs.jsonl`.
+"""
+
+import argparse
+import asyncio
+import io
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    print("⚠️  python-dotenv not installed. Run 'poetry install' first.")
+    sys.exit(1)
+
+try:
+    from temporalio.client import Client
+    from tracerail.config import TraceRailConfig
+
+    from cli.collect_results import ResultCollector, closed_since_query, parse_since
+    from workers.claimcheck import data_converter
+except ImportError:
+    print("⚠️  Dependencies not installed. Run 'poetry install' first.")
+    sys.exit(1)
+
+
+async def per_handle_waits(client: Client, workflow_ids: list[str], concurrency: int) -> float:
+    """Waits on `handle.result()` for every workflow, `concurrency` at a time."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def wait_one(workflow_id: str):
+        async with semaphore:
+            try:
+                await asyncio.wait_for(client.get_workflow_handle(workflow_id).result(), timeout=60.0)
+            except Exception:
+                pass
+
+    start = time.perf_counter()
+    await asyncio.gather(*(wait_one(workflow_id) for workflow_id in workflow_ids))
+    return time.perf_counter() - start
+
+
+async def bulk_collect(client: Client, since, concurrency: int) -> tuple[float, int]:
+    """Collects every result closed since `since` with the ResultCollector."""
+    collector = ResultCollector(client, concurrency=concurrency)
+    start = time.perf_counter()
+    written = await collector.collect(since, io.StringIO())
+    return time.perf_counter() - start, written
+
+
+async def run_benchmark(args: argparse.Namespace) -> None:
+    config = TraceRailConfig()
+    client = await Client.connect(
+        f"{config.temporal.host}:{config.temporal.port}", namespace=config.temporal.namespace,
+        data_converter=data_converter(),
+    )
+    since = parse_since(args.since)
+
+    workflow_ids = []
+    async for execution in client.list_workflows(closed_since_query(since), limit=args.count):
+        workflow_ids.append(execution.id)
+    if not workflow_ids:
+        print("❌ No closed workflows found. Seed some with `make batch-start` first.")
+        sys.exit(1)
+    print(f"   Found {len(workflow_ids)} closed workflow(s) since {since.isoformat()}")
+
+    print("\n⏳ Per-handle waits...")
+    handle_seconds = await per_handle_waits(client, workflow_ids, args.concurrency)
+    print("⏳ Bulk collection...")
+    bulk_seconds, collected = await bulk_collect(client, since, args.concurrency)
+
+    print("\n📊 Results:")
+    print(f"   Per-handle waits: {handle_seconds:.2f}s ({len(workflow_ids) / handle_seconds:.0f} results/s)")
+    print(f"   Bulk collection:  {bulk_seconds:.2f}s ({collected / bulk_seconds:.0f} results/s)")
+    print(f"   Speedup: {handle_seconds / bulk_seconds:.1f}x")
+
+
+def main():
+    """Main benchmark function"""
+    parser = argparse.ArgumentParser(description="Compare per-handle result waits with bulk collection.")
+    parser.add_argument("--count", type=int, default=5000, help="Number of closed workflows to use.")
+    parser.add_argument("--since", default="1d", help="Only consider workflows closed since then.")
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    print("🚀 TraceRail Result Collection Benchmark")
+    print("=" * 50)
+    asyncio.run(run_benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Semantic Cache Benchmark for TraceRail Bootstrap
+
+This script replays a stream of support messages through the semantic cache
+in `workers/semantic_cache.py` and compares it with calling the LLM for every
+message. Messages are generated from a set of intents (refund, cancellation,
+password reset, ...) that share much of their vocabulary, each written in
+several ways and varied with greetings, sign-offs, order numbers and typos,
+so paraphrases are common but a careless cache would confuse intents.
+
+For each similarity threshold it reports:
+
+- hit rate: messages answered from the cache;
+- precision: hits whose cached message had the same intent, and hits whose
+  cached routing decision matched the message's;
+- latency: mean time per message, where a hit costs the lookup and a miss the
+  lookup plus a fake LLM call.
+
+It also compares lookup latency with and without numpy. No API keys or
+Temporal service are needed.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from workers.fakes import FakeProvider
+from workers.semantic_cache import SEMANTIC_CACHE_THRESHOLD, SemanticCache, load_numpy
+
+# (intent, routing decision, ways of writing it)
+INTENTS = [
+    ("refund", "human", [
+        "I want a refund for order {order}, it arrived broken",
+        "Please refund order {order}, the item was broken on arrival",
+        "Order {order} came damaged and I would like my money back",
+    ]),
+    ("cancel", "automatic", [
+        "I want to cancel order {order} before it ships",
+        "Please cancel my order {order}, I no longer need it",
+        "Can you stop order {order}? I changed my mind",
+    ]),
+    ("return", "automatic", [
+        "How do I return the {product} from order {order}?",
+        "I need a return label for the {product} in order {order}",
+        "I want to send back the {product} I bought, order {order}",
+    ]),
+    ("late", "automatic", [
+        "My order {order} has not arrived yet, where is it?",
+        "Order {order} is late, the delivery date has passed",
+        "Still waiting for order {order}, can you check the delivery status?",
+    ]),
+    ("wrong-item", "human", [
+        "I received the wrong item in order {order}, I ordered a {product}",
+        "Order {order} contained a different product instead of my {product}",
+        "You sent me the wrong {product} in order {order}",
+    ]),
+    ("password", "automatic", [
+        "How do I reset my password?",
+        "I forgot my password and cannot log in",
+        "Password reset link is not working, I cannot sign in",
+    ]),
+    ("address", "automatic", [
+        "How can I change the delivery address for order {order}?",
+        "I need to update the shipping address on order {order}",
+        "Please ship order {order} to my new address instead",
+    ]),
+    ("invoice", "automatic", [
+        "Can you send me the invoice for order {order}?",
+        "I need a copy of the invoice for order {order} for my records",
+        "Where do I download the invoice for order {order}?",
+    ]),
+    ("double-charge", "human", [
+        "I was charged twice for order {order}",
+        "My card was billed two times for order {order}, please fix it",
+        "There is a duplicate charge on my card for order {order}",
+    ]),
+    ("account-delete", "human", [
+        "Please delete my account and all my data",
+        "I want to close my account and remove my personal data",
+        "How do I permanently delete my account?",
+    ]),
+    ("warranty", "human", [
+        "My {product} stopped working after two months, is it under warranty?",
+        "The {product} broke and I want to use the warranty",
+        "Is the {product} from order {order} still covered by the warranty?",
+    ]),
+    ("discount", "automatic", [
+        "My discount code does not work at checkout",
+        "The promo code was not applied to my order",
+        "Why was my coupon rejected when I paid?",
+    ]),
+]
+PRODUCTS = ["headphones", "kettle", "backpack", "monitor", "jacket", "blender"]
+GREETINGS = ["", "", "Hi,", "Hello,", "Hi team,", "Good morning,"]
+SIGN_OFFS = ["", "", "Thanks.", "Thank you!", "Regards, Sam", "Cheers"]
+
+
+def typo(text: str, rng: random.Random) -> str:
+    """Swaps two adjacent letters in one word of the text."""
+    words = text.split()
+    candidates = [i for i, word in enumerate(words) if len(word) > 4 and word.isalpha()]
+    if not candidates:
+        return text
+    i = rng.choice(candidates)
+    j = rng.randrange(len(words[i]) - 1)
+    word = words[i]
+    words[i] = word[:j] + word[j + 1] + word[j] + word[j + 2:]
+    return " ".join(words)
+
+
+def make_messages(count: int, seed: int) -> list[tuple[str, str, str]]:
+    """Returns `(intent, decision, text)` for `count` messages; popular intents are more common."""
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(len(INTENTS))]
+    messages = []
+    for _ in range(count):
+        intent, decision, templates = rng.choices(INTENTS, weights)[0]
+        text = rng.choice(templates).format(order=rng.randint(10000, 10999), product=rng.choice(PRODUCTS))
+        if rng.random() < 0.2:
+            text = typo(text, rng)
+        text = " ".join(part for part in (rng.choice(GREETINGS), text, rng.choice(SIGN_OFFS)) if part)
+        messages.append((intent, decision, text))
+    return messages
+
+
+def run(messages: list[tuple[str, str, str]], threshold: float, provider: FakeProvider, use_numpy: bool = True) -> dict:
+    cache = SemanticCache(threshold=threshold, max_entries=len(messages), use_numpy=use_numpy)
+    hits = same_intent = same_decision = 0
+    latencies_ms, lookups_us = [], []
+    for intent, decision, text in messages:
+        start = time.perf_counter()
+        match = cache.lookup(text)
+        lookup_ms = (time.perf_counter() - start) * 1000
+        lookups_us.append(lookup_ms * 1000)
+        if match is not None:
+            hits += 1
+            same_intent += match.result["intent"] == intent
+            same_decision += match.result["routing_decision"]["decision"] == decision
+            latencies_ms.append(lookup_ms)
+            continue
+        latencies_ms.append(lookup_ms + provider.sample_latency_ms())
+        cache.add(text, {"intent": intent, "routing_decision": {"decision": decision}})
+    return {
+        "threshold": threshold,
+        "hit_rate": hits / len(messages),
+        "intent_precision": same_intent / hits if hits else 1.0,
+        "decision_precision": same_decision / hits if hits else 1.0,
+        "latency_ms": statistics.fmean(latencies_ms),
+        "lookup_p50_us": statistics.median(lookups_us),
+        "lookup_p99_us": sorted(lookups_us)[int(len(lookups_us) * 0.99)],
+    }
+
+
+def main():
+    """Main benchmark function"""
+    parser = argparse.ArgumentParser(description="Measure the semantic cache's hit rate, precision and latency.")
+    parser.add_argument("--messages", type=int, default=3000)
+    parser.add_argument("--thresholds", default="0.6,0.7,0.75,0.8,0.85,0.9", help="Comma-separated thresholds to compare.")
+    parser.add_argument("--latency-ms", type=float, default=800.0, help="Mean latency of the fake LLM.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print("🚀 TraceRail Semantic Cache Benchmark")
+    print("=" * 50)
+    messages = make_messages(args.messages, args.seed)
+    print(f"   Messages: {len(messages)} over {len(INTENTS)} intents; fake LLM {args.latency_ms:.0f} ms")
+
+    def provider() -> FakeProvider:
+        return FakeProvider("fake", latency_ms=args.latency_ms, jitter_ms=args.latency_ms / 4, seed=1)
+
+    baseline = provider()
+    baseline_ms = statistics.fmean(baseline.sample_latency_ms() for _ in messages)
+    print(f"\n{'Threshold':>10}{'Hit rate':>10}{'Intent prec.':>14}{'Decision prec.':>16}{'Mean latency':>14}")
+    print(f"{'no cache':>10}{'-':>10}{'-':>14}{'-':>16}{baseline_ms:>11.0f} ms")
+    for threshold in (float(value) for value in args.thresholds.split(",")):
+        result = run(messages, threshold, provider())
+        print(
+            f"{threshold:>10.2f}{result['hit_rate']:>10.1%}{result['intent_precision']:>14.1%}"
+            f"{result['decision_precision']:>16.1%}{result['latency_ms']:>11.0f} ms"
+        )
+
+    print(f"\n⏱️  Lookup latency at threshold {SEMANTIC_CACHE_THRESHOLD}:")
+    for use_numpy in ([True, False] if load_numpy() else [False]):
+        result = run(messages, SEMANTIC_CACHE_THRESHOLD, provider(), use_numpy=use_numpy)
+        print(f"   {'numpy' if use_numpy else 'pure Python':<12} p50 {result['lookup_p50_us']:>7.0f} us"
+              f"   p99 {result['lookup_p99_us']:>7.0f} us")
+
+
+if __name__ == "__main__":
+    main()
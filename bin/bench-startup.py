@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Worker Startup Benchmark for TraceRail Bootstrap
+
+This script launches the Temporal worker several times and measures the
+time-to-first-poll: the wall-clock time from process spawn until the worker
+logs that it is polling its task queue. Results can be saved and compared
+against a baseline so scale-out stays fast.
+
+Requires a running Temporal service (`make up`).
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+WORKER_SCRIPT = Path("workers") / "worker.py"
+READY_PATTERN = re.compile(r"Worker polling after ([0-9.]+)s")
+SUMMARY_PATTERN = re.compile(r"Import time: [0-9.]+ ms across (\d+) module")
+IMPORT_PATTERN = re.compile(r"   - ([\w.]+): ([0-9.]+) ms")
+
+
+def measure_startup(timeout: float) -> dict | None:
+    """Starts the worker once and returns its startup timings."""
+    env = dict(os.environ, PYTHONUNBUFFERED="1", WORKER_PRELOAD_PROVIDER="false")
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, str(WORKER_SCRIPT)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        env=env,
+    )
+
+    result = None
+    imports = {}
+    expected_imports = None
+    try:
+        deadline = start + timeout
+        for line in process.stderr:
+            if time.perf_counter() > deadline:
+                break
+            if result is None:
+                ready = READY_PATTERN.search(line)
+                if ready:
+                    result = {
+                        "time_to_first_poll": time.perf_counter() - start,
+                        "in_process": float(ready.group(1)),
+                    }
+                continue
+
+            # The worker logs its per-module import timings right after it is ready.
+            summary = SUMMARY_PATTERN.search(line)
+            if summary:
+                expected_imports = int(summary.group(1))
+                continue
+            imported = IMPORT_PATTERN.search(line)
+            if imported:
+                imports[imported.group(1)] = float(imported.group(2))
+            if expected_imports is None or len(imports) >= expected_imports:
+                break
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    if result is not None:
+        result["imports_ms"] = imports
+    return result
+
+
+def main():
+    """Main benchmark function"""
+    parser = argparse.ArgumentParser(description="Measure worker time-to-first-poll.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of worker launches.")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for each launch.")
+    parser.add_argument("--output", type=Path, help="Write the results as JSON to this file.")
+    parser.add_argument("--baseline", type=Path, help="Compare against a previous JSON result.")
+    parser.add_argument(
+        "--max-regression", type=float, default=0.2,
+        help="Fail if the median is this fraction slower than the baseline.",
+    )
+    args = parser.parse_args()
+
+    print("🚀 TraceRail Worker Startup Benchmark")
+    print("=" * 50)
+
+    if not WORKER_SCRIPT.exists():
+        print("❌ Please run this script from the tracerail-bootstrap root directory")
+        sys.exit(1)
+
+    runs = []
+    for i in range(1, args.runs + 1):
+        result = measure_startup(args.timeout)
+        if result is None:
+            print(f"   Run {i}: ❌ worker did not start polling within {args.timeout:.0f}s")
+            continue
+        print(f"   Run {i}: {result['time_to_first_poll'] * 1000:.0f} ms to first poll")
+        runs.append(result)
+
+    if not runs:
+        print("\n❌ No successful runs. Is Temporal running? Try `make up`.")
+        sys.exit(1)
+
+    timings = [r["time_to_first_poll"] for r in runs]
+    summary = {
+        "runs": len(runs),
+        "median_s": statistics.median(timings),
+        "min_s": min(timings),
+        "max_s": max(timings),
+        "imports_ms": runs[-1]["imports_ms"],
+    }
+
+    print("\n📊 Time-to-first-poll:")
+    print(f"   Median: {summary['median_s'] * 1000:.0f} ms")
+    print(f"   Min:    {summary['min_s'] * 1000:.0f} ms")
+    print(f"   Max:    {summary['max_s'] * 1000:.0f} ms")
+    if summary["imports_ms"]:
+        print("\n📦 Slowest imports (last run):")
+        for name, elapsed in list(summary["imports_ms"].items())[:10]:
+            print(f"   - {name}: {elapsed:.1f} ms")
+
+    if args.output:
+        args.output.write_text(json.dumps(summary, indent=2))
+        print(f"\n💾 Results written to {args.output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        change = summary["median_s"] / baseline["median_s"] - 1
+        print(f"\n📈 Change vs baseline: {change * 100:+.1f}%")
+        if change > args.max_regression:
+            print("❌ Startup regressed beyond the allowed threshold.")
+            sys.exit(1)
+        print("✅ Startup is within the allowed threshold.")
+
+
+if __name__ == "__main__":
+    main()
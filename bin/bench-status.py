@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Case Status Benchmark for TraceRail Bootstrap
+
+This script compares two ways of checking the status of many cases:
+
+- per case: describe the workflow and read its history to find the stage it
+  has reached, which is what status polling did before the `status` query;
+- bulk: `bulk_status` in `workers/status.py`, which reads cases from
+  visibility, a hundred per request, and sends the `status` query only to
+  running ones started without search attributes.
+
+Requires a running Temporal service with 'ExampleWorkflow' executions and a
+worker (to answer queries). To seed 10,000 cases, start a batch first, e.g.
+`make batch-workflow INPUT=docs.jsonl`.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    print("⚠️  python-dotenv not installed. Run 'poetry install' first.")
+    sys.exit(1)
+
+try:
+    from temporalio.client import Client
+    from tracerail.config import TraceRailConfig
+
+    from workers.claimcheck import data_converter
+    from workers.status import CASE_STATUS_QUERY_LIMIT, WORKFLOW_TYPE, bulk_status
+except ImportError:
+    print("⚠️  Dependencies not installed. Run 'poetry install' first.")
+    sys.exit(1)
+
+
+async def per_case(client: Client, workflow_ids: list[str], concurrency: int) -> tuple[float, int]:
+    """Describes every workflow and fetches its history. Returns (seconds, history bytes)."""
+    semaphore = asyncio.Semaphore(concurrency)
+    history_bytes = 0
+
+    async def check(workflow_id: str):
+        nonlocal history_bytes
+        handle = client.get_workflow_handle(workflow_id)
+        async with semaphore:
+            try:
+                await handle.describe()
+                history = await handle.fetch_history()
+                history_bytes += sum(event.ByteSize() for event in history.events)
+            except Exception:
+                pass
+
+    start = time.perf_counter()
+    await asyncio.gather(*(check(workflow_id) for workflow_id in workflow_ids))
+    return time.perf_counter() - start, history_bytes
+
+
+async def run_benchmark(args: argparse.Namespace) -> None:
+    config = TraceRailConfig()
+    client = await Client.connect(
+        f"{config.temporal.host}:{config.temporal.port}", namespace=config.temporal.namespace,
+        data_converter=data_converter(),
+    )
+
+    workflow_ids = []
+    running = 0
+    async for execution in client.list_workflows(f"WorkflowType = '{WORKFLOW_TYPE}'", limit=args.count):
+        workflow_ids.append(execution.id)
+        running += execution.status is not None and execution.status.name == "RUNNING"
+    if not workflow_ids:
+        print("❌ No workflows found. Seed some with `make batch-workflow` first.")
+        sys.exit(1)
+    print(f"   Found {len(workflow_ids)} case(s), {running} running")
+
+    print("\n⏳ Per-case describe and history...")
+    per_case_seconds, history_bytes = await per_case(client, workflow_ids, args.concurrency)
+    print("⏳ Bulk status...")
+    start = time.perf_counter()
+    statuses = await bulk_status(client, workflow_ids, concurrency=args.concurrency)
+    bulk_seconds = time.perf_counter() - start
+    errors = sum("error" in status for status in statuses.values())
+    unindexed = sum(status["status"] == "RUNNING" and not status["indexed"] for status in statuses.values())
+
+    print("\n📊 Results:")
+    print(f"   Per case:    {per_case_seconds:.2f}s ({len(workflow_ids) / per_case_seconds:.0f} cases/s), "
+          f"{history_bytes / 1024 / 1024:.1f} MiB of history loaded")
+    print(f"   Bulk status: {bulk_seconds:.2f}s ({len(statuses) / bulk_seconds:.0f} cases/s), "
+          f"{min(unindexed, CASE_STATUS_QUERY_LIMIT)} queries, {errors} failed")
+    print(f"   Speedup: {per_case_seconds / bulk_seconds:.1f}x")
+
+
+def main():
+    """Main benchmark function"""
+    parser = argparse.ArgumentParser(description="Compare per-case history reads with bulk status checks.")
+    parser.add_argument("--count", type=int, default=10_000, help="Number of cases to check.")
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    print("🚀 TraceRail Case Status Benchmark")
+    print("=" * 50)
+    asyncio.run(run_benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Workflow Task Benchmark for TraceRail Bootstrap
+
+This script measures how fast a worker processes 'ExampleWorkflow' workflow
+tasks, without a Temporal server or any activity doing real work. It drives
+workflow instances directly through a workflow runner: each case is created
+the way the worker creates it for a new run, then activated task by task, with
+every scheduled activity resolved at once from a canned result. What is left
+is the workflow's own cost: creating the instance (in the sandbox, re-importing
+the workflow module) and running its code between activities.
+
+Runners compared:
+
+- sandboxed:   Temporal's default sandbox restrictions, what the worker used
+               before `workers/sandbox.py`;
+- optimized:   the sandbox with the restrictions built once in
+               `workers/sandbox.py`, which pass the pure-data modules through;
+- unsandboxed: `TrustedWorkflowRunner` with 'ExampleWorkflow' trusted, i.e.
+               `WORKFLOW_UNSANDBOXED=ExampleWorkflow`.
+
+For each runner it reports workflow tasks per second, instance creation time,
+the p50/p99 latency of a task, and the latency of each task of a case by the
+activities that task scheduled. `--profile MODE` prints the hottest functions
+of one runner.
+
+The runner is driven through the SDK's internal activation API, which may
+change between temporalio releases.
+
+Usage:
+    poetry run python bin/bench-workflow-tasks.py [--cases 500] [--human-share 0.3]
+"""
+
+import argparse
+import asyncio
+import cProfile
+import dataclasses
+import gc
+import pstats
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    import temporalio.common
+    import temporalio.converter
+    import temporalio.workflow
+    from temporalio.bridge.proto.activity_result import ActivityResolution, Success
+    from temporalio.bridge.proto.workflow_activation import (
+        FireTimer,
+        InitializeWorkflow,
+        ResolveActivity,
+        SignalWorkflow,
+        WorkflowActivation,
+        WorkflowActivationJob,
+    )
+    from temporalio.worker import WorkflowInstanceDetails
+    from temporalio.worker.workflow_sandbox import SandboxedWorkflowRunner
+
+    from workers.activity_options import load_activity_options
+    from workers.sandbox import SANDBOX_RESTRICTIONS, TrustedWorkflowRunner
+    from workers.search_attributes import initial_attributes
+    from workers.workflows import ExampleWorkflow
+except ImportError as e:
+    print(f"⚠️  Import error: {e}. Run 'poetry install' first.")
+    sys.exit(1)
+
+CONVERTER = temporalio.converter.DataConverter.default
+
+# What each activity returns: the shapes the workflow reads, nothing more.
+RESULTS = {
+    "pin_rules_snapshot_activity": {"routing": "routing@bench", "post_rules": "post_rules@bench"},
+    "llm_activity": {
+        "answer": "The invoice was paid on 3 March.", "provider": "fake",
+        "llm_response": {"content": "The invoice was paid on 3 March.", "metadata": {"confidence": 0.92}},
+    },
+    "guardrails_activity": [{"passed": True, "failures": [], "content": "The invoice was paid on 3 March.", "pii": {}}],
+    "routing_activity": {"decision": "automatic", "reason": "High confidence", "triggered_rules": ["rule-1"]},
+    "post_rules_activity": {"action": "approve", "reason": "No rule matched", "matched_rules": []},
+}
+HUMAN_ROUTING = {"decision": "human", "reason": "Low confidence", "triggered_rules": ["rule-3"]}
+
+MODES = ["sandboxed", "optimized", "unsandboxed"]
+
+
+def create_runner(mode: str):
+    """Returns the workflow runner a mode benchmarks."""
+    if mode == "sandboxed":
+        return SandboxedWorkflowRunner()
+    if mode == "optimized":
+        return SandboxedWorkflowRunner(restrictions=SANDBOX_RESTRICTIONS)
+    return TrustedWorkflowRunner(frozenset({"ExampleWorkflow"}))
+
+
+def build(cls, **values):
+    """Builds an SDK dataclass from the values its version knows about."""
+    names = {field.name for field in dataclasses.fields(cls)}
+    if "priority" in values and values["priority"] is not None:
+        values["priority"] = values["priority"].default
+    return cls(**{name: value for name, value in values.items() if name in names})
+
+
+def instance_details(defn, case: int) -> WorkflowInstanceDetails:
+    now = datetime.now(timezone.utc)
+    attributes = initial_attributes() or temporalio.common.TypedSearchAttributes.empty
+    info = build(
+        temporalio.workflow.Info,
+        attempt=1, continued_run_id=None, cron_schedule=None, execution_timeout=None, headers={},
+        namespace="default", parent=None, root=None, raw_memo={}, retry_policy=None, run_id=f"run-{case}",
+        run_timeout=None, search_attributes={}, start_time=now, workflow_start_time=now, task_queue="bench",
+        task_timeout=timedelta(seconds=10), typed_search_attributes=attributes, workflow_id=f"case-{case}",
+        workflow_type=defn.name, priority=getattr(temporalio.common, "Priority", None),
+    )
+    return build(
+        WorkflowInstanceDetails,
+        payload_converter_class=CONVERTER.payload_converter_class,
+        failure_converter_class=CONVERTER.failure_converter_class,
+        interceptor_classes=[], defn=defn, info=info, randomness_seed=case, extern_functions={},
+        disable_eager_activity_execution=False, worker_level_failure_exception_types=[],
+    )
+
+
+def payload(value):
+    return CONVERTER.payload_converter.to_payloads([value])[0]
+
+
+async def run_case(runner, defn, case: int, human: bool, executor, stats: dict) -> str:
+    """Runs one case to completion, recording creation and per-task times. Returns its status."""
+    start = time.perf_counter()
+    instance = runner.create_instance(instance_details(defn, case))
+    stats["create"].append(time.perf_counter() - start)
+
+    loop = asyncio.get_running_loop()
+    jobs = [WorkflowActivationJob(initialize_workflow=InitializeWorkflow(
+        workflow_type=defn.name, workflow_id=f"case-{case}", arguments=[payload(f"Case {case}: when was the invoice paid?")],
+        randomness_seed=case, attempt=1,
+    ))]
+    label, task, status = "start", 0, None
+    while jobs:
+        activation = WorkflowActivation(run_id=f"run-{case}", jobs=jobs, history_length=3 + 6 * task)
+        activation.timestamp.GetCurrentTime()
+        # Activation replaces the thread's event loop, so it runs off the benchmark's loop.
+        start = time.perf_counter()
+        completion = await loop.run_in_executor(executor, instance.activate, activation)
+        elapsed = time.perf_counter() - start
+        if completion.HasField("failed"):
+            raise RuntimeError(f"Case {case} failed: {completion.failed.failure.message}")
+
+        jobs, scheduled = [], []
+        for command in completion.successful.commands:
+            if command.HasField("schedule_activity"):
+                activity_type = command.schedule_activity.activity_type
+                result = HUMAN_ROUTING if human and activity_type == "routing_activity" else RESULTS[activity_type]
+                scheduled.append(activity_type)
+                jobs.append(WorkflowActivationJob(resolve_activity=ResolveActivity(
+                    seq=command.schedule_activity.seq, result=ActivityResolution(completed=Success(result=payload(result))),
+                )))
+            elif command.HasField("start_timer") and human:
+                # The case waits for a reviewer: answer before the timeout fires.
+                scheduled.append("wait for decision")
+                jobs.append(WorkflowActivationJob(signal_workflow=SignalWorkflow(
+                    signal_name="decision", input=[payload("approve")],
+                )))
+            elif command.HasField("start_timer"):
+                jobs.append(WorkflowActivationJob(fire_timer=FireTimer(seq=command.start_timer.seq)))
+            elif command.HasField("complete_workflow_execution"):
+                status = CONVERTER.payload_converter.from_payloads([command.complete_workflow_execution.result])[0]["status"]
+        stats["task"].append(elapsed)
+        stats["by_task"][f"{task + 1}. {label}"].append(elapsed)
+        label = ", ".join(scheduled) or "done"
+        task += 1
+    return status
+
+
+def percentile(values: list[float], share: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+async def run_mode(mode: str, args: argparse.Namespace, executor) -> dict:
+    """Runs every case with one runner and returns its timings."""
+    defn = temporalio.workflow._Definition.must_from_class(ExampleWorkflow)
+    runner = create_runner(mode)
+    runner.prepare_workflow(defn)
+    # Warm up imports and caches outside the measurement.
+    for case in range(min(20, args.cases)):
+        await run_case(runner, defn, case, False, executor, {"create": [], "task": [], "by_task": defaultdict(list)})
+
+    gc.collect()
+    stats = {"create": [], "task": [], "by_task": defaultdict(list), "statuses": defaultdict(int)}
+    human_every = round(1 / args.human_share) if args.human_share else 0
+    start = time.perf_counter()
+    for case in range(args.cases):
+        human = bool(human_every) and case % human_every == 0
+        stats["statuses"][await run_case(runner, defn, case, human, executor, stats)] += 1
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def print_mode(mode: str, stats: dict, baseline: dict | None) -> None:
+    tasks = len(stats["task"])
+    rate = tasks / stats["seconds"]
+    create_ms = 1000 * sum(stats["create"]) / len(stats["create"])
+    print(f"\n📊 {mode}: {rate:,.0f} tasks/s ({tasks / len(stats['create']):.1f} tasks per case)")
+    if baseline:
+        print(f"   {rate / (len(baseline['task']) / baseline['seconds']):.2f}x the sandboxed rate")
+    print(f"   Instance creation: {create_ms:.3f} ms per case")
+    print(f"   Task latency: p50 {1000 * percentile(stats['task'], 0.5):.3f} ms, "
+          f"p99 {1000 * percentile(stats['task'], 0.99):.3f} ms")
+    for label, values in stats["by_task"].items():
+        print(f"     {label:<45} p50 {1000 * percentile(values, 0.5):.3f} ms  ({len(values)} tasks)")
+    print(f"   Outcomes: {dict(stats['statuses'])}")
+
+
+async def profile(mode: str, args: argparse.Namespace, executor) -> None:
+    """
+    Profiles one runner. The workflow code runs in the executor thread, so it
+    is only included from Python 3.12, where cProfile sees every thread.
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    await run_mode(mode, args, executor)
+    profiler.disable()
+    print(f"\n🔍 Hottest functions ({mode}):")
+    pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+
+
+async def run_benchmark(args: argparse.Namespace) -> None:
+    # As the worker does at startup, outside the sandbox.
+    load_activity_options()
+    with ThreadPoolExecutor(1) as executor:
+        if args.profile:
+            await profile(args.profile, args, executor)
+            return
+        baseline = None
+        for mode in args.modes:
+            print(f"\n⏳ {mode}: {args.cases} case(s)...")
+            stats = await run_mode(mode, args, executor)
+            print_mode(mode, stats, baseline)
+            if mode == "sandboxed":
+                baseline = stats
+
+
+def main():
+    """Main benchmark function"""
+    parser = argparse.ArgumentParser(description="Measure ExampleWorkflow workflow task throughput per runner.")
+    parser.add_argument("--cases", type=int, default=500, help="Cases run per mode.")
+    parser.add_argument("--human-share", type=float, default=0.3,
+                        help="Share of cases routed to a human, who approves them at once.")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--profile", choices=MODES, help="Profile this mode instead of comparing modes.")
+    args = parser.parse_args()
+
+    print("🚀 TraceRail Workflow Task Benchmark")
+    print("=" * 50)
+    asyncio.run(run_benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
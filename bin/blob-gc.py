@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Blob Store Garbage Collection for TraceRail Bootstrap
+
+This script deletes blobs (offloaded payloads, large documents and their
+chunks) that no workflow history can reference any more.
+
+Every blob is written, or has its timestamp refreshed, while the workflow that
+references it is running. Once a workflow has closed and its history has been
+deleted after the namespace's retention period, its blobs are unreachable. A
+blob is therefore deleted when it was last written before both:
+
+- now, minus the namespace retention, minus `--max-run-hours` (the longest a
+  workflow may run, including the 24-hour human review wait), and
+- an hour before the start of the oldest workflow that is still running
+  (starters store large documents just before starting the workflow).
+
+Usage:
+    poetry run python bin/blob-gc.py [--dry-run]
+    poetry run python bin/blob-gc.py --max-age-days 10   # without Temporal
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    print("⚠️  python-dotenv not installed. Run 'poetry install' first.")
+    sys.exit(1)
+
+from workers.blobstore import BLOB_STORE, create_blob_store
+
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_DAY = 24 * SECONDS_PER_HOUR
+
+
+async def temporal_cutoff(max_run_hours: float) -> float:
+    """
+    Returns the cutoff timestamp from the namespace retention and the oldest
+    running workflow.
+    """
+    from temporalio.api.workflowservice.v1 import DescribeNamespaceRequest
+    from temporalio.client import Client
+    from tracerail.config import TraceRailConfig
+
+    config = TraceRailConfig()
+    client = await Client.connect(f"{config.temporal.host}:{config.temporal.port}", namespace=config.temporal.namespace)
+    namespace = await client.workflow_service.describe_namespace(
+        DescribeNamespaceRequest(namespace=config.temporal.namespace)
+    )
+    retention = namespace.config.workflow_execution_retention_ttl.ToSeconds()
+    cutoff = time.time() - retention - max_run_hours * SECONDS_PER_HOUR
+    print(f"   - Namespace '{config.temporal.namespace}' retention: {retention / SECONDS_PER_DAY:.1f} days")
+
+    oldest = None
+    async for execution in client.list_workflows('ExecutionStatus="Running"'):
+        started = execution.start_time.timestamp()
+        oldest = started if oldest is None else min(oldest, started)
+    if oldest is not None:
+        print(f"   - Oldest running workflow started {(time.time() - oldest) / SECONDS_PER_HOUR:.1f} hours ago")
+        cutoff = min(cutoff, oldest - SECONDS_PER_HOUR)
+    return cutoff
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete blobs no workflow history can reference any more.")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be deleted.")
+    parser.add_argument("--max-run-hours", type=float, default=25.0, help="Longest a workflow may run.")
+    parser.add_argument("--max-age-days", type=float, help="Delete blobs older than this, without asking Temporal.")
+    parser.add_argument("--store", default=BLOB_STORE, choices=["filesystem", "sqlite"], help="Blob store backend.")
+    args = parser.parse_args()
+
+    print("🧹 Blob Store Garbage Collection")
+    print("=" * 50)
+
+    if args.max_age_days is not None:
+        cutoff = time.time() - args.max_age_days * SECONDS_PER_DAY
+    else:
+        try:
+            cutoff = asyncio.run(temporal_cutoff(args.max_run_hours))
+        except ImportError:
+            print("⚠️  Dependencies not installed. Run 'poetry install' first.")
+            sys.exit(1)
+        except Exception as e:
+            print(f"❌ Could not read the retention from Temporal: {e}")
+            print("   Start it with `make up`, or pass --max-age-days.")
+            sys.exit(1)
+    print(f"   - Deleting blobs last written more than {(time.time() - cutoff) / SECONDS_PER_DAY:.1f} days ago")
+
+    store = create_blob_store(args.store)
+    try:
+        deleted, size = store.sweep(cutoff, dry_run=args.dry_run)
+    finally:
+        store.close()
+
+    verb = "Would delete" if args.dry_run else "Deleted"
+    print(f"\n✅ {verb} {deleted} blob(s), {size / 1024 / 1024:.1f} MiB ({args.store} store)")
+
+
+if __name__ == "__main__":
+    main()
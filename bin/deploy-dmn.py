@@ -3,11 +3,29 @@
 DMN Deployment Script for TraceRail Bootstrap
 
 This script deploys DMN decision tables to the Flowable DMN engine.
+
+Deployments are incremental: each file in `dmn/` is hashed and compared with
+the local manifest (`.dmn-manifest.json`), or, for files the manifest does not
+know, with the latest deployment of the same name in Flowable. Only changed
+tables are validated and uploaded, concurrently over one pooled HTTP client,
+so an unchanged table never gets a new version.
+
+Usage:
+    poetry run python bin/deploy-dmn.py            # deploy changed tables
+    poetry run python bin/deploy-dmn.py --force    # redeploy every table
+    poetry run python bin/deploy-dmn.py --list     # also list deployments
 """
 
+import argparse
 import asyncio
+import hashlib
+import json
 import os
 import sys
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
 import httpx
 
@@ -21,81 +39,161 @@ except ImportError:
     print("⚠️  python-dotenv not installed. Run 'poetry install' first.")
     sys.exit(1)
 
-
-async def test_flowable_connection():
-    """Test connection to Flowable DMN service"""
-    flowable_url = os.getenv("FLOWABLE_BASE_URL", "http://localhost:8082/flowable-rest")
-
+from workers.decision_tables import DecisionTableError, parse_dmn
+
+FLOWABLE_URL = os.getenv("FLOWABLE_BASE_URL", "http://localhost:8082/flowable-rest")
+MANIFEST_FILE = Path(".dmn-manifest.json")
+DMN_NAMESPACES = (
+    "https://www.omg.org/spec/DMN/20191111/MODEL/",
+    "http://www.omg.org/spec/DMN/20180521/MODEL/",
+    "http://www.omg.org/spec/DMN/20151101/dmn.xsd",
+)
+
+
+@dataclass
+class TableFile:
+    """A DMN file and what happened to it during this run."""
+
+    path: Path
+    content: bytes
+    sha256: str
+    status: str = "pending"  # unchanged, invalid, deployed, failed
+    message: str = ""
+    elapsed_ms: float = 0.0
+    deployment_id: str | None = None
+
+
+def create_client() -> httpx.AsyncClient:
+    """Creates the one HTTP client used for every Flowable request."""
+    return httpx.AsyncClient(
+        base_url=f"{FLOWABLE_URL}/service",
+        auth=(os.getenv("FLOWABLE_USERNAME", "rest-admin"), os.getenv("FLOWABLE_PASSWORD", "test")),
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+    )
+
+
+# --- Manifest ---
+def load_manifest() -> dict[str, dict]:
+    """
+    Returns the deployed hash of each file, for the configured Flowable only.
+    """
+    if not MANIFEST_FILE.exists():
+        return {}
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{flowable_url}/service/dmn-repository/deployments",
-                auth=(os.getenv("FLOWABLE_USERNAME", "rest-admin"), os.getenv("FLOWABLE_PASSWORD", "test"))
-            )
+        manifest = json.loads(MANIFEST_FILE.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return {}
+    return manifest.get("files", {}) if manifest.get("flowable_url") == FLOWABLE_URL else {}
 
-            if response.status_code == 200:
-                deployments = response.json()
-                print(f"✅ Connected to Flowable DMN service")
-                print(f"   Found {len(deployments.get('data', []))} existing deployments")
-                return True
-            else:
-                print(f"❌ Flowable connection failed: HTTP {response.status_code}")
-                return False
-
-    except Exception as e:
-        print(f"❌ Failed to connect to Flowable: {str(e)}")
-        print("   Make sure Flowable is running: docker compose up -d")
-        return False
 
+def save_manifest(files: dict[str, dict]) -> None:
+    MANIFEST_FILE.write_text(
+        json.dumps({"flowable_url": FLOWABLE_URL, "files": files}, indent=2, sort_keys=True), encoding="utf-8"
+    )
 
-async def deploy_dmn_file(dmn_file_path: Path):
-    """Deploy a single DMN file to Flowable"""
-    flowable_url = os.getenv("FLOWABLE_BASE_URL", "http://localhost:8082/flowable-rest")
-    deployment_url = f"{flowable_url}/service/dmn-repository/deployments"
 
-    if not dmn_file_path.exists():
-        print(f"❌ DMN file not found: {dmn_file_path}")
-        return False
+# --- Validation ---
+def validate_dmn(table: TableFile) -> str | None:
+    """
+    Checks a DMN file locally before upload.
 
+    Returns:
+        An error message, or None when the file is valid. Decision tables that
+        use FEEL beyond what the local evaluator supports only produce a warning.
+    """
     try:
-        # Read the DMN file content
-        dmn_content = dmn_file_path.read_text(encoding='utf-8')
-
-        # Prepare multipart form data
-        files = {
-            'file': (dmn_file_path.name, dmn_content, 'application/xml')
-        }
+        root = ET.fromstring(table.content)
+    except ET.ParseError as e:
+        return f"not well-formed XML: {e}"
+    namespace, _, tag = root.tag[1:].partition("}") if root.tag.startswith("{") else ("", "", root.tag)
+    if tag != "definitions" or namespace not in DMN_NAMESPACES:
+        return "root element is not a DMN <definitions>"
+
+    decisions = [el for el in root if el.tag == f"{{{namespace}}}decision"]
+    if not decisions:
+        return "no <decision> elements"
+    for decision in decisions:
+        if not decision.get("id"):
+            return "a <decision> has no id"
+        for decision_table in decision.findall(f"{{{namespace}}}decisionTable"):
+            inputs = decision_table.findall(f"{{{namespace}}}input")
+            outputs = decision_table.findall(f"{{{namespace}}}output")
+            if not outputs:
+                return f"decision '{decision.get('id')}' has no outputs"
+            for rule in decision_table.findall(f"{{{namespace}}}rule"):
+                if len(rule.findall(f"{{{namespace}}}inputEntry")) != len(inputs):
+                    return f"rule '{rule.get('id')}' does not have one input entry per input"
+                if len(rule.findall(f"{{{namespace}}}outputEntry")) != len(outputs):
+                    return f"rule '{rule.get('id')}' does not have one output entry per output"
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            username = os.getenv("FLOWABLE_USERNAME", "rest-admin")
-            password = os.getenv("FLOWABLE_PASSWORD", "test")
-            response = await client.post(
-                deployment_url,
-                files=files,
-                auth=(username, password)
-            )
+    try:
+        parse_dmn(table.content)
+    except DecisionTableError as e:
+        print(f"   ⚠️  {table.path.name}: not evaluable by the local evaluator ({e})")
+    return None
 
-            if response.status_code == 201:
-                result = response.json()
-                print(f"✅ Successfully deployed: {dmn_file_path.name}")
-                print(f"   Deployment ID: {result.get('id', 'unknown')}")
-                print(f"   Deployment time: {result.get('deploymentTime', 'unknown')}")
-                return True
-            else:
-                print(f"❌ Deployment failed: HTTP {response.status_code}")
-                print(f"   Response: {response.text}")
-                return False
 
+# --- Flowable ---
+async def test_flowable_connection(client: httpx.AsyncClient) -> bool:
+    """Test connection to Flowable DMN service"""
+    try:
+        # Only the total is needed, so ask for a single deployment.
+        response = await client.get("/dmn-repository/deployments", params={"size": 1})
+        if response.status_code == 200:
+            print(f"✅ Connected to Flowable DMN service")
+            print(f"   Found {response.json().get('total', 0)} existing deployments")
+            return True
+        print(f"❌ Flowable connection failed: HTTP {response.status_code}")
+        return False
     except Exception as e:
-        print(f"❌ Error deploying {dmn_file_path.name}: {str(e)}")
+        print(f"❌ Failed to connect to Flowable: {str(e)}")
+        print("   Make sure Flowable is running: docker compose up -d")
         return False
 
 
-async def test_dmn_execution(decision_key: str = "risk-routing"):
-    """Test the deployed DMN decision table"""
-    flowable_url = os.getenv("FLOWABLE_BASE_URL", "http://localhost:8082/flowable-rest")
-    execute_url = f"{flowable_url}/service/dmn-runtime/execute"
+async def remote_sha256(client: httpx.AsyncClient, name: str) -> str | None:
+    """
+    Returns the hash of the latest deployed resource named `name`, or None.
+    """
+    response = await client.get(
+        "/dmn-repository/deployments",
+        params={"name": name, "sort": "deployTime", "order": "desc", "size": 1},
+    )
+    if response.status_code != 200 or not response.json().get("data"):
+        return None
+    deployment_id = response.json()["data"][0]["id"]
+    resource = await client.get(f"/dmn-repository/deployments/{deployment_id}/resourcedata/{name}")
+    if resource.status_code != 200:
+        return None
+    return hashlib.sha256(resource.content).hexdigest()
+
+
+async def deploy_dmn_file(client: httpx.AsyncClient, table: TableFile, semaphore: asyncio.Semaphore) -> None:
+    """Validates and deploys a single DMN file to Flowable"""
+    async with semaphore:
+        start = time.perf_counter()
+        error = validate_dmn(table)
+        if error:
+            table.status, table.message = "invalid", error
+        else:
+            try:
+                response = await client.post(
+                    "/dmn-repository/deployments",
+                    files={"file": (table.path.name, table.content, "application/xml")},
+                )
+                if response.status_code == 201:
+                    table.status = "deployed"
+                    table.deployment_id = response.json().get("id")
+                else:
+                    table.status, table.message = "failed", f"HTTP {response.status_code}: {response.text[:200]}"
+            except Exception as e:
+                table.status, table.message = "failed", str(e)
+        table.elapsed_ms = (time.perf_counter() - start) * 1000
+
 
+async def test_dmn_execution(client: httpx.AsyncClient, decision_key: str = "risk-routing"):
+    """Test the deployed DMN decision table"""
     # Test cases
     test_cases = [
         {
@@ -134,37 +232,29 @@ async def test_dmn_execution(decision_key: str = "risk-routing"):
         }
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                username = os.getenv("FLOWABLE_USERNAME", "rest-admin")
-                password = os.getenv("FLOWABLE_PASSWORD", "test")
-                response = await client.post(
-                    execute_url,
-                    json=payload,
-                    auth=(username, password),
-                    headers={"Content-Type": "application/json"}
-                )
+            response = await client.post("/dmn-runtime/execute", json=payload)
 
-                if response.status_code == 200:
-                    result = response.json()
+            if response.status_code == 200:
+                result = response.json()
 
-                    if "resultVariables" in result and result["resultVariables"]:
-                        route = result["resultVariables"][0].get("route")
-                        confidence = result["resultVariables"][0].get("confidence")
+                if "resultVariables" in result and result["resultVariables"]:
+                    route = result["resultVariables"][0].get("route")
+                    confidence = result["resultVariables"][0].get("confidence")
 
-                        print(f"   Variables: {test_case['variables']}")
-                        print(f"   Result: route='{route}', confidence={confidence}")
+                    print(f"   Variables: {test_case['variables']}")
+                    print(f"   Result: route='{route}', confidence={confidence}")
 
-                        if route == test_case["expected_route"]:
-                            print(f"   ✅ PASS (expected '{test_case['expected_route']}')")
-                            success_count += 1
-                        else:
-                            print(f"   ❌ FAIL (expected '{test_case['expected_route']}', got '{route}')")
+                    if route == test_case["expected_route"]:
+                        print(f"   ✅ PASS (expected '{test_case['expected_route']}')")
+                        success_count += 1
                     else:
-                        print(f"   ❌ FAIL: No result variables in response")
-                        print(f"   Response: {result}")
+                        print(f"   ❌ FAIL (expected '{test_case['expected_route']}', got '{route}')")
                 else:
-                    print(f"   ❌ FAIL: HTTP {response.status_code}")
-                    print(f"   Response: {response.text}")
+                    print(f"   ❌ FAIL: No result variables in response")
+                    print(f"   Response: {result}")
+            else:
+                print(f"   ❌ FAIL: HTTP {response.status_code}")
+                print(f"   Response: {response.text}")
 
         except Exception as e:
             print(f"   ❌ ERROR: {str(e)}")
@@ -173,46 +263,93 @@ async def test_dmn_execution(decision_key: str = "risk-routing"):
     return success_count == len(test_cases)
 
 
-async def list_deployments():
-    """List all current DMN deployments"""
-    flowable_url = os.getenv("FLOWABLE_BASE_URL", "http://localhost:8082/flowable-rest")
-
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{flowable_url}/service/dmn-repository/deployments",
-                auth=(os.getenv("FLOWABLE_USERNAME", "rest-admin"), os.getenv("FLOWABLE_PASSWORD", "test"))
-            )
-
-            if response.status_code == 200:
-                deployments = response.json()
-                data = deployments.get("data", [])
-
-                print(f"\n📋 Current DMN Deployments ({len(data)}):")
-                print("=" * 50)
-
-                if not data:
-                    print("   No deployments found")
-                else:
-                    for deployment in data:
-                        print(f"   ID: {deployment.get('id', 'N/A')}")
-                        print(f"   Name: {deployment.get('name', 'N/A')}")
-                        print(f"   Time: {deployment.get('deploymentTime', 'N/A')}")
-                        print(f"   Category: {deployment.get('category', 'N/A')}")
-                        print()
-
-                return True
+async def list_deployments(client: httpx.AsyncClient, page_size: int = 100):
+    """List all current DMN deployments, one page at a time"""
+    print(f"\n📋 Current DMN Deployments:")
+    print("=" * 50)
+    start, total = 0, None
+    while total is None or start < total:
+        response = await client.get(
+            "/dmn-repository/deployments",
+            params={"start": start, "size": page_size, "sort": "deployTime", "order": "desc"},
+        )
+        if response.status_code != 200:
+            print(f"❌ Failed to list deployments: HTTP {response.status_code}")
+            return False
+        page = response.json()
+        total = page.get("total", 0)
+        if not total:
+            print("   No deployments found")
+        for deployment in page.get("data", []):
+            print(f"   {deployment.get('deploymentTime', 'N/A')}  {deployment.get('name', 'N/A')}  ({deployment.get('id', 'N/A')})")
+        start += page_size
+    return True
+
+
+async def deploy(dmn_files: list[Path], args: argparse.Namespace) -> list[TableFile]:
+    """
+    Deploys the files whose content differs from what Flowable already has.
+    """
+    tables = []
+    for path in dmn_files:
+        content = path.read_bytes()
+        tables.append(TableFile(path, content, hashlib.sha256(content).hexdigest()))
+    manifest = {} if args.force else load_manifest()
+
+    async with create_client() as client:
+        if not await test_flowable_connection(client):
+            sys.exit(1)
+        if args.list:
+            await list_deployments(client)
+
+        # Files the manifest does not know are compared with Flowable itself.
+        unknown = [t for t in tables if not args.force and t.path.name not in manifest]
+        remote = await asyncio.gather(*(remote_sha256(client, t.path.name) for t in unknown))
+        remote_hashes = {t.path.name: sha for t, sha in zip(unknown, remote) if sha}
+
+        changed = []
+        for table in tables:
+            known = manifest.get(table.path.name, {}).get("sha256") or remote_hashes.get(table.path.name)
+            if known == table.sha256:
+                table.status = "unchanged"
             else:
-                print(f"❌ Failed to list deployments: HTTP {response.status_code}")
-                return False
+                changed.append(table)
 
-    except Exception as e:
-        print(f"❌ Error listing deployments: {str(e)}")
-        return False
+        print(f"\n🚀 Deploying {len(changed)} changed DMN file(s), {len(tables) - len(changed)} unchanged...")
+        print("=" * 50)
+        semaphore = asyncio.Semaphore(args.concurrency)
+        await asyncio.gather(*(deploy_dmn_file(client, table, semaphore) for table in changed))
+
+        now = datetime.now(timezone.utc).isoformat()
+        files = {name: entry for name, entry in manifest.items() if Path("dmn", name).exists()}
+        for table in tables:
+            if table.status == "deployed":
+                files[table.path.name] = {"sha256": table.sha256, "deployment_id": table.deployment_id, "deployed_at": now}
+            elif table.status == "unchanged" and table.path.name not in files:
+                files[table.path.name] = {"sha256": table.sha256, "deployment_id": None, "deployed_at": None}
+        save_manifest(files)
+
+        if any(t.status == "deployed" for t in tables) and not args.skip_test:
+            if await test_dmn_execution(client):
+                print("\n🎉 All tests passed! DMN deployment successful.")
+                print("\nNext steps:")
+                print("   1. Start the worker: make worker")
+                print("   2. Run a workflow: make test-worker")
+                print("   3. Check routing decisions in Temporal UI")
+            else:
+                print("\n⚠️  DMN deployed but tests failed. Check the decision logic.")
+    return tables
 
 
 def main():
     """Main deployment function"""
+    parser = argparse.ArgumentParser(description="Deploy changed DMN files from dmn/ to Flowable.")
+    parser.add_argument("--force", action="store_true", help="Redeploy every file, changed or not.")
+    parser.add_argument("--list", action="store_true", help="List existing deployments first.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Uploads in flight.")
+    parser.add_argument("--skip-test", action="store_true", help="Do not run the test decision afterwards.")
+    args = parser.parse_args()
+
     print("🚀 TraceRail DMN Deployment Script")
     print("=" * 50)
 
@@ -229,58 +366,28 @@ def main():
         print("   Place your .dmn files in the dmn/ directory")
         sys.exit(1)
 
-    dmn_files = list(dmn_dir.glob("*.dmn"))
+    dmn_files = sorted(dmn_dir.glob("*.dmn"))
     if not dmn_files:
         print("❌ No .dmn files found in dmn/ directory")
         sys.exit(1)
-
-    print(f"📁 Found {len(dmn_files)} DMN file(s):")
-    for dmn_file in dmn_files:
-        print(f"   - {dmn_file.name}")
-
-    # Run deployment
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
-        # Test connection
-        connected = loop.run_until_complete(test_flowable_connection())
-        if not connected:
-            sys.exit(1)
-
-        # List existing deployments
-        loop.run_until_complete(list_deployments())
-
-        # Deploy each DMN file
-        print(f"\n🚀 Deploying DMN files...")
-        print("=" * 50)
-
-        success_count = 0
-        for dmn_file in dmn_files:
-            deployed = loop.run_until_complete(deploy_dmn_file(dmn_file))
-            if deployed:
-                success_count += 1
-
-        print(f"\n📊 Deployment Summary: {success_count}/{len(dmn_files)} successful")
-
-        if success_count > 0:
-            # Test DMN execution
-            test_passed = loop.run_until_complete(test_dmn_execution())
-
-            if test_passed:
-                print("\n🎉 All tests passed! DMN deployment successful.")
-                print("\nNext steps:")
-                print("   1. Start the worker: make worker")
-                print("   2. Run a workflow: make test-worker")
-                print("   3. Check routing decisions in Temporal UI")
-            else:
-                print("\n⚠️  DMN deployed but tests failed. Check the decision logic.")
-        else:
-            print("\n❌ No DMN files were successfully deployed.")
-            sys.exit(1)
-
-    finally:
-        loop.close()
+    print(f"📁 Found {len(dmn_files)} DMN file(s)")
+
+    start = time.perf_counter()
+    tables = asyncio.run(deploy(dmn_files, args))
+    elapsed = time.perf_counter() - start
+
+    icons = {"unchanged": "⏭️ ", "deployed": "✅", "invalid": "❌", "failed": "❌"}
+    print(f"\n📊 Deployment Summary ({elapsed:.2f}s):")
+    for table in tables:
+        timing = f"{table.elapsed_ms:8.1f} ms" if table.status != "unchanged" else " " * 11
+        detail = f"  {table.message}" if table.message else ""
+        print(f"   {icons.get(table.status, '  ')} {timing}  {table.path.name:<30} {table.status}{detail}")
+
+    counts = {status: sum(t.status == status for t in tables) for status in icons}
+    print(f"\n   Deployed: {counts['deployed']}  Unchanged: {counts['unchanged']}  "
+          f"Invalid: {counts['invalid']}  Failed: {counts['failed']}")
+    if counts["invalid"] or counts["failed"]:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
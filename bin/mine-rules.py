@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Nightly Rule Mining for TraceRail Bootstrap
+
+This script learns from the human review queue (step 9 of the System
+Blueprint). It runs in two stages:
+
+1. Export: the results of 'ExampleWorkflow' runs a human decided on are
+   collected through visibility (see `cli/collect_results.py`), together with
+   the original content, and added to a columnar store in `decisions/` (one
+   Parquet file per export with `pyarrow` installed, JSONL otherwise).
+2. Mine: keyword and confidence-threshold rules that predict the human
+   decision with high precision are proposed (`workers/mining.py`) and written
+   as disabled entries in `rules.yaml` schema, with precision and coverage.
+
+Usage:
+    poetry run python bin/mine-rules.py --since 1d
+    poetry run python bin/mine-rules.py --skip-export --days 30 --output rules.candidates.yaml
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    print("⚠️  python-dotenv not installed. Run 'poetry install' first.")
+    sys.exit(1)
+
+from workers.mining import mine_keywords, mine_threshold
+from workers.startup import lazy_import
+
+yaml = lazy_import("yaml")
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+COLUMNS = ["workflow_id", "close_time", "content", "confidence", "routing_decision", "routing_reason", "human_decision"]
+
+
+# --- Export ---
+class DecisionSink:
+    """
+    A text sink for `ResultCollector` that keeps only human-decided runs and
+    buffers them, written as one Parquet file (or JSONL lines) on flush.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.rows: list[dict] = []
+        self.written = 0
+
+    def write(self, line: str) -> None:
+        record = json.loads(line)
+        result = record.get("result") or {}
+        if not result.get("human_decision") or "content" not in record:
+            return
+        fields = (result.get("post_rules") or {}).get("fields") or {}
+        routing = result.get("routing_info") or {}
+        self.rows.append({
+            "workflow_id": record["workflow_id"],
+            "close_time": record["close_time"],
+            "content": record["content"],
+            "confidence": fields.get("confidence"),
+            "routing_decision": routing.get("decision"),
+            "routing_reason": routing.get("reason"),
+            "human_decision": result["human_decision"],
+        })
+
+    def flush(self) -> None:
+        if not self.rows:
+            return
+        if pq is not None:
+            pq.write_table(pa.Table.from_pylist(self.rows), self.path, compression="zstd")
+        else:
+            with self.path.open("a", encoding="utf-8") as f:
+                for row in self.rows:
+                    f.write(json.dumps(row) + "\n")
+        self.written += len(self.rows)
+        self.rows = []
+
+
+async def export(since: datetime, store: Path, concurrency: int) -> Path:
+    """
+    Collects human-decided workflow results closed since `since` into the store.
+    """
+    from temporalio.service import RPCError
+    from temporalio.client import Client
+    from tracerail.config import TraceRailConfig
+
+    from cli.collect_results import ResultCollector
+    from workers.blobstore import resolve
+    from workers.claimcheck import data_converter
+
+    class DecisionCollector(ResultCollector):
+        async def _fetch(self, execution):
+            record = await super()._fetch(execution)
+            if (record.get("result") or {}).get("human_decision"):
+                # The content is the workflow input, in the first history event.
+                handle = self.client.get_workflow_handle(execution.id, run_id=execution.run_id)
+                async for event in handle.fetch_history_events(page_size=1):
+                    payloads = event.workflow_execution_started_event_attributes.input.payloads
+                    # Large documents are started with a blob reference instead of the
+                    # text, and multi-part cases with a list of items.
+                    content = (await self.client.data_converter.decode(payloads))[0]
+                    items = content if isinstance(content, list) else [content]
+                    record["content"] = "\n\n".join(resolve(item) for item in items)
+                    break
+            return record
+
+    config = TraceRailConfig()
+    try:
+        client = await Client.connect(
+            f"{config.temporal.host}:{config.temporal.port}", namespace=config.temporal.namespace,
+            data_converter=data_converter(),
+        )
+    except (RPCError, RuntimeError):
+        print("❌ Could not connect to Temporal service. You can start it with: `make up`")
+        sys.exit(1)
+
+    store.mkdir(exist_ok=True)
+    suffix = ".parquet" if pq is not None else ".jsonl"
+    path = store / f"{datetime.now(timezone.utc):%Y-%m-%d-%H%M%S}{suffix}"
+    sink = DecisionSink(path)
+    # The collector flushes the sink once every result has been written.
+    await DecisionCollector(client, concurrency=concurrency).collect(since, sink)
+    print(f"   - Exported {sink.written} human decision(s) to {path}" if sink.written else "   - No new human decisions")
+    return path
+
+
+# --- Mining ---
+def load_store(store: Path, days: int) -> dict[str, list]:
+    """Reads the files exported in the last `days` days into columns."""
+    cutoff = f"{datetime.now(timezone.utc) - timedelta(days=days):%Y-%m-%d}"
+    columns = {name: [] for name in COLUMNS}
+    for path in sorted(store.glob("*.*")):
+        if path.stem < cutoff:
+            continue
+        if path.suffix == ".parquet":
+            if pq is None:
+                print(f"⚠️  Skipping {path.name}: reading Parquet requires pyarrow")
+                continue
+            table = pq.read_table(path, columns=COLUMNS)
+            for name in COLUMNS:
+                columns[name].extend(table.column(name).to_pylist())
+        elif path.suffix == ".jsonl":
+            with path.open(encoding="utf-8") as f:
+                for line in f:
+                    row = json.loads(line)
+                    for name in COLUMNS:
+                        columns[name].append(row.get(name))
+    return columns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export human decisions and mine candidate routing rules.")
+    parser.add_argument("--since", default="1d", help="Export workflows closed since (ISO-8601 or e.g. 1d).")
+    parser.add_argument("--skip-export", action="store_true", help="Only mine the existing store.")
+    parser.add_argument("--store", type=Path, default=Path("decisions"), help="Directory of the columnar store.")
+    parser.add_argument("--days", type=int, default=30, help="Days of decisions to mine.")
+    parser.add_argument("--approve", default="approve,approved,accept,accepted",
+                        help="Human decisions that mean the case could have been automatic.")
+    parser.add_argument("--min-precision", type=float, default=0.95)
+    parser.add_argument("--min-support", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=50, help="Result fetches in flight during export.")
+    parser.add_argument("--output", type=Path, default=Path("rules.candidates.yaml"))
+    args = parser.parse_args()
+
+    print("⛏️  Mining Routing Rules from Human Decisions")
+    print("=" * 50)
+
+    if not args.skip_export:
+        from cli.collect_results import parse_since
+        asyncio.run(export(parse_since(args.since), args.store, args.concurrency))
+
+    columns = load_store(args.store, args.days)
+    total = len(columns["content"])
+    if not total:
+        print("❌ No human decisions in the store yet.")
+        sys.exit(1)
+
+    approve = {value.strip().lower() for value in args.approve.split(",")}
+    labels = [str(decision).strip().lower() in approve for decision in columns["human_decision"]]
+    print(f"   - {total} decision(s) from the last {args.days} day(s), {sum(labels)} approved")
+
+    candidates = mine_keywords(columns["content"], labels, "automatic", args.min_support, args.min_precision)
+    threshold = mine_threshold(columns["confidence"], labels, "automatic", args.min_support, args.min_precision)
+    if threshold is not None:
+        candidates.append(threshold)
+
+    if not candidates:
+        print(f"\n🤷 No rule reached {args.min_precision:.0%} precision with {args.min_support}+ cases.")
+        return
+
+    print(f"\n💡 {len(candidates)} candidate rule(s):")
+    for candidate in candidates:
+        print(f"   - {candidate.kind:<9} {str(candidate.value)[:30]:<30} "
+              f"precision {candidate.precision:6.1%}  coverage {candidate.coverage:6.1%}")
+
+    header = (f"# Candidate rules mined from {total} human decisions on {datetime.now(timezone.utc):%Y-%m-%d}.\n"
+              "# Every rule is disabled; review it, replay it (make replay-rules) and copy it into rules.yaml.\n")
+    args.output.write_text(header + yaml.safe_dump([c.to_rule() for c in candidates], sort_keys=False, width=120), encoding="utf-8")
+    print(f"\n💾 Candidates written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
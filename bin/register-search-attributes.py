@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Search Attribute Registration Script for TraceRail Bootstrap
+
+This script registers the custom search attributes that index
+'ExampleWorkflow' cases (see `workers/search_attributes.py`) in the configured
+Temporal namespace. Attributes that already exist are left alone, so it is
+safe to run on every setup. Starting a case with attributes the namespace does
+not know fails, so run it before starting cases with
+`CASE_SEARCH_ATTRIBUTES=true` (the default).
+
+Usage:
+    poetry run python bin/register-search-attributes.py
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    print("⚠️  python-dotenv not installed. Run 'poetry install' first.")
+    sys.exit(1)
+
+try:
+    from temporalio.api.enums.v1 import IndexedValueType
+    from temporalio.api.operatorservice.v1 import AddSearchAttributesRequest, ListSearchAttributesRequest
+    from temporalio.client import Client
+    from temporalio.service import RPCError
+    from tracerail.config import TraceRailConfig
+
+    from workers.search_attributes import CASE_KEYS
+except ImportError:
+    print("⚠️  Dependencies not installed. Run 'poetry install' first.")
+    sys.exit(1)
+
+
+async def main():
+    config = TraceRailConfig()
+    namespace = config.temporal.namespace
+    try:
+        client = await Client.connect(f"{config.temporal.host}:{config.temporal.port}", namespace=namespace)
+    except (RPCError, RuntimeError):
+        print("❌ Could not connect to Temporal service. You can start it with: `make up`")
+        sys.exit(1)
+
+    print("🚀 Registering case search attributes")
+    print("=" * 50)
+    existing = await client.operator_service.list_search_attributes(
+        ListSearchAttributesRequest(namespace=namespace)
+    )
+    missing = {}
+    for key in CASE_KEYS:
+        value_type = IndexedValueType.ValueType(int(key.indexed_value_type))
+        if key.name not in existing.custom_attributes:
+            missing[key.name] = value_type
+            print(f"   + {key.name} ({IndexedValueType.Name(value_type)})")
+        elif existing.custom_attributes[key.name] != value_type:
+            print(f"❌ {key.name} is already registered as {IndexedValueType.Name(existing.custom_attributes[key.name])}")
+            sys.exit(1)
+        else:
+            print(f"   = {key.name} already registered")
+
+    if missing:
+        await client.operator_service.add_search_attributes(
+            AddSearchAttributesRequest(namespace=namespace, search_attributes=missing)
+        )
+    print(f"\n✅ {len(missing)} attribute(s) added to namespace '{namespace}'")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Offline Rule Replay for TraceRail Bootstrap
+
+This script replays stored routing contexts (content plus `LLMResponse`
+metadata) through an old and a new rule set and reports how the decisions
+would shift, as a decision-diff matrix with sample cases for each change.
+
+Records are streamed from JSONL or Parquet (with `pyarrow` installed) in
+batches, and each batch is evaluated against both rule sets in a pool of
+worker processes. Each process loads the rule sets once, and only counts
+and a few samples travel back, so memory stays flat however large the input is.
+
+Each record needs a `content` field and either an `llm_response` object (or
+JSON string) or a top-level `confidence`.
+
+Usage:
+    poetry run python bin/replay-rules.py cases.jsonl --old rules.yaml --new candidate.yaml
+    poetry run python bin/replay-rules.py cases.parquet --old dmn/routing.dmn --new candidate.dmn --report diff.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from pathlib import Path
+from typing import Iterator
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    print("⚠️  python-dotenv not installed. Run 'poetry install' first.")
+    sys.exit(1)
+
+from workers.rulesets import DmnRuleSet, load_rule_set
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+# --- Per-Process State ---
+# Set by `init_worker` in each pool process.
+_old = None
+_new = None
+_loop: asyncio.AbstractEventLoop | None = None
+_samples_per_cell = 5
+
+
+def init_worker(old_path: str, new_path: str, samples_per_cell: int) -> None:
+    """Loads both rule sets once per worker process."""
+    global _old, _new, _loop, _samples_per_cell
+    _loop = asyncio.new_event_loop()
+    _old = _loop.run_until_complete(load_rule_set(old_path))
+    _new = _loop.run_until_complete(load_rule_set(new_path))
+    _samples_per_cell = samples_per_cell
+
+
+async def _evaluate_async(rule_set, batch: list[dict]) -> list:
+    return [await rule_set.evaluate(record["content"], record["llm_response"]) for record in batch]
+
+
+def _evaluate(rule_set, batch: list[dict]) -> list:
+    if isinstance(rule_set, DmnRuleSet):
+        # Local tables are synchronous; skip the event loop entirely.
+        return [rule_set.evaluate_sync(record["content"], record["llm_response"]) for record in batch]
+    return _loop.run_until_complete(_evaluate_async(rule_set, batch))
+
+
+def replay_batch(raw_batch: list[str | dict]) -> tuple[Counter, dict, int]:
+    """
+    Evaluates one batch against both rule sets. JSONL lines are decoded here
+    rather than in the reader, so parsing is spread across the pool too.
+
+    Returns:
+        The decision matrix counts, up to `_samples_per_cell` changed cases per
+        cell, and the number of records that could not be decoded or evaluated.
+    """
+    batch = []
+    errors = 0
+    for raw in raw_batch:
+        try:
+            batch.append(normalize(json.loads(raw) if isinstance(raw, str) else raw))
+        except (ValueError, TypeError, AttributeError):
+            # A malformed line costs only itself, not the batch or the replay.
+            errors += 1
+    matrix: Counter = Counter()
+    samples: dict[tuple[str, str], list[dict]] = {}
+    try:
+        old_outcomes = _evaluate(_old, batch)
+        new_outcomes = _evaluate(_new, batch)
+    except Exception:
+        # Fall back to one record at a time so a bad record costs only itself.
+        old_outcomes, new_outcomes = [], []
+        for record in batch:
+            try:
+                old_outcomes.append(_evaluate(_old, [record])[0])
+                new_outcomes.append(_evaluate(_new, [record])[0])
+            except Exception:
+                errors += 1
+                old_outcomes.append(None)
+                new_outcomes.append(None)
+
+    for record, old, new in zip(batch, old_outcomes, new_outcomes):
+        if old is None or new is None:
+            continue
+        cell = (old.decision, new.decision)
+        matrix[cell] += 1
+        if old.decision != new.decision:
+            cell_samples = samples.setdefault(cell, [])
+            if len(cell_samples) < _samples_per_cell:
+                cell_samples.append({
+                    "content": record["content"][:200],
+                    "old_rule": old.rule,
+                    "new_rule": new.rule,
+                })
+    return matrix, samples, errors
+
+
+# --- Input ---
+def normalize(record: dict) -> dict:
+    """Brings a stored record into `{"content", "llm_response"}` form."""
+    llm_response = record.get("llm_response")
+    if isinstance(llm_response, str):
+        llm_response = json.loads(llm_response)
+    if llm_response is None and record.get("confidence") is not None:
+        llm_response = {"content": "", "metadata": {"confidence": record["confidence"]}}
+    return {"content": record.get("content") or "", "llm_response": llm_response}
+
+
+def read_records(path: Path, batch_size: int) -> Iterator[list[str | dict]]:
+    """Yields batches of raw JSONL lines or Parquet rows."""
+    if path.suffix == ".parquet":
+        if pq is None:
+            print("❌ Reading Parquet requires pyarrow: pip install pyarrow")
+            sys.exit(1)
+        parquet = pq.ParquetFile(path)
+        columns = [name for name in ("content", "llm_response", "confidence") if name in parquet.schema_arrow.names]
+        for record_batch in parquet.iter_batches(batch_size=batch_size, columns=columns):
+            yield record_batch.to_pylist()
+        return
+
+    with path.open(encoding="utf-8") as f:
+        lines = (line for line in f if line.strip())
+        while batch := list(islice(lines, batch_size)):
+            yield batch
+
+
+def print_matrix(matrix: Counter) -> None:
+    decisions = sorted({d for cell in matrix for d in cell})
+    width = max([len(d) for d in decisions] + [9])
+    header = "old \\ new"
+    print(f"   {header:<{width}}  " + "  ".join(f"{d:>{width}}" for d in decisions))
+    for old in decisions:
+        row = "  ".join(f"{matrix.get((old, new), 0):>{width}}" for new in decisions)
+        print(f"   {old:<{width}}  {row}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay stored routing contexts through two rule sets.")
+    parser.add_argument("input", type=Path, help="JSONL or Parquet file of routing contexts.")
+    parser.add_argument("--old", default="rules.yaml", help="Current rule set (.yaml or .dmn).")
+    parser.add_argument("--new", required=True, help="Candidate rule set (.yaml or .dmn).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes.")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Records per batch.")
+    parser.add_argument("--samples", type=int, default=5, help="Sample cases kept per changed cell.")
+    parser.add_argument("--report", type=Path, help="Write the matrix and samples to this JSON file.")
+    args = parser.parse_args()
+
+    print("🔁 Replaying Routing Contexts")
+    print("=" * 50)
+    print(f"   - Input: {args.input}")
+    print(f"   - Old rules: {args.old}")
+    print(f"   - New rules: {args.new}")
+    print(f"   - {args.workers} worker process(es), {args.batch_size} records per batch")
+
+    matrix: Counter = Counter()
+    samples: dict[tuple[str, str], list[dict]] = {}
+    errors = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(
+        max_workers=args.workers, initializer=init_worker, initargs=(args.old, args.new, args.samples)
+    ) as pool:
+        pending = set()
+
+        def merge(done):
+            nonlocal errors
+            for future in done:
+                batch_matrix, batch_samples, batch_errors = future.result()
+                matrix.update(batch_matrix)
+                errors += batch_errors
+                for cell, cell_samples in batch_samples.items():
+                    kept = samples.setdefault(cell, [])
+                    kept.extend(cell_samples[: args.samples - len(kept)])
+
+        for batch in read_records(args.input, args.batch_size):
+            # Keep a couple of batches per process queued, and no more.
+            if len(pending) >= args.workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                merge(done)
+            pending.add(pool.submit(replay_batch, batch))
+        merge(wait(pending).done)
+
+    elapsed = time.perf_counter() - start
+    total = sum(matrix.values())
+    changed = sum(count for (old, new), count in matrix.items() if old != new)
+
+    print(f"\n📊 Decision Diff ({total} records in {elapsed:.1f}s, {total / max(elapsed, 1e-9):,.0f} records/s):")
+    print_matrix(matrix)
+    print(f"\n   Changed: {changed} ({changed / max(total, 1):.2%})  Errors: {errors}")
+
+    for (old, new), cell_samples in sorted(samples.items()):
+        print(f"\n🔀 {old} -> {new} ({matrix[(old, new)]} records), e.g.:")
+        for sample in cell_samples:
+            print(f"   - '{sample['content'][:80]}' ({sample['old_rule']} -> {sample['new_rule']})")
+
+    if args.report:
+        args.report.write_text(json.dumps({
+            "old": args.old,
+            "new": args.new,
+            "total": total,
+            "changed": changed,
+            "errors": errors,
+            "matrix": [{"old": old, "new": new, "count": count} for (old, new), count in sorted(matrix.items())],
+            "samples": [{"old": old, "new": new, "cases": cases} for (old, new), cases in sorted(samples.items())],
+        }, indent=2), encoding="utf-8")
+        print(f"\n💾 Report written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
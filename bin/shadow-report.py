@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Shadow-Mode Report for TraceRail Bootstrap
+
+This script summarises the divergence log written by shadow mode
+(`workers/shadow.py`): how often the candidate rule set agreed with the live
+one, how much slower or faster it was, and which rules disagreed most.
+
+Usage:
+    poetry run python bin/shadow-report.py [shadow-divergence.jsonl]
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+
+
+def read_log(path: Path) -> tuple[dict | None, list[dict]]:
+    """
+    Returns the last cumulative stats line and all divergence records.
+    """
+    stats, divergences = None, []
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # A partially written last line
+            if record.get("type") == "stats":
+                # Counters are cumulative, so the last line covers the whole run.
+                stats = record
+            else:
+                divergences.append(record)
+    return stats, divergences
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarise the shadow-mode divergence log.")
+    parser.add_argument("log", nargs="?", type=Path, default=Path("shadow-divergence.jsonl"))
+    parser.add_argument("--top", type=int, default=10, help="Number of rule pairs to list.")
+    args = parser.parse_args()
+
+    print("🌗 Shadow-Mode Report")
+    print("=" * 50)
+    if not args.log.exists():
+        print(f"❌ Log not found: {args.log}")
+        print("   Set SHADOW_RULES_FILE and run the worker to collect one.")
+        sys.exit(1)
+
+    stats, divergences = read_log(args.log)
+    if stats and stats["evaluated"]:
+        evaluated = stats["evaluated"]
+        delta_us = (stats["shadow_us"] - stats["live_us"]) / evaluated
+        print(f"   Cases evaluated:  {evaluated}")
+        print(f"   Agreement rate:   {stats['agreed'] / evaluated:.2%}")
+        print(f"   Latency delta:    {delta_us / 1000:+.3f} ms per case (candidate - live)")
+        print(f"   Dropped / errors: {stats['dropped']} / {stats['errors']}")
+    else:
+        print("   No stats lines yet; the worker writes one every SHADOW_STATS_INTERVAL seconds.")
+
+    print(f"\n🔀 Divergences: {len(divergences)}")
+    matrix = Counter((d["live"], d["shadow"]) for d in divergences)
+    for (live, shadow), count in matrix.most_common():
+        print(f"   live={live:<10} shadow={shadow:<10} {count}")
+
+    if divergences:
+        print(f"\n📋 Top {args.top} rule pairs:")
+        pairs = Counter((d["live_rule"], d["shadow_rule"]) for d in divergences)
+        for (live_rule, shadow_rule), count in pairs.most_common(args.top):
+            print(f"   {count:>6}  '{live_rule}' -> '{shadow_rule}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Circuit Breaker Test Script for TraceRail Bootstrap
+
+This script runs the per-provider circuit breaker used by `llm_activity`
+against local fake providers through a simulated outage. The primary
+provider is healthy, then hangs, then recovers. The script compares how long
+requests hold worker slots with and without the breaker, and checks that the
+breaker opens during the outage, fails over to the second provider, and
+closes again once the primary recovers.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from workers.breaker import CircuitBreaker, CircuitOpenError
+    from workers.fakes import FakeProvider
+except ImportError:
+    print("⚠️  Dependencies not installed. Run 'poetry install' first.")
+    sys.exit(1)
+
+PHASES = [("healthy", 0.0), ("outage", 1.0), ("recovered", 0.0)]
+
+
+async def run_phase(requests: int, concurrency: int, send) -> dict:
+    """Sends `requests` requests, `concurrency` at a time, and tallies their outcomes."""
+    semaphore = asyncio.Semaphore(concurrency)
+    stats = {"slot_seconds": 0.0, "ok": 0, "failover": 0, "failed": 0}
+
+    async def one(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            outcome = await send(f"prompt {i}")
+            stats["slot_seconds"] += time.perf_counter() - start
+            stats[outcome] += 1
+
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return stats
+
+
+async def run_scenario(use_breaker: bool, requests: int, concurrency: int, activity_timeout: float) -> list[dict]:
+    primary = FakeProvider("deepseek", latency_ms=80, jitter_ms=20, tail_latency_ms=activity_timeout * 5000, seed=1)
+    secondary = FakeProvider("openai", latency_ms=120, jitter_ms=20, seed=2)
+    breaker = CircuitBreaker(
+        "deepseek", window=10, min_calls=5, failure_rate=0.5, slow_call_ms=int(activity_timeout * 500),
+        call_timeout=activity_timeout / 2, open_seconds=0.3,
+    )
+
+    async def send(prompt: str) -> str:
+        if not use_breaker:
+            try:
+                await asyncio.wait_for(primary.complete(prompt), timeout=activity_timeout)
+                return "ok"
+            except Exception:
+                return "failed"
+        if breaker.is_open:
+            await secondary.complete(prompt)
+            return "failover"
+        try:
+            await breaker.call(lambda: primary.complete(prompt))
+            return "ok"
+        except CircuitOpenError:
+            await secondary.complete(prompt)
+            return "failover"
+        except Exception:
+            return "failed"
+
+    results = []
+    for name, hang_probability in PHASES:
+        # During the outage every request to the primary hangs.
+        primary.tail_probability = hang_probability
+        results.append({"phase": name, **await run_phase(requests, concurrency, send)})
+    results[-1]["final_state"] = breaker.state
+    return results
+
+
+async def test_breaker(requests: int, concurrency: int, activity_timeout: float) -> bool:
+    print(f"🧪 {requests} requests per phase, {concurrency} in flight, activity timeout {activity_timeout:.1f}s...")
+    baseline = await run_scenario(False, requests, concurrency, activity_timeout)
+    guarded = await run_scenario(True, requests, concurrency, activity_timeout)
+
+    print("\n📊 Results:")
+    print(f"   {'':<10}{'phase':<11}{'slot-s':>8}{'ok':>6}{'failover':>10}{'failed':>8}")
+    for name, phases in (("none", baseline), ("breaker", guarded)):
+        for stats in phases:
+            print(
+                f"   {name:<10}{stats['phase']:<11}{stats['slot_seconds']:>8.1f}{stats['ok']:>6}"
+                f"{stats['failover']:>10}{stats['failed']:>8}"
+            )
+
+    outage_baseline, outage_guarded = baseline[1]["slot_seconds"], guarded[1]["slot_seconds"]
+    print(f"\n   Worker slot time during the outage: {outage_baseline:.1f}s without, {outage_guarded:.1f}s with the breaker")
+    print(f"   Breaker state after recovery: {guarded[-1]['final_state']}")
+
+    passed = True
+    if outage_guarded >= outage_baseline / 2:
+        print("   ❌ FAIL: the breaker did not cut slot time during the outage in half")
+        passed = False
+    if guarded[1]["failover"] == 0:
+        print("   ❌ FAIL: no requests failed over while the circuit was open")
+        passed = False
+    if guarded[-1]["final_state"] != "closed":
+        print("   ❌ FAIL: the breaker did not close after the provider recovered")
+        passed = False
+    if passed:
+        print("   ✅ PASS")
+    return passed
+
+
+def main():
+    """Main test function"""
+    parser = argparse.ArgumentParser(description="Test the LLM provider circuit breaker through a simulated outage.")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per phase.")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--activity-timeout", type=float, default=1.0, help="Scaled-down activity timeout (s).")
+    args = parser.parse_args()
+
+    print("🚀 TraceRail Circuit Breaker Test")
+    print("=" * 50)
+
+    passed = asyncio.run(test_breaker(args.requests, args.concurrency, args.activity_timeout))
+    if not passed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
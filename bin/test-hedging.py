@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Hedged Request Test Script for TraceRail Bootstrap
+
+This script exercises the hedged-request logic used by `llm_activity` against
+local fake providers with injected latency. It compares tail latency with and
+without hedging and checks that the hedge budget bounds the extra spend.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from workers.fakes import FakeProvider
+    from workers.providers import HedgeBudget, hedged_call
+except ImportError:
+    print("⚠️  Dependencies not installed. Run 'poetry install' first.")
+    sys.exit(1)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Returns the given percentile of a list of values."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_scenario(requests: int, hedge: bool, delay: float, max_ratio: float) -> dict:
+    """Sends `requests` prompts through hedged_call and collects latencies."""
+    primary = FakeProvider("deepseek", latency_ms=80, tail_latency_ms=1500, tail_probability=0.05, seed=1)
+    secondary = FakeProvider("openai", latency_ms=120, tail_latency_ms=1500, tail_probability=0.05, seed=2)
+    budget = HedgeBudget(max_ratio)
+
+    latencies = []
+    wins = 0
+    for i in range(requests):
+        outcome = await hedged_call(
+            primary=lambda: primary.complete(f"prompt {i}"),
+            secondary=(lambda: secondary.complete(f"prompt {i}")) if hedge else None,
+            delay=delay,
+            budget=budget,
+            is_valid=lambda response: bool(response.content),
+        )
+        latencies.append(outcome.latency_ms)
+        wins += outcome.winner == "secondary"
+
+    return {
+        "p50": statistics.median(latencies),
+        "p99": percentile(latencies, 99),
+        "hedge_rate": budget.hedge_rate,
+        "hedge_wins": wins,
+        "extra_calls": secondary.calls,
+        "cancelled": primary.cancelled + secondary.cancelled,
+    }
+
+
+async def test_hedging(requests: int, delay: float, max_ratio: float) -> bool:
+    """Compares the unhedged and hedged scenarios."""
+    print(f"🧪 Sending {requests} requests per scenario (hedge delay {delay * 1000:.0f} ms)...")
+
+    baseline = await run_scenario(requests, hedge=False, delay=delay, max_ratio=max_ratio)
+    hedged = await run_scenario(requests, hedge=True, delay=delay, max_ratio=max_ratio)
+
+    print("\n📊 Results:")
+    print(f"   {'':<12}{'p50 (ms)':>10}{'p99 (ms)':>10}{'hedge rate':>12}{'extra calls':>13}")
+    for name, stats in (("single", baseline), ("hedged", hedged)):
+        print(
+            f"   {name:<12}{stats['p50']:>10.0f}{stats['p99']:>10.0f}"
+            f"{stats['hedge_rate'] * 100:>11.1f}%{stats['extra_calls']:>13}"
+        )
+    print(f"\n   Tail latency gained (p99): {baseline['p99'] - hedged['p99']:.0f} ms")
+    print(f"   Hedges won by second provider: {hedged['hedge_wins']}")
+    print(f"   Losing requests cancelled: {hedged['cancelled']}")
+
+    passed = True
+    if hedged["p99"] >= baseline["p99"]:
+        print("   ❌ FAIL: hedging did not reduce p99 latency")
+        passed = False
+    if hedged["hedge_rate"] > max_ratio + 10 / requests:
+        print(f"   ❌ FAIL: hedge rate exceeded the {max_ratio * 100:.0f}% budget")
+        passed = False
+    if passed:
+        print("   ✅ PASS")
+    return passed
+
+
+def main():
+    """Main test function"""
+    parser = argparse.ArgumentParser(description="Test hedged LLM requests with fake providers.")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--delay-ms", type=float, default=250)
+    parser.add_argument("--max-ratio", type=float, default=0.1)
+    args = parser.parse_args()
+
+    print("🚀 TraceRail Hedged Request Test")
+    print("=" * 50)
+
+    passed = asyncio.run(test_hedging(args.requests, args.delay_ms / 1000, args.max_ratio))
+    if not passed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
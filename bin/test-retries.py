@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Retry Policy Chaos Test for TraceRail Bootstrap
+
+This script replays Temporal's retry loop locally against a fake LLM provider
+that throttles requests above a fixed rate and rejects some requests as
+invalid. It compares Temporal's default retry policy on unclassified errors
+with the `llm_activity` options from `activity_options.yaml` combined with
+the error classification in `workers/errors.py`, and reports how many
+attempts each one wasted.
+
+Time is scaled down (`--scale`), so a 900-second schedule-to-close budget
+takes a few seconds to run.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from temporalio.common import RetryPolicy
+    from temporalio.exceptions import ApplicationError
+
+    from workers.activity_options import activity_options, load_activity_options
+    from workers.errors import as_application_error
+    from workers.fakes import FakeProvider, FakeRateLimitError, FakeValidationError
+except ImportError:
+    print("⚠️  Dependencies not installed. Run 'poetry install' first.")
+    sys.exit(1)
+
+
+class ThrottledProvider:
+    """A fake provider that allows `rate` requests per (simulated) second."""
+
+    def __init__(self, rate: float, clock, seed: int = 1):
+        self.provider = FakeProvider("throttled", latency_ms=0, jitter_ms=0, seed=seed)
+        self.rate = rate
+        self.clock = clock
+        self.tokens = rate
+        self.updated = clock()
+
+    async def complete(self, prompt: str, invalid: bool):
+        now = self.clock()
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if invalid:
+            raise FakeValidationError("prompt exceeds the model's context window")
+        if self.tokens < 1:
+            raise FakeRateLimitError("rate limit exceeded, too many requests")
+        self.tokens -= 1
+        return await self.provider.complete(prompt)
+
+
+def retry_delay(policy: RetryPolicy, attempt: int, error: BaseException) -> float | None:
+    """
+    The delay Temporal waits before retrying after failed attempt number
+    `attempt`, or `None` if it does not retry.
+    """
+    if isinstance(error, ApplicationError):
+        if error.non_retryable or error.type in (policy.non_retryable_error_types or []):
+            return None
+    if policy.maximum_attempts and attempt >= policy.maximum_attempts:
+        return None
+    if isinstance(error, ApplicationError) and error.next_retry_delay is not None:
+        return error.next_retry_delay.total_seconds()
+    delay = policy.initial_interval.total_seconds() * policy.backoff_coefficient ** (attempt - 1)
+    maximum = policy.maximum_interval.total_seconds() if policy.maximum_interval else 100 * policy.initial_interval.total_seconds()
+    return min(delay, maximum)
+
+
+async def run_scenario(classify: bool, args: argparse.Namespace) -> dict:
+    start = time.perf_counter()
+
+    def clock() -> float:
+        return (time.perf_counter() - start) / args.scale
+
+    provider = ThrottledProvider(args.rate, clock)
+    rng = random.Random(args.seed)
+
+    if classify:
+        options = activity_options("llm_activity")
+        policy = options["retry_policy"]
+    else:
+        # Temporal's defaults: unlimited attempts, 1 s doubling up to 100 s.
+        options = {"schedule_to_close_timeout": activity_options("llm_activity").get("schedule_to_close_timeout")}
+        policy = RetryPolicy()
+    budget = options["schedule_to_close_timeout"].total_seconds() if options["schedule_to_close_timeout"] else 900
+
+    stats = {"attempts": 0, "wasted": 0, "succeeded": 0, "rejected": 0, "exhausted": 0, "seconds": []}
+
+    async def request(i: int, invalid: bool):
+        # Requests arrive spread over the first `spread` seconds.
+        await asyncio.sleep(rng.uniform(0, args.spread) * args.scale)
+        started = clock()
+        attempt = 0
+        while True:
+            attempt += 1
+            stats["attempts"] += 1
+            try:
+                await provider.complete(f"prompt {i}", invalid)
+                stats["succeeded"] += 1
+                stats["seconds"].append(clock() - started)
+                return
+            except Exception as e:
+                stats["wasted"] += 1
+                error = as_application_error(e, attempt) if classify else e
+                delay = retry_delay(policy, attempt, error)
+                if delay is None:
+                    stats["rejected" if invalid else "exhausted"] += 1
+                    return
+                if clock() - started + delay > budget:
+                    stats["exhausted"] += 1
+                    return
+                await asyncio.sleep(delay * args.scale)
+
+    invalid = [rng.random() < args.invalid_rate for _ in range(args.requests)]
+    await asyncio.gather(*(request(i, bad) for i, bad in enumerate(invalid)))
+    return stats
+
+
+async def test_retries(args: argparse.Namespace) -> bool:
+    print(f"🧪 {args.requests} requests over {args.spread:.0f}s against a provider allowing {args.rate:.0f}/s, "
+          f"{args.invalid_rate:.0%} invalid...")
+    baseline = await run_scenario(False, args)
+    tuned = await run_scenario(True, args)
+
+    print("\n📊 Results:")
+    print(f"   {'policy':<12}{'attempts':>10}{'wasted':>9}{'ok':>7}{'rejected':>10}{'gave up':>9}{'p50 s':>8}")
+    for name, stats in (("default", baseline), ("classified", tuned)):
+        seconds = sorted(stats["seconds"]) or [0.0]
+        print(
+            f"   {name:<12}{stats['attempts']:>10}{stats['wasted']:>9}{stats['succeeded']:>7}"
+            f"{stats['rejected']:>10}{stats['exhausted']:>9}{seconds[len(seconds) // 2]:>8.0f}"
+        )
+    print(f"\n   Wasted attempts: {baseline['wasted']} -> {tuned['wasted']}")
+
+    passed = True
+    if tuned["wasted"] >= baseline["wasted"]:
+        print("   ❌ FAIL: classification did not reduce wasted attempts")
+        passed = False
+    if tuned["succeeded"] < baseline["succeeded"]:
+        print("   ❌ FAIL: fewer requests succeeded with the tuned policy")
+        passed = False
+    if passed:
+        print("   ✅ PASS")
+    return passed
+
+
+def main():
+    """Main test function"""
+    parser = argparse.ArgumentParser(description="Compare retry policies against a throttling fake provider.")
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--rate", type=float, default=2.0, help="Requests per second the provider accepts.")
+    parser.add_argument("--spread", type=float, default=60.0, help="Seconds over which requests arrive.")
+    parser.add_argument("--invalid-rate", type=float, default=0.05, help="Fraction of requests the provider rejects.")
+    parser.add_argument("--scale", type=float, default=0.005, help="Real seconds per simulated second.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print("🚀 TraceRail Retry Policy Chaos Test")
+    print("=" * 50)
+
+    load_activity_options()
+    passed = asyncio.run(test_retries(args))
+    if not passed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Batch Workflow Starter Script for TraceRail Bootstrap
+
+This script streams documents from a JSONL or CSV file (or stdin) and starts an
+'ExampleWorkflow' for each one, with a bounded number of in-flight requests
+over a single Temporal client. Workflow IDs are derived from a hash of the
+content, so re-running the same input resumes where it left off instead of
+starting duplicates. Documents longer than `LARGE_DOCUMENT_CHARS` are put in
+the blob store and passed by reference. Results are appended to a JSONL file as workflows complete.
+Documents whose last result was a failure are processed again on resume.
+
+Usage:
+    poetry run python cli/batch_start.py documents.jsonl --results results.jsonl
+    cat documents.csv | poetry run python cli/batch_start.py - --format csv
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import sys
+import time
+from pathlib import Path
+from typing import IO, Iterator
+
+# Add the project root to the Python path to allow for absolute imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+
+# Load environment variables from a .env file in the project root
+load_dotenv()
+
+try:
+    from temporalio.client import Client
+    from temporalio.common import WorkflowIDReusePolicy
+    from temporalio.exceptions import WorkflowAlreadyStartedError
+    from temporalio.service import RPCError
+    from tracerail.config import TraceRailConfig
+
+    from workers.chunking import document_input
+    from workers.claimcheck import data_converter
+    from workers.fingerprint import simhash, workflow_id_for
+    from workers.search_attributes import initial_attributes
+    from workers.workflows import ExampleWorkflow
+except ImportError as e:
+    print(f"⚠️  Import error: {e}. Make sure dependencies are installed with 'poetry install'.")
+    sys.exit(1)
+
+# Statuses that are final; documents with these results are skipped on resume.
+# Failed documents (a failed workflow or a start request that errored) are
+# started again: a failed run's workflow ID may be reused, and so may that of
+# a closed run recorded as FAILED (older cases completed with a FAILED result).
+TERMINAL_STATUSES = {"COMPLETED"}
+
+
+def read_documents(stream: IO[str], fmt: str, field: str) -> Iterator[tuple[int, str]]:
+    """
+    Yields `(line_number, text)` pairs from a JSONL or CSV stream, one at a time.
+    Lines that are not valid JSON are reported and skipped.
+    """
+    if fmt == "csv":
+        for line_number, row in enumerate(csv.DictReader(stream), start=2):
+            text = row.get(field)
+            if text:
+                yield line_number, text
+        return
+
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            print(f"⚠️  Skipping line {line_number}: invalid JSON ({e})", file=sys.stderr)
+            continue
+        text = record if isinstance(record, str) else record.get(field) if isinstance(record, dict) else None
+        if text:
+            yield line_number, text
+
+
+def load_statuses(results_path: Path) -> dict[str, str]:
+    """
+    Returns the last status recorded for each workflow ID in the results file.
+    """
+    statuses = {}
+    if not results_path.exists():
+        return statuses
+    with results_path.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # A partially written last line from an interrupted run
+            statuses[record["workflow_id"]] = record.get("status")
+    return statuses
+
+
+def load_finished_ids(results_path: Path) -> set[str]:
+    """
+    Returns the workflow IDs that already have a final result in the results file.
+    """
+    return {workflow_id for workflow_id, status in load_statuses(results_path).items() if status in TERMINAL_STATUSES}
+
+
+class BatchStarter:
+    """
+    Starts workflows with at most `concurrency` start requests in flight.
+    Waiting for results does not count against that limit, but at most
+    `max_waiting` workflows are waited on at once; the next document is only
+    read once there is room for it. Workflow IDs in `failed` (last recorded
+    as FAILED) are started again even if their run completed.
+    """
+
+    def __init__(self, client: Client, task_queue: str, results: IO[str], concurrency: int,
+                 wait: bool, result_timeout: float, max_waiting: int = 1000, failed: set[str] = frozenset()):
+        self.client = client
+        self.task_queue = task_queue
+        self.results = results
+        self.wait = wait
+        self.result_timeout = result_timeout
+        self.failed = failed
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.waiting = asyncio.Semaphore(max(max_waiting, concurrency))
+        self.counts = {"started": 0, "existing": 0, "completed": 0, "failed": 0, "pending": 0}
+
+    def record(self, **fields) -> None:
+        self.results.write(json.dumps(fields) + "\n")
+        self.results.flush()
+
+    async def process(self, line_number: int, text: str, workflow_id: str) -> None:
+        try:
+            try:
+                # Completed runs are never repeated; only failed ones may be retried.
+                reuse_policy = (
+                    WorkflowIDReusePolicy.ALLOW_DUPLICATE if workflow_id in self.failed
+                    else WorkflowIDReusePolicy.ALLOW_DUPLICATE_FAILED_ONLY
+                )
+                handle = await self.client.start_workflow(
+                    ExampleWorkflow.run, document_input(text), id=workflow_id, task_queue=self.task_queue,
+                    id_reuse_policy=reuse_policy,
+                    memo={"simhash": f"{simhash(text):016x}"},
+                    search_attributes=initial_attributes(),
+                )
+                self.counts["started"] += 1
+            except WorkflowAlreadyStartedError:
+                # Started by an earlier, interrupted run: pick up its result instead.
+                handle = self.client.get_workflow_handle(workflow_id)
+                self.counts["existing"] += 1
+            finally:
+                # Only the start request counts against the limit, not the wait for its result.
+                self.semaphore.release()
+
+            if not self.wait:
+                self.record(workflow_id=workflow_id, line=line_number, status="STARTED")
+                return
+
+            try:
+                result = await asyncio.wait_for(handle.result(), timeout=self.result_timeout)
+            except asyncio.TimeoutError:
+                self.counts["pending"] += 1
+                self.record(workflow_id=workflow_id, line=line_number, status="PENDING")
+                return
+            if isinstance(result, dict) and result.get("status") == "FAILED":
+                # A case started before failed cases failed their run.
+                self.counts["failed"] += 1
+                self.record(workflow_id=workflow_id, line=line_number, status="FAILED", result=result)
+            else:
+                self.counts["completed"] += 1
+                self.record(workflow_id=workflow_id, line=line_number, status="COMPLETED", result=result)
+        except Exception as e:
+            self.counts["failed"] += 1
+            self.record(workflow_id=workflow_id, line=line_number, status="FAILED", error=str(e))
+        finally:
+            if self.wait:
+                self.waiting.release()
+
+    async def run(self, documents: Iterator[tuple[int, str]], finished: set[str]) -> int:
+        tasks = set()
+        skipped = 0
+        for line_number, text in documents:
+            workflow_id = workflow_id_for(text)
+            if workflow_id in finished:
+                skipped += 1
+                continue
+            # Only read the next document once there is room for it.
+            if self.wait:
+                await self.waiting.acquire()
+            await self.semaphore.acquire()
+            task = asyncio.create_task(self.process(line_number, text, workflow_id))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.wait(tasks)
+        return skipped
+
+
+async def main(args: argparse.Namespace):
+    """
+    Connects to Temporal and starts a workflow for every document in the input.
+    """
+    print("🚀 Starting Batch of Example Workflows...", file=sys.stderr)
+    print("=" * 50, file=sys.stderr)
+
+    fmt = args.format or ("csv" if args.input.endswith(".csv") else "jsonl")
+    statuses = load_statuses(args.results)
+    finished = {workflow_id for workflow_id, status in statuses.items() if status in TERMINAL_STATUSES}
+    failed = {workflow_id for workflow_id, status in statuses.items() if status == "FAILED"}
+    if finished:
+        print(f"   - Resuming: {len(finished)} document(s) already have results", file=sys.stderr)
+    if failed:
+        print(f"   - Retrying: {len(failed)} document(s) failed before", file=sys.stderr)
+
+    config = TraceRailConfig()
+    temporal_address = f"{config.temporal.host}:{config.temporal.port}"
+    try:
+        client = await Client.connect(
+            temporal_address, namespace=config.temporal.namespace, data_converter=data_converter()
+        )
+    except (RPCError, RuntimeError):
+        print("\n❌ Could not connect to Temporal service.", file=sys.stderr)
+        print("   You can start it with: `make up`", file=sys.stderr)
+        sys.exit(1)
+
+    print(f"   - Connected to Temporal on '{temporal_address}'", file=sys.stderr)
+    print(f"   - Input: {args.input} ({fmt}), max {args.concurrency} start requests in flight", file=sys.stderr)
+    print(f"   - Results: {args.results}", file=sys.stderr)
+
+    start = time.perf_counter()
+    stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8", newline="")
+    try:
+        with args.results.open("a", encoding="utf-8") as results:
+            starter = BatchStarter(
+                client, config.temporal.task_queue, results,
+                concurrency=args.concurrency, wait=not args.no_wait, result_timeout=args.result_timeout,
+                max_waiting=args.max_waiting, failed=failed,
+            )
+            skipped = await starter.run(read_documents(stream, fmt, args.field), finished)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    elapsed = time.perf_counter() - start
+    counts = starter.counts
+    total = counts["started"] + counts["existing"]
+    print(f"\n📊 Batch Summary ({elapsed:.1f}s, {total / max(elapsed, 1e-9):.1f} workflows/s):", file=sys.stderr)
+    print(f"   Started: {counts['started']}  Already running: {counts['existing']}  Skipped: {skipped}", file=sys.stderr)
+    if not args.no_wait:
+        print(f"   Completed: {counts['completed']}  Pending: {counts['pending']}", file=sys.stderr)
+    print(f"   Failed: {counts['failed']}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Start an ExampleWorkflow for every document in a file or stdin.")
+    parser.add_argument("input", help="JSONL or CSV file, or '-' for stdin.")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Input format (default: from the file extension).")
+    parser.add_argument("--field", default="text", help="JSON key or CSV column holding the text.")
+    parser.add_argument("--results", type=Path, default=Path("batch-results.jsonl"), help="JSONL file to append results to.")
+    parser.add_argument("--concurrency", type=int, default=100, help="Maximum start requests in flight.")
+    parser.add_argument("--no-wait", action="store_true", help="Only start workflows; do not wait for results.")
+    parser.add_argument("--max-waiting", type=int, default=1000, help="Maximum workflows waited on at once.")
+    parser.add_argument("--result-timeout", type=float, default=300.0, help="Seconds to wait for each result.")
+    asyncio.run(main(parser.parse_args()))
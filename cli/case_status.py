@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Case Status Script for TraceRail Bootstrap
+
+Prints the compact status of 'ExampleWorkflow' cases as JSON lines: the stage
+each case has reached, its routing decision and timestamps. They are read
+from visibility; only running cases started without search attributes are
+sent the workflow's `status` query, so no workflow history is loaded (see
+`workers/status.py`).
+
+Cases can be filtered by their search attributes (see
+`workers/search_attributes.py`), which visibility indexes, instead of listing
+every case and inspecting its result.
+
+Usage:
+    poetry run python cli/case_status.py example-workflow-1a2b... example-workflow-3c4d...
+    poetry run python cli/case_status.py --recent 100
+    poetry run python cli/case_status.py --decision human --waiting-longer-than 4h
+    poetry run python cli/case_status.py --stage failed --provider openai --recent 500
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path to allow for absolute imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+
+# Load environment variables from a .env file in the project root
+load_dotenv()
+
+try:
+    from temporalio.client import Client
+    from temporalio.service import RPCError
+    from tracerail.config import TraceRailConfig
+
+    from cli.collect_results import parse_since
+    from workers.claimcheck import data_converter
+    from workers.search_attributes import case_query
+    from workers.status import CASE_STATUS_QUERY_LIMIT, bulk_status, recent_status
+except ImportError as e:
+    print(f"⚠️  Import error: {e}. Make sure dependencies are installed with 'poetry install'.")
+    sys.exit(1)
+
+
+async def main(args: argparse.Namespace):
+    """
+    Connects to Temporal and prints the status of the requested cases.
+    """
+    config = TraceRailConfig()
+    try:
+        client = await Client.connect(
+            f"{config.temporal.host}:{config.temporal.port}", namespace=config.temporal.namespace,
+            data_converter=data_converter(),
+        )
+    except (RPCError, RuntimeError):
+        print("❌ Could not connect to Temporal service. You can start it with: `make up`", file=sys.stderr)
+        sys.exit(1)
+
+    if args.workflow_ids:
+        statuses = await bulk_status(
+            client, args.workflow_ids, concurrency=args.concurrency, max_queries=args.max_queries
+        )
+        for workflow_id in args.workflow_ids:
+            print(json.dumps(statuses.get(workflow_id, {"workflow_id": workflow_id, "status": "NOT_FOUND"})))
+    else:
+        query = args.query
+        if query is None and any((args.stage, args.decision, args.provider, args.confidence, args.rule,
+                                  args.waiting_longer_than)):
+            query = case_query(
+                status=args.stage, decision=args.decision, provider=args.provider,
+                confidence=args.confidence, rule=args.rule,
+                waiting_since_before=parse_since(args.waiting_longer_than) if args.waiting_longer_than else None,
+            )
+            print(f"🔎 {query}", file=sys.stderr)
+        records = await recent_status(
+            client, limit=args.recent, query=query, concurrency=args.concurrency, max_queries=args.max_queries
+        )
+        for record in records:
+            print(json.dumps(record))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print the status of ExampleWorkflow cases without loading histories.")
+    parser.add_argument("workflow_ids", nargs="*", help="Workflow IDs to look up.")
+    parser.add_argument("--recent", type=int, default=20, help="Without IDs, the number of recent cases to list.")
+    parser.add_argument("--query", help="Without IDs, a visibility query selecting the cases to list.")
+    filters = parser.add_argument_group("filters", "Without IDs or --query, list the cases matching all of these.")
+    filters.add_argument("--stage", nargs="+", help="Stages, e.g. awaiting_human or failed.")
+    filters.add_argument("--decision", nargs="+", help="Routing decisions, e.g. human.")
+    filters.add_argument("--provider", nargs="+", help="LLM providers.")
+    filters.add_argument("--confidence", nargs="+", choices=["high", "medium", "low", "unknown"],
+                         help="Confidence buckets.")
+    filters.add_argument("--rule", nargs="+", help="Triggered routing rules.")
+    filters.add_argument("--waiting-longer-than", metavar="DURATION",
+                         help="Cases waiting for a human for longer than this, e.g. 4h or 2d.")
+    parser.add_argument("--concurrency", type=int, default=50, help="Maximum status queries in flight.")
+    parser.add_argument("--max-queries", type=int, default=CASE_STATUS_QUERY_LIMIT,
+                        help="Maximum running cases without search attributes sent the status query.")
+    asyncio.run(main(parser.parse_args()))
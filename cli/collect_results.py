@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Workflow Result Collector for TraceRail Bootstrap
+
+Instead of holding a long-poll open on every workflow handle, this script asks
+Temporal's visibility store which 'ExampleWorkflow' executions have closed
+since a given time, then fetches only the close event of each one with a
+bounded number of concurrent requests. Results are streamed to a JSONL sink
+through a bounded queue, so a slow sink applies backpressure to the fetchers.
+
+Usage:
+    poetry run python cli/collect_results.py --since 2024-06-01T00:00:00Z --output results.jsonl
+    poetry run python cli/collect_results.py --since 1h --watch
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import IO
+
+# Add the project root to the Python path to allow for absolute imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+
+# Load environment variables from a .env file in the project root
+load_dotenv()
+
+try:
+    from temporalio.client import Client, WorkflowExecution, WorkflowExecutionStatus
+    from temporalio.service import RPCError
+    from tracerail.config import TraceRailConfig
+
+    from workers.claimcheck import data_converter
+except ImportError as e:
+    print(f"⚠️  Import error: {e}. Make sure dependencies are installed with 'poetry install'.")
+    sys.exit(1)
+
+WORKFLOW_TYPE = "ExampleWorkflow"
+
+
+def parse_since(value: str) -> datetime:
+    """
+    Parses an ISO-8601 timestamp or a relative duration such as '30m', '6h' or '2d'.
+    """
+    relative = re.fullmatch(r"(\d+)([smhd])", value)
+    if relative:
+        unit = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}[relative.group(2)]
+        return datetime.now(timezone.utc) - timedelta(**{unit: int(relative.group(1))})
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def closed_since_query(since: datetime, workflow_type: str = WORKFLOW_TYPE) -> str:
+    """
+    Builds the visibility query for executions of a type closed at or after `since`.
+    """
+    timestamp = since.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    return (
+        f"WorkflowType = '{workflow_type}' "
+        f"AND ExecutionStatus != 'Running' "
+        f"AND CloseTime >= '{timestamp}'"
+    )
+
+
+class ResultCollector:
+    """
+    Lists closed workflows through visibility and fetches their results in bulk.
+
+    Args:
+        client: The Temporal client used for every request.
+        concurrency: Maximum number of result fetches in flight.
+        queue_size: Maximum number of results buffered before the sink.
+    """
+
+    def __init__(self, client: Client, concurrency: int = 50, queue_size: int = 1000):
+        self.client = client
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        # Runs already reported, with their close time, so overlapping polls skip them.
+        self._seen: dict[tuple[str, str], datetime] = {}
+        self.watermark: datetime | None = None
+
+    async def _fetch(self, execution: WorkflowExecution) -> dict:
+        record = {
+            "workflow_id": execution.id,
+            "run_id": execution.run_id,
+            "status": execution.status.name if execution.status else None,
+            "close_time": execution.close_time.isoformat() if execution.close_time else None,
+        }
+        if execution.status != WorkflowExecutionStatus.COMPLETED:
+            # Only completed runs have a result; the status is all there is to report.
+            return record
+        handle = self.client.get_workflow_handle(execution.id, run_id=execution.run_id)
+        try:
+            # The run is closed, so this returns its close event right away.
+            record["result"] = await handle.result(follow_runs=False)
+        except Exception as e:
+            record["error"] = str(e)
+        return record
+
+    async def collect(self, since: datetime, sink: IO[str]) -> int:
+        """
+        Streams results of workflows closed since `since` to `sink` as JSON lines.
+
+        Returns:
+            The number of results written.
+        """
+        self._seen = {key: closed for key, closed in self._seen.items() if closed >= since}
+        executions: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        written = 0
+
+        async def fetcher():
+            while (execution := await executions.get()) is not None:
+                await results.put(await self._fetch(execution))
+            await results.put(None)
+
+        async def writer():
+            nonlocal written
+            finished_fetchers = 0
+            while finished_fetchers < self.concurrency:
+                record = await results.get()
+                if record is None:
+                    finished_fetchers += 1
+                    continue
+                sink.write(json.dumps(record) + "\n")
+                written += 1
+            sink.flush()
+
+        async def lister():
+            async for execution in self.client.list_workflows(closed_since_query(since), page_size=1000):
+                key = (execution.id, execution.run_id)
+                if key in self._seen:
+                    continue
+                closed = execution.close_time or since
+                self._seen[key] = closed
+                if self.watermark is None or closed > self.watermark:
+                    self.watermark = closed
+                await executions.put(execution)
+            for _ in range(self.concurrency):
+                await executions.put(None)
+
+        # If any part fails (the listing, or the sink), the others are cancelled
+        # instead of blocking forever on a queue nobody drains.
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(lister())
+                for _ in range(self.concurrency):
+                    group.create_task(fetcher())
+                group.create_task(writer())
+        except ExceptionGroup as errors:
+            raise errors.exceptions[0]
+        return written
+
+
+async def main(args: argparse.Namespace):
+    """
+    Connects to Temporal and collects the results of recently closed workflows.
+    """
+    print("📥 Collecting Example Workflow Results...", file=sys.stderr)
+    print("=" * 50, file=sys.stderr)
+
+    config = TraceRailConfig()
+    temporal_address = f"{config.temporal.host}:{config.temporal.port}"
+    try:
+        client = await Client.connect(
+            temporal_address, namespace=config.temporal.namespace, data_converter=data_converter()
+        )
+    except (RPCError, RuntimeError):
+        print("\n❌ Could not connect to Temporal service.", file=sys.stderr)
+        print("   You can start it with: `make up`", file=sys.stderr)
+        sys.exit(1)
+
+    collector = ResultCollector(client, concurrency=args.concurrency, queue_size=args.queue_size)
+    since = parse_since(args.since)
+    sink = sys.stdout if args.output is None else args.output.open("a", encoding="utf-8")
+    try:
+        while True:
+            written = await collector.collect(since, sink)
+            print(f"   - {written} result(s) closed since {since.isoformat()}", file=sys.stderr)
+            if not args.watch:
+                break
+            # Overlap slightly with the last window; already seen runs are skipped.
+            since = (collector.watermark or since) - timedelta(seconds=5)
+            await asyncio.sleep(args.interval)
+    finally:
+        if sink is not sys.stdout:
+            sink.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Collect ExampleWorkflow results via visibility queries.")
+    parser.add_argument("--since", default="1h", help="ISO-8601 timestamp or relative duration (e.g. 30m, 6h, 2d).")
+    parser.add_argument("--output", type=Path, help="JSONL file to append results to (default: stdout).")
+    parser.add_argument("--concurrency", type=int, default=50, help="Maximum result fetches in flight.")
+    parser.add_argument("--queue-size", type=int, default=1000, help="Results buffered before the sink.")
+    parser.add_argument("--watch", action="store_true", help="Keep polling for newly closed workflows.")
+    parser.add_argument("--interval", type=float, default=10.0, help="Seconds between polls with --watch.")
+    try:
+        asyncio.run(main(parser.parse_args()))
+    except KeyboardInterrupt:
+        print("\n👋 Stopped collecting.", file=sys.stderr)
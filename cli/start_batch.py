@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Batch Processing Workflow Starter for TraceRail Bootstrap
+
+This script starts a `BatchProcessingWorkflow` for a JSONL or CSV dataset.
+Unlike `cli/batch_start.py`, which starts every workflow from this process,
+the batch runs inside Temporal: it pages through the dataset, starts an
+'ExampleWorkflow' per record at a capped rate and survives restarts of this
+script and of the workers, which makes it suitable for scheduled runs over
+millions of records.
+
+The dataset must be readable by the workers. Pass a path on a shared volume,
+or `--upload` to copy the file into the blob store first.
+
+If the last batch for the same dataset failed or was terminated, the new one
+resumes from the offset it had reached. `--status` prints the progress of the
+batch without starting anything.
+
+Usage:
+    poetry run python cli/start_batch.py /data/cases.jsonl --rate 50
+    poetry run python cli/start_batch.py cases.csv --upload --field body
+    poetry run python cli/start_batch.py /data/cases.jsonl --status
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+# Add the project root to the Python path to allow for absolute imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+
+# Load environment variables from a .env file in the project root
+load_dotenv()
+
+try:
+    from temporalio.client import Client, WorkflowExecutionStatus
+    from temporalio.common import WorkflowIDConflictPolicy, WorkflowIDReusePolicy
+    from temporalio.service import RPCError
+    from tracerail.config import TraceRailConfig
+
+    from workers.blobstore import blob_ref, get_blob_store
+    from workers.claimcheck import data_converter
+    from workers.datasets import dataset_format
+    from workers.fingerprint import content_fingerprint
+    from workers.search_attributes import CASE_SEARCH_ATTRIBUTES
+    from workers.batch_workflow import BatchProcessingWorkflow
+    from workers.models import BATCH_DEFAULTS
+except ImportError as e:
+    print(f"⚠️  Import error: {e}. Make sure dependencies are installed with 'poetry install'.")
+    sys.exit(1)
+
+# Closed batches that can be resumed from their last progress.
+RESUMABLE = {WorkflowExecutionStatus.FAILED, WorkflowExecutionStatus.TERMINATED, WorkflowExecutionStatus.TIMED_OUT,
+             WorkflowExecutionStatus.CANCELED}
+
+
+def batch_workflow_id(path: Path, dataset: str) -> str:
+    """
+    Returns the batch's workflow ID: the same for the same dataset (a blob is
+    its content; a file its path, size and modification time), so starting
+    it again joins or resumes the batch instead of duplicating it.
+    """
+    stat = path.stat()
+    return f"batch-{content_fingerprint(f'{dataset}:{stat.st_size}:{stat.st_mtime_ns}')[:24]}"
+
+
+def print_progress(progress: dict) -> None:
+    cursor = "done" if progress.get("cursor") is None else f"offset {progress['cursor']}"
+    print(f"   Position: {cursor} after {progress.get('pages', 0)} page(s), {progress.get('runs', 0)} run(s)")
+    print(f"   Started: {progress.get('started', 0)}  Already existing: {progress.get('existing', 0)}")
+    if progress.get("completed") or progress.get("failed"):
+        print(f"   Completed: {progress['completed']}  Failed: {progress['failed']}")
+
+
+async def main(args: argparse.Namespace):
+    """
+    Connects to Temporal and starts, joins or resumes the batch for a dataset.
+    """
+    print("🚀 Starting Batch Processing Workflow...")
+    print("=" * 50)
+
+    path = Path(args.dataset)
+    if not path.exists():
+        print(f"❌ Dataset not found: {path}")
+        sys.exit(1)
+    fmt = dataset_format(str(path), args.format)
+    if args.upload:
+        dataset = blob_ref(get_blob_store().put(path.read_bytes()))
+        print(f"   - Uploaded {path} ({path.stat().st_size} bytes) as {dataset}")
+    else:
+        dataset = str(path.resolve())
+
+    config = TraceRailConfig()
+    try:
+        client = await Client.connect(
+            f"{config.temporal.host}:{config.temporal.port}", namespace=config.temporal.namespace,
+            data_converter=data_converter(),
+        )
+    except (RPCError, RuntimeError):
+        print("\n❌ Could not connect to Temporal service.")
+        print("   You can start it with: `make up`")
+        sys.exit(1)
+
+    workflow_id = args.id or batch_workflow_id(path, dataset)
+    handle = client.get_workflow_handle(workflow_id)
+    previous = None
+    try:
+        previous = await handle.describe()
+    except RPCError:
+        pass  # No batch for this dataset yet
+
+    if args.status:
+        if previous is None:
+            print(f"   No batch found with ID {workflow_id}")
+            return
+        print(f"   Batch {workflow_id}: {previous.status.name if previous.status else 'UNKNOWN'}")
+        print_progress(await handle.query(BatchProcessingWorkflow.progress))
+        return
+
+    batch = {
+        "dataset": dataset,
+        "format": fmt,
+        "field": args.field,
+        "page_size": args.page_size,
+        "window": args.window,
+        "max_per_second": args.rate,
+        "wait": args.wait,
+        "search_attributes": CASE_SEARCH_ATTRIBUTES,
+    }
+    if previous is not None and previous.status in RESUMABLE:
+        progress = await handle.query(BatchProcessingWorkflow.progress)
+        if progress.get("cursor") is not None:
+            batch["progress"] = progress
+            print(f"   - Resuming the {previous.status.name.lower()} batch from offset {progress['cursor']}")
+
+    handle = await client.start_workflow(
+        BatchProcessingWorkflow.run,
+        batch,
+        id=workflow_id,
+        task_queue=config.temporal.task_queue,
+        id_conflict_policy=WorkflowIDConflictPolicy.USE_EXISTING,
+        id_reuse_policy=WorkflowIDReusePolicy.ALLOW_DUPLICATE,
+    )
+    print(f"\n✅ Batch running with ID: {handle.id}")
+    print(f"   Dataset: {dataset} ({fmt}, field '{args.field}')")
+    print(f"   Pages of {args.page_size}, windows of {args.window}, at most {args.rate:g} workflows/s")
+    if args.rate:
+        print(f"   About {3600 * args.rate:,.0f} records per hour")
+    print(f"   Check progress with: poetry run python cli/start_batch.py {args.dataset} --status")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Start a BatchProcessingWorkflow for a JSONL or CSV dataset.")
+    parser.add_argument("dataset", help="JSONL or CSV file.")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Input format (default: from the file extension).")
+    parser.add_argument("--field", default=BATCH_DEFAULTS["field"], help="JSON key or CSV column holding the text.")
+    parser.add_argument("--upload", action="store_true", help="Copy the dataset into the blob store for the workers.")
+    parser.add_argument("--page-size", type=int, default=BATCH_DEFAULTS["page_size"], help="Records read per activity.")
+    parser.add_argument("--window", type=int, default=BATCH_DEFAULTS["window"], help="Child workflows started together.")
+    parser.add_argument("--rate", type=float, default=BATCH_DEFAULTS["max_per_second"],
+                        help="Most child workflows started per second (0 for no limit).")
+    parser.add_argument("--wait", action="store_true", help="Wait for each window's workflows to complete.")
+    parser.add_argument("--id", help="Batch workflow ID (default: derived from the dataset).")
+    parser.add_argument("--status", action="store_true", help="Print the batch's progress and exit.")
+    asyncio.run(main(parser.parse_args()))
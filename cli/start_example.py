@@ -2,12 +2,29 @@
 """
 Example Workflow Starter Script for TraceRail Bootstrap
 
-This script initializes the TraceRail client and starts a new
+This script connects to Temporal and starts a new
 'ExampleWorkflow' execution with the provided text as input.
+
+The workflow ID is a SHA-256 fingerprint of the text, so identical text is
+not processed twice: if a workflow for it is still running the script
+attaches to it, and if one completed in the last `CASE_REUSE_HOURS` its
+result is reused. A failed or older case is processed again.
+Documents longer than `LARGE_DOCUMENT_CHARS` are put in the blob store and
+passed by reference, so the workflow processes them in chunks.
+
+Several texts start one multi-part case: the workflow processes the items
+concurrently, at most `ITEM_CONCURRENCY` at a time, and routes them together.
+
+The case is started with its search attributes (stage, decision, provider,
+...), so it can be found with visibility queries; register them once with
+`make register-search-attributes`, or set `CASE_SEARCH_ATTRIBUTES=false`.
 """
 
 import asyncio
+import functools
+import os
 import sys
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 # Add the project root to the Python path to allow for absolute imports
@@ -19,59 +36,132 @@ from dotenv import load_dotenv
 load_dotenv()
 
 try:
-    import tracerail
-    # This workflow will be created in the next step
-    from workers.workflows import ExampleWorkflow
-    from temporalio.client import WorkflowHandle
+    from temporalio.client import Client, WorkflowHandle
+    from temporalio.common import WorkflowIDConflictPolicy, WorkflowIDReusePolicy
+    from temporalio.exceptions import WorkflowAlreadyStartedError
     from temporalio.service import RPCError
+    from tracerail.config import TraceRailConfig
+
+    from workers.chunking import document_input
+    from workers.claimcheck import data_converter
+    from workers.fingerprint import simhash, workflow_id_for
+    from workers.models import ITEM_FAN_OUT
+    from workers.search_attributes import initial_attributes
+    from workers.workflows import ExampleWorkflow
 except ImportError as e:
     print(f"⚠️  Import error: {e}. Make sure dependencies are installed with 'poetry install'.")
     sys.exit(1)
 
-async def main(text_input: str):
+ITEM_CONCURRENCY = int(os.getenv("ITEM_CONCURRENCY", str(ITEM_FAN_OUT)))
+
+# Separates the items of a multi-part case when fingerprinting them together.
+ITEM_SEPARATOR = "\x1e"
+
+# A completed case is reused for this long after it closed; after that, the
+# same text is processed again (with the current prompts, rules and models).
+CASE_REUSE_HOURS = float(os.getenv("CASE_REUSE_HOURS", "24"))
+
+
+async def rerun_reason(handle: WorkflowHandle) -> str | None:
     """
-    Connects to the TraceRail system and starts the example workflow.
+    Returns why a completed case should be processed again rather than
+    reused, or None to reuse it.
     """
+    description = await handle.describe()
+    if description.close_time is not None:
+        age = datetime.now(timezone.utc) - description.close_time
+        if age > timedelta(hours=CASE_REUSE_HOURS):
+            return f"its result is {age.total_seconds() / 3600:.0f} hours old"
+    result = await handle.result()
+    # Cases started before failed cases failed their run completed with this result.
+    if isinstance(result, dict) and result.get("status") == "FAILED":
+        return "it failed"
+    return None
+
+async def main(text_inputs: list[str], latency_critical: bool = False):
+    """
+    Connects to the TraceRail system and starts the example workflow, for
+    one text or for a multi-part case of several. A latency-critical case
+    hedges its LLM requests right away.
+    """
+    text_input = ITEM_SEPARATOR.join(text_inputs)
     print("🚀 Starting Example Workflow...")
     print("=" * 50)
 
     try:
-        # The client automatically loads configuration from the .env file.
-        # Using the async context manager is a clean way to ensure resources are handled.
-        print("   - Connecting to TraceRail client...")
-        async with await tracerail.create_client_async() as client:
-            print(f"   - Client connected to Temporal on '{client.config.temporal.host}:{client.config.temporal.port}'")
-
-            workflow_id = f"example-workflow-{hash(text_input)}"
-            task_queue = client.config.temporal.task_queue
-
-            print(f"\n   - Starting workflow with ID: {workflow_id}")
-            print(f"   - Task Queue: {task_queue}")
-            print(f"   - Input: '{text_input}'")
-
-            # Start the workflow
-            handle: WorkflowHandle = await client.start_workflow(
-                ExampleWorkflow.run,
-                text_input,
-                id=workflow_id,
-                task_queue=task_queue,
+        # The configuration is loaded from the .env file.
+        config = TraceRailConfig()
+        print("   - Connecting to Temporal...")
+        client = await Client.connect(
+            f"{config.temporal.host}:{config.temporal.port}", namespace=config.temporal.namespace,
+            data_converter=data_converter(),
+        )
+        print(f"   - Client connected to Temporal on '{config.temporal.host}:{config.temporal.port}'")
+
+        # Stable across processes, unlike hash(), so duplicates are detected.
+        workflow_id = workflow_id_for(text_input)
+        task_queue = config.temporal.task_queue
+
+        print(f"\n   - Starting workflow with ID: {workflow_id}")
+        print(f"   - Task Queue: {task_queue}")
+        for text in text_inputs:
+            print(f"   - Input: '{text[:200]}'")
+
+        # Large documents go to the blob store; the workflow gets a reference.
+        item_inputs = [document_input(text) for text in text_inputs]
+        for text, item_input in zip(text_inputs, item_inputs):
+            if item_input != text:
+                print(f"   - Large document ({len(text)} characters), passed as {item_input}")
+        if len(item_inputs) == 1:
+            workflow_args = [item_inputs[0]]
+        else:
+            workflow_args = [item_inputs, ITEM_CONCURRENCY]
+            print(f"   - Multi-part case of {len(item_inputs)} items, {ITEM_CONCURRENCY} processed at a time")
+        if latency_critical:
+            workflow_args = [workflow_args[0], ITEM_CONCURRENCY, True]
+            print("   - Latency-critical: LLM requests are hedged right away")
+
+        start = functools.partial(
+            client.start_workflow,
+            ExampleWorkflow.run,
+            args=workflow_args,
+            id=workflow_id,
+            task_queue=task_queue,
+            memo={"simhash": f"{simhash(text_input):016x}"},
+            # Indexes the case for visibility queries (see workers/search_attributes.py).
+            search_attributes=initial_attributes(),
+        )
+        try:
+            # A running workflow for the same text is joined rather than duplicated;
+            # only a failed one is started again.
+            handle: WorkflowHandle = await start(
+                id_conflict_policy=WorkflowIDConflictPolicy.USE_EXISTING,
+                id_reuse_policy=WorkflowIDReusePolicy.ALLOW_DUPLICATE_FAILED_ONLY,
             )
-
-            print("\n✅ Workflow started successfully!")
-            print(f"   Workflow ID: {handle.id}")
-            print(f"   Run ID: {handle.first_execution_run_id}")
-
-            print("\n⏳ Waiting for workflow to complete...")
-            try:
-                # Use asyncio.wait_for to handle the timeout correctly
-                result = await asyncio.wait_for(handle.result(), timeout=60.0)
-                print("\n🎉 Workflow completed!")
-                print(f"   Result: {result}")
-            except asyncio.TimeoutError:
-                print("\n⚠️  Workflow timed out waiting for result.")
-                print("   Check the Temporal UI for progress.")
-            except Exception as e:
-                print(f"\n❌ Error while waiting for result: {e}")
+            print("\n✅ Workflow started (or joined) successfully!")
+        except WorkflowAlreadyStartedError:
+            handle = client.get_workflow_handle(workflow_id)
+            rerun = await rerun_reason(handle)
+            if rerun is None:
+                print("\n♻️  This text was already processed; reusing the result.")
+            else:
+                handle = await start(id_reuse_policy=WorkflowIDReusePolicy.ALLOW_DUPLICATE)
+                print(f"\n🔁 This text was already processed, but {rerun}; started it again.")
+
+        print(f"   Workflow ID: {handle.id}")
+        print(f"   Run ID: {handle.first_execution_run_id or handle.run_id}")
+
+        print("\n⏳ Waiting for workflow to complete...")
+        try:
+            # Use asyncio.wait_for to handle the timeout correctly
+            result = await asyncio.wait_for(handle.result(), timeout=60.0)
+            print("\n🎉 Workflow completed!")
+            print(f"   Result: {result}")
+        except asyncio.TimeoutError:
+            print("\n⚠️  Workflow timed out waiting for result.")
+            print("   Check the Temporal UI for progress.")
+        except Exception as e:
+            print(f"\n❌ Error while waiting for result: {e}")
 
     except RPCError:
         print("\n❌ RPCError: Could not connect to Temporal service.")
@@ -83,9 +173,14 @@ async def main(text_input: str):
         sys.exit(1)
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: poetry run python cli/start_example.py \"<your text here>\"")
+    args = sys.argv[1:]
+    latency_critical = "--latency-critical" in args
+    args = [arg for arg in args if arg != "--latency-critical"]
+    if not args:
+        print(
+            "Usage: poetry run python cli/start_example.py [--latency-critical] "
+            "\"<your text here>\" [\"<another item>\" ...]"
+        )
         sys.exit(1)
 
-    input_text = sys.argv[1]
-    asyncio.run(main(input_text))
+    asyncio.run(main(args, latency_critical))
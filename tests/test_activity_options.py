@@ -0,0 +1,36 @@
+"""Tests for the activity timeouts and retry policies (`workers/activity_options.py`)."""
+
+from datetime import timedelta
+
+import pytest
+
+from workers import activity_options as options_module
+from workers.activity_options import ActivityOptionsError, activity_options, compile_options
+
+
+def test_options_are_merged_over_the_defaults():
+    compiled = compile_options({
+        "defaults": {"start_to_close": 20, "retry": {"maximum_attempts": 5, "initial_interval": 1}},
+        "activities": {"llm_activity": {"start_to_close": 120, "retry": {"maximum_attempts": 8}}},
+    })
+    llm = compiled["llm_activity"]
+    assert llm["start_to_close_timeout"] == timedelta(seconds=120)
+    assert (llm["retry_policy"].maximum_attempts, llm["retry_policy"].initial_interval) == (8, timedelta(seconds=1))
+    assert compiled["*"]["start_to_close_timeout"] == timedelta(seconds=20)
+
+
+def test_invalid_options_are_rejected():
+    with pytest.raises(ActivityOptionsError, match="positive number"):
+        compile_options({"defaults": {"start_to_close": -1}})
+    with pytest.raises(ActivityOptionsError, match="Unknown"):
+        compile_options({"defaults": {"start_to_close": 1, "retry": {"attempts": 3}}})
+    with pytest.raises(ActivityOptionsError, match="timeout"):
+        compile_options({"defaults": {"heartbeat_timeout": 5}})
+
+
+def test_workflows_never_load_the_file(monkeypatch):
+    # Loading reads a file and imports yaml, which has no place in the sandbox.
+    monkeypatch.setattr(options_module, "_options", None)
+    monkeypatch.setattr(options_module.workflow, "in_workflow", lambda: True)
+    with pytest.raises(ActivityOptionsError, match="not loaded"):
+        activity_options("llm_activity")
@@ -0,0 +1,177 @@
+"""Tests for resuming and bounding the streaming batch starter (`cli/batch_start.py`)."""
+
+import asyncio
+import io
+import json
+import time
+
+import pytest
+
+pytest.importorskip("tracerail")
+pytest.importorskip("dotenv")
+
+from temporalio.common import WorkflowIDReusePolicy  # noqa: E402
+from temporalio.exceptions import WorkflowAlreadyStartedError  # noqa: E402
+
+from cli.batch_start import BatchStarter, load_finished_ids, load_statuses, read_documents  # noqa: E402
+from workers.fingerprint import workflow_id_for  # noqa: E402
+
+
+class FakeHandle:
+    def __init__(self, client, workflow_id: str):
+        self.client = client
+        self.workflow_id = workflow_id
+
+    async def result(self):
+        self.client.waiting += 1
+        self.client.max_waiting = max(self.client.max_waiting, self.client.waiting)
+        try:
+            await asyncio.sleep(self.client.result_delay)
+        finally:
+            self.client.waiting -= 1
+        if self.workflow_id in self.client.failed_cases:
+            return {"status": "FAILED", "reason": "LLM processing failed."}
+        return {"status": "COMPLETED_AUTOMATICALLY"}
+
+
+class FakeClient:
+    """Records start requests and how many were in flight at once."""
+
+    def __init__(self, existing: set[str] = frozenset(), failing: set[str] = frozenset(), result_delay: float = 0.0,
+                 failed_cases: set[str] = frozenset()):
+        self.existing = set(existing)
+        self.failing = set(failing)
+        self.failed_cases = set(failed_cases)
+        self.result_delay = result_delay
+        self.started: list[str] = []
+        self.reuse_policies: dict[str, WorkflowIDReusePolicy] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.waiting = 0
+        self.max_waiting = 0
+
+    async def start_workflow(self, workflow, arg, *, id: str, id_reuse_policy=None, **kwargs):
+        self.reuse_policies[id] = id_reuse_policy
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            if id in self.failing:
+                raise RuntimeError("start request failed")
+            if id in self.existing:
+                raise WorkflowAlreadyStartedError(id, "ExampleWorkflow")
+            self.started.append(id)
+            return FakeHandle(self, id)
+        finally:
+            self.in_flight -= 1
+
+    def get_workflow_handle(self, workflow_id: str):
+        return FakeHandle(self, workflow_id)
+
+
+def run_batch(client: FakeClient, texts: list[str], finished: set[str] = frozenset(),
+              concurrency: int = 4, wait: bool = True, max_waiting: int = 1000,
+              failed: set[str] = frozenset()) -> tuple[BatchStarter, list[dict]]:
+    results = io.StringIO()
+    starter = BatchStarter(client, "queue", results, concurrency=concurrency, wait=wait, result_timeout=5.0,
+                           max_waiting=max_waiting, failed=set(failed))
+    asyncio.run(starter.run(((i, text) for i, text in enumerate(texts, start=1)), set(finished)))
+    return starter, [json.loads(line) for line in results.getvalue().splitlines()]
+
+
+def test_read_documents_skips_invalid_lines(capsys):
+    stream = io.StringIO('{"text": "first"}\n{"text": broken\n\n"second"\n[1, 2]\n{"other": "x"}\n')
+    assert list(read_documents(stream, "jsonl", "text")) == [(1, "first"), (4, "second")]
+    assert "Skipping line 2" in capsys.readouterr().err
+
+
+def test_read_documents_csv():
+    stream = io.StringIO("id,text\n1,first\n2,\n3,third\n")
+    assert list(read_documents(stream, "csv", "text")) == [(2, "first"), (4, "third")]
+
+
+def test_resume_skips_completed_but_retries_failed(tmp_path):
+    results = tmp_path / "results.jsonl"
+    results.write_text(
+        json.dumps({"workflow_id": "a", "status": "COMPLETED"}) + "\n"
+        + json.dumps({"workflow_id": "b", "status": "FAILED"}) + "\n"
+        + json.dumps({"workflow_id": "c", "status": "STARTED"}) + "\n"
+        + '{"workflow_id": "d", "sta',
+        encoding="utf-8",
+    )
+    assert load_finished_ids(results) == {"a"}
+    assert load_finished_ids(tmp_path / "missing.jsonl") == set()
+
+
+def test_last_recorded_status_wins(tmp_path):
+    results = tmp_path / "results.jsonl"
+    results.write_text(
+        json.dumps({"workflow_id": "a", "status": "FAILED"}) + "\n"
+        + json.dumps({"workflow_id": "a", "status": "COMPLETED"}) + "\n"
+        + json.dumps({"workflow_id": "b", "status": "COMPLETED"}) + "\n"
+        + json.dumps({"workflow_id": "b", "status": "FAILED"}) + "\n",
+        encoding="utf-8",
+    )
+    assert load_statuses(results) == {"a": "COMPLETED", "b": "FAILED"}
+    assert load_finished_ids(results) == {"a"}
+
+
+def test_resumed_batch_starts_only_unfinished_documents():
+    texts = ["done", "failed before", "new"]
+    done, failed = workflow_id_for("done"), workflow_id_for("failed before")
+    client = FakeClient()
+    starter, records = run_batch(client, texts, finished={done})
+    assert sorted(client.started) == sorted([failed, workflow_id_for("new")])
+    assert {record["status"] for record in records} == {"COMPLETED"}
+    assert starter.counts["completed"] == 2
+
+
+def test_existing_workflow_result_is_collected():
+    text = "already running"
+    client = FakeClient(existing={workflow_id_for(text)})
+    starter, records = run_batch(client, [text])
+    assert starter.counts["existing"] == 1
+    assert records[0]["status"] == "COMPLETED"
+
+
+def test_failed_start_is_recorded():
+    client = FakeClient(failing={workflow_id_for("bad")})
+    starter, records = run_batch(client, ["bad", "good"])
+    assert {record["status"] for record in records} == {"FAILED", "COMPLETED"}
+    assert starter.counts["failed"] == 1
+
+
+def test_concurrency_bounds_start_requests_not_waiting_workflows():
+    # Results take much longer than starts: with the limit held only during
+    # the start request, all documents start long before the first result.
+    client = FakeClient(result_delay=0.2)
+    texts = [f"document {i}" for i in range(40)]
+    start = time.perf_counter()
+    starter, records = run_batch(client, texts, concurrency=4)
+    assert time.perf_counter() - start < 1.0
+    assert client.max_in_flight <= 4
+    assert starter.counts["completed"] == 40
+    assert len(records) == 40
+
+
+def test_failed_result_is_recorded_as_failed():
+    client = FakeClient(failed_cases={workflow_id_for("bad")})
+    starter, records = run_batch(client, ["bad", "good"])
+    statuses = {record["workflow_id"]: record["status"] for record in records}
+    assert statuses == {workflow_id_for("bad"): "FAILED", workflow_id_for("good"): "COMPLETED"}
+    assert (starter.counts["failed"], starter.counts["completed"]) == (1, 1)
+
+
+def test_previously_failed_documents_may_reuse_a_closed_id():
+    failed = workflow_id_for("failed before")
+    client = FakeClient()
+    run_batch(client, ["failed before", "new"], failed={failed})
+    assert client.reuse_policies[failed] == WorkflowIDReusePolicy.ALLOW_DUPLICATE
+    assert client.reuse_policies[workflow_id_for("new")] == WorkflowIDReusePolicy.ALLOW_DUPLICATE_FAILED_ONLY
+
+
+def test_waiting_for_results_is_bounded():
+    client = FakeClient(result_delay=0.01)
+    starter, records = run_batch(client, [f"document {i}" for i in range(30)], concurrency=2, max_waiting=5)
+    assert client.max_waiting <= 5
+    assert starter.counts["completed"] == 30
@@ -0,0 +1,140 @@
+"""Tests for the LLM provider circuit breakers (`workers/breaker.py`)."""
+
+import asyncio
+
+import pytest
+
+from workers.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def succeed():
+    return "ok"
+
+
+async def fail():
+    raise ConnectionError("provider down")
+
+
+def breaker(clock: Clock, **options) -> CircuitBreaker:
+    settings = {"window": 4, "min_calls": 4, "failure_rate": 0.5, "slow_call_ms": 10_000, "call_timeout": 0,
+                "open_seconds": 30, "half_open_probes": 1, "clock": clock}
+    return CircuitBreaker("test", **{**settings, **options})
+
+
+def run_calls(circuit: CircuitBreaker, *calls) -> list:
+    async def run():
+        results = []
+        for fn in calls:
+            try:
+                results.append(await circuit.call(fn))
+            except Exception as e:
+                results.append(type(e))
+        return results
+
+    return asyncio.run(run())
+
+
+def test_opens_once_the_failure_rate_is_reached():
+    circuit = breaker(Clock())
+    assert run_calls(circuit, fail, succeed, fail) == [ConnectionError, "ok", ConnectionError]
+    assert circuit.state == CLOSED  # Fewer calls than min_calls.
+    assert run_calls(circuit, succeed, succeed) == ["ok", CircuitOpenError]
+    assert circuit.state == OPEN
+    assert circuit.rejected == 1
+
+
+def test_healthy_provider_stays_closed():
+    circuit = breaker(Clock())
+    run_calls(circuit, *[succeed] * 3, fail, *[succeed] * 3, fail)
+    assert circuit.state == CLOSED
+
+
+def test_half_open_probe_closes_or_reopens():
+    clock = Clock()
+    circuit = breaker(clock)
+    run_calls(circuit, *[fail] * 4)
+    assert circuit.retry_after == 30
+
+    clock.now = 30
+    assert circuit.state == HALF_OPEN
+    assert run_calls(circuit, fail) == [ConnectionError]
+    assert circuit.state == OPEN
+
+    clock.now = 60
+    assert run_calls(circuit, succeed, fail) == ["ok", ConnectionError]
+    assert circuit.state == CLOSED
+
+
+def test_half_open_admits_a_limited_number_of_probes():
+    clock = Clock()
+    circuit = breaker(clock)
+    run_calls(circuit, *[fail] * 4)
+    clock.now = 30
+
+    async def run():
+        gate = asyncio.Event()
+
+        async def slow_probe():
+            await gate.wait()
+            return "ok"
+
+        probe = asyncio.create_task(circuit.call(slow_probe))
+        await asyncio.sleep(0)
+        with pytest.raises(CircuitOpenError):
+            await circuit.call(succeed)
+        gate.set()
+        return await probe
+
+    assert asyncio.run(run()) == "ok"
+    assert circuit.state == CLOSED
+
+
+def test_slow_calls_trip_the_breaker():
+    circuit = breaker(Clock(), slow_call_ms=0, slow_call_rate=1.0)
+    run_calls(circuit, *[succeed] * 4)
+    assert circuit.state == OPEN
+
+
+def test_hanging_calls_time_out_as_failures():
+    async def hang():
+        await asyncio.sleep(10)
+
+    circuit = breaker(Clock(), window=2, min_calls=2, call_timeout=0.01)
+    assert run_calls(circuit, hang, hang) == [TimeoutError, TimeoutError]
+    assert circuit.state == OPEN
+
+
+def test_errors_that_are_not_failures_are_ignored():
+    circuit = breaker(Clock(), is_failure=lambda error: not isinstance(error, ValueError))
+
+    async def invalid():
+        raise ValueError("bad request")
+
+    run_calls(circuit, *[invalid] * 4)
+    assert circuit.state == CLOSED
+
+
+def test_cancelled_probe_frees_its_slot():
+    clock = Clock()
+    circuit = breaker(clock)
+    run_calls(circuit, *[fail] * 4)
+    clock.now = 30
+
+    async def run():
+        probe = asyncio.create_task(circuit.call(asyncio.Event().wait))
+        await asyncio.sleep(0)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        return await circuit.call(succeed)
+
+    assert asyncio.run(run()) == "ok"
+    assert circuit.state == CLOSED
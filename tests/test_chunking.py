@@ -0,0 +1,95 @@
+"""Tests for splitting large documents (`workers/chunking.py`) and the blob store behind them."""
+
+import asyncio
+
+import pytest
+from temporalio.testing import ActivityEnvironment
+
+from workers import activities
+from workers.blobstore import BlobNotFoundError, BlobStore, FileBlobStore, SQLiteBlobStore, is_blob_ref, key_of
+from workers.chunking import chunk_text, document_input
+
+
+def count_words(text: str) -> int:
+    return len(text.split())
+
+
+def sentences(count: int, words: int = 5) -> str:
+    return " ".join(f"Sentence {i} has {'word ' * (words - 4)}end." for i in range(count))
+
+
+def test_small_document_is_one_chunk():
+    chunks = chunk_text("One paragraph.\n\nAnother one.", max_tokens=50, count_tokens=count_words)
+    assert [chunk.text for chunk in chunks] == ["One paragraph.\n\nAnother one."]
+    assert chunks[0].tokens == 4
+
+
+def test_chunks_respect_the_budget_and_overlap():
+    text = sentences(40)
+    chunks = chunk_text(text, max_tokens=20, overlap_tokens=5, count_tokens=count_words)
+    assert len(chunks) > 1
+    assert all(chunk.tokens <= 20 for chunk in chunks)
+    for previous, chunk in zip(chunks, chunks[1:]):
+        # Each chunk starts with the last sentence of the previous one.
+        last_sentence = previous.text.rsplit("Sentence ", 1)[1]
+        assert chunk.text.startswith(f"Sentence {last_sentence}")
+    assert chunks[-1].text.endswith("Sentence 39 has word end.")
+
+
+def test_paragraphs_are_kept_whole_when_they_fit():
+    paragraphs = [sentences(3) for _ in range(4)]
+    chunks = chunk_text("\n\n".join(paragraphs), max_tokens=15, overlap_tokens=0, count_tokens=count_words)
+    assert [chunk.text for chunk in chunks] == paragraphs
+
+
+def test_oversized_sentence_is_cut_between_words():
+    sentence = " ".join(f"w{i}" for i in range(50)) + "."
+    chunks = chunk_text(sentence, max_tokens=20, overlap_tokens=0, count_tokens=count_words)
+    assert all(chunk.tokens <= 20 for chunk in chunks)
+    assert " ".join(chunk.text for chunk in chunks) == sentence
+
+
+def test_invalid_budget():
+    with pytest.raises(ValueError):
+        chunk_text("text", max_tokens=0)
+
+
+def test_document_input_offloads_large_documents(tmp_path):
+    store = FileBlobStore(tmp_path)
+    assert document_input("short", threshold=10, store=store) == "short"
+    ref = document_input("x" * 11, threshold=10, store=store)
+    assert is_blob_ref(ref)
+    assert store.get_text(key_of(ref)) == "x" * 11
+
+
+@pytest.mark.parametrize("backend", ["filesystem", "sqlite"])
+def test_blob_store_round_trip(tmp_path, backend):
+    store = FileBlobStore(tmp_path) if backend == "filesystem" else SQLiteBlobStore(tmp_path / "blobs.sqlite3")
+    key = store.put_text("héllo")
+    assert store.put(b"h\xc3\xa9llo") == key
+    assert store.exists(key)
+    assert store.get_text(key) == "héllo"
+    with store.view(key) as view:
+        assert bytes(view) == "héllo".encode()
+    assert store.sweep(older_than=0) == (0, 0)
+    with pytest.raises(BlobNotFoundError):
+        store.get("0" * 64)
+    store.close()
+
+
+def test_blob_store_is_abstract():
+    with pytest.raises(TypeError):
+        BlobStore()
+
+
+def test_chunk_document_activity_stores_chunks(tmp_path, monkeypatch):
+    store = FileBlobStore(tmp_path)
+    monkeypatch.setattr(activities, "get_blob_store", lambda: store)
+    document = "\n\n".join(sentences(200, words=10) for _ in range(3))
+    ref = document_input(document, threshold=100, store=store)
+
+    chunks = asyncio.run(ActivityEnvironment().run(activities.chunk_document_activity, ref))
+    assert len(chunks) > 1
+    texts = [store.get_text(key_of(chunk["ref"])) for chunk in chunks]
+    assert texts[0].startswith("Sentence 0 has")
+    assert texts[-1].endswith(document[-60:])
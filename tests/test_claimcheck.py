@@ -0,0 +1,61 @@
+"""Tests for the claim-check payload codec (`workers/claimcheck.py`)."""
+
+import asyncio
+import dataclasses
+
+import pytest
+from temporalio.converter import DataConverter
+
+from workers.blobstore import FileBlobStore, SQLiteBlobStore
+from workers.claimcheck import ENCODING, KEY_METADATA, ClaimCheckCodec
+
+
+@pytest.fixture(params=["filesystem", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "filesystem":
+        # A zero threshold memory-maps every blob when it is read.
+        store = FileBlobStore(tmp_path, mmap_threshold=0)
+    else:
+        store = SQLiteBlobStore(tmp_path / "blobs.sqlite3")
+    yield store
+    store.close()
+
+
+def converter(codec: ClaimCheckCodec) -> DataConverter:
+    return dataclasses.replace(DataConverter.default, payload_codec=codec)
+
+
+def test_round_trip_offloads_only_large_payloads(store):
+    codec = ClaimCheckCodec(store, threshold=1024)
+    values = ["small", {"document": "x" * 5000, "pages": list(range(100))}, None]
+
+    async def run():
+        payloads = await converter(codec).encode(values)
+        return payloads, await converter(codec).decode(payloads)
+
+    payloads, decoded = asyncio.run(run())
+    assert decoded == values
+    assert [payload.metadata.get("encoding") == ENCODING for payload in payloads] == [False, True, False]
+    assert payloads[1].data == b""
+    assert store.exists(payloads[1].metadata[KEY_METADATA].decode())
+
+
+def test_identical_payloads_share_a_blob(store):
+    codec = ClaimCheckCodec(store, threshold=10)
+
+    async def run():
+        return await converter(codec).encode(["y" * 100, "y" * 100])
+
+    first, second = asyncio.run(run())
+    assert first.metadata[KEY_METADATA] == second.metadata[KEY_METADATA]
+
+
+def test_zero_threshold_still_resolves_references(store):
+    async def run():
+        payloads = await converter(ClaimCheckCodec(store, threshold=10)).encode(["z" * 100])
+        disabled = ClaimCheckCodec(store, threshold=0)
+        return await converter(disabled).encode(["z" * 100]), await converter(disabled).decode(payloads)
+
+    encoded, decoded = asyncio.run(run())
+    assert encoded[0].metadata["encoding"] != ENCODING
+    assert decoded == ["z" * 100]
@@ -0,0 +1,78 @@
+"""Tests for bulk result collection (`cli/collect_results.py`)."""
+
+import asyncio
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("tracerail")
+pytest.importorskip("dotenv")
+
+from temporalio.client import WorkflowExecutionStatus  # noqa: E402
+
+from cli.collect_results import ResultCollector, closed_since_query  # noqa: E402
+
+SINCE = datetime(2024, 6, 1, tzinfo=timezone.utc)
+
+
+class FakeExecution:
+    def __init__(self, number: int):
+        self.id = f"case-{number}"
+        self.run_id = "run"
+        self.status = WorkflowExecutionStatus.COMPLETED
+        self.close_time = SINCE + timedelta(seconds=number)
+
+
+class FakeHandle:
+    def __init__(self, workflow_id: str):
+        self.workflow_id = workflow_id
+
+    async def result(self, follow_runs: bool = True):
+        return {"status": "COMPLETED_AUTOMATICALLY", "id": self.workflow_id}
+
+
+class FakeClient:
+    def __init__(self, count: int):
+        self.count = count
+
+    async def list_workflows(self, query: str, page_size: int):
+        for number in range(self.count):
+            yield FakeExecution(number)
+
+    def get_workflow_handle(self, workflow_id: str, run_id: str | None = None):
+        return FakeHandle(workflow_id)
+
+
+class BrokenSink(io.StringIO):
+    def write(self, text: str) -> int:
+        raise OSError("disk full")
+
+
+def test_query_selects_closed_runs_of_the_type():
+    query = closed_since_query(SINCE)
+    assert "WorkflowType = 'ExampleWorkflow'" in query
+    assert "CloseTime >= '2024-06-01T00:00:00.000000Z'" in query
+
+
+def test_results_are_written_once_across_polls():
+    collector = ResultCollector(FakeClient(50), concurrency=4, queue_size=8)
+    sink = io.StringIO()
+    assert asyncio.run(collector.collect(SINCE, sink)) == 50
+    assert asyncio.run(collector.collect(SINCE, sink)) == 0
+    records = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert sorted(record["workflow_id"] for record in records) == sorted(f"case-{n}" for n in range(50))
+    assert collector.watermark == SINCE + timedelta(seconds=49)
+
+
+def test_failing_sink_stops_the_fetchers():
+    # With small queues, fetchers and the listing block once the writer is
+    # gone; they must be cancelled rather than hang.
+    collector = ResultCollector(FakeClient(500), concurrency=4, queue_size=2)
+
+    async def collect():
+        return await asyncio.wait_for(collector.collect(SINCE, BrokenSink()), timeout=5.0)
+
+    with pytest.raises(OSError, match="disk full"):
+        asyncio.run(collect())
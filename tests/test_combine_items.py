@@ -0,0 +1,62 @@
+"""Tests for combining the items of a multi-part case (`combine_items_activity` in `workers/activities.py`)."""
+
+import asyncio
+
+import pytest
+from temporalio.testing import ActivityEnvironment
+
+from workers import activities
+
+
+def item_result(answer: str, confidence: float | None, tokens: int, decision: str = "automatic",
+                hedged: bool = False) -> dict:
+    metadata = {"confidence": confidence} if confidence is not None else {}
+    return {
+        "answer": answer,
+        "provider": "deepseek",
+        "hedged": hedged,
+        "llm_response": {
+            "content": answer,
+            "metadata": metadata,
+            "usage": {"prompt_tokens": tokens, "completion_tokens": 1, "total_tokens": tokens + 1, "model": "m"},
+        },
+        "routing_decision": {"decision": decision},
+    }
+
+
+def combine(item_results: list[dict]) -> dict:
+    return asyncio.run(ActivityEnvironment().run(activities.combine_items_activity, item_results))
+
+
+def test_answers_are_kept_apart_in_item_order():
+    combined = combine([item_result("first", 0.9, 10), item_result("second", 0.8, 20)])
+    assert combined["answer"] == "Item 1:\nfirst\n\nItem 2:\nsecond"
+    assert combined["llm_response"]["content"] == combined["answer"]
+    assert combined["item_answers"] == ["first", "second"]
+    assert combined["items"] == 2
+
+
+def test_lowest_confidence_and_summed_usage():
+    combined = combine([item_result("a", 0.9, 10), item_result("b", 0.4, 20), item_result("c", None, 30)])
+    assert combined["llm_response"]["metadata"]["confidence"] == 0.4
+    assert combined["llm_response"]["usage"] == {
+        "prompt_tokens": 60, "completion_tokens": 3, "total_tokens": 63, "model": "m",
+    }
+
+
+def test_one_human_item_routes_the_case_to_a_human():
+    combined = combine([item_result("a", 0.9, 1), item_result("b", 0.9, 1, decision="human", hedged=True)])
+    assert combined["routing_decision"] == {"decision": "human"}
+    assert combined["hedged"] is True
+
+
+def test_item_results_are_not_modified():
+    items = [item_result("a", 0.9, 1), item_result("b", 0.5, 1)]
+    combine(items)
+    assert items[0]["llm_response"]["metadata"] == {"confidence": 0.9}
+    assert items[0]["llm_response"]["content"] == "a"
+
+
+def test_no_items():
+    with pytest.raises(ValueError, match="at least one"):
+        combine([])
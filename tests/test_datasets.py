@@ -0,0 +1,92 @@
+"""Tests for reading batch datasets a page at a time (`workers/datasets.py`)."""
+
+import asyncio
+import json
+
+import pytest
+from temporalio.testing import ActivityEnvironment
+
+from workers import activities
+from workers.blobstore import FileBlobStore, blob_ref
+from workers.datasets import DatasetError, read_page
+from workers.fingerprint import workflow_id_for
+
+
+def read_all(dataset: str, limit: int, **kwargs) -> tuple[list[str], int]:
+    """Reads a dataset page by page, resuming from each `next_cursor`."""
+    texts, cursor, pages = [], 0, 0
+    while cursor is not None:
+        page = read_page(dataset, cursor, limit, **kwargs)
+        texts += [text for _, text in page.records]
+        cursor = page.next_cursor
+        pages += 1
+    return texts, pages
+
+
+def test_jsonl_pages_resume_from_the_cursor(tmp_path):
+    path = tmp_path / "docs.jsonl"
+    records = [{"text": f"document {i}"} for i in range(7)] + ["plain string", {"other": "no text"}, {"text": "last"}]
+    path.write_text("\n".join(json.dumps(record) for record in records) + "\n\n", encoding="utf-8")
+
+    first = read_page(str(path), 0, 3)
+    assert [text for _, text in first.records] == ["document 0", "document 1", "document 2"]
+    second = read_page(str(path), first.next_cursor, 3)
+    assert [text for _, text in second.records] == ["document 3", "document 4", "document 5"]
+
+    texts, _ = read_all(str(path), 3)
+    assert texts == [f"document {i}" for i in range(7)] + ["plain string", "last"]
+
+
+def test_offsets_point_at_their_records(tmp_path):
+    path = tmp_path / "docs.jsonl"
+    path.write_text('{"text": "é first"}\n{"text": "second"}\n', encoding="utf-8")
+    page = read_page(str(path), 0, 10)
+    offsets = [offset for offset, _ in page.records]
+    assert offsets == [0, len('{"text": "é first"}\n'.encode("utf-8"))]
+    assert read_page(str(path), offsets[1], 10).records == [(offsets[1], "second")]
+    assert page.next_cursor is None
+
+
+def test_csv_cursor_skips_the_header_and_keeps_multi_line_fields(tmp_path):
+    path = tmp_path / "docs.csv"
+    path.write_text(
+        'id,text\n1,first\n2,"spans\nthree\nlines"\n3,\n4,"with ""quotes"", and a comma"\n5,last\n',
+        encoding="utf-8",
+    )
+    first = read_page(str(path), 0, 2)
+    assert [text for _, text in first.records] == ["first", "spans\nthree\nlines"]
+
+    # Resuming mid-file starts at the next record, not inside the quoted field.
+    rest = read_page(str(path), first.next_cursor, 10)
+    assert [text for _, text in rest.records] == ['with "quotes", and a comma', "last"]
+    assert rest.next_cursor is None
+
+    texts, pages = read_all(str(path), 1)
+    assert texts == ["first", "spans\nthree\nlines", 'with "quotes", and a comma', "last"]
+    assert pages == 4
+
+
+def test_empty_and_invalid_datasets(tmp_path):
+    empty = tmp_path / "empty.csv"
+    empty.write_text("", encoding="utf-8")
+    assert read_page(str(empty)).records == []
+
+    broken = tmp_path / "broken.jsonl"
+    broken.write_text('{"text": "ok"}\n{"text": \n', encoding="utf-8")
+    with pytest.raises(DatasetError, match="offset 15"):
+        read_page(str(broken))
+    with pytest.raises(DatasetError, match="Cannot open"):
+        read_page(str(tmp_path / "missing.jsonl"))
+    with pytest.raises(DatasetError, match="format"):
+        read_page(str(broken), fmt="xml")
+
+
+def test_read_dataset_page_activity_from_a_blob(tmp_path, monkeypatch):
+    store = FileBlobStore(tmp_path / "blobs")
+    monkeypatch.setattr("workers.datasets.get_blob_store", lambda: store)
+    ref = blob_ref(store.put(b'{"text": "first"}\n{"text": "second"}\n'))
+
+    page = asyncio.run(ActivityEnvironment().run(activities.read_dataset_page_activity, ref, 0, 1))
+    assert [item["workflow_id"] for item in page["items"]] == [workflow_id_for("first")]
+    assert page["items"][0]["input"] == "first"
+    assert page["next_cursor"] == len(b'{"text": "first"}\n')
@@ -0,0 +1,115 @@
+"""Tests for the local DMN evaluator (`workers/decision_tables.py`)."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from workers import decision_tables
+from workers.decision_tables import DecisionTableError, compile_input_entry, load_table, parse_dmn
+
+DMN = Path(__file__).parent.parent / "dmn"
+
+
+def test_unary_tests():
+    cases = [
+        ("< 0.6", 0.5, True), ("< 0.6", 0.6, False), ("< 0.6", None, False),
+        ("[1..5]", 5, True), ("(1..5]", 1, False), ('"a","b"', "b", True), ('"a","b"', "c", False),
+        ('not("a")', "b", True), ('not("a")', "a", False), ("true", True, True),
+    ]
+    for text, value, expected in cases:
+        predicate, _ = compile_input_entry(text)
+        assert predicate(value, {}) is expected, text
+    assert compile_input_entry("-") == (None, set())
+
+
+def test_unsupported_syntax():
+    with pytest.raises(DecisionTableError):
+        compile_input_entry("matches(content, \"x\")")
+    with pytest.raises(DecisionTableError):
+        parse_dmn("<definitions")
+
+
+def test_routing_table():
+    table = load_table(DMN / "routing.dmn", "routingDecision")
+    assert table.evaluate({"confidence": 0.4, "content": "All fine"}).output == {"routingAction": "human"}
+    assert table.evaluate({"confidence": 0.9, "content": "An URGENT request"}).matched_rules == ["rule2"]
+    assert table.evaluate({"confidence": 0.9, "content": "All fine"}).output == {"routingAction": "automatic"}
+
+
+def test_post_rules_table():
+    table = load_table(DMN / "post-rules.dmn")
+    context = {"guardrailsPassed": True, "confidence": 0.9, "piiCount": 0, "answerLength": 200}
+    assert table.evaluate(context).output["postAction"] == "approve"
+    assert table.evaluate({**context, "guardrailsPassed": False}).matched_rules == ["guardrails-failed"]
+    assert table.evaluate({**context, "answerLength": 5}).matched_rules == ["too-short"]
+
+
+def test_reevaluate_only_rules_reading_the_changed_field():
+    table = load_table(DMN / "post-rules.dmn")
+    context = {"guardrailsPassed": True, "confidence": 0.9, "piiCount": 0, "answerLength": 200}
+    previous = table.evaluate(context)
+
+    changed = {**context, "piiCount": 2}
+    result = table.reevaluate(previous.to_dict(), changed, {"piiCount"})
+    assert result.evaluated_rules == 1
+    assert result.matched_rules == ["pii-redacted"]
+    assert result.matches == table.evaluate(changed).matches
+
+
+def test_reevaluate_other_version_evaluates_everything():
+    table = load_table(DMN / "routing.dmn")
+    previous = table.evaluate({"confidence": 0.9, "content": "All fine"}).to_dict()
+    previous["version"] = "older"
+    result = table.reevaluate(previous, {"confidence": 0.3, "content": "All fine"}, {"content"})
+    assert result.evaluated_rules == len(table.rules)
+    assert result.matched_rules == ["rule1"]
+
+
+def priority_dmn(hit_policy: str, output_values: str | None = '"reject","review","approve"') -> str:
+    allowed = f"<outputValues><text>{output_values}</text></outputValues>" if output_values else ""
+    rules = "".join(
+        f'<rule id="{rule_id}"><inputEntry><text>{test}</text></inputEntry>'
+        f'<outputEntry><text>"{action}"</text></outputEntry></rule>'
+        for rule_id, test, action in [
+            ("low", "&lt; 0.9", "review"), ("any", "-", "approve"), ("very-low", "&lt; 0.3", "reject"),
+        ]
+    )
+    return (
+        '<definitions xmlns="https://www.omg.org/spec/DMN/20191111/MODEL/">'
+        f'<decision id="action"><decisionTable hitPolicy="{hit_policy}">'
+        '<input><inputExpression><text>confidence</text></inputExpression></input>'
+        f'<output name="action">{allowed}</output>{rules}'
+        "</decisionTable></decision></definitions>"
+    )
+
+
+def test_priority_hit_policy_ranks_by_output_values():
+    table = parse_dmn(priority_dmn("PRIORITY"))["action"]
+    assert table.evaluate({"confidence": 0.95}).matched_rules == ["any"]
+    assert table.evaluate({"confidence": 0.5}).matched_rules == ["low"]
+    assert table.evaluate({"confidence": 0.1}).output == {"action": "reject"}
+
+
+def test_output_order_hit_policy_sorts_all_matches():
+    table = parse_dmn(priority_dmn("OUTPUT ORDER"))["action"]
+    assert table.evaluate({"confidence": 0.1}).matched_rules == ["very-low", "low", "any"]
+
+
+def test_priority_hit_policy_needs_output_values():
+    with pytest.raises(DecisionTableError, match="outputValues"):
+        parse_dmn(priority_dmn("PRIORITY", output_values=None))
+    with pytest.raises(DecisionTableError, match="not an allowed value"):
+        parse_dmn(priority_dmn("PRIORITY", output_values='"reject","approve"'))
+
+
+def test_changed_file_replaces_its_cached_tables(tmp_path):
+    path = tmp_path / "action.dmn"
+    path.write_text(priority_dmn("PRIORITY"), encoding="utf-8")
+    first = load_table(path)
+    assert load_table(path) is first
+
+    path.write_text(priority_dmn("OUTPUT ORDER"), encoding="utf-8")
+    os.utime(path, (1, 1))
+    assert load_table(path).hit_policy == "OUTPUT ORDER"
+    assert decision_tables._tables[str(path)][0] == 1
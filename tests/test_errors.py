@@ -0,0 +1,93 @@
+"""Tests for provider error classification (`workers/errors.py`)."""
+
+import random
+from types import SimpleNamespace
+
+from temporalio.exceptions import ApplicationError
+
+from workers.activity_options import rate_limit_backoff
+from workers.breaker import CircuitOpenError
+from workers.errors import (
+    CIRCUIT_OPEN,
+    RATE_LIMIT,
+    VALIDATION,
+    as_application_error,
+    classify,
+    rate_limit_delay,
+    retry_after,
+    status_code,
+)
+from workers.fakes import FakeRateLimitError, FakeValidationError
+
+
+class ProviderError(Exception):
+    def __init__(self, message: str = "provider error", status: int | None = None, headers: dict | None = None):
+        super().__init__(message)
+        self.response = SimpleNamespace(status_code=status, headers=headers or {})
+
+
+class BadRequestError(Exception):
+    pass
+
+
+def test_status_code_from_the_error_or_its_response():
+    assert status_code(FakeRateLimitError()) == 429
+    assert status_code(ProviderError(status=413)) == 413
+    assert status_code(RuntimeError("boom")) is None
+
+
+def test_classify_by_status_name_and_message():
+    assert classify(FakeRateLimitError()) == RATE_LIMIT
+    assert classify(ProviderError("Too Many Requests")) == RATE_LIMIT
+    assert classify(FakeValidationError()) == VALIDATION
+    assert classify(ProviderError(status=422)) == VALIDATION
+    assert classify(BadRequestError("prompt too long")) == VALIDATION
+    assert classify(CircuitOpenError("openai", 5.0)) == CIRCUIT_OPEN
+    assert classify(ProviderError(status=500)) is None
+    assert classify(TimeoutError()) is None
+
+
+def test_classify_follows_the_cause_chain():
+    try:
+        try:
+            raise FakeRateLimitError("throttled")
+        except FakeRateLimitError as e:
+            raise RuntimeError("LLM request failed") from e
+    except RuntimeError as e:
+        assert classify(e) == RATE_LIMIT
+
+
+def test_retry_after_hint():
+    assert retry_after(ProviderError(headers={"retry-after": "12"})) == 12.0
+    assert retry_after(ProviderError(headers={"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"})) is None
+    assert retry_after(RuntimeError()) is None
+
+
+def test_rate_limit_delay_is_long_jittered_and_capped():
+    initial, maximum = rate_limit_backoff()
+    rng = random.Random(7)
+    for attempt in (1, 2, 3, 30):
+        ceiling = min(maximum, initial * 2 ** (attempt - 1))
+        delay = rate_limit_delay(attempt, rng=rng)
+        assert ceiling / 2 <= delay <= ceiling
+    assert rate_limit_delay(1, hint=maximum * 2) == maximum * 2
+
+
+def test_application_errors_carry_the_retry_decision():
+    rate_limited = as_application_error(ProviderError("rate limit", headers={"retry-after": "1000"}), attempt=1)
+    assert isinstance(rate_limited, ApplicationError) and rate_limited.type == RATE_LIMIT
+    assert rate_limited.next_retry_delay.total_seconds() == 1000
+
+    rejected = as_application_error(FakeValidationError("bad prompt"), attempt=1)
+    assert (rejected.type, rejected.non_retryable) == (VALIDATION, True)
+
+    circuit = as_application_error(CircuitOpenError("openai", 5.0), attempt=1)
+    assert circuit.type == CIRCUIT_OPEN
+    assert 5.0 <= circuit.next_retry_delay.total_seconds() <= 6.0
+
+
+def test_other_errors_are_left_alone():
+    error = RuntimeError("boom")
+    assert as_application_error(error, attempt=1) is error
+    application_error = ApplicationError("already classified", type="Other")
+    assert as_application_error(application_error) is application_error
@@ -0,0 +1,93 @@
+"""Tests for the tiered guardrail validators (`workers/guardrails.py`)."""
+
+import asyncio
+import os
+from dataclasses import dataclass
+
+from workers import guardrails
+from workers.guardrails import COST_MODEL, CompiledGuard, LengthValidator, compile_guard, load_guard
+
+
+@dataclass
+class CountingValidator:
+    """A stand-in for a model-based validator that records what it checked."""
+
+    name: str
+    passes: bool = True
+    hard: bool = True
+    cost: int = COST_MODEL
+
+    def __post_init__(self):
+        self.checked: list[str] = []
+
+    def check(self, text: str) -> tuple[bool, str]:
+        self.checked.append(text)
+        return self.passes, "" if self.passes else "rejected by the model"
+
+
+REGEX_SPECS = [
+    {"name": "no-secrets", "type": "regex", "pattern": r"password\s*[:=]"},
+    {"name": "short", "type": "length", "max_chars": 40},
+]
+
+
+def test_validators_run_cheapest_first():
+    model = CountingValidator("model")
+    guard = CompiledGuard([model, LengthValidator("length", max_chars=10)], "spec")
+    assert [validator.name for validator in guard.validators] == ["length", "model"]
+
+
+def test_hard_failure_skips_the_expensive_tiers():
+    model = CountingValidator("model")
+    guard = CompiledGuard([model, LengthValidator("length", max_chars=10)], "spec")
+    results = asyncio.run(guard.validate_many(["fine", "far too long for the limit"]))
+    assert [result.passed for result in results] == [True, False]
+    assert results[1].failures[0].name == "length"
+    assert model.checked == ["fine"]
+
+
+def test_soft_failure_is_reported_but_does_not_block():
+    model = CountingValidator("model")
+    guard = CompiledGuard([model, LengthValidator("length", max_chars=10, hard=False)], "spec")
+    result = asyncio.run(guard.validate("far too long for the limit"))
+    assert result.passed
+    assert [(failure.name, failure.hard) for failure in result.failures] == [("length", False)]
+    assert model.checked == ["far too long for the limit"]
+
+
+def test_compiled_regex_specs():
+    guard = compile_guard(REGEX_SPECS)
+    results = asyncio.run(guard.validate_many(["all good", "the password: hunter2", "x" * 41]))
+    assert [[failure.name for failure in result.failures] for result in results] == [[], ["no-secrets"], ["short"]]
+
+
+def test_identical_specs_share_one_compiled_guard():
+    specs = [dict(spec) for spec in REGEX_SPECS]
+    assert compile_guard(specs) is compile_guard([dict(spec) for spec in REGEX_SPECS])
+    disabled = [*specs, {"name": "off", "type": "unknown", "is_enabled": False}]
+    assert compile_guard(disabled) is compile_guard(specs)
+    assert compile_guard(specs[:1]) is not compile_guard(specs)
+
+
+def test_guard_file_is_only_reloaded_when_it_changes(tmp_path, monkeypatch):
+    path = tmp_path / "guardrails.yaml"
+    path.write_text("- {name: short, type: length, max_chars: 5}\n", encoding="utf-8")
+    first = load_guard(path)
+    assert load_guard(path) is first
+
+    loads = []
+    safe_load = guardrails.yaml.safe_load
+    monkeypatch.setattr(guardrails.yaml, "safe_load", lambda text: loads.append(text) or safe_load(text))
+    assert load_guard(path) is first
+    assert loads == []
+
+    path.write_text("- {name: short, type: length, max_chars: 50}\n", encoding="utf-8")
+    os.utime(path, (1, 1))
+    second = load_guard(path)
+    assert len(loads) == 1
+    assert second is not first
+    assert asyncio.run(second.validate("123456")).passed
+
+
+def test_missing_file_has_no_validators(tmp_path):
+    assert load_guard(tmp_path / "missing.yaml").validators == []
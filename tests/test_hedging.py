@@ -0,0 +1,111 @@
+"""Tests for hedged LLM requests (`workers/providers.py`)."""
+
+import asyncio
+import time
+
+from workers.providers import HedgeBudget, hedged_call
+
+
+def answer(value: str, seconds: float = 0.0):
+    async def call() -> str:
+        await asyncio.sleep(seconds)
+        return value
+    return call
+
+
+def fail(seconds: float = 0.0):
+    async def call() -> str:
+        await asyncio.sleep(seconds)
+        raise RuntimeError("provider down")
+    return call
+
+
+def test_fast_primary_is_not_hedged():
+    budget = HedgeBudget(max_ratio=1.0)
+    outcome = asyncio.run(hedged_call(answer("primary"), answer("secondary"), delay=0.5, budget=budget))
+    assert (outcome.result, outcome.winner, outcome.hedged) == ("primary", "primary", False)
+    assert budget.hedges == 0
+
+
+def test_slow_primary_is_hedged():
+    outcome = asyncio.run(hedged_call(answer("primary", 1.0), answer("secondary"), delay=0.01))
+    assert (outcome.result, outcome.winner, outcome.hedged) == ("secondary", "secondary", True)
+
+
+def test_failed_primary_hedges_at_once():
+    start = time.perf_counter()
+    outcome = asyncio.run(hedged_call(fail(), answer("secondary"), delay=5.0))
+    assert outcome.winner == "secondary"
+    assert time.perf_counter() - start < 1.0
+
+
+def test_invalid_result_loses():
+    outcome = asyncio.run(hedged_call(
+        answer(""), answer("secondary", 0.01), delay=5.0, is_valid=lambda result: bool(result),
+    ))
+    assert outcome.result == "secondary"
+
+
+def test_both_failing_raises_last_error():
+    try:
+        asyncio.run(hedged_call(fail(), fail(0.01), delay=0.0))
+    except RuntimeError as e:
+        assert "provider down" in str(e)
+    else:
+        raise AssertionError("hedged_call should have raised")
+
+
+def test_budget_bounds_hedges():
+    budget = HedgeBudget(max_ratio=0.1, burst=1.0)
+
+    async def run() -> list:
+        return [await hedged_call(answer("primary", 0.02), answer("secondary"), delay=0.0, budget=budget)
+                for _ in range(30)]
+
+    outcomes = asyncio.run(run())
+    assert sum(outcome.hedged for outcome in outcomes) == budget.hedges
+    assert budget.hedges <= 1 + 0.1 * 30
+
+
+def test_refused_hedge_waits_without_polling(monkeypatch):
+    # With an exhausted budget the hedge is refused at the deadline; the rest
+    # of the wait must block on the primary instead of polling with timeout=0.
+    budget = HedgeBudget(max_ratio=0.0, burst=0.0)
+    waits = 0
+    wait = asyncio.wait
+
+    async def counting_wait(*args, **kwargs):
+        nonlocal waits
+        waits += 1
+        return await wait(*args, **kwargs)
+
+    monkeypatch.setattr(asyncio, "wait", counting_wait)
+    cpu_start = time.process_time()
+    outcome = asyncio.run(hedged_call(answer("primary", 0.3), answer("secondary"), delay=0.01, budget=budget))
+    cpu = time.process_time() - cpu_start
+
+    assert (outcome.winner, outcome.hedged) == ("primary", False)
+    assert waits <= 3
+    assert cpu < 0.2
+
+
+def test_loser_is_awaited_after_cancel():
+    cleaned_up = []
+
+    async def slow_primary() -> str:
+        try:
+            await asyncio.sleep(5.0)
+        finally:
+            await asyncio.sleep(0)
+            cleaned_up.append("primary")
+        return "primary"
+
+    async def run():
+        outcome = await hedged_call(slow_primary, answer("secondary"), delay=0.0)
+        others = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        return outcome, others
+
+    outcome, others = asyncio.run(run())
+    assert outcome.winner == "secondary"
+    assert cleaned_up == ["primary"]
+    assert others == []
@@ -0,0 +1,58 @@
+"""Tests for the single-pass PII scanner (`workers/pii.py`)."""
+
+from workers.pii import count_by_kind, iban_valid, luhn_valid, redact, redact_buffer, scan
+
+
+def test_luhn():
+    assert luhn_valid("4111111111111111")
+    assert luhn_valid("5500005555555559")
+    assert not luhn_valid("4111111111111112")
+    assert not luhn_valid("1234567812345678")
+
+
+def test_iban():
+    assert iban_valid("GB82WEST12345698765432")
+    assert iban_valid("DE89 3704 0044 0532 0130 00")
+    assert not iban_valid("GB82WEST12345698765433")
+    assert not iban_valid("DE00 3704 0044 0532 0130 00")
+
+
+def test_redact_replaces_each_kind():
+    text = ("Mail jane.doe@example.com or call +44 20 7946 0958. Card 4111 1111 1111 1111, "
+            "IBAN GB82 WEST 1234 5698 7654 32.")
+    redacted, matches = redact(text)
+    assert redacted == "Mail [EMAIL] or call [PHONE]. Card [CARD], IBAN [IBAN]."
+    assert count_by_kind(matches) == {"email": 1, "phone": 1, "card": 1, "iban": 1}
+
+
+def test_checksums_keep_other_numbers():
+    # Fails Luhn and is too long for a phone; the IBAN fails mod-97; dates are too short.
+    text = "Order 1234567812345678 shipped on 2024-06-01, ref GB82WEST12345698765433."
+    assert scan(text) == []
+
+
+def test_text_without_pii_is_returned_as_is():
+    text = "Nothing to see here."
+    redacted, matches = redact(text)
+    assert redacted is text
+    assert matches == []
+
+
+def test_redact_buffer_masks_in_place():
+    buffer = bytearray("Card: 4111-1111-1111-1111 (ok)".encode())
+    matches = redact_buffer(buffer)
+    assert [match.kind for match in matches] == ["card"]
+    assert buffer == b"Card: ******************* (ok)"
+
+
+def test_spaced_iban_followed_by_digits():
+    # The IBAN pattern also takes the next group of four characters.
+    assert redact("IBAN BE68 5390 0754 7034 2024 paid")[0] == "IBAN [IBAN] 2024 paid"
+    assert redact("IBAN DE89 3704 0044 0532 0130 00 1234 paid")[0] == "IBAN [IBAN] 1234 paid"
+
+
+def test_iso_date_and_time_is_not_a_phone():
+    text = "Order 2024-06-01 12:30"
+    redacted, matches = redact(text)
+    assert redacted is text and matches == []
+    assert redact("Shipped 2024-06-01 12:30, call 020 7946 0958")[0] == "Shipped 2024-06-01 12:30, call [PHONE]"
@@ -0,0 +1,69 @@
+"""Tests for prompt templates and the prefix cache (`workers/prompts.py`)."""
+
+import os
+
+from workers.prompts import PromptCache, PromptTemplate, load_template
+
+
+class CountingCache(PromptCache):
+    def __init__(self):
+        super().__init__()
+        self.counted: list[str] = []
+
+    def count_tokens(self, text: str) -> int:
+        self.counted.append(text)
+        return len(text.split())
+
+
+def test_assemble_prepends_the_prefix():
+    cache = CountingCache()
+    template = PromptTemplate(version="v1", system="Be brief.", rule_context=("r1: first",))
+    prompt = cache.assemble(template, "case text")
+    assert prompt.text == template.render_prefix() + "case text"
+    assert prompt.text.startswith("Be brief.\n\nRouting rules:\n- r1: first")
+
+
+def test_content_is_only_tokenized_when_read():
+    cache = CountingCache()
+    template = PromptTemplate(version="v1", system="Be brief.")
+    prompt = cache.assemble(template, "one two three")
+    assert cache.counted == [template.render_prefix()]
+    assert prompt.content_tokens == 3
+    assert prompt.prompt_tokens == prompt.prefix_tokens + 3
+    assert cache.counted[1:] == ["one two three"]
+
+
+def test_prefix_is_cached_by_content_not_version():
+    cache = CountingCache()
+    old = PromptTemplate(version="v1", system="Answer in English.")
+    new = PromptTemplate(version="v1", system="Answer in French.")
+    cache.assemble(old, "a")
+    cache.assemble(old, "b")
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.assemble(new, "c").text.startswith("Answer in French.")
+    assert cache.misses == 2
+
+
+def write(path, text: str, mtime: float) -> None:
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def test_template_reloads_when_rules_file_changes(tmp_path):
+    prompt_file, rules_file = tmp_path / "prompt.yaml", tmp_path / "rules.yaml"
+    write(prompt_file, 'version: "v1"\nsystem: "Triage."\nrules_file: "rules.yaml"\n', 1_000)
+    write(rules_file, "- name: refunds\n  description: Refund requests\n", 1_000)
+    assert load_template(prompt_file).rule_context == ("refunds: Refund requests",)
+    assert load_template(prompt_file) is load_template(prompt_file)
+
+    write(rules_file, "- name: refunds\n  description: Refunds over 100 EUR\n", 2_000)
+    assert load_template(prompt_file).rule_context == ("refunds: Refunds over 100 EUR",)
+
+
+def test_template_reloads_when_file_changes(tmp_path):
+    prompt_file = tmp_path / "prompt.yaml"
+    write(prompt_file, 'version: "v1"\nsystem: "Triage."\n', 1_000)
+    assert load_template(prompt_file).system == "Triage."
+    write(prompt_file, 'version: "v1"\nsystem: "Triage politely."\n', 2_000)
+    assert load_template(prompt_file).system == "Triage politely."
+    assert load_template("") is None
@@ -0,0 +1,68 @@
+"""Tests for the workflow runner (`workers/sandbox.py`)."""
+
+import logging
+from types import SimpleNamespace
+
+from temporalio.worker.workflow_sandbox import SandboxedWorkflowRunner
+
+from workers import sandbox
+from workers.sandbox import TrustedWorkflowRunner
+
+
+class RecordingRunner:
+    def __init__(self, name: str):
+        self.name = name
+        self.prepared = []
+        self.failure_types = None
+
+    def prepare_workflow(self, defn):
+        self.prepared.append(defn.name)
+
+    def create_instance(self, det):
+        return (self.name, det.defn.name)
+
+    def set_worker_level_failure_exception_types(self, types):
+        self.failure_types = types
+
+
+def runner(trusted: set[str]) -> TrustedWorkflowRunner:
+    trusted_runner = TrustedWorkflowRunner(frozenset(trusted))
+    trusted_runner._sandboxed = RecordingRunner("sandboxed")
+    trusted_runner._unsandboxed = RecordingRunner("unsandboxed")
+    return trusted_runner
+
+
+def details(name: str):
+    return SimpleNamespace(defn=SimpleNamespace(name=name))
+
+
+def test_only_trusted_workflows_leave_the_sandbox():
+    trusted_runner = runner({"ExampleWorkflow"})
+    assert trusted_runner.create_instance(details("ExampleWorkflow")) == ("unsandboxed", "ExampleWorkflow")
+    assert trusted_runner.create_instance(details("BatchProcessingWorkflow")) == ("sandboxed", "BatchProcessingWorkflow")
+
+
+def test_every_workflow_is_validated_in_the_sandbox(caplog):
+    trusted_runner = runner({"ExampleWorkflow"})
+    with caplog.at_level(logging.WARNING, logger=sandbox.__name__):
+        for name in ("ExampleWorkflow", "BatchProcessingWorkflow"):
+            trusted_runner.prepare_workflow(details(name).defn)
+    assert trusted_runner._sandboxed.prepared == ["ExampleWorkflow", "BatchProcessingWorkflow"]
+    assert trusted_runner._unsandboxed.prepared == []
+    assert [record.getMessage() for record in caplog.records] == [
+        "Workflow 'ExampleWorkflow' runs without the sandbox (WORKFLOW_UNSANDBOXED)"
+    ]
+
+
+def test_failure_exception_types_reach_both_runners():
+    trusted_runner = runner(set())
+    trusted_runner.set_worker_level_failure_exception_types([ValueError])
+    assert trusted_runner._sandboxed.failure_types == [ValueError]
+    assert trusted_runner._unsandboxed.failure_types == [ValueError]
+
+
+def test_workflow_runner_honours_the_setting(monkeypatch):
+    monkeypatch.setattr(sandbox, "UNSANDBOXED_WORKFLOWS", frozenset())
+    assert isinstance(sandbox.workflow_runner(), SandboxedWorkflowRunner)
+    monkeypatch.setattr(sandbox, "UNSANDBOXED_WORKFLOWS", frozenset({"ExampleWorkflow"}))
+    assert isinstance(sandbox.workflow_runner(), TrustedWorkflowRunner)
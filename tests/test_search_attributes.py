@@ -0,0 +1,77 @@
+"""Tests for case search attributes (`workers/search_attributes.py`)."""
+
+from datetime import datetime, timedelta, timezone
+
+from temporalio.common import SearchAttributePair, TypedSearchAttributes
+
+from workers.search_attributes import (
+    STATUS,
+    WAITING_SINCE,
+    attribute_updates,
+    attribute_values,
+    case_query,
+    confidence_bucket,
+    initial_attributes,
+    quote,
+    triggered_rule,
+)
+
+
+def updates_by_name(status: dict) -> dict:
+    return {update.key.name: update.value for update in attribute_updates(status)}
+
+
+def test_quote_escapes_quotes_and_backslashes():
+    assert quote("it's") == r"'it\'s'"
+    assert quote("a\\b") == r"'a\\b'"
+    assert quote(r"x\' OR 1=1") == r"'x\\\' OR 1=1'"
+
+
+def test_case_query():
+    assert case_query() == "WorkflowType = 'ExampleWorkflow'"
+    query = case_query(
+        decision="human",
+        rule=["low confidence", "vip's escalation"],
+        waiting_since_before=datetime(2024, 5, 1, 12, 0, tzinfo=timezone(timedelta(hours=2))),
+        running=True,
+    )
+    assert query == (
+        "WorkflowType = 'ExampleWorkflow' AND TraceRailDecision = 'human'"
+        r" AND TraceRailRule IN ('low confidence', 'vip\'s escalation')"
+        " AND TraceRailWaitingSince < '2024-05-01T10:00:00Z' AND ExecutionStatus = 'Running'"
+    )
+    # Naive datetimes are taken as UTC.
+    assert case_query(started_after=datetime(2024, 5, 1), running=False).endswith(
+        "StartTime > '2024-05-01T00:00:00Z' AND ExecutionStatus != 'Running'"
+    )
+
+
+def test_waiting_since_is_set_while_awaiting_a_human_and_unset_after():
+    waiting = updates_by_name({"stage": "awaiting_human", "decision": "human", "waiting_since": "2024-05-01T10:00:00+00:00"})
+    assert waiting == {
+        "TraceRailStatus": "awaiting_human",
+        "TraceRailDecision": "human",
+        "TraceRailWaitingSince": datetime(2024, 5, 1, 10, tzinfo=timezone.utc),
+    }
+
+    done = updates_by_name({"stage": "completed", "decision": "human", "confidence": "high",
+                            "waiting_since": "2024-05-01T10:00:00+00:00"})
+    assert done["TraceRailStatus"] == "completed"
+    assert done["TraceRailConfidence"] == "high"
+    assert "TraceRailWaitingSince" in done and done["TraceRailWaitingSince"] is None
+
+
+def test_confidence_bucket_and_triggered_rule():
+    assert [confidence_bucket(c) for c in (None, 0.95, 0.9, 0.8, 0.2)] == ["unknown", "high", "high", "medium", "low"]
+    assert triggered_rule({"triggered_rules": ["r1", "r2"], "reason": "x"}) == "r1"
+    assert triggered_rule({"reason": "default"}) == "default"
+    assert triggered_rule({}) is None
+    assert len(triggered_rule({"reason": "r" * 300})) == 255
+
+
+def test_initial_attributes_and_values():
+    assert initial_attributes(False) is None
+    assert initial_attributes(True).get(STATUS) == "started"
+    since = datetime(2024, 5, 1, 10, tzinfo=timezone.utc)
+    attributes = TypedSearchAttributes([SearchAttributePair(STATUS, "awaiting_human"), SearchAttributePair(WAITING_SINCE, since)])
+    assert attribute_values(attributes) == {"stage": "awaiting_human", "waiting_since": since.isoformat()}
@@ -0,0 +1,68 @@
+"""Tests for the semantic cache of LLM results (`workers/semantic_cache.py`)."""
+
+import pytest
+
+from workers import semantic_cache as module
+from workers.semantic_cache import HashingEmbedder, SemanticCache
+
+TEXT = "My parcel arrived damaged and I would like a refund for the broken lamp."
+PARAPHRASE = "My parcel arrived damaged and I'd like a refund for the broken lamp!"
+OTHER = "Please update the billing address on my account to the new office."
+
+
+def cache(use_numpy: bool = False, **kwargs) -> SemanticCache:
+    return SemanticCache(HashingEmbedder(dim=256), use_numpy=use_numpy, **{"threshold": 0.8, **kwargs})
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_paraphrase_hits_and_unrelated_text_misses(use_numpy):
+    if use_numpy and not module.load_numpy():
+        pytest.skip("numpy is not installed")
+    semantic_cache = cache(use_numpy)
+    semantic_cache.add(TEXT, {"answer": "refund"})
+
+    match = semantic_cache.lookup(PARAPHRASE)
+    assert match is not None and match.result == {"answer": "refund"}
+    assert 0.8 <= match.similarity <= 1.0001
+    assert semantic_cache.lookup(OTHER) is None
+    assert (semantic_cache.hits, semantic_cache.misses) == (1, 1)
+
+
+def test_threshold():
+    strict = cache(threshold=0.9999)
+    strict.add(TEXT, {"answer": "refund"})
+    assert strict.lookup(PARAPHRASE) is None
+    assert strict.lookup(TEXT) is not None
+
+
+def test_namespaces_are_isolated():
+    semantic_cache = cache()
+    semantic_cache.add(TEXT, {"answer": "v1"}, namespace="v1")
+    assert semantic_cache.lookup(TEXT, "v2") is None
+    assert semantic_cache.lookup(TEXT, "v1").result == {"answer": "v1"}
+
+
+def test_expired_entries_are_not_reused(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(module.time, "time", lambda: now[0])
+    semantic_cache = cache(ttl=60)
+    semantic_cache.add(TEXT, {"answer": "refund"})
+
+    now[0] += 30
+    assert semantic_cache.lookup(TEXT).age_seconds == 30
+    now[0] += 31
+    assert semantic_cache.lookup(TEXT) is None
+
+
+def test_oldest_entry_is_evicted():
+    semantic_cache = cache(max_entries=2)
+    semantic_cache.add(TEXT, {"answer": "refund"})
+    semantic_cache.add(OTHER, {"answer": "billing"})
+    semantic_cache.add("The mobile app crashes whenever I open the settings page.", {"answer": "bug"})
+
+    assert len(semantic_cache) == 2
+    assert semantic_cache.lookup(TEXT) is None
+    assert semantic_cache.lookup(OTHER).result == {"answer": "billing"}
+    # The evicted entry's slot no longer appears in any LSH bucket.
+    slots = {slot for table in semantic_cache._buckets for bucket in table.values() for slot in bucket}
+    assert slots == {0, 1}
@@ -0,0 +1,85 @@
+"""Tests for shadow-mode rule evaluation (`workers/shadow.py`)."""
+
+import json
+import threading
+import time
+from pathlib import Path
+
+from workers import shadow
+from workers.rulesets import RuleOutcome
+from workers.shadow import ShadowCase, ShadowEvaluator
+
+ROUTING_DMN = Path(__file__).parent.parent / "dmn" / "routing.dmn"
+
+
+def case(content: str, confidence: float, live_decision: str) -> ShadowCase:
+    return ShadowCase(
+        content=content,
+        llm_response={"metadata": {"confidence": confidence}},
+        live_decision=live_decision,
+        live_rule="live",
+        live_latency_us=10,
+    )
+
+
+def read_log(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+class BlockedRuleSet:
+    """A candidate that holds every evaluation until it is released."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    async def evaluate(self, content: str, llm_response: dict | None = None) -> RuleOutcome:
+        self.started.set()
+        self.release.wait(5.0)
+        return RuleOutcome("automatic", "blocked")
+
+    async def close(self) -> None:
+        pass
+
+
+def test_divergences_and_stats_are_logged(tmp_path):
+    log = tmp_path / "shadow.jsonl"
+    evaluator = ShadowEvaluator(ROUTING_DMN, log, queue_size=10, stats_interval=60)
+    assert evaluator.submit(case("All fine", 0.9, "automatic"))
+    assert evaluator.submit(case("All fine", 0.4, "automatic"))
+    evaluator.close()
+
+    divergence, stats = read_log(log)
+    assert (divergence["live"], divergence["shadow"], divergence["live_rule"]) == ("automatic", "human", "live")
+    assert (stats["type"], stats["evaluated"], stats["agreed"], stats["dropped"]) == ("stats", 2, 1, 0)
+    assert evaluator.stats.agreement_rate == 0.5
+
+
+def test_full_queue_drops_cases_without_blocking(tmp_path, monkeypatch):
+    rule_set = BlockedRuleSet()
+
+    async def load_rule_set(path):
+        return rule_set
+
+    monkeypatch.setattr(shadow, "load_rule_set", load_rule_set)
+    evaluator = ShadowEvaluator("candidate.dmn", tmp_path / "shadow.jsonl", queue_size=2, stats_interval=60)
+    assert evaluator.submit(case("first", 0.9, "automatic"))
+    assert rule_set.started.wait(5.0)
+
+    # The first case is being evaluated; two fit in the queue, the rest are dropped.
+    start = time.perf_counter()
+    accepted = [evaluator.submit(case(f"case {i}", 0.9, "automatic")) for i in range(5)]
+    assert time.perf_counter() - start < 0.1
+    assert accepted == [True, True, False, False, False]
+    assert evaluator.stats.dropped == 3
+
+    rule_set.release.set()
+    evaluator.close()
+    assert read_log(tmp_path / "shadow.jsonl")[-1]["evaluated"] == 3
+
+
+def test_candidate_that_fails_to_load_disables_shadow_mode(tmp_path):
+    evaluator = ShadowEvaluator(tmp_path / "candidate.txt", tmp_path / "shadow.jsonl", queue_size=1)
+    evaluator.close(timeout=1.0)
+    assert not evaluator._thread.is_alive()
+    assert not (tmp_path / "shadow.jsonl").exists()
@@ -0,0 +1,95 @@
+"""Tests for coalescing duplicate calls (`workers/singleflight.py`)."""
+
+import asyncio
+
+import pytest
+
+from workers.singleflight import CACHED, COALESCED, LEADER, SingleFlight
+
+
+def counting_call(calls: list, result="answer", delay: float = 0.05, error: Exception | None = None):
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return result
+
+    return fn
+
+
+def test_identical_calls_share_one_run():
+    async def run():
+        flight, calls = SingleFlight(), []
+        results = await asyncio.gather(*(flight.do("key", counting_call(calls)) for _ in range(5)))
+        return results, calls, flight.in_flight
+
+    results, calls, in_flight = asyncio.run(run())
+    assert len(calls) == 1
+    assert [value for value, _ in results] == ["answer"] * 5
+    assert sorted(role for _, role in results) == [COALESCED] * 4 + [LEADER]
+    assert in_flight == 0
+
+
+def test_different_keys_run_separately():
+    async def run():
+        flight, calls = SingleFlight(), []
+        await asyncio.gather(flight.do("a", counting_call(calls)), flight.do("b", counting_call(calls)))
+        return calls
+
+    assert len(asyncio.run(run())) == 2
+
+
+def test_result_reused_within_ttl_only():
+    async def run():
+        flight, calls = SingleFlight(ttl=0.1), []
+        first = await flight.do("key", counting_call(calls, delay=0))
+        second = await flight.do("key", counting_call(calls, delay=0))
+        await asyncio.sleep(0.15)
+        third = await flight.do("key", counting_call(calls, delay=0))
+        return [first[1], second[1], third[1]], calls
+
+    roles, calls = asyncio.run(run())
+    assert roles == [LEADER, CACHED, LEADER]
+    assert len(calls) == 2
+
+
+def test_failures_are_shared_but_not_cached():
+    async def run():
+        flight, calls = SingleFlight(ttl=60), []
+        failing = counting_call(calls, error=ValueError("provider down"))
+        results = await asyncio.gather(flight.do("key", failing), flight.do("key", failing), return_exceptions=True)
+        retried = await flight.do("key", counting_call(calls, delay=0))
+        return results, retried, calls
+
+    results, retried, calls = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert retried == ("answer", LEADER)
+    assert len(calls) == 2
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_call():
+    async def run():
+        flight, calls = SingleFlight(), []
+        leader = asyncio.create_task(flight.do("key", counting_call(calls)))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("key", counting_call(calls)))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower, calls
+
+    result, calls = asyncio.run(run())
+    assert result == ("answer", COALESCED)
+    assert len(calls) == 1
+
+
+def test_cache_keeps_most_recent_entries():
+    async def run():
+        flight, calls = SingleFlight(ttl=60, max_entries=2), []
+        for key in ("a", "b", "c"):
+            await flight.do(key, counting_call(calls, result=key, delay=0))
+        return [(await flight.do(key, counting_call(calls, result=key, delay=0)))[1] for key in ("b", "c", "a")]
+
+    assert asyncio.run(run()) == [CACHED, CACHED, LEADER]
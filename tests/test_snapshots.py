@@ -0,0 +1,57 @@
+"""Tests for pinned rule-set snapshots (`workers/snapshots.py`)."""
+
+import asyncio
+import os
+from pathlib import Path
+
+import pytest
+
+from workers import snapshots
+from workers.blobstore import FileBlobStore
+from workers.snapshots import SnapshotNotFoundError, fetch_snapshot, get_table, pin_snapshot
+
+POST_RULES = Path(__file__).parent.parent / "dmn" / "post-rules.dmn"
+
+
+@pytest.fixture
+def fresh_caches(monkeypatch):
+    monkeypatch.setattr(snapshots, "_pinned", {})
+    monkeypatch.setattr(snapshots, "_tables", {})
+
+
+def test_snapshot_pinned_on_one_worker_is_found_on_another(tmp_path, fresh_caches):
+    blobs = FileBlobStore(tmp_path / "blobs")
+    snapshot_id = pin_snapshot(POST_RULES, tmp_path / "worker-a", blobs)
+    assert snapshot_id.endswith(".dmn") and len(snapshot_id) == 64 + len(".dmn")
+
+    path = fetch_snapshot(snapshot_id, tmp_path / "worker-b", blobs)
+    assert path.read_bytes() == POST_RULES.read_bytes()
+
+
+def test_pinning_an_unchanged_file_refreshes_its_blob(tmp_path, fresh_caches, monkeypatch):
+    blobs = FileBlobStore(tmp_path / "blobs")
+    snapshot_id = pin_snapshot(POST_RULES, tmp_path / "snapshots", blobs)
+    blob = blobs.path(snapshot_id.split(".")[0])
+    os.utime(blob, (1, 1))
+
+    monkeypatch.setattr(Path, "read_bytes", lambda self: pytest.fail("an unchanged file was read again"))
+    assert pin_snapshot(POST_RULES, tmp_path / "snapshots", blobs) == snapshot_id
+    assert blob.stat().st_mtime > 1
+
+
+def test_unknown_snapshot_is_not_found(tmp_path, fresh_caches, monkeypatch):
+    monkeypatch.setattr(snapshots, "get_blob_store", lambda: FileBlobStore(tmp_path / "blobs"))
+    with pytest.raises(SnapshotNotFoundError):
+        fetch_snapshot("0123456789abcdef01234567.dmn", tmp_path / "snapshots")
+    with pytest.raises(SnapshotNotFoundError):
+        asyncio.run(get_table("0" * 64 + ".dmn", "postRules", tmp_path / "snapshots"))
+
+
+def test_get_table_compiles_a_snapshot_once(tmp_path, fresh_caches, monkeypatch):
+    blobs = FileBlobStore(tmp_path / "blobs")
+    monkeypatch.setattr(snapshots, "get_blob_store", lambda: blobs)
+    snapshot_id = pin_snapshot(POST_RULES, tmp_path / "worker-a")
+
+    table = asyncio.run(get_table(snapshot_id, "postRules", tmp_path / "worker-b"))
+    assert asyncio.run(get_table(snapshot_id, "postRules", tmp_path / "worker-b")) is table
+    assert table.evaluate({"guardrailsPassed": False}).matched_rules == ["guardrails-failed"]
@@ -0,0 +1,41 @@
+"""Tests for reusing earlier cases in the example starter (`cli/start_example.py`)."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("tracerail")
+pytest.importorskip("dotenv")
+
+from cli.start_example import CASE_REUSE_HOURS, rerun_reason  # noqa: E402
+
+
+class FakeDescription:
+    def __init__(self, close_time: datetime | None):
+        self.close_time = close_time
+
+
+class FakeHandle:
+    def __init__(self, hours_ago: float, result: dict):
+        self.close_time = datetime.now(timezone.utc) - timedelta(hours=hours_ago)
+        self._result = result
+
+    async def describe(self) -> FakeDescription:
+        return FakeDescription(self.close_time)
+
+    async def result(self) -> dict:
+        return self._result
+
+
+def test_recent_completed_case_is_reused():
+    assert asyncio.run(rerun_reason(FakeHandle(1, {"status": "COMPLETED_AUTOMATICALLY"}))) is None
+
+
+def test_case_that_completed_with_a_failure_is_rerun():
+    assert asyncio.run(rerun_reason(FakeHandle(1, {"status": "FAILED", "reason": "LLM processing failed."})))
+
+
+def test_case_older_than_the_reuse_window_is_rerun():
+    handle = FakeHandle(CASE_REUSE_HOURS + 1, {"status": "COMPLETED_AUTOMATICALLY"})
+    assert "hours old" in asyncio.run(rerun_reason(handle))
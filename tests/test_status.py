@@ -0,0 +1,71 @@
+"""Tests for case status lookups (`workers/status.py`)."""
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from temporalio.client import WorkflowExecutionStatus
+from temporalio.common import SearchAttributePair, TypedSearchAttributes
+
+from workers.search_attributes import DECISION, STATUS
+from workers.status import bulk_status, recent_status
+
+STARTED = datetime(2025, 5, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class Execution:
+    id: str
+    status: WorkflowExecutionStatus
+    typed_search_attributes: TypedSearchAttributes = TypedSearchAttributes.empty
+    run_id: str = "run"
+    start_time: datetime = STARTED
+    close_time: datetime | None = None
+
+
+@dataclass
+class FakeClient:
+    executions: list[Execution]
+    queried: list[str] = field(default_factory=list)
+
+    async def list_workflows(self, query, limit=None, page_size=None):
+        for execution in self.executions[:limit]:
+            yield execution
+
+    def get_workflow_handle(self, workflow_id, run_id=None):
+        client = self
+
+        class Handle:
+            async def query(self, query):
+                client.queried.append(workflow_id)
+                return {"stage": "awaiting_human", "human_decision": None}
+
+        return Handle()
+
+
+def indexed(stage: str) -> TypedSearchAttributes:
+    return TypedSearchAttributes([SearchAttributePair(STATUS, stage), SearchAttributePair(DECISION, "human")])
+
+
+def test_indexed_and_closed_cases_are_not_queried():
+    client = FakeClient([
+        Execution("indexed", WorkflowExecutionStatus.RUNNING, indexed("awaiting_human")),
+        Execution("closed", WorkflowExecutionStatus.COMPLETED, close_time=STARTED),
+        Execution("unindexed", WorkflowExecutionStatus.RUNNING),
+    ])
+    statuses = asyncio.run(bulk_status(client, ["indexed", "closed", "unindexed"]))
+
+    assert client.queried == ["unindexed"]
+    assert statuses["indexed"]["stage"] == "awaiting_human"
+    assert statuses["indexed"]["decision"] == "human"
+    assert statuses["closed"]["stage"] == "closed"
+    assert statuses["unindexed"]["stage"] == "awaiting_human"
+    assert "human_decision" in statuses["unindexed"]
+
+
+def test_queries_of_unindexed_cases_are_bounded():
+    client = FakeClient([Execution(f"case-{i}", WorkflowExecutionStatus.RUNNING) for i in range(10)])
+    records = asyncio.run(recent_status(client, limit=10, max_queries=3))
+
+    assert client.queried == ["case-0", "case-1", "case-2"]
+    assert [record["stage"] for record in records] == ["awaiting_human"] * 3 + ["running"] * 7
@@ -0,0 +1,27 @@
+"""Replays recorded histories of earlier workflow versions (`workers/workflows.py`)."""
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+from temporalio.client import WorkflowHistory
+from temporalio.worker import Replayer
+
+from workers.activity_options import load_activity_options
+from workers.sandbox import workflow_runner
+from workers.workflows import ExampleWorkflow
+
+HISTORIES = Path(__file__).parent / "histories"
+
+
+@pytest.mark.parametrize("path", sorted(HISTORIES.glob("example-workflow-*.json")), ids=lambda path: path.stem)
+def test_replays_cases_started_before_the_new_steps(path):
+    # Cases started by the first version: the LLM, routing and, for the
+    # human case, a 24 hour wait for the 'decision' signal.
+    history = WorkflowHistory.from_json(path.stem, json.loads(path.read_text()))
+    # As the worker does at startup, outside the sandbox.
+    load_activity_options()
+    replayer = Replayer(workflows=[ExampleWorkflow], workflow_runner=workflow_runner())
+    result = asyncio.run(replayer.replay_workflow(history, raise_on_replay_failure=False))
+    assert result.replay_failure is None
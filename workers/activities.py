@@ -6,89 +6,569 @@ tracerail-core library. These activities act as the bridge between the
 workflow's logic and the core functionalities like LLM processing and routing.
 """
 
+import asyncio
 import logging
+import os
+import time
 from temporalio import activity
 
-try:
-    import tracerail
-    from tracerail.routing import RoutingContext, RoutingResult
-    from tracerail.llm import LLMResponse
-except ImportError as e:
-    # This will cause the worker to fail on startup if dependencies aren't right,
-    # which is a good, clear failure mode.
-    raise ImportError(f"Could not import tracerail-core. Please run 'poetry install'.") from e
+from .providers import (
+    FAILOVER_PROVIDER,
+    HEDGE_DELAY_MS,
+    HEDGE_PROVIDER,
+    get_client,
+    hedge_budget,
+    hedged_call,
+    record_hedge_metrics,
+)
+from .breaker import CircuitOpenError, get_breaker, guarded, is_available
+from .blobstore import BlobStore, blob_ref, get_blob_store, is_blob_ref, key_of, resolve
+from .chunking import Chunk, chunk_text, document_input
+from .datasets import read_page
+from .decision_tables import load_table
+from .errors import as_application_error
+from .fingerprint import content_fingerprint, simhash, workflow_id_for
+from .guardrails import load_guard, record_guard_metrics
+from .metrics import activity_meter
+from .pii import count_by_kind, redact_batch
+from .prompts import load_template, prompt_cache
+from .rulesets import EngineRuleSet, outcome_of
+from .semantic_cache import SEMANTIC_CACHE, get_semantic_cache, record_semantic_cache_metrics
+from .shadow import ShadowCase, get_shadow_evaluator
+from .singleflight import LEADER, SingleFlight
+from .snapshots import ROUTING_RULES_FILE, get_rule_set, get_table, pin_snapshot
+
+# tracerail-core (and the provider SDKs it pulls in) is imported lazily by the
+# modules above, when the first activity runs, so the worker can start polling
+# without paying for it. The worker checks that the package is installed.
+
+# Redact PII from LLM output before the guardrail validators run
+PII_REDACTION = os.getenv("PII_REDACTION", "true").lower() == "true"
+
+# Coalesce identical LLM calls, and reuse their result for this many seconds
+LLM_DEDUP = os.getenv("LLM_DEDUP", "true").lower() == "true"
+LLM_DEDUP_TTL = float(os.getenv("LLM_DEDUP_TTL", "300"))
+llm_flight = SingleFlight(ttl=LLM_DEDUP_TTL)
+
+# The post-rules decision table evaluated after routing (step 5 of the blueprint)
+POST_RULES_FILE = os.getenv("POST_RULES_FILE", "dmn/post-rules.dmn")
+POST_RULES_DECISION = os.getenv("POST_RULES_DECISION", "postRules")
+
+# How chunk answers of a large document are combined: "llm" summarizes them in
+# one more call, "concat" joins them as they are
+CHUNK_REDUCE = os.getenv("CHUNK_REDUCE", "llm").lower()
+REDUCE_INSTRUCTIONS = (
+    "The following are answers for consecutive parts of one document. "
+    "Combine them into a single answer for the whole document.\n\n"
+)
 
 # --- Activity-Specific Logging ---
 # This helps differentiate activity logs from the rest of the application.
 logger = logging.getLogger(__name__)
 
 
+async def _resolve(value: str) -> str:
+    """Resolves a blob reference off the event loop; inline text is returned as is."""
+    return await asyncio.to_thread(resolve, value) if is_blob_ref(value) else value
+
+
 @activity.defn
-async def llm_activity(text_input: str) -> dict:
+async def llm_activity(text_input: str, latency_critical: bool = False) -> dict:
     """
     An activity that processes text using the configured LLM provider
     from the tracerail-core library.
 
+    When `LLM_PROMPT_FILE` is set, the text is prefixed with the cached prompt
+    template. When `LLM_HEDGE_PROVIDER` is set, a slow request is hedged: the
+    same prompt is sent to the second provider and the first valid response wins.
+    Identical prompts in flight at the same time (or within `LLM_DEDUP_TTL`
+    seconds) share one LLM call. With `SEMANTIC_CACHE=on`, the result of a
+    sufficiently similar past text is reused instead. Every call goes through the provider's circuit
+    breaker: while it is open, the activity fails over to `LLM_FAILOVER_PROVIDER`
+    or fails right away with `CircuitOpenError`.
+
+    Provider errors are classified for retries: rate limits are retried after
+    a long jittered backoff, and rejected requests are not retried at all
+    (see `workers/errors.py`).
+
     Args:
-        text_input: The text to be processed by the LLM.
+        text_input: The text to be processed by the LLM, or a blob reference
+            to it (as for the chunks of a large document).
+        latency_critical: Hedge at once instead of after `LLM_HEDGE_DELAY_MS`.
 
     Returns:
         A dictionary containing the LLM's response and metadata.
     """
+    try:
+        return await _process_with_llm(text_input, latency_critical)
+    except Exception as e:
+        error = as_application_error(e)
+        if error is e:
+            raise
+        logger.warning(f"LLM request failed ({error.type}): {e}")
+        raise error from e
+
+
+async def _process_with_llm(text_input: str, latency_critical: bool = False) -> dict:
     activity.heartbeat("Initializing client...")
     logger.info(f"Received LLM activity request for input: '{text_input[:30]}...'")
+    text_input = await _resolve(text_input)
+    template = load_template()
+
+    # Look for a similar past text; results are only reused for the same prompt version.
+    semantic_cache = get_semantic_cache()
+    namespace = template.version if template else ""
+    match = None
+    if semantic_cache is not None:
+        start = time.perf_counter()
+        match = await asyncio.to_thread(semantic_cache.lookup, text_input, namespace)
+        lookup_us = int((time.perf_counter() - start) * 1_000_000)
+        if SEMANTIC_CACHE == "on" or match is None:
+            record_semantic_cache_metrics(match, lookup_us)
+        if match is not None and SEMANTIC_CACHE == "on":
+            logger.info(f"Reused the LLM result of a similar text (similarity {match.similarity:.3f}).")
+            return {**match.result, "semantic_cache": {"similarity": round(match.similarity, 4)}}
+
+    # Clients are created once per provider and shared across activities.
+    # They load their configuration from the environment (.env).
+    client = await get_client()
+    provider = client.config.llm.provider.value
+    if not is_available(provider):
+        # Fail over while the provider's circuit is open, or fail fast instead of waiting out the timeout.
+        if not FAILOVER_PROVIDER or FAILOVER_PROVIDER == provider or not is_available(FAILOVER_PROVIDER):
+            raise CircuitOpenError(provider, get_breaker(provider).retry_after)
+        logger.warning(f"Circuit for '{provider}' is open; failing over to '{FAILOVER_PROVIDER}'.")
+        activity_meter().create_counter(
+            "tracerail_llm_failovers", "LLM requests sent to the failover provider because of an open circuit."
+        ).add(1, {"provider": provider, "failover": FAILOVER_PROVIDER})
+        provider = FAILOVER_PROVIDER
+        client = await get_client(provider)
+    activity.heartbeat(f"Processing with {provider}...")
+
+    # Requests are never hedged to a provider whose circuit is open.
+    hedge_client = None
+    if HEDGE_PROVIDER and HEDGE_PROVIDER != provider and is_available(HEDGE_PROVIDER):
+        hedge_client = await get_client(HEDGE_PROVIDER)
 
-    # The client automatically loads configuration from the environment (.env)
-    async with await tracerail.create_client_async() as client:
-        provider = client.config.llm.provider.value
-        activity.heartbeat(f"Processing with {provider}...")
+    # Prepend the static prompt prefix, which is rendered and tokenized once per version
+    prompt_text = text_input
+    if template is not None:
+        prompt = prompt_cache.assemble(template, text_input)
+        prompt_text = prompt.text
+        activity_meter().create_histogram(
+            "tracerail_prompt_assembly_time", "Time spent assembling the prompt.", "us"
+        ).record(prompt.assembly_us, {"prompt_version": prompt.version})
 
+    async def call_llm() -> dict:
+        nonlocal provider
+        primary_provider = provider
         # Use the high-level process_content method which handles the full pipeline
-        result = await client.process_content(text_input)
+        outcome = await hedged_call(
+            primary=lambda: guarded(primary_provider, lambda: client.process_content(prompt_text)),
+            secondary=(
+                lambda: guarded(HEDGE_PROVIDER, lambda: hedge_client.process_content(prompt_text))
+            ) if hedge_client else None,
+            delay=0 if latency_critical else HEDGE_DELAY_MS / 1000,
+            budget=hedge_budget,
+            is_valid=lambda result: bool(result.llm_response.content),
+        )
+        result = outcome.result
+        if outcome.winner == "secondary":
+            provider = HEDGE_PROVIDER
+        record_hedge_metrics(outcome, provider)
+
+        usage = result.llm_response.usage
+        if usage is not None and usage.prompt_tokens is not None:
+            activity_meter().create_histogram(
+                "tracerail_prompt_tokens", "Prompt tokens billed per LLM request.", "tokens"
+            ).record(usage.prompt_tokens, {"provider": provider})
 
-        logger.info("LLM processing complete.")
+        logger.info(f"LLM processing complete in {outcome.latency_ms} ms (provider: {provider}, hedged: {outcome.hedged}).")
 
         # Return a simplified dictionary, similar to what might have existed before,
         # for compatibility or ease of use in the workflow.
         return {
             "answer": result.llm_response.content,
             "provider": provider,
+            "hedged": outcome.hedged,
+            "prompt_version": template.version if template else None,
             # Pass along the full response and routing decision for the next step
             "llm_response": result.llm_response.to_dict(),
             "routing_decision": result.routing_decision.to_dict(),
         }
 
+    if not LLM_DEDUP:
+        response = await call_llm()
+    else:
+        # Identical prompts to the same providers share one LLM call.
+        key = content_fingerprint(f"{provider}\x00{HEDGE_PROVIDER}\x00{prompt_text}")
+        response, role = await llm_flight.do(key, call_llm)
+        activity_meter().create_counter(
+            "tracerail_llm_dedup", "LLM requests by whether they ran, joined an identical in-flight call or reused a result."
+        ).add(1, {"outcome": role})
+        if role != LEADER:
+            logger.info(f"Reused an identical LLM call ({role}).")
+        response = {**response, "deduplicated": role != LEADER}
+
+    if semantic_cache is not None:
+        if match is not None:
+            # Shadow mode: would reusing the match have routed the text the same way?
+            cached, fresh = match.result.get("routing_decision") or {}, response.get("routing_decision") or {}
+            agreed = cached.get("decision") == fresh.get("decision")
+            record_semantic_cache_metrics(match, lookup_us, agreed)
+            logger.info(f"Semantic cache shadow hit (similarity {match.similarity:.3f}, agreed: {agreed}).")
+        entry = {key: value for key, value in response.items() if key != "deduplicated"}
+        await asyncio.to_thread(semantic_cache.add, text_input, entry, namespace)
+    return response
+
+
+@activity.defn
+async def chunk_document_activity(document_ref: str) -> list[dict]:
+    """
+    An activity that splits a large document from the blob store into
+    token-aware chunks, stores each chunk and returns references to them, so
+    the chunk text never enters workflow history.
+
+    Args:
+        document_ref: A blob reference to the document.
+
+    Returns:
+        One dictionary per chunk with its blob `ref` and `tokens`.
+    """
+    store = get_blob_store()
+    text = await asyncio.to_thread(store.get_text, key_of(document_ref))
+    start = time.perf_counter()
+    chunks = chunk_text(text)
+    activity_meter().create_histogram(
+        "tracerail_chunking_time", "Time spent splitting a large document into chunks.", "ms"
+    ).record(int((time.perf_counter() - start) * 1000))
+    logger.info(f"Split a {len(text)}-character document into {len(chunks)} chunk(s).")
+    return await asyncio.to_thread(_store_chunks, store, chunks)
+
+
+def _store_chunks(store: BlobStore, chunks: list[Chunk]) -> list[dict]:
+    """Stores each chunk and returns its blob reference and token count."""
+    return [{"ref": blob_ref(store.put_text(chunk.text)), "tokens": chunk.tokens} for chunk in chunks]
+
+
+def _min_confidence(responses: list[dict]) -> float | None:
+    confidences = [
+        float(confidence) for response in responses
+        if (confidence := (response.get("metadata") or {}).get("confidence")) is not None
+    ]
+    return min(confidences) if confidences else None
+
+
+@activity.defn
+async def reduce_chunks_activity(chunk_results: list[dict]) -> dict:
+    """
+    An activity that combines the LLM results of a document's chunks into one
+    result shaped like `llm_activity`'s, which the rest of the workflow uses
+    unchanged.
+
+    With `CHUNK_REDUCE=llm` the chunk answers are summarized by one more LLM
+    call; otherwise they are concatenated. Either way, the combined response
+    reports the lowest confidence of any chunk, so one doubtful part of a
+    document is enough to send it for review, and chunk token usage is summed.
+
+    Args:
+        chunk_results: The `llm_activity` results of the chunks, in order.
+
+    Returns:
+        A dictionary like `llm_activity`'s, with the number of `chunks`.
+    """
+    if not chunk_results:
+        raise ValueError("reduce_chunks_activity needs at least one chunk result")
+    responses = [result["llm_response"] for result in chunk_results]
+    answers = [result.get("answer") or "" for result in chunk_results]
+
+    if CHUNK_REDUCE == "llm" and len(chunk_results) > 1:
+        prompt = REDUCE_INSTRUCTIONS + "\n\n".join(f"Part {i}:\n{answer}" for i, answer in enumerate(answers, start=1))
+        reduced = await llm_activity(prompt)
+        responses.append(reduced["llm_response"])
+    else:
+        joined = "\n\n".join(answers)
+        reduced = {**chunk_results[0], "answer": joined, "llm_response": {**responses[0], "content": joined}}
+
+    logger.info(f"Reduced {len(chunk_results)} chunk result(s) ({CHUNK_REDUCE}).")
+    return {**_combine_results(chunk_results, reduced, responses), "chunks": len(chunk_results)}
+
+
+def _combine_results(results: list[dict], combined: dict, responses: list[dict]) -> dict:
+    """
+    Completes the combined result of several `llm_activity` results: the
+    lowest confidence and the summed token usage of `responses`, and a human
+    routing decision if any of the results had one.
+    """
+    llm_response = dict(combined["llm_response"])  # May be shared with the dedup cache
+    confidence = _min_confidence(responses)
+    if confidence is not None:
+        llm_response["metadata"] = {**(llm_response.get("metadata") or {}), "confidence": confidence}
+    usages = [response["usage"] for response in responses if response.get("usage")]
+    if usages:
+        llm_response["usage"] = {**usages[-1], **{
+            key: sum(usage.get(key) or 0 for usage in usages) for key in ("prompt_tokens", "completion_tokens", "total_tokens")
+        }}
+
+    # A part the LLM routed to a human keeps the whole case with one.
+    routing_decisions = [result["routing_decision"] for result in results if result.get("routing_decision")]
+    routing_decision = next((d for d in routing_decisions if d.get("decision") == "human"), combined.get("routing_decision"))
+
+    return {
+        **combined,
+        "hedged": any(result.get("hedged") for result in results) or combined.get("hedged", False),
+        "llm_response": llm_response,
+        "routing_decision": routing_decision,
+    }
+
+
+@activity.defn
+async def combine_items_activity(item_results: list[dict]) -> dict:
+    """
+    An activity that combines the LLM results of the items of a multi-part
+    case (attachments or sub-questions processed independently) into one
+    result shaped like `llm_activity`'s, so the case is routed and reviewed
+    once.
+
+    The answers are kept apart, labelled by item, and also returned as
+    `item_answers`. As with chunks, the lowest confidence of any item is
+    reported and token usage is summed.
+
+    Args:
+        item_results: The `llm_activity` results of the items, in order.
+
+    Returns:
+        A dictionary like `llm_activity`'s, with the number of `items`.
+    """
+    if not item_results:
+        raise ValueError("combine_items_activity needs at least one item result")
+    responses = [result["llm_response"] for result in item_results]
+    answers = [result.get("answer") or "" for result in item_results]
+    joined = "\n\n".join(f"Item {i}:\n{answer}" for i, answer in enumerate(answers, start=1))
+    combined = {**item_results[0], "answer": joined, "llm_response": {**responses[0], "content": joined}}
+
+    logger.info(f"Combined {len(item_results)} item result(s).")
+    return {**_combine_results(item_results, combined, responses), "items": len(item_results), "item_answers": answers}
+
+
+@activity.defn
+async def pin_rules_snapshot_activity() -> dict:
+    """
+    An activity that pins the current routing and post rules as immutable
+    snapshots, so the rest of the workflow evaluates exactly these rules.
+
+    Returns:
+        The snapshot IDs, keyed by `routing` and `post_rules`. `routing` is
+        None without a `ROUTING_RULES_FILE`: the configured engine routes.
+    """
+    def pin() -> dict:
+        return {
+            "routing": pin_snapshot(ROUTING_RULES_FILE) if ROUTING_RULES_FILE else None,
+            "post_rules": pin_snapshot(POST_RULES_FILE),
+        }
+
+    # Pinning reads the rule files and writes to the blob store.
+    return await asyncio.to_thread(pin)
+
 
 @activity.defn
-async def routing_activity(llm_response_dict: dict, original_content: str) -> dict:
+async def routing_activity(llm_response_dict: dict, original_content: str | list[str],
+                           snapshot_id: str | None = None) -> dict:
     """
     An activity that makes a routing decision based on the output of the LLM
-    and a set of rules defined in `rules.yaml`.
+    and the rules pinned by the workflow, or tracerail-core's configured
+    routing engine if it pinned none.
 
     Args:
         llm_response_dict: The dictionary representation of the LLMResponse from the previous step.
-        original_content: The original text content that was processed.
+        original_content: The original text content that was processed, or
+            a blob reference to it. For a multi-part case, the list of items.
+        snapshot_id: The rules snapshot pinned by the workflow. Without one,
+            the current `ROUTING_RULES_FILE` is pinned and used, or, if that
+            is not set, the configured routing engine.
 
     Returns:
         A dictionary containing the routing decision.
     """
-    activity.heartbeat("Initializing routing engine...")
     logger.info("Received routing activity request...")
+    # Large documents are passed by reference; the rules still see the full text.
+    if isinstance(original_content, list):
+        original_content = "\n\n".join(await asyncio.gather(*(_resolve(item) for item in original_content)))
+    else:
+        original_content = await _resolve(original_content)
+
+    # The compiled rules are cached per snapshot, so this is a lookup after the first call.
+    if snapshot_id is None and ROUTING_RULES_FILE:
+        snapshot_id = await asyncio.to_thread(pin_snapshot, ROUTING_RULES_FILE)
+    if snapshot_id is not None:
+        rule_set = await get_rule_set(snapshot_id)
+    else:
+        rule_set = EngineRuleSet((await get_client()).routing_engine)
+
+    start = time.perf_counter()
+    routing_result = await rule_set.route(original_content, llm_response_dict)
+    latency_us = int((time.perf_counter() - start) * 1_000_000)
+    logger.info(
+        f"Routing decision: '{routing_result['decision']}' based on reason: '{routing_result['reason']}' "
+        f"({f'snapshot {snapshot_id}' if snapshot_id else 'configured engine'})"
+    )
 
-    # We don't need to re-run the LLM, just the routing part.
-    # The config is loaded from the environment by default.
-    async with await tracerail.create_client_async() as client:
-        # Re-create the necessary context objects from the input dictionaries
-        llm_response = LLMResponse.model_validate(llm_response_dict)
-        routing_context = RoutingContext(
+    # Hand the case to the shadow evaluator, if any; this never waits.
+    shadow = get_shadow_evaluator()
+    if shadow is not None:
+        live = outcome_of(routing_result)
+        shadow.submit(ShadowCase(
             content=original_content,
-            llm_response=llm_response,
-        )
+            llm_response=llm_response_dict,
+            live_decision=live.decision,
+            live_rule=live.rule,
+            live_latency_us=latency_us,
+        ))
+
+    return {**routing_result, "snapshot_id": snapshot_id}
+
+
+@activity.defn
+async def guardrails_activity(outputs: list[str]) -> list[dict]:
+    """
+    An activity that validates LLM outputs against the validators defined in
+    `guardrails.yaml`. Several pending outputs can be validated in one call.
+
+    Before any validator runs, every output is pre-scanned for PII (emails,
+    phone numbers, card numbers, IBANs), which is redacted.
+
+    Args:
+        outputs: The LLM outputs to validate.
+
+    Returns:
+        One dictionary per output with `passed`, the failed validators, the
+        latency of each validator that ran, the (redacted) `content` and the
+        number of PII matches per kind.
+    """
+    activity.heartbeat("Validating outputs...")
+    meter = activity_meter()
+
+    pii_counts = [{} for _ in outputs]
+    if PII_REDACTION:
+        start = time.perf_counter()
+        redacted = redact_batch(outputs)
+        meter.create_histogram(
+            "tracerail_pii_scan_time", "Time spent scanning LLM outputs for PII.", "us"
+        ).record(int((time.perf_counter() - start) * 1_000_000))
+        outputs = [text for text, _ in redacted]
+        pii_counts = [count_by_kind(matches) for _, matches in redacted]
+        pii_matches = meter.create_counter("tracerail_pii_matches", "PII found in LLM outputs.")
+        for counts in pii_counts:
+            for kind, count in counts.items():
+                pii_matches.add(count, {"kind": kind})
+
+    guard = load_guard()
+    results = await guard.validate_many(outputs)
+    record_guard_metrics(results)
+
+    failed = sum(not result.passed for result in results)
+    logger.info(f"Guardrails validated {len(outputs)} output(s), {failed} rejected.")
+    return [
+        {**result.to_dict(), "content": text, "pii": counts}
+        for result, text, counts in zip(results, outputs, pii_counts)
+    ]
+
+
+@activity.defn
+async def post_rules_activity(fields: dict, previous: dict | None = None, changed: list[str] | None = None,
+                              snapshot_id: str | None = None) -> dict:
+    """
+    An activity that evaluates the post-rules decision table in `dmn/` against
+    the fields extracted from the LLM output.
+
+    When `previous` and `changed` are given (a reviewer corrected some fields),
+    only the rules that read a changed field are re-evaluated; the match of
+    every other rule is taken from `previous`.
+
+    Args:
+        fields: The input values of the table, by input expression.
+        previous: The result of the previous evaluation of the same table.
+        changed: The names of the fields that changed since `previous`.
+        snapshot_id: The post-rules snapshot pinned by the workflow. Without
+            one, the table currently on disk is used.
+
+    Returns:
+        A dictionary with the `action` and `reason` of the matched rule, plus
+        the per-rule matches needed for the next incremental evaluation.
+    """
+    if snapshot_id is not None:
+        table = await get_table(snapshot_id, POST_RULES_DECISION)
+    else:
+        table = load_table(POST_RULES_FILE, POST_RULES_DECISION)
+    start = time.perf_counter()
+    if previous is not None and changed is not None:
+        evaluation = table.reevaluate(previous, fields, changed)
+    else:
+        evaluation = table.evaluate(fields)
+    activity_meter().create_histogram(
+        "tracerail_post_rules_time", "Time spent evaluating the post-rules table.", "us"
+    ).record(int((time.perf_counter() - start) * 1_000_000), {"incremental": str(changed is not None).lower()})
+
+    output = evaluation.output or {}
+    logger.info(
+        f"Post rules: '{output.get('postAction')}' via {evaluation.matched_rules} "
+        f"({evaluation.evaluated_rules}/{len(table.rules)} rules evaluated)."
+    )
+    return {
+        **evaluation.to_dict(),
+        "action": output.get("postAction"),
+        "reason": output.get("reason"),
+    }
+
+
+@activity.defn
+async def read_dataset_page_activity(dataset: str, cursor: int, limit: int, fmt: str | None = None,
+                                     text_field: str = "text") -> dict:
+    """
+    An activity that reads one page of a batch dataset and prepares each
+    record for an `ExampleWorkflow` child: its workflow input (a blob
+    reference for a large document), content-derived workflow ID and SimHash,
+    as `cli/batch_start.py` does for a single document.
+
+    Args:
+        dataset: A JSONL or CSV file the workers can read, or a blob reference to one.
+        cursor: The byte offset to read from; 0 for the start of the dataset.
+        limit: The most records to return.
+        fmt: `jsonl` or `csv`; by default taken from the file extension.
+        text_field: The JSON key or CSV column holding the text.
+
+    Returns:
+        A dictionary with the page's `items` and the `next_cursor`, which is
+        `None` after the last page.
+    """
+    def read() -> dict:
+        page = read_page(dataset, cursor, limit, fmt, text_field)
+        items = [
+            {
+                "offset": offset,
+                "input": document_input(text),
+                "workflow_id": workflow_id_for(text),
+                "simhash": f"{simhash(text):016x}",
+            }
+            for offset, text in page.records
+        ]
+        return {"items": items, "next_cursor": page.next_cursor}
+
+    # Reading the page and storing large documents in the blob store block on I/O.
+    page = await asyncio.to_thread(read)
+    logger.info(f"Read {len(page['items'])} record(s) from '{dataset}' at offset {cursor}.")
+    return page
 
-        activity.heartbeat("Evaluating routing rules...")
-        # Route the context using the engine from the initialized client
-        routing_result: RoutingResult = await client.routing_engine.route(routing_context)
-        logger.info(f"Routing decision: '{routing_result.decision.value}' based on reason: '{routing_result.reason}'")
 
-        # Return the routing result as a dictionary
-        return routing_result.to_dict()
+# Every activity a worker registers for ExampleWorkflow and BatchProcessingWorkflow.
+ACTIVITIES = [
+    llm_activity,
+    guardrails_activity,
+    routing_activity,
+    post_rules_activity,
+    pin_rules_snapshot_activity,
+    chunk_document_activity,
+    reduce_chunks_activity,
+    combine_items_activity,
+    read_dataset_page_activity,
+]
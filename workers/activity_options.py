@@ -0,0 +1,137 @@
+"""
+Activity Options
+
+Loads the timeouts and retry policies of `ExampleWorkflow`'s activities from
+`activity_options.yaml`, so they can be tuned without touching workflow code.
+The workflow spreads them into each call:
+
+    await workflow.execute_activity(llm_activity, text, **activity_options("llm_activity"))
+
+The worker loads the file once at startup, outside the workflow sandbox, and
+workflows read the cached result. A workflow never loads it itself: reading
+files and importing yaml have no place in the sandbox, so `activity_options()`
+raises if the host did not load the options first. Timeouts and retry
+policies are not part of the replay check, so changing them does not break
+running workflows.
+"""
+
+import logging
+import os
+from datetime import timedelta
+from pathlib import Path
+
+from temporalio import workflow
+from temporalio.common import RetryPolicy
+
+from .startup import lazy_import
+
+yaml = lazy_import("yaml")
+
+logger = logging.getLogger(__name__)
+
+ACTIVITY_OPTIONS_FILE = os.getenv("ACTIVITY_OPTIONS_FILE", "activity_options.yaml")
+
+# Used for any activity the file does not mention, and when there is no file.
+DEFAULT_SPEC = {"defaults": {"start_to_close": 60}}
+
+_TIMEOUTS = {
+    "start_to_close": "start_to_close_timeout",
+    "schedule_to_close": "schedule_to_close_timeout",
+    "schedule_to_start": "schedule_to_start_timeout",
+    "heartbeat_timeout": "heartbeat_timeout",
+}
+_RETRY_FIELDS = {"initial_interval", "backoff_coefficient", "maximum_interval", "maximum_attempts", "non_retryable_error_types"}
+
+
+class ActivityOptionsError(Exception):
+    """Raised when the activity options file is invalid."""
+
+
+def _seconds(value, where: str) -> timedelta:
+    if not isinstance(value, (int, float)) or value <= 0:
+        raise ActivityOptionsError(f"{where} must be a positive number of seconds, got {value!r}")
+    return timedelta(seconds=value)
+
+
+def retry_policy(spec: dict, where: str = "retry") -> RetryPolicy:
+    """Builds a Temporal retry policy from a `retry` block."""
+    unknown = set(spec) - _RETRY_FIELDS
+    if unknown:
+        raise ActivityOptionsError(f"Unknown {where} option(s): {', '.join(sorted(unknown))}")
+    kwargs = {}
+    for field in ("initial_interval", "maximum_interval"):
+        if field in spec:
+            kwargs[field] = _seconds(spec[field], f"{where}.{field}")
+    if "backoff_coefficient" in spec:
+        kwargs["backoff_coefficient"] = float(spec["backoff_coefficient"])
+    if "maximum_attempts" in spec:
+        kwargs["maximum_attempts"] = int(spec["maximum_attempts"])
+    if "non_retryable_error_types" in spec:
+        kwargs["non_retryable_error_types"] = [str(name) for name in spec["non_retryable_error_types"]]
+    return RetryPolicy(**kwargs)
+
+
+def compile_options(spec: dict) -> dict[str, dict]:
+    """
+    Turns a parsed options file into `execute_activity` keyword arguments per
+    activity. The `"*"` entry holds the defaults.
+    """
+    defaults = spec.get("defaults") or {}
+    activities = spec.get("activities") or {}
+    compiled = {}
+    for name, options in {"*": {}, **activities}.items():
+        options = options or {}
+        merged = {**defaults, **options, "retry": {**(defaults.get("retry") or {}), **(options.get("retry") or {})}}
+        unknown = set(merged) - set(_TIMEOUTS) - {"retry"}
+        if unknown:
+            raise ActivityOptionsError(f"Unknown option(s) for '{name}': {', '.join(sorted(unknown))}")
+        kwargs = {
+            argument: _seconds(merged[key], f"{name}.{key}") for key, argument in _TIMEOUTS.items() if key in merged
+        }
+        if "start_to_close_timeout" not in kwargs and "schedule_to_close_timeout" not in kwargs:
+            raise ActivityOptionsError(f"'{name}' needs a start_to_close or schedule_to_close timeout")
+        if merged["retry"]:
+            kwargs["retry_policy"] = retry_policy(merged["retry"], f"{name}.retry")
+        compiled[name] = kwargs
+    return compiled
+
+
+_options: dict[str, dict] | None = None
+_rate_limit: dict = {}
+
+
+def load_activity_options(path: str | Path = ACTIVITY_OPTIONS_FILE) -> dict[str, dict]:
+    """
+    Loads and caches the options file. Called by the worker at startup.
+    """
+    global _options, _rate_limit
+    path = Path(path)
+    if path.exists():
+        spec = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    else:
+        logger.warning(f"Activity options file '{path}' not found; using default timeouts.")
+        spec = DEFAULT_SPEC
+    _options = compile_options(spec)
+    _rate_limit = spec.get("rate_limit") or {}
+    return _options
+
+
+def activity_options(name: str) -> dict:
+    """
+    Returns the `execute_activity` keyword arguments for an activity. Outside
+    a workflow the options are loaded on first use.
+    """
+    if _options is None:
+        if workflow.in_workflow():
+            raise ActivityOptionsError(
+                "Activity options are not loaded: call load_activity_options() on the worker before running workflows"
+            )
+        load_activity_options()
+    return _options.get(name, _options["*"])
+
+
+def rate_limit_backoff() -> tuple[float, float]:
+    """Returns the initial and maximum backoff, in seconds, for rate-limited calls."""
+    if _options is None:
+        load_activity_options()
+    return float(_rate_limit.get("initial", 10)), float(_rate_limit.get("maximum", 300))
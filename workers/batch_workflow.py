@@ -0,0 +1,141 @@
+"""
+Batch Processing Workflow for the TraceRail Bootstrap Application
+
+`BatchProcessingWorkflow` processes a whole dataset for scheduled and bulk
+runs: it pages through the file and starts an `ExampleWorkflow` child per
+record, a window at a time and at a capped rate, continuing as new before its
+history grows large.
+
+It lives apart from `workflows.py` so that neither workflow's sandbox
+re-imports the other. Children are started by workflow type name, which is
+the same command the typed `ExampleWorkflow.run` handle would send.
+"""
+
+import asyncio
+import logging
+from datetime import timedelta
+from temporalio import workflow
+from temporalio.common import WorkflowIDReusePolicy
+from temporalio.exceptions import ChildWorkflowError, WorkflowAlreadyStartedError
+
+with workflow.unsafe.imports_passed_through():
+    from .activities import read_dataset_page_activity
+    from .activity_options import activity_options
+    from .models import BATCH_DEFAULTS, BATCH_HISTORY_EVENTS
+    from .search_attributes import WORKFLOW_TYPE, initial_attributes
+
+logger = logging.getLogger(__name__)
+
+
+@workflow.defn
+class BatchProcessingWorkflow:
+    """
+    Processes every record of a dataset with an `ExampleWorkflow` child.
+
+    Records are read a page at a time by an activity, and children are started
+    a window at a time, no faster than `max_per_second`. Children are
+    abandoned rather than cancelled when the batch closes, so cases waiting
+    for a human outlive it. Child workflow IDs are derived from the content,
+    as in `cli/batch_start.py`, so a record whose case already exists is
+    counted and skipped, and a restarted batch can safely repeat a page. A
+    case that failed (its run failed) is started again.
+
+    Progress is a small dictionary (cursor and counts) that is carried across
+    continue-as-new and can be read with the `progress` query.
+    """
+
+    def __init__(self):
+        self._progress: dict = {}
+
+    @workflow.run
+    async def run(self, batch: dict) -> dict:
+        """
+        Executes the batch.
+
+        Args:
+            batch: The `dataset` (a JSONL or CSV file the workers can read, or
+                a blob reference to one) and, optionally, its `format` and text
+                `field`, the `page_size`, the `window` of children started
+                together, `max_per_second`, `wait` to also wait for each
+                window's children to complete, and `search_attributes`
+                (false starts the children without search attributes). A
+                continued or resumed batch also carries its `progress`.
+
+        Returns:
+            The final progress.
+        """
+        options = {**BATCH_DEFAULTS, **batch}
+        self._progress = {
+            "cursor": 0, "pages": 0, "started": 0, "existing": 0, "completed": 0, "failed": 0, "runs": 0,
+            **(batch.get("progress") or {}),
+        }
+        self._progress["runs"] += 1
+        workflow.logger.info(f"Batch run {self._progress['runs']} of '{options['dataset']}' from offset {self._progress['cursor']}")
+
+        while self._progress["cursor"] is not None:
+            page = await workflow.execute_activity(
+                read_dataset_page_activity,
+                args=[options["dataset"], self._progress["cursor"], options["page_size"], options["format"], options["field"]],
+                **activity_options("read_dataset_page_activity"),
+            )
+            items = page["items"]
+            for start in range(0, len(items), options["window"]):
+                await self._run_window(items[start:start + options["window"]], options)
+            # The cursor only moves past a page once all of it was started.
+            self._progress["cursor"] = page["next_cursor"]
+            self._progress["pages"] += 1
+
+            info = workflow.info()
+            if self._progress["cursor"] is not None and (
+                info.is_continue_as_new_suggested() or info.get_current_history_length() >= BATCH_HISTORY_EVENTS
+            ):
+                workflow.logger.info(f"Continuing as new at offset {self._progress['cursor']}: {self._progress}")
+                workflow.continue_as_new({**batch, "progress": self._progress})
+
+        workflow.logger.info(f"Batch of '{options['dataset']}' finished: {self._progress}")
+        return self._progress
+
+    async def _run_window(self, items: list[dict], options: dict) -> None:
+        """Starts a window of children, then waits out the rest of its rate budget."""
+        window_start = workflow.now()
+        await asyncio.gather(*(self._run_child(item, options["wait"], options["search_attributes"]) for item in items))
+        if options["max_per_second"]:
+            budget = timedelta(seconds=len(items) / options["max_per_second"])
+            remaining = budget - (workflow.now() - window_start)
+            if remaining > timedelta(0):
+                await asyncio.sleep(remaining.total_seconds())
+
+    async def _run_child(self, item: dict, wait: bool, search_attributes: bool) -> None:
+        try:
+            handle = await workflow.start_child_workflow(
+                WORKFLOW_TYPE,
+                item["input"],
+                id=item["workflow_id"],
+                parent_close_policy=workflow.ParentClosePolicy.ABANDON,
+                id_reuse_policy=WorkflowIDReusePolicy.ALLOW_DUPLICATE_FAILED_ONLY,
+                memo={"simhash": item["simhash"]},
+                search_attributes=initial_attributes(search_attributes),
+            )
+        except WorkflowAlreadyStartedError:
+            # Started by an earlier run of the batch, another batch, or a duplicate record.
+            self._progress["existing"] += 1
+            return
+        self._progress["started"] += 1
+        if not wait:
+            return
+        try:
+            result = await handle
+        except ChildWorkflowError as e:
+            workflow.logger.warning(f"Child {item['workflow_id']} failed: {e}")
+            self._progress["failed"] += 1
+            return
+        if isinstance(result, dict) and result.get("status") == "FAILED":
+            # A child run by a worker from before failed cases failed their run.
+            self._progress["failed"] += 1
+        else:
+            self._progress["completed"] += 1
+
+    @workflow.query
+    def progress(self) -> dict:
+        """Returns the batch's cursor and counts."""
+        return self._progress
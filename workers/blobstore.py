@@ -0,0 +1,274 @@
+"""
+Blob Store
+
+A local, content-addressed store for payloads too large to travel through
+workflow history, such as whole documents, their chunks, and any payload the
+claim-check codec (`workers/claimcheck.py`) offloads. A blob is kept under the
+SHA-256 of its bytes, and workflows pass around a short reference
+(`blob:<sha256>`) instead of the content itself.
+
+Because keys are derived from the content, writing the same blob twice only
+refreshes its timestamp, and a blob never changes once written. The timestamp
+is what garbage collection goes by (see `bin/blob-gc.py`): a blob untouched
+for longer than the namespace's retention can no longer be referenced by any
+workflow history.
+
+Two backends are available, chosen with `BLOB_STORE`:
+
+- `filesystem` (default): one file per blob under `BLOB_STORE_DIR`. Large
+  blobs are read through a memory map instead of being copied into a buffer.
+- `sqlite`: a single SQLite database at `BLOB_STORE_DB`, memory-mapped by
+  SQLite itself up to `BLOB_MMAP_SIZE` bytes.
+
+The store must be shared by the starters and all workers (a volume or network
+mount) for a reference created on one machine to be resolved on another.
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+BLOB_STORE = os.getenv("BLOB_STORE", "filesystem").lower()
+BLOB_STORE_DIR = Path(os.getenv("BLOB_STORE_DIR", ".blobs"))
+BLOB_STORE_DB = Path(os.getenv("BLOB_STORE_DB", ".blobs.sqlite3"))
+# Filesystem blobs at least this large are memory-mapped when read
+BLOB_MMAP_THRESHOLD = int(os.getenv("BLOB_MMAP_THRESHOLD", str(1024 * 1024)))
+# How much of the SQLite database may be memory-mapped
+BLOB_MMAP_SIZE = int(os.getenv("BLOB_MMAP_SIZE", str(1024 * 1024 * 1024)))
+BLOB_REF_PREFIX = "blob:"
+
+
+class BlobNotFoundError(Exception):
+    """Raised when a referenced blob is not in the store."""
+
+
+def blob_ref(key: str) -> str:
+    """Returns the reference that stands in for a blob in workflow payloads."""
+    return f"{BLOB_REF_PREFIX}{key}"
+
+
+def is_blob_ref(value) -> bool:
+    """Returns True when a value is a blob reference rather than inline content."""
+    return isinstance(value, str) and value.startswith(BLOB_REF_PREFIX) and len(value) == len(BLOB_REF_PREFIX) + 64
+
+
+def key_of(ref: str) -> str:
+    """Returns the blob key of a reference."""
+    return ref[len(BLOB_REF_PREFIX):]
+
+
+def blob_key(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobStore(ABC):
+    """
+    The interface shared by the backends. Stores are safe to use from
+    several threads, but block on I/O: call them from async code through
+    `asyncio.to_thread`.
+    """
+
+    @abstractmethod
+    def put(self, data: bytes) -> str:
+        """Stores `data` (or refreshes its timestamp) and returns its key."""
+
+    @abstractmethod
+    def get(self, key: str) -> bytes:
+        """Returns a blob, or raises `BlobNotFoundError`."""
+
+    @contextmanager
+    def view(self, key: str) -> Iterator[memoryview]:
+        """
+        Yields a read-only view of a blob, valid until the block exits. Large
+        blobs are not copied where the backend can avoid it.
+        """
+        yield memoryview(self.get(key))
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """Returns True when a blob is in the store."""
+
+    @abstractmethod
+    def sweep(self, older_than: float, dry_run: bool = False) -> tuple[int, int]:
+        """
+        Deletes the blobs last written before the `older_than` timestamp.
+
+        Returns:
+            The number of blobs and bytes deleted (or, with `dry_run`, that
+            would be).
+        """
+
+    def close(self) -> None:
+        pass
+
+    def put_text(self, text: str) -> str:
+        return self.put(text.encode("utf-8"))
+
+    def get_text(self, key: str) -> str:
+        return self.get(key).decode("utf-8")
+
+
+class FileBlobStore(BlobStore):
+    """
+    Stores blobs as files under `root`, fanned out by the first two hex
+    digits of their key so no directory grows too large.
+    """
+
+    def __init__(self, root: str | Path = BLOB_STORE_DIR, mmap_threshold: int = BLOB_MMAP_THRESHOLD):
+        self.root = Path(root)
+        self.mmap_threshold = mmap_threshold
+
+    def path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def put(self, data: bytes) -> str:
+        key = blob_key(data)
+        path = self.path(key)
+        try:
+            # Already stored: mark it as recently referenced, so GC keeps it.
+            os.utime(path)
+            return key
+        except FileNotFoundError:
+            pass
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so a reader never sees a partial blob.
+        temporary = path.with_name(f".{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temporary.write_bytes(data)
+        temporary.replace(path)
+        return key
+
+    def get(self, key: str) -> bytes:
+        try:
+            return self.path(key).read_bytes()
+        except FileNotFoundError:
+            raise BlobNotFoundError(f"Blob '{key}' not found in {self.root}") from None
+
+    @contextmanager
+    def view(self, key: str) -> Iterator[memoryview]:
+        try:
+            f = self.path(key).open("rb")
+        except FileNotFoundError:
+            raise BlobNotFoundError(f"Blob '{key}' not found in {self.root}") from None
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            if size < max(self.mmap_threshold, 1):
+                yield memoryview(f.read())
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    yield view
+                finally:
+                    view.release()
+
+    def exists(self, key: str) -> bool:
+        return self.path(key).exists()
+
+    def sweep(self, older_than: float, dry_run: bool = False) -> tuple[int, int]:
+        deleted = size = 0
+        for path in self.root.glob("??/*"):
+            if path.name.startswith("."):
+                continue
+            stat = path.stat()
+            if stat.st_mtime >= older_than:
+                continue
+            if not dry_run:
+                path.unlink(missing_ok=True)
+            deleted += 1
+            size += stat.st_size
+        return deleted, size
+
+
+class SQLiteBlobStore(BlobStore):
+    """
+    Stores blobs in one SQLite database in WAL mode, so readers do not block
+    the writer. All threads share one connection behind a lock.
+    """
+
+    def __init__(self, path: str | Path = BLOB_STORE_DB, mmap_size: int = BLOB_MMAP_SIZE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS blobs ("
+            " key TEXT PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL, touched_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS blobs_touched_at ON blobs (touched_at)")
+
+    def put(self, data: bytes) -> str:
+        key = blob_key(data)
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO blobs (key, data, size, touched_at) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET touched_at = excluded.touched_at",
+                (key, data, len(data), time.time()),
+            )
+        return key
+
+    def get(self, key: str) -> bytes:
+        with self._lock:
+            row = self._db.execute("SELECT data FROM blobs WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            raise BlobNotFoundError(f"Blob '{key}' not found in {self.path}")
+        return row[0]
+
+    def exists(self, key: str) -> bool:
+        with self._lock:
+            return self._db.execute("SELECT 1 FROM blobs WHERE key = ?", (key,)).fetchone() is not None
+
+    def sweep(self, older_than: float, dry_run: bool = False) -> tuple[int, int]:
+        with self._lock:
+            deleted, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs WHERE touched_at < ?", (older_than,)
+            ).fetchone()
+            if not dry_run and deleted:
+                self._db.execute("DELETE FROM blobs WHERE touched_at < ?", (older_than,))
+        return deleted, size
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def create_blob_store(backend: str = BLOB_STORE) -> BlobStore:
+    """Creates a store for a `BLOB_STORE` backend name."""
+    if backend == "filesystem":
+        return FileBlobStore()
+    if backend == "sqlite":
+        return SQLiteBlobStore()
+    raise ValueError(f"Unknown blob store '{backend}': expected 'filesystem' or 'sqlite'")
+
+
+_store: BlobStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    """Returns the process-wide blob store configured by `BLOB_STORE`."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = create_blob_store()
+    return _store
+
+
+def resolve(value: str) -> str:
+    """Returns the text behind a blob reference, or `value` itself if it is inline."""
+    if is_blob_ref(value):
+        return get_blob_store().get_text(key_of(value))
+    return value
@@ -0,0 +1,219 @@
+"""
+LLM Provider Circuit Breakers
+
+One circuit breaker per LLM provider, shared by every activity in the worker.
+When a provider degrades, requests to it stop waiting out the activity's full
+timeout: once enough recent calls have failed or been slow, the circuit opens
+and calls fail immediately (or `llm_activity` fails over to another provider)
+instead of tying up worker slots.
+
+A breaker is **closed** while the provider is healthy and tracks the outcome
+of the last `LLM_BREAKER_WINDOW` calls. It **opens** when, with at least
+`LLM_BREAKER_MIN_CALLS` calls in the window, the failure rate or the rate of
+calls slower than `LLM_BREAKER_SLOW_CALL_MS` reaches its threshold. Calls
+running longer than `LLM_BREAKER_CALL_TIMEOUT` seconds are abandoned and
+count as failures, so a provider that hangs trips the breaker too. After
+`LLM_BREAKER_OPEN_SECONDS` the breaker goes **half-open** and lets a few probe
+calls through: a successful probe closes it, a failed one opens it again.
+
+Each breaker's state is exported as the `tracerail_llm_circuit_state` gauge
+(0 closed, 1 half-open, 2 open).
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+
+from .metrics import activity_meter
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+BREAKER_ENABLED = os.getenv("LLM_BREAKER", "true").lower() == "true"
+BREAKER_WINDOW = int(os.getenv("LLM_BREAKER_WINDOW", "20"))
+BREAKER_MIN_CALLS = int(os.getenv("LLM_BREAKER_MIN_CALLS", "10"))
+BREAKER_FAILURE_RATE = float(os.getenv("LLM_BREAKER_FAILURE_RATE", "0.5"))
+BREAKER_SLOW_CALL_MS = int(os.getenv("LLM_BREAKER_SLOW_CALL_MS", "20000"))
+BREAKER_SLOW_CALL_RATE = float(os.getenv("LLM_BREAKER_SLOW_CALL_RATE", "0.8"))
+BREAKER_CALL_TIMEOUT = float(os.getenv("LLM_BREAKER_CALL_TIMEOUT", "45"))
+BREAKER_OPEN_SECONDS = float(os.getenv("LLM_BREAKER_OPEN_SECONDS", "30"))
+BREAKER_HALF_OPEN_PROBES = int(os.getenv("LLM_BREAKER_HALF_OPEN_PROBES", "1"))
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit for '{name}' is open; retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Args:
+        name: The provider the breaker guards, used in errors and metrics.
+        window: Number of recent calls the failure and slow rates cover.
+        min_calls: Calls needed in the window before the breaker may trip.
+        failure_rate: Fraction of failed calls that opens the circuit.
+        slow_call_ms: Calls taking at least this long count as slow.
+        slow_call_rate: Fraction of slow calls that opens the circuit.
+        call_timeout: Seconds after which a call is abandoned as failed (0 disables).
+        open_seconds: How long the circuit stays open before probing.
+        half_open_probes: Calls let through at a time while half-open.
+        is_failure: Decides whether an error counts against the provider.
+    """
+
+    def __init__(self, name: str, window: int = BREAKER_WINDOW, min_calls: int = BREAKER_MIN_CALLS,
+                 failure_rate: float = BREAKER_FAILURE_RATE, slow_call_ms: int = BREAKER_SLOW_CALL_MS,
+                 slow_call_rate: float = BREAKER_SLOW_CALL_RATE, call_timeout: float = BREAKER_CALL_TIMEOUT,
+                 open_seconds: float = BREAKER_OPEN_SECONDS, half_open_probes: int = BREAKER_HALF_OPEN_PROBES,
+                 is_failure: Callable[[BaseException], bool] = lambda error: True,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_ms = slow_call_ms
+        self.slow_call_rate = slow_call_rate
+        self.call_timeout = call_timeout
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.is_failure = is_failure
+        self._clock = clock
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+        # (failed, slow) for each recent call
+        self._calls: deque[tuple[bool, bool]] = deque(maxlen=window)
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls are rejected outright (half-open is not open)."""
+        return self.state == OPEN
+
+    @property
+    def retry_after(self) -> float:
+        """Seconds until an open circuit lets a probe through."""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.open_seconds - (self._clock() - self._opened_at))
+
+    def _transition(self, state: str) -> None:
+        if state == self._state:
+            return
+        logger.warning(f"Circuit for LLM provider '{self.name}' is now {state.replace('_', '-')} (was {self._state}).")
+        self._state = state
+        self._probes = 0
+        if state == OPEN:
+            self._opened_at = self._clock()
+        elif state == CLOSED:
+            self._calls.clear()
+        activity_meter().create_counter(
+            "tracerail_llm_circuit_transitions", "LLM provider circuit state changes."
+        ).add(1, {"provider": self.name, "state": state})
+
+    def _publish(self) -> None:
+        activity_meter().create_gauge(
+            "tracerail_llm_circuit_state", "LLM provider circuit state: 0 closed, 1 half-open, 2 open."
+        ).set(STATE_VALUES[self._state], {"provider": self.name})
+
+    def _admit(self) -> None:
+        state = self.state
+        if state == OPEN or (state == HALF_OPEN and self._probes >= self.half_open_probes):
+            self.rejected += 1
+            self._publish()
+            raise CircuitOpenError(self.name, self.retry_after)
+        if state == HALF_OPEN:
+            self._probes += 1
+
+    def record(self, failed: bool, latency_ms: float) -> None:
+        """Records the outcome of a call and updates the state."""
+        slow = latency_ms >= self.slow_call_ms
+        if self._state == HALF_OPEN:
+            self._transition(OPEN if failed or slow else CLOSED)
+        elif self._state == CLOSED:
+            self._calls.append((failed, slow))
+            if len(self._calls) >= self.min_calls:
+                failures = sum(f for f, _ in self._calls) / len(self._calls)
+                slow_calls = sum(s for _, s in self._calls) / len(self._calls)
+                if failures >= self.failure_rate or slow_calls >= self.slow_call_rate:
+                    logger.warning(
+                        f"Tripping circuit for '{self.name}': {failures:.0%} failed, {slow_calls:.0%} slow "
+                        f"over the last {len(self._calls)} calls."
+                    )
+                    self._transition(OPEN)
+        self._publish()
+
+    def _release_probe(self) -> None:
+        if self._state == HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Runs `fn` through the breaker.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, without calling `fn`.
+        """
+        self._admit()
+        start = time.perf_counter()
+        try:
+            if self.call_timeout > 0:
+                async with asyncio.timeout(self.call_timeout):
+                    result = await fn()
+            else:
+                result = await fn()
+        except asyncio.CancelledError:
+            # Cancelled by the caller (a lost hedge, an activity timeout): not the provider's fault.
+            self._release_probe()
+            raise
+        except Exception as e:
+            if self.is_failure(e):
+                self.record(True, (time.perf_counter() - start) * 1000)
+            else:
+                self._release_probe()
+            raise
+        self.record(False, (time.perf_counter() - start) * 1000)
+        return result
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    """Returns the worker-wide breaker for a provider, creating it on first use."""
+    breaker = _breakers.get(provider)
+    if breaker is None:
+        from .errors import VALIDATION, classify  # errors imports this module
+
+        # A request the provider rejected as invalid says nothing about its health.
+        breaker = _breakers[provider] = CircuitBreaker(provider, is_failure=lambda error: classify(error) != VALIDATION)
+    return breaker
+
+
+async def guarded(provider: str, fn: Callable[[], Awaitable[T]]) -> T:
+    """Calls `fn` through the provider's breaker, or directly when breakers are disabled."""
+    if not BREAKER_ENABLED:
+        return await fn()
+    return await get_breaker(provider).call(fn)
+
+
+def is_available(provider: str) -> bool:
+    """False while the provider's circuit is open (always True when breakers are disabled)."""
+    return not BREAKER_ENABLED or not get_breaker(provider).is_open
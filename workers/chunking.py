@@ -0,0 +1,106 @@
+"""
+Document Chunking
+
+Splits documents that are too large for a single LLM call into token-aware
+chunks for map-reduce processing. Text is cut at the largest natural boundary
+that fits: paragraphs first, then sentences, then words, so a chunk only ends
+mid-sentence when a single sentence is larger than the chunk budget. Each unit
+is tokenized once, with the same encoding as the prompt cache, and consecutive
+chunks overlap by a few units so context at the boundaries is not lost.
+
+Starters offload large documents to the blob store (see `document_input`), and
+`ExampleWorkflow` processes any blob reference it receives in chunks.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from typing import Callable
+
+from .blobstore import BlobStore, blob_ref, get_blob_store
+from .prompts import prompt_cache
+
+# Documents longer than this are offloaded to the blob store and processed in chunks
+LARGE_DOCUMENT_CHARS = int(os.getenv("LARGE_DOCUMENT_CHARS", "32000"))
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "2000"))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "100"))
+
+# Each pattern keeps the whitespace that follows a unit, so joining units restores the text.
+_PARAGRAPHS = re.compile(r"\S.*?(?:\n[ \t]*\n\s*|\s*\Z)", re.S)
+_SENTENCES = re.compile(r"\S.*?(?:[.!?](?:\s+|\Z)|\Z)", re.S)
+_WORDS = re.compile(r"\S+\s*")
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """A piece of a document and its approximate token count."""
+
+    text: str
+    tokens: int
+
+
+def _units(text: str, max_tokens: int, count_tokens: Callable[[str], int]) -> list[tuple[str, int]]:
+    """
+    Splits text into `(unit, tokens)` pairs of at most `max_tokens` each,
+    preferring paragraph, then sentence, then word boundaries.
+    """
+    units = []
+    for paragraph in _PARAGRAPHS.findall(text):
+        tokens = count_tokens(paragraph)
+        if tokens <= max_tokens:
+            units.append((paragraph, tokens))
+            continue
+        for sentence in _SENTENCES.findall(paragraph):
+            tokens = count_tokens(sentence)
+            if tokens <= max_tokens:
+                units.append((sentence, tokens))
+                continue
+            # A single oversized sentence: cut it into evenly sized runs of words.
+            words = _WORDS.findall(sentence)
+            pieces = -(-tokens // max_tokens)
+            size = -(-len(words) // pieces)
+            for i in range(0, len(words), size):
+                piece = "".join(words[i:i + size])
+                units.append((piece, count_tokens(piece)))
+    return units
+
+
+def chunk_text(text: str, max_tokens: int = CHUNK_MAX_TOKENS, overlap_tokens: int = CHUNK_OVERLAP_TOKENS,
+               count_tokens: Callable[[str], int] = prompt_cache.count_tokens) -> list[Chunk]:
+    """
+    Packs a document into chunks of at most `max_tokens` (as counted per
+    unit), each starting with up to `overlap_tokens` of the previous chunk.
+    """
+    if max_tokens <= 0:
+        raise ValueError("max_tokens must be positive")
+    overlap_tokens = min(overlap_tokens, max_tokens // 2)
+
+    chunks = []
+    current: list[tuple[str, int]] = []
+    current_tokens = 0
+    for unit, tokens in _units(text, max_tokens, count_tokens):
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(Chunk("".join(u for u, _ in current).strip(), current_tokens))
+            # Carry the trailing units that fit in the overlap into the next chunk.
+            overlap, overlap_size = [], 0
+            for previous in reversed(current):
+                if overlap_size + previous[1] > overlap_tokens or overlap_size + previous[1] + tokens > max_tokens:
+                    break
+                overlap.insert(0, previous)
+                overlap_size += previous[1]
+            current, current_tokens = overlap, overlap_size
+        current.append((unit, tokens))
+        current_tokens += tokens
+    if current:
+        chunks.append(Chunk("".join(u for u, _ in current).strip(), current_tokens))
+    return chunks
+
+
+def document_input(text: str, threshold: int = LARGE_DOCUMENT_CHARS, store: BlobStore | None = None) -> str:
+    """
+    Returns the workflow input for a document: the text itself, or a blob
+    reference when it is longer than `threshold` characters.
+    """
+    if len(text) <= threshold:
+        return text
+    return blob_ref((store or get_blob_store()).put_text(text))
@@ -0,0 +1,105 @@
+"""
+Claim-Check Payload Codec
+
+Keeps large payloads out of Temporal history. Every payload (workflow inputs
+and results, activity arguments and return values, signals) passes through
+this codec on the client and the worker. Payloads larger than
+`CLAIM_CHECK_THRESHOLD` bytes are written to the blob store, and history gets
+a small reference payload in their place; decoding swaps the blob back in.
+Small payloads are passed through untouched, so typical cases pay nothing.
+
+The codec must be configured on every client that reads or writes these
+workflows: the worker, the starters and anything that fetches results.
+"""
+
+import asyncio
+import dataclasses
+import logging
+import os
+from typing import Sequence
+
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import DataConverter, PayloadCodec
+
+from .blobstore import BlobStore, get_blob_store
+
+logger = logging.getLogger(__name__)
+
+# Payloads larger than this many bytes are offloaded (0 disables offloading)
+CLAIM_CHECK_THRESHOLD = int(os.getenv("CLAIM_CHECK_THRESHOLD", str(64 * 1024)))
+
+ENCODING = b"binary/claim-check"
+KEY_METADATA = "claim-check-key"
+SIZE_METADATA = "claim-check-size"
+
+
+class ClaimCheckCodec(PayloadCodec):
+    """
+    Offloads payloads above `threshold` bytes to a blob store. Store I/O runs
+    in a thread, so it never blocks the worker's event loop.
+    """
+
+    def __init__(self, store: BlobStore | None = None, threshold: int = CLAIM_CHECK_THRESHOLD):
+        self._store = store
+        self.threshold = threshold
+
+    @property
+    def store(self) -> BlobStore:
+        if self._store is None:
+            self._store = get_blob_store()
+        return self._store
+
+    def _offload(self, payloads: list[Payload]) -> list[Payload]:
+        references = []
+        for payload in payloads:
+            data = payload.SerializeToString()
+            key = self.store.put(data)
+            logger.debug(f"Offloaded a {len(data)}-byte payload to blob {key}")
+            references.append(Payload(
+                metadata={
+                    "encoding": ENCODING,
+                    KEY_METADATA: key.encode(),
+                    SIZE_METADATA: str(len(data)).encode(),
+                },
+                data=b"",
+            ))
+        return references
+
+    def _restore(self, references: list[Payload]) -> list[Payload]:
+        payloads = []
+        for reference in references:
+            payload = Payload()
+            # Large blobs are parsed straight from a memory map, without a read buffer.
+            with self.store.view(reference.metadata[KEY_METADATA].decode()) as view:
+                payload.ParseFromString(view)
+            payloads.append(payload)
+        return payloads
+
+    async def encode(self, payloads: Sequence[Payload]) -> list[Payload]:
+        encoded = list(payloads)
+        if self.threshold <= 0:
+            return encoded
+        large = [i for i, payload in enumerate(encoded) if payload.ByteSize() > self.threshold]
+        if large:
+            references = await asyncio.to_thread(self._offload, [encoded[i] for i in large])
+            for i, reference in zip(large, references):
+                encoded[i] = reference
+        return encoded
+
+    async def decode(self, payloads: Sequence[Payload]) -> list[Payload]:
+        decoded = list(payloads)
+        claimed = [i for i, payload in enumerate(decoded) if payload.metadata.get("encoding") == ENCODING]
+        if claimed:
+            restored = await asyncio.to_thread(self._restore, [decoded[i] for i in claimed])
+            for i, payload in zip(claimed, restored):
+                decoded[i] = payload
+        return decoded
+
+
+def data_converter(threshold: int = CLAIM_CHECK_THRESHOLD) -> DataConverter:
+    """
+    Returns the default data converter with the claim-check codec. With a
+    threshold of 0 nothing new is offloaded, but references already in
+    history are still resolved.
+    """
+    return dataclasses.replace(DataConverter.default, payload_codec=ClaimCheckCodec(threshold=threshold))
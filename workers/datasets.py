@@ -0,0 +1,125 @@
+"""
+Dataset Pages
+
+Reads a JSONL or CSV dataset one page at a time for `BatchProcessingWorkflow`.
+A dataset is a file the workers can read (a shared volume or network mount) or
+a blob reference to one. Pages are addressed by a byte offset into the file,
+so reading page 10,000 seeks straight to it instead of re-reading every
+earlier record, and a batch can resume from the cursor it last recorded.
+
+The formats match `cli/batch_start.py`: one JSON string or object per line,
+or a CSV file with a header row. Quoted CSV fields may span lines.
+"""
+
+import csv
+import io
+import json
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import IO, Iterator
+
+from .blobstore import FileBlobStore, get_blob_store, is_blob_ref, key_of
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("jsonl", "csv")
+
+
+class DatasetError(Exception):
+    """Raised when a dataset cannot be read."""
+
+
+@dataclass
+class Page:
+    """
+    A page of dataset records: `(offset, text)` pairs, where `offset` is the
+    byte offset the record starts at, and the cursor of the next page, or
+    `None` after the last record.
+    """
+
+    records: list[tuple[int, str]] = field(default_factory=list)
+    next_cursor: int | None = None
+
+
+def dataset_format(dataset: str, fmt: str | None = None) -> str:
+    """Returns the dataset's format: `fmt` if given, else from its extension."""
+    fmt = fmt or ("csv" if dataset.lower().endswith(".csv") else "jsonl")
+    if fmt not in FORMATS:
+        raise DatasetError(f"Unknown dataset format '{fmt}'; expected one of {', '.join(FORMATS)}")
+    return fmt
+
+
+@contextmanager
+def open_dataset(dataset: str) -> Iterator[IO[bytes]]:
+    """Opens a dataset path or blob reference as a seekable binary file."""
+    if is_blob_ref(dataset):
+        store = get_blob_store()
+        if isinstance(store, FileBlobStore):
+            dataset = str(store.path(key_of(dataset)))
+        else:
+            with io.BytesIO(store.get(key_of(dataset))) as f:
+                yield f
+            return
+    try:
+        f = open(dataset, "rb")
+    except OSError as e:
+        raise DatasetError(f"Cannot open dataset '{dataset}': {e}") from e
+    with f:
+        yield f
+
+
+def _lines(f: IO[bytes], positions: list[int]) -> Iterator[str]:
+    """Yields decoded lines, recording the offset after each in `positions`."""
+    while line := f.readline():
+        positions.append(f.tell())
+        yield line.decode("utf-8")
+
+
+def _texts(f: IO[bytes], fmt: str, text_field: str, header: list[str] | None) -> Iterator[tuple[int, str | None]]:
+    """Yields `(offset, text)` for each record from the file's position on."""
+    positions = [f.tell()]
+    if fmt == "csv":
+        for row in csv.reader(_lines(f, positions)):
+            yield positions[0], dict(zip(header, row)).get(text_field)
+            del positions[:-1]
+        return
+    for line in _lines(f, positions):
+        offset = positions[0]
+        del positions[:-1]
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise DatasetError(f"Invalid JSON record at offset {offset}: {e}") from e
+        yield offset, record if isinstance(record, str) else record.get(text_field)
+
+
+def read_page(dataset: str, cursor: int = 0, limit: int = 1000, fmt: str | None = None,
+              text_field: str = "text") -> Page:
+    """
+    Reads up to `limit` records starting at byte offset `cursor` (0 for the
+    start of the dataset). Records without text are skipped but still advance
+    the cursor.
+    """
+    fmt = dataset_format(dataset, fmt)
+    page = Page()
+    with open_dataset(dataset) as f:
+        header = None
+        if fmt == "csv":
+            header = next(csv.reader(_lines(f, [])), None)
+            if header is None:
+                return page
+        if cursor:
+            f.seek(cursor)
+        for offset, text in _texts(f, fmt, text_field, header):
+            if text:
+                page.records.append((offset, text))
+            if len(page.records) >= limit:
+                break
+        # Another record follows unless the page stopped at the end of the file.
+        end = f.tell()
+        page.next_cursor = end if f.read(1) else None
+    return page
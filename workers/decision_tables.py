@@ -0,0 +1,498 @@
+"""
+Local DMN Decision Table Evaluator
+
+Compiles the decision tables in `dmn/` into Python predicates so they can be
+evaluated inside the worker without a round trip to Flowable. Only the subset
+of FEEL used by our tables is supported: `-`, comparisons (`< 0.6`), ranges
+(`[1..10]`), literal lists (`"a","b"`), `not(...)`, and boolean expressions
+with `and`/`or` over `contains`, `starts with`, `ends with`, `lower`, `upper`
+and `string length`.
+
+At compile time every rule records which inputs it depends on. When a single
+field changes (for example, a reviewer corrects an extracted value), only the
+rules that read that field are re-evaluated; every other rule keeps its
+previous result.
+
+PRIORITY and OUTPUT ORDER tables rank matched rules by the order of their
+outputs' allowed values (`outputValues`), as the DMN standard specifies.
+"""
+
+import hashlib
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+Predicate = Callable[[Any, dict], bool]
+
+
+class DecisionTableError(Exception):
+    """Raised when a decision table cannot be parsed or evaluated."""
+
+
+# --- FEEL Subset ---
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<number>-?\d+(?:\.\d+)?)
+      | (?P<string>"(?:[^"\\]|\\.)*")
+      | (?P<op><=|>=|!=|<|>|=|\.\.|[(),\[\]])
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*(?:\ (?:with|length)\b)?)
+    )""",
+    re.VERBOSE,
+)
+
+_FUNCTIONS: dict[str, Callable[..., Any]] = {
+    "contains": lambda s, sub: s is not None and sub in s,
+    "starts with": lambda s, prefix: s is not None and s.startswith(prefix),
+    "ends with": lambda s, suffix: s is not None and s.endswith(suffix),
+    "lower": lambda s: s.lower() if s is not None else None,
+    "upper": lambda s: s.upper() if s is not None else None,
+    "string length": lambda s: len(s) if s is not None else 0,
+    "not": lambda value: not value,
+}
+
+_COMPARATORS: dict[str, Callable[[Any, Any], bool]] = {
+    "<": lambda a, b: a is not None and a < b,
+    "<=": lambda a, b: a is not None and a <= b,
+    ">": lambda a, b: a is not None and a > b,
+    ">=": lambda a, b: a is not None and a >= b,
+    "=": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+}
+
+
+def _tokenize(text: str) -> list[tuple[str, str]]:
+    tokens, position = [], 0
+    text = text.strip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if not match or match.end() == position:
+            raise DecisionTableError(f"Unsupported FEEL syntax near '{text[position:]}'")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """
+    A recursive-descent parser that turns a FEEL expression into a closure
+    over `(input_value, context)` and records the context names it reads.
+    """
+
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.position = 0
+        self.names: set[str] = set()
+
+    def peek(self) -> tuple[str, str] | None:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def take(self, value: str | None = None) -> tuple[str, str]:
+        token = self.peek()
+        if token is None or (value is not None and token[1] != value):
+            raise DecisionTableError(f"Expected '{value}' but found {token}")
+        self.position += 1
+        return token
+
+    def done(self) -> bool:
+        return self.position >= len(self.tokens)
+
+    # expression := and_expr ("or" and_expr)*
+    def expression(self) -> Callable[[dict], Any]:
+        left = self.and_expression()
+        while self.peek() == ("name", "or"):
+            self.take()
+            right = self.and_expression()
+            left = _either(left, right)
+        return left
+
+    def and_expression(self) -> Callable[[dict], Any]:
+        left = self.comparison()
+        while self.peek() == ("name", "and"):
+            self.take()
+            right = self.comparison()
+            left = _both(left, right)
+        return left
+
+    def comparison(self) -> Callable[[dict], Any]:
+        left = self.operand()
+        token = self.peek()
+        if token and token[0] == "op" and token[1] in _COMPARATORS:
+            compare = _COMPARATORS[self.take()[1]]
+            right = self.operand()
+            return lambda ctx: compare(left(ctx), right(ctx))
+        return left
+
+    def operand(self) -> Callable[[dict], Any]:
+        kind, value = self.take()
+        if kind == "number":
+            number = float(value)
+            return lambda ctx: number
+        if kind == "string":
+            text = value[1:-1].replace('\\"', '"')
+            return lambda ctx: text
+        if kind == "op" and value == "(":
+            inner = self.expression()
+            self.take(")")
+            return inner
+        if kind == "name":
+            if value in ("true", "false"):
+                constant = value == "true"
+                return lambda ctx: constant
+            if value == "null":
+                return lambda ctx: None
+            if self.peek() == ("op", "("):
+                return self.call(value)
+            self.names.add(value)
+            return lambda ctx: ctx.get(value)
+        raise DecisionTableError(f"Unexpected token '{value}'")
+
+    def call(self, name: str) -> Callable[[dict], Any]:
+        function = _FUNCTIONS.get(name)
+        if function is None:
+            raise DecisionTableError(f"Unsupported FEEL function '{name}'")
+        self.take("(")
+        args = [] if self.peek() == ("op", ")") else [self.expression()]
+        while self.peek() == ("op", ","):
+            self.take()
+            args.append(self.expression())
+        self.take(")")
+        return lambda ctx: function(*(arg(ctx) for arg in args))
+
+
+def _either(left: Callable[[dict], Any], right: Callable[[dict], Any]) -> Callable[[dict], bool]:
+    return lambda ctx: bool(left(ctx)) or bool(right(ctx))
+
+
+def _both(left: Callable[[dict], Any], right: Callable[[dict], Any]) -> Callable[[dict], bool]:
+    return lambda ctx: bool(left(ctx)) and bool(right(ctx))
+
+
+def _compile_unary_test(text: str) -> Callable[[Any, dict], bool]:
+    """Compiles a single unary test such as `< 0.6`, `[1..5]` or `"human"`."""
+    parser = _Parser(text)
+    token = parser.peek()
+
+    if token and token[1] in ("[", "(", "]") and ".." in text:
+        low_open = parser.take()[1] != "["
+        low = parser.operand()
+        parser.take("..")
+        high = parser.operand()
+        high_open = parser.take()[1] != "]"
+
+        def in_range(value, ctx):
+            if value is None:
+                return False
+            lo, hi = low(ctx), high(ctx)
+            return (value > lo if low_open else value >= lo) and (value < hi if high_open else value <= hi)
+
+        test = in_range
+    elif token and token[0] == "op" and token[1] in _COMPARATORS:
+        compare = _COMPARATORS[parser.take()[1]]
+        right = parser.operand()
+
+        def compared(value, ctx):
+            return compare(value, right(ctx))
+
+        test = compared
+    else:
+        expression = parser.expression()
+        if parser.names or (token and token[0] == "name" and token[1] in _FUNCTIONS):
+            # A boolean expression over the context, e.g. `contains(lower(content), "x")`.
+            def holds(value, ctx):
+                return bool(expression(ctx))
+
+            test = holds
+        else:
+            def equals(value, ctx):
+                return value == expression(ctx)
+
+            test = equals
+
+    if not parser.done():
+        raise DecisionTableError(f"Unsupported FEEL syntax in '{text}'")
+    test.names = parser.names
+    return test
+
+
+def compile_input_entry(text: str) -> tuple[Predicate | None, set[str]]:
+    """
+    Compiles an input entry into a predicate over `(input_value, context)`.
+
+    Returns:
+        The predicate (`None` for `-`, which matches anything) and the context
+        names the entry reads besides its own input.
+    """
+    text = text.strip()
+    if text in ("", "-"):
+        return None, set()
+    if text.startswith("not(") and text.endswith(")"):
+        inner, names = compile_input_entry(text[4:-1])
+        return (lambda value, ctx: not inner(value, ctx)), names
+
+    tests = [_compile_unary_test(part) for part in _split_top_level(text)]
+    names = set().union(*(test.names for test in tests))
+    if len(tests) == 1:
+        return tests[0], names
+    return (lambda value, ctx: any(test(value, ctx) for test in tests)), names
+
+
+def _split_top_level(text: str) -> list[str]:
+    """Splits a comma-separated list of unary tests, ignoring nested commas."""
+    parts, depth, current, in_string = [], 0, [], False
+    for char in text:
+        if char == '"':
+            in_string = not in_string
+        elif not in_string and char in "([":
+            depth += 1
+        elif not in_string and char in ")]":
+            depth -= 1
+        elif not in_string and char == "," and depth == 0:
+            parts.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    parts.append("".join(current))
+    return [part.strip() for part in parts]
+
+
+def parse_literal(text: str) -> Any:
+    """Parses an output entry literal."""
+    text = text.strip()
+    if text.startswith('"') and text.endswith('"'):
+        return text[1:-1]
+    if text in ("true", "false"):
+        return text == "true"
+    if text in ("", "null"):
+        return None
+    try:
+        return float(text) if "." in text else int(text)
+    except ValueError:
+        return text
+
+
+# --- Decision Tables ---
+@dataclass
+class Rule:
+    id: str
+    entries: list[Predicate | None]
+    outputs: dict[str, Any]
+    depends_on: set[str]
+
+    def matches(self, values: list[Any], context: dict) -> bool:
+        return all(entry is None or entry(value, context) for entry, value in zip(self.entries, values))
+
+
+@dataclass
+class Evaluation:
+    """The result of evaluating a table, including per-rule matches for reuse."""
+
+    matches: list[bool]
+    outputs: list[dict[str, Any]]
+    matched_rules: list[str]
+    evaluated_rules: int
+    version: str
+
+    @property
+    def output(self) -> dict[str, Any] | None:
+        return self.outputs[0] if self.outputs else None
+
+    def to_dict(self) -> dict:
+        return {
+            "output": self.output,
+            "outputs": self.outputs,
+            "matched_rules": self.matched_rules,
+            "matches": self.matches,
+            "evaluated_rules": self.evaluated_rules,
+            "version": self.version,
+        }
+
+
+@dataclass
+class DecisionTable:
+    key: str
+    name: str
+    hit_policy: str
+    inputs: list[str]
+    output_names: list[str]
+    rules: list[Rule]
+    version: str
+    # output name -> its allowed values, highest priority first
+    output_values: dict[str, list[Any]] = field(default_factory=dict)
+    # input name -> indices of the rules that read it
+    dependency_index: dict[str, list[int]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        index: dict[str, list[int]] = {}
+        for i, rule in enumerate(self.rules):
+            for name in rule.depends_on:
+                index.setdefault(name, []).append(i)
+        self.dependency_index = index
+        if self.hit_policy in ("PRIORITY", "OUTPUT ORDER"):
+            self._check_output_values()
+
+    def _check_output_values(self) -> None:
+        if not self.output_values:
+            raise DecisionTableError(
+                f"{self.hit_policy} table '{self.key}' needs allowed output values (outputValues) to rank its rules"
+            )
+        for rule in self.rules:
+            for name, values in self.output_values.items():
+                if rule.outputs.get(name) not in values:
+                    raise DecisionTableError(
+                        f"Rule '{rule.id}' of table '{self.key}' outputs {rule.outputs.get(name)!r}, "
+                        f"which is not an allowed value of '{name}'"
+                    )
+
+    def _priority(self, i: int) -> tuple[int, ...]:
+        """Ranks a rule by the position of its outputs in their allowed values."""
+        outputs = self.rules[i].outputs
+        return tuple(values.index(outputs.get(name)) for name, values in self.output_values.items())
+
+    def _apply_hit_policy(self, matches: list[bool]) -> list[int]:
+        matched = [i for i, matched in enumerate(matches) if matched]
+        policy = self.hit_policy
+        if policy == "FIRST":
+            return matched[:1]
+        if policy in ("PRIORITY", "OUTPUT ORDER"):
+            # `sorted` is stable, so rules of equal priority keep their table order.
+            ranked = sorted(matched, key=self._priority)
+            return ranked[:1] if policy == "PRIORITY" else ranked
+        if policy == "UNIQUE" and len(matched) > 1:
+            raise DecisionTableError(f"UNIQUE table '{self.key}' matched {len(matched)} rules")
+        if policy == "ANY":
+            if len({tuple(sorted(self.rules[i].outputs.items())) for i in matched}) > 1:
+                raise DecisionTableError(f"ANY table '{self.key}' matched rules with different outputs")
+            return matched[:1]
+        return matched  # COLLECT, RULE ORDER
+
+    def _result(self, matches: list[bool], evaluated: int) -> Evaluation:
+        hits = self._apply_hit_policy(matches)
+        return Evaluation(
+            matches=matches,
+            outputs=[self.rules[i].outputs for i in hits],
+            matched_rules=[self.rules[i].id for i in hits],
+            evaluated_rules=evaluated,
+            version=self.version,
+        )
+
+    def evaluate(self, context: dict) -> Evaluation:
+        """
+        Evaluates every rule against the context.
+        """
+        values = [context.get(name) for name in self.inputs]
+        matches = [rule.matches(values, context) for rule in self.rules]
+        return self._result(matches, len(self.rules))
+
+    def reevaluate(self, previous: Evaluation | dict, context: dict, changed: set[str] | list[str]) -> Evaluation:
+        """
+        Re-evaluates only the rules that depend on the changed fields, reusing
+        the previous match of every other rule. Falls back to a full
+        evaluation if the previous result came from a different table version.
+        """
+        previous_matches = previous["matches"] if isinstance(previous, dict) else previous.matches
+        previous_version = previous["version"] if isinstance(previous, dict) else previous.version
+        if previous_version != self.version or len(previous_matches) != len(self.rules):
+            return self.evaluate(context)
+
+        affected = sorted({i for name in changed for i in self.dependency_index.get(name, ())})
+        values = [context.get(name) for name in self.inputs]
+        matches = list(previous_matches)
+        for i in affected:
+            matches[i] = self.rules[i].matches(values, context)
+        return self._result(matches, len(affected))
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _children(element: ET.Element, name: str) -> list[ET.Element]:
+    return [child for child in element if _local(child.tag) == name]
+
+
+def _text(element: ET.Element) -> str:
+    text_elements = _children(element, "text")
+    return (text_elements[0].text or "") if text_elements else ""
+
+
+def parse_dmn(source: str | bytes, version: str | None = None) -> dict[str, DecisionTable]:
+    """
+    Parses DMN XML and compiles every decision table in it, keyed by decision id.
+    """
+    try:
+        root = ET.fromstring(source)
+    except ET.ParseError as e:
+        raise DecisionTableError(f"Invalid DMN XML: {e}") from e
+    if version is None:
+        raw = source.encode("utf-8") if isinstance(source, str) else source
+        version = hashlib.sha256(raw).hexdigest()[:12]
+
+    tables = {}
+    for decision in root.iter():
+        if _local(decision.tag) != "decision":
+            continue
+        for table in _children(decision, "decisionTable"):
+            inputs = []
+            for input_element in _children(table, "input"):
+                expression = _children(input_element, "inputExpression")
+                inputs.append(_text(expression[0]).strip() if expression else input_element.get("label", ""))
+            output_elements = _children(table, "output")
+            output_names = [output.get("name") or output.get("label") for output in output_elements]
+            output_values = {
+                name: [parse_literal(value) for value in _split_top_level(_text(allowed[0]))]
+                for name, output in zip(output_names, output_elements)
+                if (allowed := _children(output, "outputValues"))
+            }
+
+            rules = []
+            for rule_element in _children(table, "rule"):
+                entries, depends_on = [], set()
+                for input_name, entry in zip(inputs, _children(rule_element, "inputEntry")):
+                    predicate, names = compile_input_entry(_text(entry))
+                    entries.append(predicate)
+                    if predicate is not None:
+                        depends_on |= names | {input_name}
+                outputs = {
+                    name: parse_literal(_text(entry))
+                    for name, entry in zip(output_names, _children(rule_element, "outputEntry"))
+                }
+                rules.append(Rule(rule_element.get("id", f"rule{len(rules) + 1}"), entries, outputs, depends_on))
+
+            key = decision.get("id")
+            tables[key] = DecisionTable(
+                key=key,
+                name=decision.get("name", key),
+                hit_policy=(table.get("hitPolicy") or "UNIQUE").replace("_", " "),
+                inputs=inputs,
+                output_names=output_names,
+                rules=rules,
+                version=version,
+                output_values=output_values,
+            )
+    return tables
+
+
+# path -> (modification time, tables); only the latest version of a file is kept.
+_tables: dict[str, tuple[float, dict[str, DecisionTable]]] = {}
+
+
+def load_table(path: str | Path, key: str | None = None) -> DecisionTable:
+    """
+    Loads a decision table from a DMN file, compiling it only when the file changes.
+    """
+    path = Path(path)
+    mtime = path.stat().st_mtime
+    cached = _tables.get(str(path))
+    if cached is not None and cached[0] == mtime:
+        tables = cached[1]
+    else:
+        tables = parse_dmn(path.read_bytes())
+        _tables[str(path)] = (mtime, tables)
+    if key is None:
+        return next(iter(tables.values()))
+    if key not in tables:
+        raise DecisionTableError(f"Decision '{key}' not found in {path}")
+    return tables[key]
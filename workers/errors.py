@@ -0,0 +1,124 @@
+"""
+Provider Error Classification
+
+LLM provider errors need different retry treatment. A rate-limited call
+retried after a second only adds load to a provider that is already
+throttling us. A rejected request (a prompt too long, or a malformed
+parameter) fails the same way on every attempt. These helpers classify an
+error and turn it into a Temporal `ApplicationError` that tells the server
+how to retry:
+
+- `RateLimitError`: retried after a long, jittered backoff (`rate_limit` in
+  `activity_options.yaml`), or after the provider's Retry-After hint.
+- `ValidationError`: never retried.
+- `CircuitOpenError`: retried once the circuit is due to half-open.
+
+Anything else is re-raised unchanged and follows the activity's retry policy.
+"""
+
+import random
+from datetime import timedelta
+
+from temporalio import activity
+from temporalio.exceptions import ApplicationError
+
+from .activity_options import rate_limit_backoff
+from .breaker import CircuitOpenError
+
+RATE_LIMIT = "RateLimitError"
+VALIDATION = "ValidationError"
+CIRCUIT_OPEN = "CircuitOpenError"
+
+_RATE_LIMIT_STATUS = {429}
+_VALIDATION_STATUS = {400, 404, 413, 422}
+_RATE_LIMIT_HINTS = ("rate limit", "ratelimit", "rate_limit", "too many requests")
+_VALIDATION_NAMES = ("validation", "badrequest", "invalidrequest", "unprocessable")
+
+
+def _chain(exc: BaseException):
+    """Yields an error and the errors it was raised from."""
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        yield exc
+        exc = exc.__cause__ or exc.__context__
+
+
+def status_code(exc: BaseException) -> int | None:
+    """Returns the HTTP status of a provider error, if it carries one."""
+    for candidate in (exc, getattr(exc, "response", None)):
+        for attribute in ("status_code", "status", "http_status"):
+            value = getattr(candidate, attribute, None)
+            if isinstance(value, int):
+                return value
+    return None
+
+
+def retry_after(exc: BaseException) -> float | None:
+    """Returns the provider's Retry-After hint in seconds, if any."""
+    value = getattr(exc, "retry_after", None)
+    if value is None:
+        headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+        value = headers.get("retry-after") if hasattr(headers, "get") else None
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None  # An HTTP date; fall back to our own backoff
+
+
+def classify(exc: BaseException) -> str | None:
+    """
+    Returns `RateLimitError`, `ValidationError` or `CircuitOpenError` for an
+    error (or any error it was raised from), or `None` for other errors.
+    """
+    for error in _chain(exc):
+        if isinstance(error, CircuitOpenError):
+            return CIRCUIT_OPEN
+        status = status_code(error)
+        name = type(error).__name__.lower()
+        if status in _RATE_LIMIT_STATUS or any(hint in name or hint in str(error).lower() for hint in _RATE_LIMIT_HINTS):
+            return RATE_LIMIT
+        if status in _VALIDATION_STATUS or any(hint in name for hint in _VALIDATION_NAMES):
+            return VALIDATION
+    return None
+
+
+def rate_limit_delay(attempt: int, hint: float | None = None, rng: random.Random = random) -> float:
+    """
+    Returns the delay before retrying a rate-limited call: exponential in the
+    attempt, with "equal jitter" (half fixed, half random) so the delay stays
+    long but workers spread out.
+    """
+    initial, maximum = rate_limit_backoff()
+    ceiling = min(maximum, initial * 2 ** max(0, attempt - 1))
+    delay = ceiling / 2 + rng.uniform(0, ceiling / 2)
+    return max(delay, hint or 0.0)
+
+
+def _current_attempt() -> int:
+    try:
+        return activity.info().attempt
+    except RuntimeError:
+        return 1
+
+
+def as_application_error(exc: BaseException, attempt: int | None = None) -> BaseException:
+    """
+    Returns the error to raise from an activity for `exc`: an
+    `ApplicationError` carrying the retry decision for a classified error,
+    or `exc` itself. `attempt` defaults to the current activity's attempt.
+    """
+    if isinstance(exc, ApplicationError):
+        return exc
+    kind = classify(exc)
+    if kind == RATE_LIMIT:
+        hint = next((h for h in map(retry_after, _chain(exc)) if h is not None), None)
+        delay = rate_limit_delay(attempt or _current_attempt(), hint)
+        return ApplicationError(f"Rate limited: {exc}", type=RATE_LIMIT, next_retry_delay=timedelta(seconds=delay))
+    if kind == VALIDATION:
+        return ApplicationError(f"Request rejected: {exc}", type=VALIDATION, non_retryable=True)
+    if kind == CIRCUIT_OPEN:
+        circuit = next(error for error in _chain(exc) if isinstance(error, CircuitOpenError))
+        delay = circuit.retry_after + random.uniform(0, 1)
+        return ApplicationError(str(circuit), type=CIRCUIT_OPEN, next_retry_delay=timedelta(seconds=delay))
+    return exc
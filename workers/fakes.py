@@ -0,0 +1,226 @@
+"""
+Fake LLM Providers for Local Testing
+
+Deterministic stand-ins for real LLM providers with injectable latency and
+failures. They let the benchmark and test scripts in `bin/` exercise hedging,
+retries and circuit breaking without API keys or network access.
+
+`FakeLLMClient` stands in for a whole tracerail-core client, so the real
+activities can run end to end without an LLM (see `bin/bench-e2e.py`).
+"""
+
+import asyncio
+import hashlib
+import math
+import random
+from dataclasses import asdict, dataclass, field
+from types import SimpleNamespace
+
+
+class FakeProviderError(Exception):
+    """Raised by a fake provider to simulate a failed request."""
+
+
+class FakeRateLimitError(FakeProviderError):
+    """Raised to simulate a provider throttling requests (HTTP 429)."""
+
+    status_code = 429
+
+
+class FakeValidationError(FakeProviderError):
+    """Raised to simulate a provider rejecting a request (HTTP 400)."""
+
+    status_code = 400
+
+
+@dataclass
+class FakeResponse:
+    """The response returned by a fake provider."""
+
+    content: str
+    provider: str
+    prompt_tokens: int
+    completion_tokens: int
+    latency_ms: float
+
+
+@dataclass
+class FakeProvider:
+    """
+    A fake LLM provider.
+
+    Each request sleeps for `latency_ms` (+/- `jitter_ms`). With probability
+    `tail_probability` it sleeps for `tail_latency_ms` instead, which models the
+    slow responses that set tail latency. Each 1,000 prompt tokens add
+    `latency_per_1k_tokens_ms`, which models prompt processing time. With
+    probability `error_rate` the request raises `FakeProviderError`.
+    """
+
+    name: str
+    latency_ms: float = 100.0
+    jitter_ms: float = 20.0
+    tail_latency_ms: float = 2000.0
+    tail_probability: float = 0.0
+    error_rate: float = 0.0
+    latency_per_1k_tokens_ms: float = 0.0
+    seed: int | None = None
+    calls: int = 0
+    cancelled: int = 0
+    _random: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._random = random.Random(self.seed)
+
+    def sample_latency_ms(self) -> float:
+        """Draws the latency for the next request."""
+        if self._random.random() < self.tail_probability:
+            return self.tail_latency_ms
+        return max(0.0, self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms))
+
+    async def complete(self, prompt: str) -> FakeResponse:
+        """Simulates a completion request for the prompt."""
+        self.calls += 1
+        prompt_tokens = max(1, len(prompt) // 4)
+        latency_ms = self.sample_latency_ms() + self.latency_per_1k_tokens_ms * prompt_tokens / 1000
+        failed = self._random.random() < self.error_rate
+        try:
+            await asyncio.sleep(latency_ms / 1000)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if failed:
+            raise FakeProviderError(f"{self.name} failed after {latency_ms:.0f} ms")
+
+        return FakeResponse(
+            content=f"[{self.name}] processed {prompt_tokens} tokens",
+            provider=self.name,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=self._random.randint(20, 200),
+            latency_ms=latency_ms,
+        )
+
+
+@dataclass
+class FakeUsage:
+    """Token usage of a fake completion, shaped like tracerail-core's."""
+
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+
+
+@dataclass
+class FakeLLMResponse:
+    """An LLM response, shaped like tracerail-core's `LLMResponse`."""
+
+    content: str
+    provider: str
+    model: str
+    usage: FakeUsage
+    metadata: dict
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class FakeRoutingDecision:
+    """A routing decision, shaped like tracerail-core's."""
+
+    decision: str
+    reason: str
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class FakeLLMClient:
+    """
+    A stand-in for a tracerail-core client whose `process_content` answers
+    without calling an LLM.
+
+    Every response is drawn from a generator seeded with `seed`, the prompt
+    and the attempt number, so a run gives the same responses whatever order
+    concurrent requests arrive in. A request takes `latency_ms` (+/-
+    `jitter_ms`, or `tail_latency_ms` with probability `tail_probability`),
+    plus `latency_per_1k_tokens_ms` per 1,000 prompt tokens and
+    `ms_per_output_token` per completion token. Completion lengths are
+    log-normal around `completion_tokens` with shape `completion_tokens_sigma`,
+    and confidences follow a Beta(`confidence_alpha`, `confidence_beta`)
+    distribution. With probability `error_rate` a request raises
+    `FakeProviderError`. Confidences below `human_below` are routed to a human.
+    """
+
+    name: str = "fake"
+    latency_ms: float = 100.0
+    jitter_ms: float = 20.0
+    tail_latency_ms: float = 2000.0
+    tail_probability: float = 0.0
+    latency_per_1k_tokens_ms: float = 0.0
+    ms_per_output_token: float = 0.0
+    completion_tokens: int = 120
+    completion_tokens_sigma: float = 0.5
+    confidence_alpha: float = 8.0
+    confidence_beta: float = 2.0
+    human_below: float = 0.6
+    error_rate: float = 0.0
+    seed: int = 0
+    calls: int = 0
+    errors: int = 0
+    prompt_tokens_total: int = 0
+    completion_tokens_total: int = 0
+    latencies_ms: list[float] = field(default_factory=list, repr=False)
+    _attempts: dict[str, int] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self):
+        # What llm_activity reads of a tracerail-core client's configuration.
+        self.config = SimpleNamespace(llm=SimpleNamespace(provider=SimpleNamespace(value=self.name)))
+
+    def _random(self, prompt: str) -> random.Random:
+        digest = hashlib.blake2b(prompt.encode("utf-8"), digest_size=8).hexdigest()
+        attempt = self._attempts.get(digest, 0)
+        self._attempts[digest] = attempt + 1
+        return random.Random(f"{self.seed}:{digest}:{attempt}")
+
+    async def process_content(self, prompt: str) -> SimpleNamespace:
+        """Simulates processing the prompt and returns its response and routing decision."""
+        self.calls += 1
+        rng = self._random(prompt)
+        prompt_tokens = max(1, len(prompt) // 4)
+        completion_tokens = max(1, round(self.completion_tokens * math.exp(
+            rng.gauss(-self.completion_tokens_sigma ** 2 / 2, self.completion_tokens_sigma)
+        )))
+        if rng.random() < self.tail_probability:
+            latency_ms = self.tail_latency_ms
+        else:
+            latency_ms = max(0.0, self.latency_ms + rng.uniform(-self.jitter_ms, self.jitter_ms))
+        latency_ms += self.latency_per_1k_tokens_ms * prompt_tokens / 1000 + self.ms_per_output_token * completion_tokens
+        confidence = round(rng.betavariate(self.confidence_alpha, self.confidence_beta), 3)
+        failed = rng.random() < self.error_rate
+
+        await asyncio.sleep(latency_ms / 1000)
+        if failed:
+            self.errors += 1
+            raise FakeProviderError(f"{self.name} failed after {latency_ms:.0f} ms")
+        self.latencies_ms.append(latency_ms)
+        self.prompt_tokens_total += prompt_tokens
+        self.completion_tokens_total += completion_tokens
+
+        human = confidence < self.human_below
+        return SimpleNamespace(
+            llm_response=FakeLLMResponse(
+                content=f"[{self.name}] answer of {completion_tokens} tokens to a {prompt_tokens}-token prompt",
+                provider=self.name,
+                model=f"{self.name}-model",
+                usage=FakeUsage(prompt_tokens, completion_tokens, prompt_tokens + completion_tokens),
+                metadata={"confidence": confidence},
+            ),
+            routing_decision=FakeRoutingDecision(
+                decision="human" if human else "automatic",
+                reason=f"Confidence {confidence} is {'below' if human else 'at or above'} {self.human_below}",
+            ),
+        )
+
+    async def close(self) -> None:
+        pass
@@ -0,0 +1,44 @@
+"""
+Content Fingerprints
+
+Stable, process-independent identifiers for case content. Unlike Python's
+built-in `hash()`, which is randomized per process, these fingerprints are the
+same on every machine and run, so they can be used as idempotent workflow IDs.
+SimHashes, kept in each case's memo, additionally let near-duplicates (the
+same text with small edits) be recognised later by the few bits they differ in.
+"""
+
+import hashlib
+
+WORKFLOW_ID_PREFIX = "example-workflow"
+
+
+def content_fingerprint(text: str) -> str:
+    """
+    Returns the SHA-256 hex digest of the text.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def workflow_id_for(text: str, prefix: str = WORKFLOW_ID_PREFIX) -> str:
+    """
+    Returns the deterministic workflow ID for a piece of content.
+    """
+    return f"{prefix}-{content_fingerprint(text)[:32]}"
+
+
+def simhash(text: str, shingle_size: int = 1) -> int:
+    """
+    Returns a 64-bit SimHash of the text's word shingles (single words by
+    default, which suits short texts). Texts that differ only slightly, by
+    whitespace or a changed word, get hashes a few bits apart.
+    """
+    words = text.lower().split()
+    shingles = [" ".join(words[i:i + shingle_size]) for i in range(max(len(words) - shingle_size + 1, 1))]
+    weights = [0] * 64
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
@@ -0,0 +1,272 @@
+"""
+Guardrails Filter
+
+Validates LLM output before it reaches the post-rules gate (step 4 of the
+System Blueprint). Validators are declared in `guardrails.yaml`, compiled once
+per worker and cached by a hash of their spec. They run cheapest first
+(regex and length checks, then schema checks, then model-based checks from
+guardrails-ai), and validation stops at the first hard failure so an
+obviously bad output never pays for the expensive checks.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+from .metrics import activity_meter
+from .startup import lazy_import
+
+guardrails = lazy_import("guardrails")
+jsonschema = lazy_import("jsonschema")
+yaml = lazy_import("yaml")
+
+logger = logging.getLogger(__name__)
+
+GUARDRAILS_FILE = os.getenv("GUARDRAILS_FILE", "guardrails.yaml")
+
+# Validators run in this order of cost; cheaper tiers run first.
+COST_REGEX = 0
+COST_SCHEMA = 1
+COST_MODEL = 2
+
+
+@dataclass
+class ValidatorResult:
+    """The outcome of one validator on one output."""
+
+    name: str
+    passed: bool
+    hard: bool
+    message: str = ""
+    latency_us: int = 0
+
+
+@dataclass
+class GuardResult:
+    """The outcome of all validators on one output."""
+
+    passed: bool = True
+    results: list[ValidatorResult] = field(default_factory=list)
+
+    @property
+    def failures(self) -> list[ValidatorResult]:
+        return [result for result in self.results if not result.passed]
+
+    def to_dict(self) -> dict:
+        return {
+            "passed": self.passed,
+            "failures": [
+                {"name": r.name, "hard": r.hard, "message": r.message} for r in self.failures
+            ],
+            "latency_us": {r.name: r.latency_us for r in self.results},
+        }
+
+
+class Validator(Protocol):
+    name: str
+    cost: int
+    hard: bool
+
+    def check(self, text: str) -> tuple[bool, str]: ...
+
+
+# --- Validator Types ---
+@dataclass
+class RegexValidator:
+    """Fails when the pattern matches (or, with `must_match`, when it does not)."""
+
+    name: str
+    pattern: re.Pattern
+    must_match: bool = False
+    hard: bool = True
+    cost: int = COST_REGEX
+
+    def check(self, text: str) -> tuple[bool, str]:
+        found = self.pattern.search(text) is not None
+        if found == self.must_match:
+            return True, ""
+        return False, "required pattern not found" if self.must_match else "forbidden pattern found"
+
+
+@dataclass
+class LengthValidator:
+    """Fails when the output is shorter or longer than the limits."""
+
+    name: str
+    min_chars: int = 0
+    max_chars: int | None = None
+    hard: bool = True
+    cost: int = COST_REGEX
+
+    def check(self, text: str) -> tuple[bool, str]:
+        if len(text) < self.min_chars:
+            return False, f"shorter than {self.min_chars} characters"
+        if self.max_chars is not None and len(text) > self.max_chars:
+            return False, f"longer than {self.max_chars} characters"
+        return True, ""
+
+
+@dataclass
+class JsonSchemaValidator:
+    """Fails when the output is not JSON matching the schema."""
+
+    name: str
+    validator: Any
+    hard: bool = True
+    cost: int = COST_SCHEMA
+
+    def check(self, text: str) -> tuple[bool, str]:
+        try:
+            document = json.loads(text)
+        except json.JSONDecodeError as e:
+            return False, f"not valid JSON: {e.msg}"
+        error = next(iter(self.validator.iter_errors(document)), None)
+        return (True, "") if error is None else (False, error.message)
+
+
+@dataclass
+class ModelValidator:
+    """Runs a guardrails-ai hub validator, such as `ToxicLanguage`."""
+
+    name: str
+    guard: Any
+    hard: bool = True
+    cost: int = COST_MODEL
+
+    def check(self, text: str) -> tuple[bool, str]:
+        outcome = self.guard.validate(text)
+        if outcome.validation_passed:
+            return True, ""
+        return False, str(outcome.error or "model-based validation failed")
+
+
+def compile_validator(spec: dict) -> Validator:
+    """
+    Builds a validator from one entry of `guardrails.yaml`.
+    """
+    name = spec["name"]
+    kind = spec["type"]
+    hard = spec.get("severity", "hard") == "hard"
+    if kind == "regex":
+        flags = 0 if spec.get("case_sensitive", False) else re.IGNORECASE
+        return RegexValidator(name, re.compile(spec["pattern"], flags), spec.get("must_match", False), hard)
+    if kind == "length":
+        return LengthValidator(name, spec.get("min_chars", 0), spec.get("max_chars"), hard)
+    if kind == "json_schema":
+        validator_cls = jsonschema.validators.validator_for(spec["schema"])
+        return JsonSchemaValidator(name, validator_cls(spec["schema"]), hard)
+    if kind == "guardrails_hub":
+        hub_validator = getattr(lazy_import("guardrails.hub"), spec["validator"])
+        guard = guardrails.Guard().use(hub_validator, **spec.get("params", {}), on_fail="noop")
+        return ModelValidator(name, guard, hard)
+    raise ValueError(f"Unknown guardrail type '{kind}' for '{name}'")
+
+
+# --- Compiled Guards ---
+class CompiledGuard:
+    """
+    An ordered set of compiled validators.
+    """
+
+    def __init__(self, validators: list[Validator], spec_hash: str):
+        # `sorted` is stable, so validators of the same cost keep their file order.
+        self.validators = sorted(validators, key=lambda v: v.cost)
+        self.spec_hash = spec_hash
+
+    def _run(self, validator: Validator, text: str) -> ValidatorResult:
+        start = time.perf_counter()
+        passed, message = validator.check(text)
+        latency_us = int((time.perf_counter() - start) * 1_000_000)
+        return ValidatorResult(validator.name, passed, validator.hard, message, latency_us)
+
+    def _apply(self, result: GuardResult, outcome: ValidatorResult) -> None:
+        result.results.append(outcome)
+        if not outcome.passed and outcome.hard:
+            result.passed = False
+
+    async def validate_many(self, texts: list[str]) -> list[GuardResult]:
+        """
+        Validates several outputs at once. Each cost tier runs over all outputs
+        that are still passing before the next tier starts, and model-based
+        validators run concurrently in threads.
+        """
+        results = [GuardResult() for _ in texts]
+        for tier in sorted({v.cost for v in self.validators}):
+            for validator in (v for v in self.validators if v.cost == tier):
+                pending = [i for i, r in enumerate(results) if r.passed]
+                if not pending:
+                    return results
+                if tier < COST_MODEL:
+                    outcomes = [self._run(validator, texts[i]) for i in pending]
+                else:
+                    outcomes = await asyncio.gather(
+                        *(asyncio.to_thread(self._run, validator, texts[i]) for i in pending)
+                    )
+                for i, outcome in zip(pending, outcomes):
+                    self._apply(results[i], outcome)
+        return results
+
+    async def validate(self, text: str) -> GuardResult:
+        return (await self.validate_many([text]))[0]
+
+
+_compiled: dict[str, CompiledGuard] = {}
+_files: dict[tuple[str, float], str] = {}
+
+
+def spec_hash(specs: list[dict]) -> str:
+    """Returns a stable hash of a list of validator specs."""
+    return hashlib.sha256(json.dumps(specs, sort_keys=True).encode()).hexdigest()
+
+
+def compile_guard(specs: list[dict]) -> CompiledGuard:
+    """
+    Compiles validator specs, reusing the cached guard for identical specs.
+    """
+    enabled = [spec for spec in specs if spec.get("is_enabled", True)]
+    key = spec_hash(enabled)
+    guard = _compiled.get(key)
+    if guard is None:
+        guard = CompiledGuard([compile_validator(spec) for spec in enabled], key)
+        _compiled[key] = guard
+        logger.info(f"Compiled {len(guard.validators)} guardrail validator(s) (spec {key[:12]})")
+    return guard
+
+
+def load_guard(path: str | Path = GUARDRAILS_FILE) -> CompiledGuard:
+    """
+    Loads and compiles the guardrails file. The file is only re-read when it changes.
+    """
+    path = Path(path)
+    if not path.exists():
+        return compile_guard([])
+    file_key = (str(path), path.stat().st_mtime)
+    key = _files.get(file_key)
+    if key is not None and key in _compiled:
+        return _compiled[key]
+
+    guard = compile_guard(yaml.safe_load(path.read_text(encoding="utf-8")) or [])
+    _files.clear()
+    _files[file_key] = guard.spec_hash
+    return guard
+
+
+def record_guard_metrics(results: list[GuardResult]) -> None:
+    """
+    Records per-validator latency and failure counts.
+    """
+    meter = activity_meter()
+    latency = meter.create_histogram("tracerail_guardrail_latency", "Guardrail validator latency.", "us")
+    failures = meter.create_counter("tracerail_guardrail_failures", "Outputs rejected by a guardrail validator.")
+    for result in results:
+        for outcome in result.results:
+            latency.record(outcome.latency_us, {"validator": outcome.name})
+            if not outcome.passed:
+                failures.add(1, {"validator": outcome.name, "hard": str(outcome.hard).lower()})
@@ -0,0 +1,29 @@
+"""
+Metric Helpers for the TraceRail Worker
+
+Activities record metrics through Temporal's metric meter, which the worker
+exports to Prometheus when `WORKER_METRICS_ADDRESS` is set. These helpers let
+the same code run outside an activity (in benchmarks and test scripts), where
+metrics are silently dropped.
+"""
+
+from temporalio import activity
+from temporalio.common import MetricMeter
+
+
+def activity_meter() -> MetricMeter:
+    """
+    Returns the current activity's metric meter, or a no-op meter when called
+    outside of an activity.
+    """
+    try:
+        return activity.metric_meter()
+    except RuntimeError:
+        return MetricMeter.noop
+
+
+def elapsed_ms(start: float, end: float) -> int:
+    """
+    Converts a pair of `time.perf_counter()` readings to whole milliseconds.
+    """
+    return int((end - start) * 1000)
@@ -0,0 +1,172 @@
+"""
+Rule Mining from Human Decisions
+
+Finds high-precision routing rules in past human review decisions (step 9 of
+the System Blueprint). Given cases a human approved or rejected, it proposes:
+
+- keyword rules: word n-grams whose presence predicts approval, and
+- confidence thresholds: the lowest LLM confidence above which cases were
+  (almost) always approved.
+
+Counting is vectorized with numpy when it is installed: every case is
+reduced to an array of n-gram ids, and document frequencies overall and among
+approved cases come from two `bincount` calls. Without numpy the same counts
+are taken with `collections.Counter`.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+
+from .stopwords import STOPWORDS
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+@dataclass
+class Candidate:
+    """A proposed rule with the evidence for it."""
+
+    kind: str  # "keyword" or "threshold"
+    value: str | float
+    decision: str
+    support: int  # cases the rule matches
+    positives: int  # of which had the rule's decision
+    total: int  # cases mined
+
+    @property
+    def precision(self) -> float:
+        return self.positives / self.support if self.support else 0.0
+
+    @property
+    def coverage(self) -> float:
+        return self.support / self.total if self.total else 0.0
+
+    def to_rule(self) -> dict:
+        """Renders the candidate in `rules.yaml` schema, disabled for review."""
+        stats = f"precision {self.precision:.1%}, coverage {self.coverage:.1%} ({self.support} of {self.total} reviewed cases)"
+        if self.kind == "keyword":
+            return {
+                "name": f"Mined: {self.value}",
+                "description": f"Mined from human decisions: {stats}.",
+                "rule_type": "keyword_match",
+                "decision": self.decision,
+                "priority": "normal",
+                "is_enabled": False,
+                "condition": {"keywords": [self.value], "case_sensitive": False},
+            }
+        return {
+            "name": f"Mined: confidence >= {self.value:.2f}",
+            "description": f"Mined from human decisions: {stats}.",
+            "rule_type": "confidence_threshold",
+            "decision": self.decision,
+            "priority": "normal",
+            "is_enabled": False,
+            "condition": {"operator": "gte", "threshold": round(float(self.value), 2)},
+        }
+
+
+def ngrams(text: str, max_n: int = 2) -> set[str]:
+    """
+    Returns the distinct word n-grams of a text, up to `max_n` words, skipping
+    n-grams made only of stopwords and numbers.
+    """
+    words = _WORD.findall(text.lower())
+    grams = set()
+    for n in range(1, max_n + 1):
+        for i in range(len(words) - n + 1):
+            gram = words[i:i + n]
+            if all(word in STOPWORDS or word.isdigit() for word in gram):
+                continue
+            grams.add(" ".join(gram))
+    return grams
+
+
+def _document_frequencies(docs: list[set[str]], labels: list[bool]) -> tuple[list[str], list[int], list[int]]:
+    """Counts, per n-gram, the cases containing it and the positive ones among them."""
+    if np is None:
+        overall, positive = Counter(), Counter()
+        for grams, label in zip(docs, labels):
+            overall.update(grams)
+            if label:
+                positive.update(grams)
+        vocabulary = list(overall)
+        return vocabulary, [overall[g] for g in vocabulary], [positive[g] for g in vocabulary]
+
+    ids: dict[str, int] = {}
+    gram_ids = [np.fromiter((ids.setdefault(g, len(ids)) for g in grams), dtype=np.int64, count=len(grams)) for grams in docs]
+    flat = np.concatenate(gram_ids) if gram_ids else np.zeros(0, dtype=np.int64)
+    doc_labels = np.repeat(np.asarray(labels, dtype=bool), [len(g) for g in gram_ids])
+    overall = np.bincount(flat, minlength=len(ids))
+    positive = np.bincount(flat[doc_labels], minlength=len(ids))
+    return list(ids), overall.tolist(), positive.tolist()
+
+
+def mine_keywords(texts: list[str], labels: list[bool], decision: str, min_support: int = 20,
+                  min_precision: float = 0.95, max_n: int = 2, limit: int = 20) -> list[Candidate]:
+    """
+    Proposes keyword rules for `decision` from texts labelled True when a human
+    made that decision.
+
+    Returns:
+        Candidates with at least `min_support` cases and `min_precision`,
+        most covering first. N-grams with identical counts almost always come
+        from the same cases (such as "password" and "password reset"), so
+        only the shortest of them is kept.
+    """
+    docs = [ngrams(text, max_n) for text in texts]
+    vocabulary, overall, positive = _document_frequencies(docs, labels)
+    total = len(texts)
+
+    found = [
+        Candidate("keyword", gram, decision, support, hits, total)
+        for gram, support, hits in zip(vocabulary, overall, positive)
+        if support >= min_support and hits / support >= min_precision
+    ]
+    found.sort(key=lambda c: (-c.support, -c.precision, len(c.value), c.value))
+
+    kept, signatures = [], set()
+    for candidate in found:
+        signature = (candidate.support, candidate.positives)
+        if signature not in signatures:
+            signatures.add(signature)
+            kept.append(candidate)
+    return kept[:limit]
+
+
+def mine_threshold(confidences: list[float | None], labels: list[bool], decision: str,
+                   min_support: int = 20, min_precision: float = 0.95) -> Candidate | None:
+    """
+    Finds the lowest confidence threshold `t` such that cases with confidence
+    of at least `t` had `decision` with `min_precision`, covering the most cases.
+    """
+    pairs = sorted(((c, label) for c, label in zip(confidences, labels) if c is not None), reverse=True)
+    if not pairs:
+        return None
+    total = len(labels)
+
+    if np is not None:
+        values = np.fromiter((c for c, _ in pairs), dtype=float, count=len(pairs))
+        hits = np.cumsum(np.fromiter((label for _, label in pairs), dtype=np.int64, count=len(pairs)))
+        support = np.arange(1, len(pairs) + 1)
+        # Only cut between distinct values, so a threshold never splits ties.
+        last_of_value = np.append(values[1:] != values[:-1], True)
+        valid = last_of_value & (support >= min_support) & (hits >= min_precision * support)
+        if not valid.any():
+            return None
+        best = int(np.flatnonzero(valid)[-1])
+        return Candidate("threshold", float(values[best]), decision, int(support[best]), int(hits[best]), total)
+
+    best, hits = None, 0
+    for i, (value, label) in enumerate(pairs):
+        hits += label
+        support = i + 1
+        is_last_of_value = i + 1 == len(pairs) or pairs[i + 1][0] != value
+        if is_last_of_value and support >= min_support and hits >= min_precision * support:
+            best = Candidate("threshold", value, decision, support, hits, total)
+    return best
@@ -0,0 +1,68 @@
+"""
+Workflow Models
+
+The constants, default options and pure functions the workflows use, kept
+apart from the workflow definitions. The sandbox re-imports a workflow's
+module for every workflow run, but passes this module through from the host
+(see `workers/sandbox.py`), so none of this is rebuilt per run. It must stay
+pure data: no I/O, clocks, randomness or mutable module state, and no imports
+beyond the standard library.
+"""
+
+# Chunks of a large document sent to the LLM at the same time. Changing this
+# changes the order in which running workflows schedule activities, so only
+# change it together with a new workflow version.
+CHUNK_FAN_OUT = 8
+
+# Items of a multi-part case sent to the LLM at the same time, unless the
+# starter passes another cap. Each large-document item also fans out its chunks.
+ITEM_FAN_OUT = 4
+
+# Patch IDs (`workflow.patched`) of the steps added to 'ExampleWorkflow' after
+# its first version. A case started before a step existed replays without it.
+PATCH_PIN_RULES = "pin-rules-snapshots"
+PATCH_GUARDRAILS = "guardrails"
+PATCH_POST_RULES = "post-rules"
+PATCH_CHUNKING = "chunk-large-documents"
+PATCH_MULTI_PART = "multi-part-cases"
+PATCH_SEARCH_ATTRIBUTES = "case-search-attributes"
+PATCH_FAIL_CASES = "fail-failed-cases"
+
+# Options of a `BatchProcessingWorkflow` the starter does not set.
+BATCH_DEFAULTS = {
+    "format": None,
+    "field": "text",
+    "page_size": 500,
+    "window": 100,
+    "max_per_second": 50.0,
+    "wait": False,
+    "search_attributes": True,
+}
+
+# A batch run continues as new once its history reaches this many events (or
+# the server suggests it), far below Temporal's 50k limit. Each child adds two
+# or three events, so a run covers a few thousand records.
+BATCH_HISTORY_EVENTS = 10_000
+
+
+def new_case_status(started_at: str) -> dict:
+    """Returns the `status` summary of a case that has just started."""
+    return {
+        "stage": "started", "decision": None, "action": None, "provider": None, "confidence": None,
+        "rule": None, "result": None, "started_at": started_at, "updated_at": started_at, "waiting_since": None,
+    }
+
+
+def post_rule_fields(llm_response: dict, guardrails_result: dict) -> dict:
+    """
+    Extracts the structured fields the post-rules table reads from the
+    cleaned LLM output. This is a pure function, so the workflow can call it.
+    """
+    metadata = llm_response.get("metadata") or {}
+    confidence = llm_response.get("confidence", metadata.get("confidence"))
+    return {
+        "guardrailsPassed": guardrails_result["passed"],
+        "confidence": float(confidence) if confidence is not None else None,
+        "piiCount": sum(guardrails_result.get("pii", {}).values()),
+        "answerLength": len(guardrails_result.get("content") or ""),
+    }
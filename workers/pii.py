@@ -0,0 +1,193 @@
+"""
+PII Scanner
+
+A single-pass scanner for emails, phone numbers, payment card numbers and
+IBANs in LLM output. All patterns are combined into one compiled regular
+expression, so each text is scanned once no matter how many kinds of PII are
+looked for. Card numbers must pass the Luhn check and IBANs the ISO 7064
+mod-97 check, which keeps order numbers and other long digit runs from being
+redacted.
+
+Two redaction modes are provided: `redact()` returns a copy of a string with
+typed placeholders (and returns the original object untouched when it has no
+PII), and `redact_buffer()` masks matches in place in a `bytearray`, for the
+MB-scale documents processed by the nightly replay.
+"""
+
+import re
+from dataclasses import dataclass
+
+# --- Combined Pattern ---
+# Digit runs are matched once and classified afterwards, because card numbers
+# and phone numbers overlap and only a checksum tells them apart.
+_PATTERNS = {
+    "email": r"(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}",
+    "iban": r"\b[A-Z]{2}[0-9]{2}(?:[ ]?[A-Z0-9]{4}){2,7}(?:[ ]?[A-Z0-9]{1,4})?\b",
+    "digits": r"(?<![\w+])\+?\(?\d(?:(?:[ .-]|\) ?| ?\()?\d){6,18}\b",
+}
+
+_TEXT_PATTERN = re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern in _PATTERNS.items()))
+_BYTES_PATTERN = re.compile(_TEXT_PATTERN.pattern.encode("ascii"))
+
+# An ISO date, optionally followed by the hour of a time ("2024-06-01 12"):
+# the digit pattern stops at the colon, and what it matched is not a phone.
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}(?:[ T]\d{1,2})?")
+
+# The shortest IBAN (Norway) has 15 characters.
+_IBAN_MIN_CHARS = 15
+
+PLACEHOLDERS = {
+    "email": "[EMAIL]",
+    "phone": "[PHONE]",
+    "card": "[CARD]",
+    "iban": "[IBAN]",
+}
+
+
+@dataclass(frozen=True)
+class PIIMatch:
+    """One detected piece of PII."""
+
+    kind: str
+    start: int
+    end: int
+
+
+def luhn_valid(digits: str) -> bool:
+    """
+    Returns True when the digit string passes the Luhn checksum.
+    """
+    total = 0
+    for i, char in enumerate(reversed(digits)):
+        value = ord(char) - 48
+        if i % 2 == 1:
+            value *= 2
+            if value > 9:
+                value -= 9
+        total += value
+    return total % 10 == 0
+
+
+def iban_valid(iban: str) -> bool:
+    """
+    Returns True when the IBAN passes the ISO 7064 mod-97 check.
+    """
+    compact = iban.replace(" ", "")
+    rearranged = compact[4:] + compact[:4]
+    remainder = 0
+    for char in rearranged:
+        # Letters count as two digits: A=10 ... Z=35.
+        value = int(char, 36)
+        remainder = (remainder * (100 if value > 9 else 10) + value) % 97
+    return remainder == 1
+
+
+def _iban_length(value: str) -> int:
+    """
+    Returns the length of the longest valid IBAN at the start of a raw match,
+    or 0. The pattern takes every following group of four characters, so a
+    spaced IBAN may run into the next word ("... 7034 2024 paid"); shorter
+    spans are tried at each group boundary.
+    """
+    ends = [len(value)] + [i for i in range(len(value) - 1, 0, -1) if value[i] == " "]
+    for end in ends:
+        candidate = value[:end]
+        if len(candidate.replace(" ", "")) >= _IBAN_MIN_CHARS and iban_valid(candidate):
+            return end
+    return 0
+
+
+def _classify(kind: str, value: str) -> tuple[str, int] | None:
+    """
+    Decides what a raw match is and how much of it is PII, or returns None
+    if it is not PII.
+    """
+    if kind == "email":
+        return "email", len(value)
+    if kind == "iban":
+        length = _iban_length(value)
+        return ("iban", length) if length else None
+    digits = "".join(char for char in value if char.isdigit())
+    if 13 <= len(digits) <= 19 and luhn_valid(digits):
+        return "card", len(value)
+    if _ISO_DATE.fullmatch(value):
+        return None
+    # Ten digits, or eight with a country code, so that dates are not phones.
+    if 10 <= len(digits) <= 15 or (value.startswith("+") and len(digits) >= 8):
+        return "phone", len(value)
+    return None
+
+
+# --- Scanning ---
+def scan(text: str) -> list[PIIMatch]:
+    """
+    Finds all PII in the text in a single pass.
+    """
+    matches = []
+    for match in _TEXT_PATTERN.finditer(text):
+        found = _classify(match.lastgroup, match.group())
+        if found is not None:
+            kind, length = found
+            matches.append(PIIMatch(kind, match.start(), match.start() + length))
+    return matches
+
+
+def redact(text: str) -> tuple[str, list[PIIMatch]]:
+    """
+    Replaces each piece of PII with a typed placeholder such as `[EMAIL]`.
+
+    Returns:
+        The redacted text and the matches. When there is no PII the original
+        string object is returned without copying it.
+    """
+    matches = scan(text)
+    if not matches:
+        return text, matches
+    parts = []
+    position = 0
+    for match in matches:
+        parts.append(text[position:match.start])
+        parts.append(PLACEHOLDERS[match.kind])
+        position = match.end
+    parts.append(text[position:])
+    return "".join(parts), matches
+
+
+def redact_buffer(buffer: bytearray, mask: int = ord("*")) -> list[PIIMatch]:
+    """
+    Masks PII in place in a UTF-8 `bytearray`, keeping its length unchanged.
+
+    Returns:
+        The matches, with byte offsets.
+    """
+    matches = []
+    view = memoryview(buffer)
+    for match in _BYTES_PATTERN.finditer(buffer):
+        found = _classify(match.lastgroup, match.group().decode("ascii", "replace"))
+        if found is None:
+            continue
+        kind, length = found
+        matches.append(PIIMatch(kind, match.start(), match.start() + length))
+    # Masking after the scan keeps the matches independent of earlier edits.
+    for match in matches:
+        view[match.start:match.end] = bytes([mask]) * (match.end - match.start)
+    view.release()
+    return matches
+
+
+def scan_batch(texts: list[str]) -> list[list[PIIMatch]]:
+    """Scans several texts; the batch form of `scan()`."""
+    return [scan(text) for text in texts]
+
+
+def redact_batch(texts: list[str]) -> list[tuple[str, list[PIIMatch]]]:
+    """Redacts several texts; the batch form of `redact()`."""
+    return [redact(text) for text in texts]
+
+
+def count_by_kind(matches: list[PIIMatch]) -> dict[str, int]:
+    """Counts matches per kind of PII."""
+    counts: dict[str, int] = {}
+    for match in matches:
+        counts[match.kind] = counts.get(match.kind, 0) + 1
+    return counts
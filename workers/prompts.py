@@ -0,0 +1,204 @@
+"""
+Prompt Templates and Prefix Cache
+
+The system prompt and rule context sent with every case are identical across
+cases, so they are assembled and tokenized once per prompt content and reused.
+The static prefix always comes first and is rendered byte-for-byte the same,
+which lets providers with prompt caching (OpenAI, DeepSeek) hit their
+server-side cache. The per-case content is only tokenized if its token count
+is read; the activities rely on the provider's reported usage instead.
+
+A template is enabled by pointing `LLM_PROMPT_FILE` at a YAML file:
+
+    version: "2024-06-01"
+    system: "You are a support triage assistant..."
+    rules_file: "rules.yaml"   # optional, adds the rule names and descriptions
+"""
+
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import cached_property
+from pathlib import Path
+from typing import Callable
+
+from .startup import lazy_import
+
+tiktoken = lazy_import("tiktoken")
+yaml = lazy_import("yaml")
+
+logger = logging.getLogger(__name__)
+
+PROMPT_FILE = os.getenv("LLM_PROMPT_FILE", "")
+TOKEN_ENCODING = os.getenv("LLM_TOKEN_ENCODING", "cl100k_base")
+
+# Separates the static prefix from the per-case content.
+CONTENT_SEPARATOR = "\n\n---\n\n"
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """A versioned prompt: a static prefix followed by the case content."""
+
+    version: str
+    system: str
+    rule_context: tuple[str, ...] = ()
+    # The rules file the rule context was read from, if any.
+    rules_file: Path | None = field(default=None, compare=False)
+
+    def render_prefix(self) -> str:
+        parts = [self.system.strip()]
+        if self.rule_context:
+            parts.append("Routing rules:\n" + "\n".join(f"- {line}" for line in self.rule_context))
+        return "\n\n".join(parts) + CONTENT_SEPARATOR
+
+    @cached_property
+    def digest(self) -> str:
+        """Identifies the rendered prefix, whatever `version` the file declares."""
+        return hashlib.sha256(self.render_prefix().encode()).hexdigest()
+
+
+@dataclass(frozen=True)
+class AssembledPrompt:
+    """A prompt ready to send, with its token accounting."""
+
+    text: str
+    version: str
+    prefix_tokens: int
+    content: str
+    assembly_us: int
+    count_tokens: Callable[[str], int] = field(repr=False, compare=False)
+
+    @cached_property
+    def content_tokens(self) -> int:
+        """Tokens of the case content, counted on first use."""
+        return self.count_tokens(self.content)
+
+    @property
+    def prompt_tokens(self) -> int:
+        return self.prefix_tokens + self.content_tokens
+
+
+class PromptCache:
+    """
+    Caches rendered prefixes and their token counts, keyed by the prefix
+    content and token encoding.
+    """
+
+    def __init__(self, encoding_name: str = TOKEN_ENCODING, max_versions: int = 32):
+        self.encoding_name = encoding_name
+        self.max_versions = max_versions
+        self._prefixes: OrderedDict[tuple[str, str], tuple[str, int]] = OrderedDict()
+        self._encoding = None
+        self._encoding_failed = False
+        self.hits = 0
+        self.misses = 0
+
+    def count_tokens(self, text: str) -> int:
+        """
+        Counts tokens with tiktoken, falling back to a ~4 characters per token
+        estimate when the encoding is unavailable (e.g. offline).
+        """
+        if self._encoding is None and not self._encoding_failed:
+            try:
+                self._encoding = tiktoken.get_encoding(self.encoding_name)
+            except Exception as e:
+                logger.warning(f"Token encoding '{self.encoding_name}' unavailable, estimating counts: {e}")
+                self._encoding_failed = True
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return max(1, len(text) // 4) if text else 0
+
+    def prefix(self, template: PromptTemplate) -> tuple[str, int]:
+        """
+        Returns the rendered prefix of a template and its token count.
+        """
+        key = (template.digest, self.encoding_name)
+        cached = self._prefixes.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._prefixes.move_to_end(key)
+            return cached
+
+        self.misses += 1
+        text = template.render_prefix()
+        cached = (text, self.count_tokens(text))
+        self._prefixes[key] = cached
+        if len(self._prefixes) > self.max_versions:
+            self._prefixes.popitem(last=False)
+        return cached
+
+    def assemble(self, template: PromptTemplate, content: str) -> AssembledPrompt:
+        """
+        Builds the full prompt for a case. Nothing is tokenized unless the
+        prefix is new; `content_tokens` counts the content when read.
+        """
+        start = time.perf_counter()
+        prefix_text, prefix_tokens = self.prefix(template)
+        text = prefix_text + content
+        return AssembledPrompt(
+            text=text,
+            version=template.version,
+            prefix_tokens=prefix_tokens,
+            content=content,
+            assembly_us=int((time.perf_counter() - start) * 1_000_000),
+            count_tokens=self.count_tokens,
+        )
+
+
+# --- Template Loading ---
+# Template file -> (modification times of it and its rules file, template).
+_templates: dict[str, tuple[tuple[float, float | None], PromptTemplate]] = {}
+
+
+def _rule_context(rules_file: Path) -> tuple[str, ...]:
+    """Summarizes enabled rules, sorted by name so the prefix is stable."""
+    rules = yaml.safe_load(rules_file.read_text(encoding="utf-8")) or []
+    lines = [
+        f"{rule['name']}: {rule.get('description', '').strip()}"
+        for rule in rules
+        if rule.get("is_enabled", True)
+    ]
+    return tuple(sorted(lines))
+
+
+def _mtime(path: Path | None) -> float | None:
+    return path.stat().st_mtime if path is not None else None
+
+
+def load_template(path: str | Path = PROMPT_FILE) -> PromptTemplate | None:
+    """
+    Loads a prompt template, reusing the parsed template until the file or
+    the rules file it summarizes changes. Returns `None` when no template is
+    configured.
+    """
+    if not path:
+        return None
+    path = Path(path)
+    cached = _templates.get(str(path))
+    if cached is not None:
+        (template_mtime, rules_mtime), template = cached
+        if template_mtime == _mtime(path) and rules_mtime == _mtime(template.rules_file):
+            return template
+
+    raw = path.read_text(encoding="utf-8")
+    spec = yaml.safe_load(raw) or {}
+    rules_file = path.parent / spec["rules_file"] if spec.get("rules_file") else None
+    template = PromptTemplate(
+        # Without an explicit version, the file content identifies the prompt.
+        version=str(spec.get("version") or hashlib.sha256(raw.encode()).hexdigest()[:12]),
+        system=spec.get("system", ""),
+        rule_context=_rule_context(rules_file) if rules_file is not None else (),
+        rules_file=rules_file,
+    )
+    _templates.clear()
+    _templates[str(path)] = ((_mtime(path), _mtime(rules_file)), template)
+    logger.info(f"Loaded prompt template version '{template.version}' from {path}")
+    return template
+
+
+# The worker-wide prompt cache, shared by every llm_activity.
+prompt_cache = PromptCache()
@@ -0,0 +1,246 @@
+"""
+LLM Provider Clients and Hedged Requests
+
+This module keeps one tracerail-core client per LLM provider for the lifetime
+of the worker, and implements hedged requests: when the primary provider is
+slow, the same prompt is sent to a second provider and the first valid
+response wins. A budget bounds how many requests may be hedged, so the extra
+spend stays predictable.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+
+from .metrics import activity_meter, elapsed_ms
+from .startup import lazy_import
+
+tracerail = lazy_import("tracerail")
+tracerail_config = lazy_import("tracerail.config")
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# --- Hedging Configuration ---
+# The provider that receives the hedged copy of a request. Empty disables hedging.
+HEDGE_PROVIDER = os.getenv("LLM_HEDGE_PROVIDER", "")
+# How long to wait for the primary before hedging. 0 sends both right away.
+HEDGE_DELAY_MS = int(os.getenv("LLM_HEDGE_DELAY_MS", "2000"))
+# The maximum fraction of requests that may be hedged.
+HEDGE_MAX_RATIO = float(os.getenv("LLM_HEDGE_MAX_RATIO", "0.1"))
+
+# --- Failover Configuration ---
+# The provider used instead of the configured one while its circuit is open.
+FAILOVER_PROVIDER = os.getenv("LLM_FAILOVER_PROVIDER", "")
+
+
+# --- Provider Client Pool ---
+_clients: dict[str, Any] = {}
+_clients_lock = asyncio.Lock()
+
+
+def config_for_provider(provider: str | None = None):
+    """
+    Loads the TraceRail configuration, optionally overriding the LLM provider.
+    """
+    config = tracerail_config.TraceRailConfig()
+    if provider is None or provider == config.llm.provider.value:
+        return config
+    llm_config = config.llm.model_copy(update={"provider": type(config.llm.provider)(provider)})
+    return config.model_copy(update={"llm": llm_config})
+
+
+async def get_client(provider: str | None = None):
+    """
+    Returns the shared tracerail-core client for a provider, creating it on
+    first use. `None` selects the provider configured in the environment.
+    """
+    key = provider or ""
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    async with _clients_lock:
+        if key not in _clients:
+            if provider is None:
+                _clients[key] = await tracerail.create_client_async()
+            else:
+                _clients[key] = await tracerail.create_client_async(config=config_for_provider(provider))
+            logger.info(f"Created LLM client for provider '{provider or 'default'}'")
+        return _clients[key]
+
+
+def install_client(client, provider: str | None = None) -> None:
+    """
+    Puts a client in the pool in place of the one `get_client` would create
+    for a provider, such as a `FakeLLMClient` for local performance runs.
+    """
+    _clients[provider or ""] = client
+
+
+async def close_clients() -> None:
+    """
+    Closes every pooled client. Called when the worker shuts down.
+    """
+    async with _clients_lock:
+        for client in _clients.values():
+            await client.close()
+        _clients.clear()
+
+
+# --- Hedged Requests ---
+class HedgeBudget:
+    """
+    Limits hedged requests to a fraction of all requests.
+
+    Every request earns `max_ratio` tokens, up to `burst`; every hedge spends
+    one. With `max_ratio=0.1`, at most about one request in ten is hedged, so a
+    provider outage cannot double the LLM bill.
+    """
+
+    def __init__(self, max_ratio: float, burst: float = 10.0):
+        self.max_ratio = max_ratio
+        self.burst = burst
+        self._tokens = burst
+        self.requests = 0
+        self.hedges = 0
+
+    def record_request(self) -> None:
+        self.requests += 1
+        self._tokens = min(self.burst, self._tokens + self.max_ratio)
+
+    def try_spend(self) -> bool:
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        self.hedges += 1
+        return True
+
+    @property
+    def hedge_rate(self) -> float:
+        return self.hedges / self.requests if self.requests else 0.0
+
+
+@dataclass
+class HedgeOutcome(Generic[T]):
+    """The result of a hedged call and which side produced it."""
+
+    result: T
+    winner: str
+    hedged: bool
+    latency_ms: int
+
+
+async def hedged_call(
+    primary: Callable[[], Awaitable[T]],
+    secondary: Callable[[], Awaitable[T]] | None,
+    delay: float,
+    budget: HedgeBudget | None = None,
+    is_valid: Callable[[T], bool] = lambda result: True,
+) -> HedgeOutcome[T]:
+    """
+    Runs `primary`, and `secondary` too if the primary has not produced a valid
+    result within `delay` seconds. The first valid result wins and the other
+    request is cancelled.
+
+    Args:
+        primary: Starts the request to the primary provider.
+        secondary: Starts the hedged request, or `None` to disable hedging.
+        delay: Seconds to wait before hedging. `0` hedges right away.
+        budget: Bounds how many calls may be hedged.
+        is_valid: Decides whether a result is good enough to win.
+
+    Returns:
+        A `HedgeOutcome` with the winning result.
+
+    Raises:
+        The last error seen if neither side produced a valid result.
+    """
+    start = time.perf_counter()
+    if budget is not None:
+        budget.record_request()
+
+    tasks: dict[asyncio.Task, str] = {asyncio.create_task(primary()): "primary"}
+    hedged = False
+    # Set once the hedge was sent or refused by the budget; after that there
+    # is no deadline to wake up for, only the requests themselves.
+    hedge_decided = secondary is None
+    last_error: BaseException | None = None
+
+    def start_hedge() -> None:
+        nonlocal hedged, hedge_decided
+        if hedge_decided:
+            return
+        hedge_decided = True
+        if budget is not None and not budget.try_spend():
+            return
+        hedged = True
+        tasks[asyncio.create_task(secondary())] = "secondary"
+
+    try:
+        if delay <= 0:
+            start_hedge()
+
+        pending = set(tasks)
+        while pending:
+            timeout = None
+            if not hedge_decided:
+                timeout = max(0.0, delay - (time.perf_counter() - start))
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+            if not done:
+                # The primary is slow: send the hedged request.
+                start_hedge()
+                pending = {task for task in tasks if not task.done()}
+                continue
+
+            for task in done:
+                if task.exception() is not None:
+                    last_error = task.exception()
+                    logger.warning(f"{tasks[task].capitalize()} request failed: {last_error}")
+                elif is_valid(task.result()):
+                    return HedgeOutcome(
+                        result=task.result(),
+                        winner=tasks[task],
+                        hedged=hedged,
+                        latency_ms=elapsed_ms(start, time.perf_counter()),
+                    )
+                else:
+                    logger.warning(f"{tasks[task].capitalize()} request returned an invalid response.")
+
+            # The finished side was no good, so do not wait any longer to hedge.
+            start_hedge()
+            pending = {task for task in tasks if not task.done()}
+
+        if last_error is not None:
+            raise last_error
+        raise ValueError("No provider returned a valid response.")
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        # Wait for the losers to unwind so none is left pending or with an unretrieved error.
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def record_hedge_metrics(outcome: HedgeOutcome, provider: str) -> None:
+    """
+    Records latency, hedge rate and hedge wins for an LLM request.
+    """
+    meter = activity_meter().with_additional_attributes({"provider": provider})
+    meter.create_histogram(
+        "tracerail_llm_request_latency", "End-to-end LLM request latency.", "ms"
+    ).record(outcome.latency_ms, {"hedged": str(outcome.hedged).lower()})
+    meter.create_counter("tracerail_llm_requests", "LLM requests.").add(1)
+    if outcome.hedged:
+        meter.create_counter("tracerail_llm_hedges", "LLM requests that were hedged.").add(1)
+        if outcome.winner == "secondary":
+            meter.create_counter("tracerail_llm_hedge_wins", "Hedged requests won by the second provider.").add(1)
+
+
+# The worker-wide hedge budget, shared by every llm_activity.
+hedge_budget = HedgeBudget(HEDGE_MAX_RATIO)
@@ -0,0 +1,119 @@
+"""
+Rule Sets
+
+A common interface over the two ways routing rules are written in this repo:
+a `rules.yaml` file for tracerail-core's rules engine, and a DMN decision
+table in `dmn/` (evaluated locally with `decision_tables`). Shadow mode and
+offline replay use it to evaluate a candidate rule set next to the live one.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+from .decision_tables import load_table
+from .startup import lazy_import
+
+tracerail_config = lazy_import("tracerail.config")
+tracerail_routing = lazy_import("tracerail.routing")
+tracerail_llm = lazy_import("tracerail.llm")
+
+# The decision used when no rule of a DMN table matches, as in tracerail-core.
+FALLBACK_DECISION = "human"
+NO_MATCH_REASON = "No applicable routing rules were matched."
+
+
+@dataclass(frozen=True)
+class RuleOutcome:
+    """The decision of a rule set for one case and the rule that made it."""
+
+    decision: str
+    rule: str
+
+
+def outcome_of(routing_result: dict) -> RuleOutcome:
+    """Reduces a routing result dictionary to its decision and rule."""
+    triggered = routing_result.get("triggered_rules") or []
+    return RuleOutcome(str(routing_result["decision"]), str(triggered[0] if triggered else routing_result.get("reason")))
+
+
+class YamlRuleSet:
+    """A `rules.yaml` file evaluated by tracerail-core's rules engine."""
+
+    def __init__(self, path: str | Path, engine):
+        self.path = str(path)
+        self.engine = engine
+
+    async def route(self, content: str, llm_response: dict | None = None) -> dict:
+        """Routes a case and returns tracerail-core's full routing result."""
+        context = tracerail_routing.RoutingContext(
+            content=content,
+            llm_response=tracerail_llm.LLMResponse.model_validate(llm_response) if llm_response else None,
+        )
+        return (await self.engine.route(context)).to_dict()
+
+    async def evaluate(self, content: str, llm_response: dict | None = None) -> RuleOutcome:
+        return outcome_of(await self.route(content, llm_response))
+
+    async def close(self) -> None:
+        await self.engine.close()
+
+
+class EngineRuleSet(YamlRuleSet):
+    """
+    The routing engine of a tracerail-core client, whatever it is configured
+    to be. The client owns the engine, so closing the rule set leaves it open.
+    """
+
+    def __init__(self, engine):
+        super().__init__("<configured engine>", engine)
+
+    async def close(self) -> None:
+        pass
+
+
+class DmnRuleSet:
+    """A DMN routing table with `confidence` and `content` inputs."""
+
+    def __init__(self, path: str | Path, decision_key: str | None = None):
+        self.path = str(path)
+        self.table = load_table(path, decision_key)
+
+    async def route(self, content: str, llm_response: dict | None = None) -> dict:
+        """Routes a case and returns a result shaped like tracerail-core's."""
+        outcome = self.evaluate_sync(content, llm_response)
+        matched = outcome.rule != NO_MATCH_REASON
+        return {
+            "decision": outcome.decision,
+            "reason": f"Matched rule '{outcome.rule}' of decision table '{self.table.key}'" if matched else outcome.rule,
+            "triggered_rules": [outcome.rule] if matched else [],
+        }
+
+    async def evaluate(self, content: str, llm_response: dict | None = None) -> RuleOutcome:
+        return self.evaluate_sync(content, llm_response)
+
+    def evaluate_sync(self, content: str, llm_response: dict | None = None) -> RuleOutcome:
+        metadata = (llm_response or {}).get("metadata") or {}
+        evaluation = self.table.evaluate({"content": content, "confidence": metadata.get("confidence")})
+        if evaluation.output is None:
+            return RuleOutcome(FALLBACK_DECISION, NO_MATCH_REASON)
+        decision = next(iter(evaluation.output.values()))
+        return RuleOutcome(str(decision), evaluation.matched_rules[0])
+
+    async def close(self) -> None:
+        pass
+
+
+async def load_rule_set(path: str | Path, decision_key: str | None = None) -> YamlRuleSet | DmnRuleSet:
+    """
+    Loads a rule set from a `.yaml`/`.yml` rules file or a `.dmn` decision table.
+    """
+    path = Path(path)
+    if path.suffix == ".dmn":
+        return DmnRuleSet(path, decision_key)
+    if path.suffix in (".yaml", ".yml"):
+        config = tracerail_config.RoutingConfig(
+            engine_type=tracerail_config.RoutingEngine.RULES,
+            engine_config={"rules_file": str(path)},
+        )
+        return YamlRuleSet(path, await tracerail_routing.create_routing_engine(config))
+    raise ValueError(f"Unsupported rule set '{path}': expected a .yaml or .dmn file")
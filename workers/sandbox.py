@@ -0,0 +1,92 @@
+"""
+Workflow Sandbox
+
+The workflow runner the worker uses. By default every workflow runs in
+Temporal's sandbox: for each new run (and each replay into an empty cache) the
+sandbox re-imports the workflow's module and checks what it touches, so
+workflow code cannot leak state between runs or call non-deterministic APIs
+unnoticed. That costs a few milliseconds per run, which shows up as workflow
+task latency when thousands of short cases start together.
+
+Two things keep the cost down without giving up the checks:
+
+- `SANDBOX_RESTRICTIONS` is built once, when the worker starts, and passes
+  the modules the workflows only read from (pure data in `workers/models.py`,
+  activity stubs, option and search attribute helpers) through from the host
+  wherever they are imported, not only inside `imports_passed_through()`
+  blocks, so they are never re-executed per run;
+- the workflow modules themselves are small: each workflow lives in its own
+  module and keeps its constants in `workers/models.py`.
+
+Workflows listed in `WORKFLOW_UNSANDBOXED` (comma-separated workflow names)
+are still validated in the sandbox when the worker starts, but then run
+without it. Only list workflows whose code is reviewed for determinism; a
+mistake in them is no longer caught and can corrupt running cases on replay.
+Compare the modes with `make bench-workflow-tasks`.
+"""
+
+import logging
+import os
+from typing import Sequence
+
+from temporalio.worker import (
+    UnsandboxedWorkflowRunner,
+    WorkflowInstance,
+    WorkflowInstanceDetails,
+    WorkflowRunner,
+)
+from temporalio.worker.workflow_sandbox import SandboxedWorkflowRunner, SandboxRestrictions
+
+logger = logging.getLogger(__name__)
+
+# Modules the workflows import that hold no per-run state. They are imported
+# once in the host and shared by every sandboxed run.
+PASSTHROUGH_MODULES = (
+    "workers.models",
+    "workers.activities",
+    "workers.activity_options",
+    "workers.blobstore",
+    "workers.search_attributes",
+)
+
+SANDBOX_RESTRICTIONS = SandboxRestrictions.default.with_passthrough_modules(*PASSTHROUGH_MODULES)
+
+UNSANDBOXED_WORKFLOWS = frozenset(
+    name.strip() for name in os.getenv("WORKFLOW_UNSANDBOXED", "").split(",") if name.strip()
+)
+
+
+class TrustedWorkflowRunner(WorkflowRunner):
+    """
+    Runs the workflows named in `trusted` without the sandbox and all others
+    in it. Every workflow is validated in the sandbox when the worker starts.
+    """
+
+    def __init__(self, trusted: frozenset[str] = UNSANDBOXED_WORKFLOWS,
+                 restrictions: SandboxRestrictions = SANDBOX_RESTRICTIONS) -> None:
+        super().__init__()
+        self.trusted = trusted
+        self._sandboxed = SandboxedWorkflowRunner(restrictions=restrictions)
+        self._unsandboxed = UnsandboxedWorkflowRunner()
+
+    def prepare_workflow(self, defn) -> None:
+        self._sandboxed.prepare_workflow(defn)
+        if defn.name in self.trusted:
+            logger.warning(f"Workflow '{defn.name}' runs without the sandbox (WORKFLOW_UNSANDBOXED)")
+
+    def create_instance(self, det: WorkflowInstanceDetails) -> WorkflowInstance:
+        if det.defn.name in self.trusted:
+            return self._unsandboxed.create_instance(det)
+        return self._sandboxed.create_instance(det)
+
+    def set_worker_level_failure_exception_types(self, types: Sequence[type[BaseException]]) -> None:
+        super().set_worker_level_failure_exception_types(types)
+        self._sandboxed.set_worker_level_failure_exception_types(types)
+        self._unsandboxed.set_worker_level_failure_exception_types(types)
+
+
+def workflow_runner() -> WorkflowRunner:
+    """Returns the runner for the worker's workflows, honouring `WORKFLOW_UNSANDBOXED`."""
+    if UNSANDBOXED_WORKFLOWS:
+        return TrustedWorkflowRunner()
+    return SandboxedWorkflowRunner(restrictions=SANDBOX_RESTRICTIONS)
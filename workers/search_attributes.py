@@ -0,0 +1,157 @@
+"""
+Case Search Attributes
+
+Typed custom search attributes that index `ExampleWorkflow` cases in Temporal
+visibility, so dashboards and scripts can filter cases with one visibility
+query (for example, "all human-routed cases waiting for more than 4 hours")
+instead of listing every workflow and inspecting its result.
+
+The starter sets the initial attributes, and the workflow upserts them as the
+case advances: its stage, routing decision, LLM provider, confidence bucket,
+triggered routing rule and, while it waits for a human, the time it started
+waiting. The attributes must be registered in the namespace once, with
+`make register-search-attributes`. Set `CASE_SEARCH_ATTRIBUTES=false` to start
+cases without them, for example against a namespace where they are not
+registered; the workflow then leaves them alone.
+
+`case_query` turns common filters into a visibility query for
+`client.list_workflows` or `cli/case_status.py --query`.
+"""
+
+import os
+from datetime import datetime, timezone
+
+from temporalio.common import (
+    SearchAttributeKey,
+    SearchAttributePair,
+    SearchAttributeUpdate,
+    TypedSearchAttributes,
+)
+
+CASE_SEARCH_ATTRIBUTES = os.getenv("CASE_SEARCH_ATTRIBUTES", "true").lower() in ("1", "true", "yes")
+
+WORKFLOW_TYPE = "ExampleWorkflow"
+
+STATUS = SearchAttributeKey.for_keyword("TraceRailStatus")
+DECISION = SearchAttributeKey.for_keyword("TraceRailDecision")
+PROVIDER = SearchAttributeKey.for_keyword("TraceRailProvider")
+CONFIDENCE = SearchAttributeKey.for_keyword("TraceRailConfidence")
+RULE = SearchAttributeKey.for_keyword("TraceRailRule")
+WAITING_SINCE = SearchAttributeKey.for_datetime("TraceRailWaitingSince")
+
+CASE_KEYS = [STATUS, DECISION, PROVIDER, CONFIDENCE, RULE, WAITING_SINCE]
+
+# Lower bounds of the confidence buckets, highest first. 0.75 is the routing
+# rules' threshold for automatic handling.
+CONFIDENCE_BUCKETS = [(0.9, "high"), (0.75, "medium"), (0.0, "low")]
+
+
+def confidence_bucket(confidence: float | None) -> str:
+    """Returns `high`, `medium`, `low` or, without a confidence, `unknown`."""
+    if confidence is None:
+        return "unknown"
+    return next((name for bound, name in CONFIDENCE_BUCKETS if confidence >= bound), "low")
+
+
+def triggered_rule(routing_result: dict) -> str | None:
+    """Returns the first routing rule that fired, or the reason for the decision."""
+    triggered = routing_result.get("triggered_rules") or []
+    rule = triggered[0] if triggered else routing_result.get("reason")
+    return str(rule)[:255] if rule else None
+
+
+def initial_attributes(enabled: bool = CASE_SEARCH_ATTRIBUTES) -> TypedSearchAttributes | None:
+    """Returns the attributes a starter sets on a new case, or `None` when disabled."""
+    if not enabled:
+        return None
+    return TypedSearchAttributes([SearchAttributePair(STATUS, "started")])
+
+
+def indexed(attributes: TypedSearchAttributes) -> bool:
+    """Whether a case was started with search attributes, so it may upsert them."""
+    return STATUS in attributes
+
+
+def attribute_updates(status: dict) -> list[SearchAttributeUpdate]:
+    """
+    Turns the workflow's `status` summary into search attribute updates.
+    Attributes with no value yet are left unset; `TraceRailWaitingSince` is
+    unset again once the case stops waiting.
+    """
+    updates = [STATUS.value_set(status["stage"])]
+    for key, value in ((DECISION, status.get("decision")), (PROVIDER, status.get("provider")),
+                       (CONFIDENCE, status.get("confidence")), (RULE, status.get("rule"))):
+        if value is not None:
+            updates.append(key.value_set(str(value)))
+    if status["stage"] == "awaiting_human" and status.get("waiting_since"):
+        updates.append(WAITING_SINCE.value_set(datetime.fromisoformat(status["waiting_since"])))
+    else:
+        updates.append(WAITING_SINCE.value_unset())
+    return updates
+
+
+def quote(value: str) -> str:
+    """Quotes a string for a visibility query."""
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def _match(name: str, value: str | list[str]) -> str:
+    values = [value] if isinstance(value, str) else list(value)
+    if len(values) == 1:
+        return f"{name} = {quote(values[0])}"
+    return f"{name} IN ({', '.join(quote(v) for v in values)})"
+
+
+def case_query(
+    status: str | list[str] | None = None,
+    decision: str | list[str] | None = None,
+    provider: str | list[str] | None = None,
+    confidence: str | list[str] | None = None,
+    rule: str | list[str] | None = None,
+    waiting_since_before: datetime | None = None,
+    started_after: datetime | None = None,
+    running: bool | None = None,
+) -> str:
+    """
+    Builds a visibility query for `ExampleWorkflow` cases. Each filter takes a
+    value or a list of accepted values, and filters are combined with AND.
+
+    `waiting_since_before` selects cases that have been waiting for a human
+    since before that time. All human-routed cases waiting for more than 4
+    hours, for example:
+
+        case_query(decision="human", waiting_since_before=now - timedelta(hours=4))
+    """
+    clauses = [f"WorkflowType = '{WORKFLOW_TYPE}'"]
+    for key, value in ((STATUS, status), (DECISION, decision), (PROVIDER, provider),
+                       (CONFIDENCE, confidence), (RULE, rule)):
+        if value:
+            clauses.append(_match(key.name, value))
+    if waiting_since_before is not None:
+        clauses.append(f"{WAITING_SINCE.name} < {quote(_timestamp(waiting_since_before))}")
+    if started_after is not None:
+        clauses.append(f"StartTime > {quote(_timestamp(started_after))}")
+    if running is not None:
+        clauses.append(f"ExecutionStatus {'=' if running else '!='} 'Running'")
+    return " AND ".join(clauses)
+
+
+def _timestamp(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def attribute_values(attributes: TypedSearchAttributes) -> dict:
+    """Returns a case's search attribute values by status field name, for `workers/status.py`."""
+    values = {
+        "stage": attributes.get(STATUS),
+        "decision": attributes.get(DECISION),
+        "provider": attributes.get(PROVIDER),
+        "confidence": attributes.get(CONFIDENCE),
+        "rule": attributes.get(RULE),
+    }
+    waiting_since = attributes.get(WAITING_SINCE)
+    if waiting_since is not None:
+        values["waiting_since"] = waiting_since.isoformat()
+    return {name: value for name, value in values.items() if value is not None}
@@ -0,0 +1,312 @@
+"""
+Semantic Cache
+
+Many incoming texts are paraphrases of cases that were already answered. The
+exact-match deduplication in `llm_activity` only catches identical prompts, so
+this cache finds past cases that are *similar*: every text is embedded into
+a vector, and an in-process approximate nearest-neighbour index returns the
+most similar past case in well under a millisecond. When its cosine
+similarity reaches `SEMANTIC_CACHE_THRESHOLD`, the past LLM result is reused
+instead of calling the LLM. Routing still runs on the reused response, under
+the workflow's pinned rules, so the rules stay authoritative.
+
+`SEMANTIC_CACHE` selects the mode:
+
+- `off` (default): no lookups.
+- `shadow`: every text still goes to the LLM, and each hit is compared with
+  the fresh result, which measures the cache's precision before relying on it.
+- `on`: hits are reused.
+
+Texts are embedded by a hashed n-gram vectorizer (words and character n-grams
+hashed into `SEMANTIC_CACHE_DIM` buckets), which needs no model and works
+offline, or by a local sentence-transformers model named in
+`SEMANTIC_CACHE_EMBEDDER`. The index uses random-hyperplane LSH: each vector
+gets a few short bit signatures, and only past cases sharing a signature are
+compared exactly. It is vectorized with numpy when it is installed; without
+numpy, hashed vectors are kept sparse and compared in pure Python. numpy is
+only imported once a cache is created, so workers with the cache off never
+load it.
+
+Each worker process has its own cache of the last `SEMANTIC_CACHE_MAX_ENTRIES`
+results, which expire after `SEMANTIC_CACHE_TTL` seconds. Results are only
+reused for the same prompt version. Embedding a long text takes milliseconds,
+so activities call the cache from a thread; a lock serializes its lookups and
+additions.
+"""
+
+import hashlib
+import logging
+import os
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .metrics import activity_meter
+from .startup import lazy_import, timed_import
+from .stopwords import STOPWORDS
+
+# Set by `load_numpy` when the first cache or model embedder is created.
+np = None
+
+sentence_transformers = lazy_import("sentence_transformers")
+
+logger = logging.getLogger(__name__)
+
+SEMANTIC_CACHE = os.getenv("SEMANTIC_CACHE", "off").lower()
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.8"))
+SEMANTIC_CACHE_EMBEDDER = os.getenv("SEMANTIC_CACHE_EMBEDDER", "hashing")
+SEMANTIC_CACHE_DIM = int(os.getenv("SEMANTIC_CACHE_DIM", "512"))
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "20000"))
+SEMANTIC_CACHE_TTL = float(os.getenv("SEMANTIC_CACHE_TTL", "86400"))
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def load_numpy() -> bool:
+    """Imports numpy on first use. Returns False when it is not installed."""
+    global np
+    if np is None:
+        try:
+            np = timed_import("numpy")
+        except ImportError:
+            return False
+    return True
+
+
+class HashingEmbedder:
+    """
+    Embeds text as hashed word and character n-gram counts, L2-normalized.
+
+    Words other than stopwords carry most of the meaning; character n-grams
+    (`char_ngrams`, within words) make vectors robust to typos and
+    inflections. Each feature is hashed to one of `dim` buckets with a random
+    sign, so collisions cancel out on average instead of adding up.
+    """
+
+    sparse = True
+
+    def __init__(self, dim: int = SEMANTIC_CACHE_DIM, char_ngrams: tuple[int, ...] = (3, 4), char_weight: float = 0.5):
+        self.dim = dim
+        self.char_ngrams = char_ngrams
+        self.char_weight = char_weight
+
+    @staticmethod
+    @lru_cache(maxsize=65536)
+    def _bucket(feature: str) -> int:
+        return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+    def embed(self, text: str) -> dict[int, float]:
+        """Returns the text's vector as `{bucket: value}`."""
+        vector: dict[int, float] = {}
+
+        def add(feature: str, weight: float):
+            value = self._bucket(feature)
+            index = value % self.dim
+            vector[index] = vector.get(index, 0.0) + (weight if value >> 63 else -weight)
+
+        for word in _WORD.findall(text.lower()):
+            if word in STOPWORDS:
+                continue
+            add(word, 1.0)
+            padded = f"<{word}>"
+            for n in self.char_ngrams:
+                for i in range(len(padded) - n + 1):
+                    add(padded[i:i + n], self.char_weight)
+        norm = sum(value * value for value in vector.values()) ** 0.5
+        return {index: value / norm for index, value in vector.items() if value} if norm else {}
+
+
+class SentenceTransformerEmbedder:
+    """Embeds text with a local sentence-transformers model (needs numpy)."""
+
+    sparse = False
+
+    def __init__(self, model_name: str):
+        load_numpy()
+        self.model = sentence_transformers.SentenceTransformer(model_name, device="cpu")
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def embed(self, text: str):
+        return self.model.encode(text, normalize_embeddings=True).astype(np.float32)
+
+
+@dataclass
+class Match:
+    """The most similar cached case for a text."""
+
+    result: dict
+    similarity: float
+    age_seconds: float
+
+
+class SemanticCache:
+    """
+    A bounded, in-process nearest-neighbour cache of LLM results.
+
+    `lookup` returns the best match at or above `threshold` among entries of
+    the same `namespace` (the prompt version); `add` stores a result,
+    replacing the oldest entry once `max_entries` are held.
+    """
+
+    def __init__(self, embedder=None, threshold: float = SEMANTIC_CACHE_THRESHOLD,
+                 max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES, ttl: float = SEMANTIC_CACHE_TTL,
+                 tables: int = 16, bits: int = 8, seed: int = 0, use_numpy: bool = True):
+        self.embedder = embedder or HashingEmbedder()
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.tables = tables
+        self.bits = bits
+        self.use_numpy = use_numpy and load_numpy()
+        if not self.use_numpy and not self.embedder.sparse:
+            raise RuntimeError("A dense embedding model needs numpy")
+
+        dim = self.embedder.dim
+        rng = random.Random(seed)
+        planes = [[rng.gauss(0, 1) for _ in range(dim)] for _ in range(tables * bits)]
+        if self.use_numpy:
+            self._planes = np.asarray(planes, dtype=np.float32)
+            self._weights = (1 << np.arange(bits, dtype=np.int64))
+            self._vectors = np.zeros((max_entries, dim), dtype=np.float32)
+        else:
+            self._planes = planes
+            self._vectors = [None] * max_entries
+        self._buckets: list[dict[int, set[int]]] = [{} for _ in range(tables)]
+        self._slots: list[tuple | None] = [None] * max_entries  # (namespace, result, created_at, signature)
+        self._next = 0
+        self._last: tuple | None = None  # (text, vector, signature) of the last text embedded
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(slot is not None for slot in self._slots)
+
+    def _vector(self, text: str):
+        vector = self.embedder.embed(text)
+        if self.use_numpy and self.embedder.sparse:
+            dense = np.zeros(self.embedder.dim, dtype=np.float32)
+            if vector:
+                dense[list(vector)] = list(vector.values())
+            return dense
+        return vector
+
+    def _prepare(self, text: str) -> tuple:
+        """Returns the text's vector and signature; a miss is often followed by `add`."""
+        if self._last is None or self._last[0] != text:
+            vector = self._vector(text)
+            self._last = (text, vector, self._signature(vector))
+        return self._last[1:]
+
+    def _signature(self, vector) -> tuple[int, ...]:
+        """One `bits`-bit LSH key per table: the signs of the vector's projections."""
+        if self.use_numpy:
+            signs = (self._planes @ vector > 0).reshape(self.tables, self.bits)
+            return tuple(int(key) for key in signs @ self._weights)
+        projections = [sum(plane[i] * value for i, value in vector.items()) for plane in self._planes]
+        return tuple(
+            sum(1 << bit for bit in range(self.bits) if projections[table * self.bits + bit] > 0)
+            for table in range(self.tables)
+        )
+
+    def _similarities(self, vector, candidates: list[int]) -> list[float]:
+        if self.use_numpy:
+            return (self._vectors[candidates] @ vector).tolist()
+        return [
+            sum(value * vector.get(i, 0.0) for i, value in self._vectors[slot].items())
+            for slot in candidates
+        ]
+
+    def lookup(self, text: str, namespace: str = "") -> Match | None:
+        """Returns the most similar live entry at or above the threshold, if any."""
+        with self._lock:
+            return self._lookup(text, namespace)
+
+    def _lookup(self, text: str, namespace: str) -> Match | None:
+        vector, signature = self._prepare(text)
+        now = time.time()
+        candidates = set()
+        for table, key in enumerate(signature):
+            candidates.update(self._buckets[table].get(key, ()))
+        candidates = [
+            slot for slot in candidates
+            if self._slots[slot][0] == namespace and now - self._slots[slot][2] <= self.ttl
+        ]
+        best = None
+        if candidates:
+            similarities = self._similarities(vector, candidates)
+            index = max(range(len(candidates)), key=similarities.__getitem__)
+            if similarities[index] >= self.threshold:
+                _, result, created_at, _ = self._slots[candidates[index]]
+                best = Match(result=result, similarity=similarities[index], age_seconds=now - created_at)
+        if best is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return best
+
+    def add(self, text: str, result: dict, namespace: str = "") -> None:
+        """Stores a result for the text, evicting the oldest entry if full."""
+        with self._lock:
+            self._add(text, result, namespace)
+
+    def _add(self, text: str, result: dict, namespace: str) -> None:
+        vector, signature = self._prepare(text)
+        slot = self._next
+        self._next = (self._next + 1) % self.max_entries
+        old = self._slots[slot]
+        if old is not None:
+            for table, key in enumerate(old[3]):
+                bucket = self._buckets[table].get(key)
+                if bucket is not None:
+                    bucket.discard(slot)
+                    if not bucket:
+                        del self._buckets[table][key]
+        self._vectors[slot] = vector
+        self._slots[slot] = (namespace, result, time.time(), signature)
+        for table, key in enumerate(signature):
+            self._buckets[table].setdefault(key, set()).add(slot)
+
+
+def create_embedder(name: str = SEMANTIC_CACHE_EMBEDDER):
+    """Returns the hashed n-gram embedder, or the named sentence-transformers model."""
+    if name == "hashing":
+        return HashingEmbedder()
+    return SentenceTransformerEmbedder(name)
+
+
+_cache: SemanticCache | None = None
+
+
+def get_semantic_cache() -> SemanticCache | None:
+    """Returns the process's semantic cache, or `None` when `SEMANTIC_CACHE=off`."""
+    global _cache
+    if SEMANTIC_CACHE not in ("shadow", "on"):
+        return None
+    if _cache is None:
+        _cache = SemanticCache(create_embedder())
+        logger.info(
+            f"Semantic cache enabled ({SEMANTIC_CACHE}, {SEMANTIC_CACHE_EMBEDDER} embeddings, "
+            f"threshold {SEMANTIC_CACHE_THRESHOLD}, {'numpy' if _cache.use_numpy else 'pure Python'})"
+        )
+    return _cache
+
+
+def record_semantic_cache_metrics(match: Match | None, lookup_us: int, agreed: bool | None = None) -> None:
+    """
+    Records a lookup's outcome and latency and, in shadow mode, whether a hit
+    agreed with the fresh LLM result.
+    """
+    meter = activity_meter()
+    attributes = {"mode": SEMANTIC_CACHE, "outcome": "hit" if match else "miss"}
+    meter.create_counter("tracerail_semantic_cache", "Semantic cache lookups by outcome.").add(1, attributes)
+    meter.create_histogram(
+        "tracerail_semantic_cache_lookup_time", "Time spent embedding a text and searching the semantic cache.", "us"
+    ).record(lookup_us, attributes)
+    if agreed is not None:
+        meter.create_counter(
+            "tracerail_semantic_cache_agreement", "Shadow-mode hits by whether the cached routing decision matched the LLM's."
+        ).add(1, {"agreed": str(agreed).lower()})
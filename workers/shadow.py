@@ -0,0 +1,191 @@
+"""
+Shadow-Mode Rule Evaluation
+
+Evaluates a candidate rule set (`SHADOW_RULES_FILE`, a `rules.yaml` file or a
+DMN table) on every live routing context, off the critical path. The routing
+activity only puts the case on a bounded queue, which never blocks; a daemon
+thread with its own event loop evaluates the candidate and compares it with
+the live decision. When the queue is full the case is dropped and counted,
+so a slow candidate can never delay production routing.
+
+Divergences are appended to a compact JSONL log (`SHADOW_LOG_FILE`), along
+with periodic cumulative stats lines. `bin/shadow-report.py` summarises it.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from .fingerprint import content_fingerprint
+from .rulesets import load_rule_set
+
+logger = logging.getLogger(__name__)
+
+SHADOW_RULES_FILE = os.getenv("SHADOW_RULES_FILE", "")
+SHADOW_LOG_FILE = os.getenv("SHADOW_LOG_FILE", "shadow-divergence.jsonl")
+SHADOW_QUEUE_SIZE = int(os.getenv("SHADOW_QUEUE_SIZE", "1000"))
+SHADOW_STATS_INTERVAL = float(os.getenv("SHADOW_STATS_INTERVAL", "60"))
+
+
+@dataclass
+class ShadowCase:
+    """A live routing decision waiting to be compared with the candidate."""
+
+    content: str
+    llm_response: dict | None
+    live_decision: str
+    live_rule: str
+    live_latency_us: int
+
+
+@dataclass
+class ShadowStats:
+    """Cumulative counters since the evaluator started."""
+
+    evaluated: int = 0
+    agreed: int = 0
+    dropped: int = 0
+    errors: int = 0
+    live_latency_us: int = 0
+    shadow_latency_us: int = 0
+
+    @property
+    def agreement_rate(self) -> float:
+        return self.agreed / self.evaluated if self.evaluated else 1.0
+
+    def to_dict(self) -> dict:
+        return {
+            "type": "stats",
+            "ts": round(time.time(), 3),
+            "evaluated": self.evaluated,
+            "agreed": self.agreed,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "live_us": self.live_latency_us,
+            "shadow_us": self.shadow_latency_us,
+        }
+
+
+class ShadowEvaluator:
+    """
+    Compares a candidate rule set with live decisions in a background thread.
+
+    Args:
+        rules_file: The candidate `rules.yaml` or `.dmn` file.
+        log_path: The append-only JSONL divergence log.
+        queue_size: Cases buffered before new ones are dropped.
+        stats_interval: Seconds between cumulative stats lines in the log.
+    """
+
+    def __init__(self, rules_file: str | Path, log_path: str | Path = SHADOW_LOG_FILE,
+                 queue_size: int = SHADOW_QUEUE_SIZE, stats_interval: float = SHADOW_STATS_INTERVAL):
+        self.rules_file = str(rules_file)
+        self.log_path = Path(log_path)
+        self.stats_interval = stats_interval
+        self.stats = ShadowStats()
+        self._queue: queue.Queue[ShadowCase | None] = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="shadow-rules", daemon=True)
+        self._thread.start()
+
+    def submit(self, case: ShadowCase) -> bool:
+        """
+        Queues a live decision for comparison without waiting. Returns False
+        if the queue was full and the case was dropped.
+        """
+        try:
+            self._queue.put_nowait(case)
+            return True
+        except queue.Full:
+            self.stats.dropped += 1
+            return False
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Evaluates the cases already queued, writes final stats and stops."""
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        asyncio.run(self._loop())
+
+    async def _loop(self) -> None:
+        try:
+            rule_set = await load_rule_set(self.rules_file)
+        except Exception as e:
+            logger.error(f"Shadow mode disabled: could not load '{self.rules_file}': {e}")
+            return
+        logger.info(f"Shadow mode evaluating '{self.rules_file}' against live routing decisions")
+
+        next_stats = time.monotonic() + self.stats_interval
+        with self.log_path.open("a", encoding="utf-8") as log:
+            while True:
+                try:
+                    case = self._queue.get(timeout=1.0)
+                    if case is None:
+                        break
+                    await self._compare(rule_set, case, log)
+                except queue.Empty:
+                    pass
+                if time.monotonic() >= next_stats:
+                    log.write(json.dumps(self.stats.to_dict(), separators=(",", ":")) + "\n")
+                    log.flush()
+                    next_stats = time.monotonic() + self.stats_interval
+            log.write(json.dumps(self.stats.to_dict(), separators=(",", ":")) + "\n")
+        await rule_set.close()
+
+    async def _compare(self, rule_set, case: ShadowCase, log) -> None:
+        start = time.perf_counter()
+        try:
+            outcome = await rule_set.evaluate(case.content, case.llm_response)
+        except Exception as e:
+            self.stats.errors += 1
+            logger.warning(f"Shadow rule evaluation failed: {e}")
+            return
+        shadow_latency_us = int((time.perf_counter() - start) * 1_000_000)
+
+        stats = self.stats
+        stats.evaluated += 1
+        stats.live_latency_us += case.live_latency_us
+        stats.shadow_latency_us += shadow_latency_us
+        if outcome.decision == case.live_decision:
+            stats.agreed += 1
+            return
+        record = {
+            "ts": round(time.time(), 3),
+            "fp": content_fingerprint(case.content)[:16],
+            "live": case.live_decision,
+            "shadow": outcome.decision,
+            "live_rule": case.live_rule,
+            "shadow_rule": outcome.rule,
+            "dl_us": shadow_latency_us - case.live_latency_us,
+        }
+        log.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+_evaluator: ShadowEvaluator | None = None
+
+
+def get_shadow_evaluator() -> ShadowEvaluator | None:
+    """
+    Returns the process-wide shadow evaluator, or None when shadow mode is off.
+    """
+    global _evaluator
+    if _evaluator is None and SHADOW_RULES_FILE:
+        _evaluator = ShadowEvaluator(SHADOW_RULES_FILE)
+    return _evaluator
+
+
+def close_shadow_evaluator() -> None:
+    """Flushes and stops the shadow evaluator, if one was started."""
+    global _evaluator
+    if _evaluator is not None:
+        _evaluator.close()
+        _evaluator = None
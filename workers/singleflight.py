@@ -0,0 +1,79 @@
+"""
+Singleflight
+
+Coalesces duplicate work inside a worker. While a call for a key is in
+flight, identical calls wait for its result instead of starting their own;
+once it finishes, the result is kept for a short time so that duplicates
+arriving just afterwards can reuse it.
+
+The shared call runs in its own task and callers wait on it through
+`asyncio.shield`, so one caller being cancelled (an activity timing out, for
+example) does not cancel the call for everyone else.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+LEADER = "leader"
+COALESCED = "coalesced"
+CACHED = "cached"
+
+
+class SingleFlight:
+    """
+    Args:
+        ttl: Seconds a finished result is reused for (0 disables reuse).
+        max_entries: Finished results kept, least recently used first out.
+    """
+
+    def __init__(self, ttl: float = 0.0, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._in_flight: dict[str, asyncio.Task] = {}
+        self._recent: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def _cached(self, key: str) -> tuple[bool, Any]:
+        entry = self._recent.get(key)
+        if entry is None:
+            return False, None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl:
+            del self._recent[key]
+            return False, None
+        self._recent.move_to_end(key)
+        return True, value
+
+    def _store(self, key: str, task: asyncio.Task) -> None:
+        self._in_flight.pop(key, None)
+        if self.ttl > 0 and not task.cancelled() and task.exception() is None:
+            self._recent[key] = (time.monotonic(), task.result())
+            self._recent.move_to_end(key)
+            while len(self._recent) > self.max_entries:
+                self._recent.popitem(last=False)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> tuple[Any, str]:
+        """
+        Runs `fn` unless an identical call is in flight or recently finished.
+
+        Returns:
+            The result and how it was obtained: `leader` (this call ran `fn`),
+            `coalesced` (it joined an in-flight call) or `cached`.
+        """
+        hit, value = self._cached(key)
+        if hit:
+            return value, CACHED
+
+        task = self._in_flight.get(key)
+        role = COALESCED
+        if task is None:
+            task = asyncio.create_task(fn())
+            task.add_done_callback(lambda done: self._store(key, done))
+            self._in_flight[key] = task
+            role = LEADER
+        return await asyncio.shield(task), role
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
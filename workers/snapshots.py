@@ -0,0 +1,149 @@
+"""
+Rule-Set Snapshots
+
+Immutable, content-addressed copies of the rule files, so every activity of a
+workflow evaluates the same rules no matter when it runs or is retried.
+
+A workflow pins snapshots when it starts: the current `ROUTING_RULES_FILE`
+(a `rules.yaml` or DMN file) is put in the blob store (`workers/blobstore.py`)
+under the SHA-256 of its content, and the snapshot ID travels with the
+workflow. Activities look up the compiled rule set by ID in a per-worker
+cache, so a hit is a dictionary lookup with no file read or parse. On a miss
+(a new worker, or a snapshot pinned on another worker) the snapshot is copied
+from the blob store into the worker's `RULES_SNAPSHOT_DIR` and compiled once.
+
+The blob store is shared by all workers, as it already must be for large
+documents, so a snapshot pinned on one worker is found on any other. Pinning
+refreshes the blob's timestamp, so blob GC keeps it while cases use it.
+Snapshots pinned before the blob store was used (24-digit IDs) are only in
+the snapshot directory of the worker that pinned them.
+
+Pinning and loading read files; call them from async code through
+`asyncio.to_thread` (`get_rule_set` and `get_table` already do).
+
+Routing is only pinned when `ROUTING_RULES_FILE` is set. Without it, cases are
+routed by the engine tracerail-core is configured with (the rules engine, or a
+Flowable DMN deployment), which has no local file to snapshot.
+"""
+
+import asyncio
+import logging
+import os
+from pathlib import Path
+
+from .blobstore import BlobNotFoundError, BlobStore, get_blob_store
+from .decision_tables import DecisionTable, load_table
+from .rulesets import DmnRuleSet, YamlRuleSet, load_rule_set
+
+logger = logging.getLogger(__name__)
+
+ROUTING_RULES_FILE = os.getenv("ROUTING_RULES_FILE", "")
+RULES_SNAPSHOT_DIR = Path(os.getenv("RULES_SNAPSHOT_DIR", ".rules-snapshots"))
+
+
+class SnapshotNotFoundError(Exception):
+    """Raised when a pinned snapshot is in neither the cache nor the store."""
+
+
+# Source file path -> (mtime, content), so unchanged files are not re-read.
+_pinned: dict[str, tuple[float, bytes]] = {}
+_rule_sets: dict[str, YamlRuleSet | DmnRuleSet] = {}
+_tables: dict[tuple[str, str], DecisionTable] = {}
+_locks: dict[str, asyncio.Lock] = {}
+
+
+def snapshot_path(snapshot_id: str, store: Path = RULES_SNAPSHOT_DIR) -> Path:
+    """Returns where a snapshot is kept in the worker's snapshot directory."""
+    return store / snapshot_id
+
+
+def _write(path: Path, content: bytes) -> None:
+    if path.exists():
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write then rename, so a reader never sees a partial snapshot.
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temporary.write_bytes(content)
+    temporary.replace(path)
+
+
+def pin_snapshot(source: str | Path, store: Path = RULES_SNAPSHOT_DIR, blobs: BlobStore | None = None) -> str:
+    """
+    Puts a rule file in the blob store, keyed by its content.
+
+    Returns:
+        The snapshot ID: the content's blob key followed by the file's
+        suffix, e.g. `3f2a...c1.yaml`.
+    """
+    source = Path(source)
+    mtime = source.stat().st_mtime
+    cached = _pinned.get(str(source))
+    if cached is not None and cached[0] == mtime:
+        content = cached[1]
+    else:
+        content = source.read_bytes()
+        _pinned[str(source)] = (mtime, content)
+    snapshot_id = f"{(blobs or get_blob_store()).put(content)}{source.suffix}"
+    path = snapshot_path(snapshot_id, store)
+    if not path.exists():
+        _write(path, content)
+        logger.info(f"Pinned new rules snapshot {snapshot_id} from {source}")
+    return snapshot_id
+
+
+def fetch_snapshot(snapshot_id: str, store: Path = RULES_SNAPSHOT_DIR, blobs: BlobStore | None = None) -> Path:
+    """
+    Returns the path of a snapshot in the worker's snapshot directory,
+    copying it from the blob store first if it was pinned elsewhere.
+    """
+    path = snapshot_path(snapshot_id, store)
+    if path.exists():
+        return path
+    key = snapshot_id.split(".", 1)[0]
+    try:
+        content = (blobs or get_blob_store()).get(key)
+    except BlobNotFoundError:
+        raise SnapshotNotFoundError(f"Rules snapshot '{snapshot_id}' not found in {store} or the blob store") from None
+    _write(path, content)
+    return path
+
+
+async def get_rule_set(snapshot_id: str, store: Path = RULES_SNAPSHOT_DIR) -> YamlRuleSet | DmnRuleSet:
+    """
+    Returns the compiled rule set of a snapshot, compiling it on the first use.
+    """
+    rule_set = _rule_sets.get(snapshot_id)
+    if rule_set is not None:
+        return rule_set
+
+    lock = _locks.setdefault(snapshot_id, asyncio.Lock())
+    async with lock:
+        rule_set = _rule_sets.get(snapshot_id)
+        if rule_set is None:
+            path = await asyncio.to_thread(fetch_snapshot, snapshot_id, store)
+            rule_set = await load_rule_set(path)
+            _rule_sets[snapshot_id] = rule_set
+            logger.info(f"Compiled rules snapshot {snapshot_id}")
+    return rule_set
+
+
+def _load_table(snapshot_id: str, decision_key: str, store: Path) -> DecisionTable:
+    return load_table(fetch_snapshot(snapshot_id, store), decision_key)
+
+
+async def get_table(snapshot_id: str, decision_key: str, store: Path = RULES_SNAPSHOT_DIR) -> DecisionTable:
+    """
+    Returns a compiled decision table from a DMN snapshot.
+    """
+    table = _tables.get((snapshot_id, decision_key))
+    if table is None:
+        table = await asyncio.to_thread(_load_table, snapshot_id, decision_key, store)
+        _tables[(snapshot_id, decision_key)] = table
+    return table
+
+
+async def close_snapshots() -> None:
+    """Closes the routing engines of all compiled snapshots."""
+    for rule_set in _rule_sets.values():
+        await rule_set.close()
+    _rule_sets.clear()
@@ -0,0 +1,106 @@
+"""
+Startup Helpers for the TraceRail Worker
+
+Cold start matters for autoscaled workers. This module provides lazy module
+proxies, so heavy packages (tracerail-core, provider SDKs, guardrails) are only
+imported when an activity first needs them, and records how long every import
+takes so the worker can log a per-module breakdown at startup.
+"""
+
+import importlib
+import logging
+import sys
+import time
+from types import ModuleType
+
+logger = logging.getLogger(__name__)
+
+# --- Import Timings ---
+# Module name -> seconds spent importing it. Only imports that actually ran
+# are recorded; modules that were already loaded cost nothing.
+import_timings: dict[str, float] = {}
+
+# The SDK each LLM provider needs. Used to warm only the configured provider.
+PROVIDER_MODULES: dict[str, str] = {
+    "openai": "openai",
+    "deepseek": "openai",
+}
+
+
+def timed_import(name: str) -> ModuleType:
+    """
+    Imports a module by name and records the time the import took.
+
+    Args:
+        name: The dotted module name to import.
+
+    Returns:
+        The imported module.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    elapsed = time.perf_counter() - start
+    import_timings[name] = elapsed
+    logger.debug(f"Imported '{name}' in {elapsed * 1000:.1f} ms")
+    return module
+
+
+class LazyModule(ModuleType):
+    """
+    A module proxy that defers the real import until an attribute is accessed.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self) -> ModuleType:
+        if self.__dict__["_module"] is None:
+            self.__dict__["_module"] = timed_import(self.__name__)
+        return self.__dict__["_module"]
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.__dict__["_module"] is not None
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Returns a proxy for the module that imports it on first attribute access.
+    """
+    return LazyModule(name)
+
+
+def preload_provider(provider: str) -> None:
+    """
+    Imports the SDK needed by the configured LLM provider, and nothing else.
+
+    Meant to run in a background thread once the worker is polling, so the
+    first activity does not pay for the import.
+    """
+    module = PROVIDER_MODULES.get(provider)
+    if module is None:
+        logger.debug(f"No SDK registered for provider '{provider}', nothing to preload.")
+        return
+    try:
+        timed_import(module)
+    except ImportError as e:
+        logger.warning(f"Could not preload SDK '{module}' for provider '{provider}': {e}")
+
+
+def log_import_timings() -> None:
+    """
+    Logs the recorded import timings, slowest first.
+    """
+    if not import_timings:
+        return
+    total = sum(import_timings.values())
+    logger.info(f"Import time: {total * 1000:.1f} ms across {len(import_timings)} module(s)")
+    for name, elapsed in sorted(import_timings.items(), key=lambda item: item[1], reverse=True):
+        logger.info(f"   - {name}: {elapsed * 1000:.1f} ms")
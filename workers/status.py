@@ -0,0 +1,123 @@
+"""
+Case Status
+
+Status checks for `ExampleWorkflow` cases that never load a workflow history
+on the caller's side. Describing a workflow and reading its history to find
+where it stands costs a history fetch per case. Here instead, every case's
+status comes from visibility, which lists up to a hundred cases per request:
+
+- a closed case, or a running case started with search attributes, is
+  answered from what visibility has indexed: its stage, routing decision and
+  the other facts the workflow upserts as it advances;
+- a running case started without them only has an execution status there, so
+  it is sent the `status` query. A worker answers it, replaying the case's
+  history if it is not in its workflow cache, so at most `max_queries`
+  (`CASE_STATUS_QUERY_LIMIT`) such cases are queried per call; the rest keep
+  their visibility status.
+
+`bulk_status` resolves many workflow IDs at once, and `recent_status` lists the
+latest cases, as the task bridge's `/workflows?limit=...` endpoint does. Both
+return compact dictionaries shaped like the `status` query's result.
+"""
+
+import asyncio
+import logging
+import os
+
+from temporalio.client import Client, WorkflowExecution, WorkflowExecutionStatus
+
+from .search_attributes import STATUS, WORKFLOW_TYPE, attribute_values, quote
+from .workflows import ExampleWorkflow
+
+logger = logging.getLogger(__name__)
+
+# Workflow IDs per `WorkflowId IN (...)` visibility query.
+VISIBILITY_BATCH = 100
+
+# Running cases without search attributes sent the `status` query per call
+CASE_STATUS_QUERY_LIMIT = int(os.getenv("CASE_STATUS_QUERY_LIMIT", "100"))
+
+
+def visibility_status(execution: WorkflowExecution) -> dict:
+    """
+    Returns the status of a case as far as visibility knows it: the execution
+    status, timestamps and, for cases started with search attributes
+    (`indexed`), the last stage and routing facts the workflow indexed.
+    """
+    status = execution.status.name if execution.status else None
+    return {
+        "workflow_id": execution.id,
+        "run_id": execution.run_id,
+        "status": status,
+        "stage": "running" if execution.status == WorkflowExecutionStatus.RUNNING else "closed",
+        "started_at": execution.start_time.isoformat() if execution.start_time else None,
+        "closed_at": execution.close_time.isoformat() if execution.close_time else None,
+        "indexed": STATUS in execution.typed_search_attributes,
+        **attribute_values(execution.typed_search_attributes),
+    }
+
+
+async def _with_query(client: Client, records: list[dict], concurrency: int, max_queries: int) -> list[dict]:
+    """
+    Completes the records of running cases that visibility has not indexed
+    with their `status` query, `concurrency` at a time and at most
+    `max_queries` of them.
+    """
+    unindexed = [
+        record for record in records
+        if record["status"] == WorkflowExecutionStatus.RUNNING.name and not record["indexed"]
+    ]
+    if len(unindexed) > max_queries:
+        logger.info(
+            f"Querying {max_queries} of {len(unindexed)} running cases without search attributes; "
+            "the others only have their visibility status"
+        )
+    selected = {id(record) for record in unindexed[:max_queries]}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def query(record: dict) -> dict:
+        if id(record) not in selected:
+            return record
+        handle = client.get_workflow_handle(record["workflow_id"], run_id=record["run_id"])
+        async with semaphore:
+            try:
+                return {**record, **await handle.query(ExampleWorkflow.status)}
+            except Exception as e:
+                # Closed since it was listed, or no worker is polling; visibility is all there is.
+                logger.debug(f"Status query for {record['workflow_id']} failed: {e}")
+                return {**record, "error": str(e)}
+
+    return list(await asyncio.gather(*(query(record) for record in records)))
+
+
+async def bulk_status(client: Client, workflow_ids: list[str], concurrency: int = 50,
+                      max_queries: int = CASE_STATUS_QUERY_LIMIT) -> dict[str, dict]:
+    """
+    Returns the status of each workflow ID (the latest run), keyed by ID. IDs
+    with no execution are left out.
+    """
+    records: dict[str, dict] = {}
+    for start in range(0, len(workflow_ids), VISIBILITY_BATCH):
+        batch = workflow_ids[start:start + VISIBILITY_BATCH]
+        query = f"WorkflowId IN ({', '.join(quote(workflow_id) for workflow_id in batch)})"
+        async for execution in client.list_workflows(query, page_size=VISIBILITY_BATCH):
+            known = records.get(execution.id)
+            # Visibility lists every run of an ID; keep the latest.
+            if known is None or (execution.start_time and execution.start_time.isoformat() > known["started_at"]):
+                records[execution.id] = visibility_status(execution)
+    queried = await _with_query(client, list(records.values()), concurrency, max_queries)
+    return {record["workflow_id"]: record for record in queried}
+
+
+async def recent_status(client: Client, limit: int = 100, query: str | None = None,
+                        concurrency: int = 50, max_queries: int = CASE_STATUS_QUERY_LIMIT) -> list[dict]:
+    """
+    Returns the status of the `limit` most recently started cases, or of
+    those matching a visibility `query`.
+    """
+    query = query or f"WorkflowType = '{WORKFLOW_TYPE}'"
+    records = [
+        visibility_status(execution)
+        async for execution in client.list_workflows(query, limit=limit, page_size=min(limit, 1000))
+    ]
+    return await _with_query(client, records, concurrency, max_queries)
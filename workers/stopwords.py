@@ -0,0 +1,13 @@
+"""
+Stopwords
+
+Words too common to say anything about a case on their own. Rule mining
+(`workers/mining.py`) never proposes them as keywords, and the semantic
+cache's hashing embedder (`workers/semantic_cache.py`) leaves them out of
+its vectors. Kept apart so neither has to import the other.
+"""
+
+STOPWORDS = frozenset(
+    "a an and are as at be but by can do for from has have i if in is it its me my "
+    "no not of on or our please so that the this to was we were what when with you your".split()
+)
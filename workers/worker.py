@@ -6,36 +6,73 @@ This script initializes and runs a Temporal worker that listens on a specific
 task queue for workflows and activities to execute.
 """
 
+import time
+
+# Taken before any other import so startup time includes module loading.
+_STARTUP_BEGIN = time.perf_counter()
+
 import asyncio
 import logging
+import os
 from pathlib import Path
 import sys
 
 # Add the project root to the Python path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from dotenv import load_dotenv
+from workers.startup import log_import_timings, preload_provider, timed_import
 
-# Load environment variables from a .env file in the project root
-load_dotenv()
+# Configure basic logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
 
 try:
-    from temporalio.client import Client
-    from temporalio.worker import Worker
-
-    # Import the activities and workflows the worker will execute
-    from workers.activities import llm_activity, routing_activity
-    from workers.workflows import ExampleWorkflow
+    # Load environment variables from a .env file in the project root
+    timed_import("dotenv").load_dotenv()
+
+    Client = timed_import("temporalio.client").Client
+    Worker = timed_import("temporalio.worker").Worker
+    temporal_runtime = timed_import("temporalio.runtime")
+
+    # Import the activities and workflows the worker will execute.
+    # tracerail-core itself is imported lazily by the activities.
+    ACTIVITIES = timed_import("workers.activities").ACTIVITIES
+    ExampleWorkflow = timed_import("workers.workflows").ExampleWorkflow
+    BatchProcessingWorkflow = timed_import("workers.batch_workflow").BatchProcessingWorkflow
+    workflow_runner = timed_import("workers.sandbox").workflow_runner
+    close_clients = timed_import("workers.providers").close_clients
+    close_shadow_evaluator = timed_import("workers.shadow").close_shadow_evaluator
+    close_snapshots = timed_import("workers.snapshots").close_snapshots
+    data_converter = timed_import("workers.claimcheck").data_converter
+    load_activity_options = timed_import("workers.activity_options").load_activity_options
 
     # Import the core config to get Temporal settings
-    from tracerail.config import TraceRailConfig
+    TraceRailConfig = timed_import("tracerail.config").TraceRailConfig
 
 except ImportError as e:
     print(f"⚠️  Import error: {e}. Please run 'poetry install' to install dependencies.")
     sys.exit(1)
 
-# Configure basic logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+# When enabled, the configured provider's SDK is imported in the background
+# once the worker is polling, so the first activity does not pay for it.
+PRELOAD_PROVIDER = os.getenv("WORKER_PRELOAD_PROVIDER", "true").lower() == "true"
+
+# When set (e.g. "0.0.0.0:9464"), worker and activity metrics are exposed
+# on this address for Prometheus to scrape.
+METRICS_ADDRESS = os.getenv("WORKER_METRICS_ADDRESS", "")
+
+
+def create_runtime():
+    """
+    Creates a Temporal runtime that exports metrics to Prometheus, or returns
+    `None` to use the default runtime when metrics are disabled.
+    """
+    if not METRICS_ADDRESS:
+        return None
+    return temporal_runtime.Runtime(
+        telemetry=temporal_runtime.TelemetryConfig(
+            metrics=temporal_runtime.PrometheusConfig(bind_address=METRICS_ADDRESS)
+        )
+    )
 
 
 async def main():
@@ -51,26 +88,52 @@ async def main():
     task_queue = temporal_config.task_queue
     temporal_address = f"{temporal_config.host}:{temporal_config.port}"
 
+    workflows = [ExampleWorkflow, BatchProcessingWorkflow]
+
     print(f"   - Connecting to Temporal server at: {temporal_address}")
     print(f"   - Listening on task queue: '{task_queue}'")
-    print("   - Registered Workflows: [ExampleWorkflow]")
-    print("   - Registered Activities: [llm_activity, routing_activity]")
+    print(f"   - Registered Workflows: [{', '.join(w.__name__ for w in workflows)}]")
+    print(f"   - Registered Activities: [{', '.join(a.__name__ for a in ACTIVITIES)}]")
+    if METRICS_ADDRESS:
+        print(f"   - Exposing metrics on: {METRICS_ADDRESS}")
     print("\nLogs will appear below. Press Ctrl+C to stop the worker.")
     print("-" * 50)
 
+    preload_task = None
     try:
-        # Create a client to connect to the Temporal service
-        client = await Client.connect(temporal_address, namespace=temporal_config.namespace)
+        # Timeouts and retry policies for the workflow's activities; a bad file stops the worker here.
+        activity_options = load_activity_options()
+        logging.info(f"Loaded options for {len(activity_options) - 1} activity type(s)")
+
+        # Create a client to connect to the Temporal service. Large payloads
+        # are offloaded to the blob store by the claim-check codec.
+        client = await Client.connect(
+            temporal_address, namespace=temporal_config.namespace, runtime=create_runtime(),
+            data_converter=data_converter(),
+        )
 
         # Create and run the worker. The worker polls the task queue and executes
         # workflows and activities.
         worker = Worker(
             client,
             task_queue=task_queue,
-            workflows=[ExampleWorkflow],
-            activities=[llm_activity, routing_activity],
+            workflows=workflows,
+            workflow_runner=workflow_runner(),
+            activities=ACTIVITIES,
         )
-        await worker.run()
+        run_task = asyncio.create_task(worker.run())
+        while not worker.is_running and not run_task.done():
+            await asyncio.sleep(0.005)
+
+        if worker.is_running:
+            # `bin/bench-startup.py` looks for this line to measure time-to-first-poll.
+            logging.info(f"Worker polling after {time.perf_counter() - _STARTUP_BEGIN:.3f}s")
+            log_import_timings()
+            if PRELOAD_PROVIDER:
+                provider = config.llm.provider.value
+                preload_task = asyncio.create_task(asyncio.to_thread(preload_provider, provider))
+
+        await run_task
 
     except ConnectionRefusedError:
         logging.error(f"❌ Connection refused. Is the Temporal service running at {temporal_address}?")
@@ -79,6 +142,16 @@ async def main():
     except Exception as e:
         logging.error(f"❌ An unexpected error occurred: {e}", exc_info=True)
         sys.exit(1)
+    finally:
+        # A preload still running when the worker stops is not waited for
+        if preload_task is not None:
+            preload_task.cancel()
+        # Close the LLM clients shared by the activities
+        await close_clients()
+        # Close the routing engines compiled from rules snapshots
+        await close_snapshots()
+        # Flush the shadow-mode divergence log, if shadow mode is on
+        await asyncio.to_thread(close_shadow_evaluator)
 
 
 if __name__ == "__main__":
@@ -4,17 +4,62 @@ Temporal Workflows for the TraceRail Bootstrap Application
 This module defines the example Temporal workflow (`ExampleWorkflow`) that
 demonstrates how to orchestrate LLM processing and routing logic using
 the activities defined in `activities.py`.
+
+Large documents arrive as a blob reference instead of text. They are split
+into chunks that are sent to the LLM in parallel, a bounded number at a time,
+and the chunk results are reduced into one response before routing.
+
+A multi-part case (several attachments or sub-questions) arrives as a list of
+items. Each item is processed by the LLM independently, a bounded number at a
+time, and the case is then routed, and waits for a human, once.
+
+Workflow modules are re-imported by the sandbox for every workflow run, so
+this one holds only the workflow: its constants and pure helpers live in
+`models.py`, which the sandbox passes through (see `sandbox.py`), and
+`BatchProcessingWorkflow` lives in `batch_workflow.py`.
+
+Every step added since the first version of the workflow (pinned rules,
+guardrails, post rules, chunking, multi-part cases, search attributes,
+failing failed cases) is behind `workflow.patched()`, so cases started by an older worker replay
+without it. Remove a patch only once no case started without it is running.
 """
 
+import asyncio
 import logging
 from datetime import timedelta
 from temporalio import workflow
+from temporalio.exceptions import ApplicationError
 
 # Import activity stubs.
 # `with workflow.unsafe.imports_passed_through():` is used to bypass the
 # sandbox restrictions for type hinting, which is a best practice.
 with workflow.unsafe.imports_passed_through():
-    from .activities import llm_activity, routing_activity
+    from .activities import (
+        chunk_document_activity,
+        combine_items_activity,
+        guardrails_activity,
+        llm_activity,
+        pin_rules_snapshot_activity,
+        post_rules_activity,
+        reduce_chunks_activity,
+        routing_activity,
+    )
+    from .activity_options import activity_options
+    from .blobstore import is_blob_ref
+    from .models import (
+        CHUNK_FAN_OUT,
+        ITEM_FAN_OUT,
+        PATCH_CHUNKING,
+        PATCH_FAIL_CASES,
+        PATCH_GUARDRAILS,
+        PATCH_MULTI_PART,
+        PATCH_PIN_RULES,
+        PATCH_POST_RULES,
+        PATCH_SEARCH_ATTRIBUTES,
+        new_case_status,
+        post_rule_fields,
+    )
+    from .search_attributes import attribute_updates, confidence_bucket, indexed, triggered_rule
 
 # --- Workflow-Specific Logging ---
 # This helps differentiate workflow logs from activity or worker logs.
@@ -29,69 +74,265 @@ class ExampleWorkflow:
     def __init__(self):
         # A variable to store the result from a human decision signal.
         self._human_decision_result: str | None = None
+        # Field corrections sent by a reviewer, not yet applied to the post rules.
+        self._pending_field_updates: dict = {}
+        # A compact summary of progress for the `status` query.
+        self._status: dict = {}
+        # Whether the starter set the case search attributes, which are then
+        # kept up to date. Cases started without them (before they existed,
+        # or with CASE_SEARCH_ATTRIBUTES=false) never upsert, so they replay.
+        self._indexed = False
+        # Whether LLM requests are hedged at once rather than after the hedge delay.
+        self._latency_critical = False
 
     @workflow.run
-    async def run(self, text_input: str) -> dict:
+    async def run(
+        self, text_input: str | list[str], max_parallel: int = ITEM_FAN_OUT, latency_critical: bool = False
+    ) -> dict:
         """
         Executes the main logic of the workflow.
 
         Args:
-            text_input: The initial text content to process.
+            text_input: The initial text content to process, or a blob
+                reference to a large document, or a list of such items
+                for a multi-part case.
+            max_parallel: The most items of a multi-part case processed
+                by the LLM at the same time.
+            latency_critical: Hedge every LLM request right away (when a
+                hedge provider is configured) instead of waiting for the
+                primary to be slow.
 
         Returns:
             A dictionary summarizing the final outcome of the workflow.
+
+        Raises:
+            ApplicationError: A step failed (type `CaseFailed`). Cases started
+                before failed runs existed return a result with status `FAILED`.
         """
-        workflow.logger.info(f"Workflow started for input: '{text_input[:50]}...'")
+        if isinstance(text_input, list):
+            workflow.logger.info(f"Workflow started for {len(text_input)} items")
+        else:
+            workflow.logger.info(f"Workflow started for input: '{text_input[:50]}...'")
+        started_at = workflow.now().isoformat()
+        self._status = new_case_status(started_at)
+        self._latency_critical = latency_critical
+        self._indexed = indexed(workflow.info().typed_search_attributes) and workflow.patched(PATCH_SEARCH_ATTRIBUTES)
+
+        # --- Pin the rules ---
+        # Every later step, retries included, evaluates these exact rule sets.
+        # Cases started before rules were pinned use the rules current at each step.
+        if workflow.patched(PATCH_PIN_RULES):
+            snapshots = await workflow.execute_activity(
+                pin_rules_snapshot_activity, **activity_options("pin_rules_snapshot_activity")
+            )
+            workflow.logger.info(f"Pinned rules snapshots: {snapshots}")
+        else:
+            snapshots = {"routing": None, "post_rules": None}
+        self._advance("llm")
 
         # --- Step 1: Process text with an LLM ---
-        # Call the LLM activity with a timeout.
+        # Call the LLM activity (timeouts and retries come from activity_options.yaml),
+        # map-reduce over the chunks of a large document, or process each item
+        # of a multi-part case and combine the results.
         try:
-            llm_result = await workflow.execute_activity(
-                llm_activity, text_input, start_to_close_timeout=timedelta(seconds=60)
-            )
+            if isinstance(text_input, list) and workflow.patched(PATCH_MULTI_PART):
+                llm_result = await self._process_items(text_input, max_parallel)
+            else:
+                llm_result = await self._process_item(text_input)
             workflow.logger.info(f"LLM activity completed. Provider: {llm_result.get('provider')}")
         except Exception as e:
             workflow.logger.error(f"LLM activity failed: {e}")
-            return {"status": "FAILED", "reason": "LLM processing failed."}
+            return self._fail("LLM processing failed.")
+
+        self._advance("guardrails", provider=llm_result.get("provider"))
+
+        # --- Step 2: Redact PII and validate the LLM output with guardrails ---
+        # Cases started before the guardrails existed route the answer as it is.
+        if workflow.patched(PATCH_GUARDRAILS):
+            try:
+                guardrails_results = await workflow.execute_activity(
+                    guardrails_activity, [llm_result.get("answer") or ""], **activity_options("guardrails_activity")
+                )
+                guardrails_result = guardrails_results[0]
+                workflow.logger.info(f"Guardrails activity completed. Passed: {guardrails_result['passed']}")
+            except Exception as e:
+                workflow.logger.error(f"Guardrails activity failed: {e}")
+                return self._fail("Guardrails validation failed.")
+        else:
+            guardrails_result = {"passed": True, "failures": [], "content": llm_result.get("answer"), "pii": {}}
 
-        # --- Step 2: Make a routing decision ---
+        # --- Step 3: Make a routing decision ---
         # Use the results from the LLM activity to inform the routing logic.
-        try:
-            routing_result = await workflow.execute_activity(
-                routing_activity,
-                args=[llm_result["llm_response"], text_input],
-                start_to_close_timeout=timedelta(seconds=20),
-            )
-            decision = routing_result.get("decision")
-            workflow.logger.info(f"Routing activity completed. Decision: {decision}")
-        except Exception as e:
-            workflow.logger.error(f"Routing activity failed: {e}")
-            return {"status": "FAILED", "reason": "Routing decision failed."}
+        # Outputs rejected by the guardrails always go to a human.
+        if not guardrails_result["passed"]:
+            failed = ", ".join(f["name"] for f in guardrails_result["failures"] if f["hard"])
+            routing_result = {"decision": "human", "reason": f"Rejected by guardrails: {failed}"}
+            decision = "human"
+            workflow.logger.info(f"Output rejected by guardrails ({failed}). Routing to human.")
+        else:
+            self._advance("routing")
+            try:
+                routing_result = await workflow.execute_activity(
+                    routing_activity,
+                    args=[llm_result["llm_response"], text_input, snapshots["routing"]],
+                    **activity_options("routing_activity"),
+                )
+                decision = routing_result.get("decision")
+                workflow.logger.info(f"Routing activity completed. Decision: {decision}")
+            except Exception as e:
+                workflow.logger.error(f"Routing activity failed: {e}")
+                return self._fail("Routing decision failed.")
+
+        # --- Step 4: Evaluate the post rules on the cleaned output ---
+        # Cases started before the post rules existed are decided by routing alone.
+        fields = post_rule_fields(llm_result["llm_response"], guardrails_result)
+        self._advance(
+            "post_rules", decision=decision, rule=triggered_rule(routing_result),
+            confidence=confidence_bucket(fields["confidence"]),
+        )
+        post_rules_result = None
+        if workflow.patched(PATCH_POST_RULES):
+            try:
+                post_rules_result = await workflow.execute_activity(
+                    post_rules_activity,
+                    args=[fields, None, None, snapshots["post_rules"]],
+                    **activity_options("post_rules_activity"),
+                )
+                workflow.logger.info(f"Post rules completed. Action: {post_rules_result['action']}")
+            except Exception as e:
+                workflow.logger.error(f"Post rules activity failed: {e}")
+                return self._fail("Post rules evaluation failed.")
+        action = post_rules_result["action"] if post_rules_result else None
 
-        # --- Step 3: Act on the routing decision ---
-        if decision == "human":
+        # --- Step 5: Act on the routing decision and the post rules ---
+        if decision == "human" or action == "review":
             workflow.logger.info("Routing to human. Waiting for 'decision' signal...")
             # This is where a task would be created and the system would wait
             # for a human to interact with it, for example, via the Task Bridge.
-            try:
-                await workflow.wait_condition(lambda: self._human_decision_result is not None, timeout=timedelta(hours=24))
-                workflow.logger.info(f"Signal received! Human decision: '{self._human_decision_result}'")
-                final_status = f"COMPLETED_BY_HUMAN ({self._human_decision_result})"
-            except TimeoutError:
-                workflow.logger.warning("Timed out waiting for human decision.")
-                final_status = "TIMED_OUT"
+            # While waiting, the reviewer may correct fields with 'update_fields'.
+            deadline = workflow.now() + timedelta(hours=24)
+            self._advance("awaiting_human", action=action, waiting_since=workflow.now().isoformat())
+            final_status = None
+            while final_status is None:
+                try:
+                    await workflow.wait_condition(
+                        lambda: self._human_decision_result is not None
+                        or (post_rules_result is not None and bool(self._pending_field_updates)),
+                        timeout=max(deadline - workflow.now(), timedelta(seconds=1)),
+                    )
+                except TimeoutError:
+                    workflow.logger.warning("Timed out waiting for human decision.")
+                    final_status = "TIMED_OUT"
+                    break
+
+                if self._human_decision_result is not None:
+                    workflow.logger.info(f"Signal received! Human decision: '{self._human_decision_result}'")
+                    final_status = f"COMPLETED_BY_HUMAN ({self._human_decision_result})"
+                    break
+
+                # Only the rules that read a corrected field are evaluated again.
+                changes, self._pending_field_updates = self._pending_field_updates, {}
+                fields.update(changes)
+                post_rules_result = await workflow.execute_activity(
+                    post_rules_activity,
+                    args=[fields, post_rules_result, sorted(changes), snapshots["post_rules"]],
+                    **activity_options("post_rules_activity"),
+                )
+                action = post_rules_result["action"]
+                workflow.logger.info(f"Post rules re-evaluated after correction. Action: {action}")
+                self._advance("awaiting_human", action=action, confidence=confidence_bucket(fields["confidence"]))
+                if decision != "human" and action != "review":
+                    # The post rules were the only reason for review, and the correction cleared them.
+                    final_status = "COMPLETED_AFTER_CORRECTION"
         else:
             # For "automatic" or other decisions, the workflow completes right away.
             workflow.logger.info("Routing is automatic. Completing workflow.")
             final_status = "COMPLETED_AUTOMATICALLY"
 
-        # --- Step 4: Return the final result ---
+        # --- Step 6: Return the final result ---
+        self._advance("completed", action=action, result=final_status)
         return {
             "status": final_status,
-            "llm_output": llm_result.get("answer"),
+            "llm_output": guardrails_result["content"],
+            "guardrails": {key: value for key, value in guardrails_result.items() if key != "content"},
             "routing_info": routing_result,
+            "rules_snapshots": snapshots,
+            "human_decision": self._human_decision_result,
+            "post_rules": {
+                "action": action,
+                "reason": post_rules_result["reason"],
+                "matched_rules": post_rules_result["matched_rules"],
+                "fields": fields,
+            } if post_rules_result else None,
         }
 
+    def _advance(self, stage: str, **fields) -> None:
+        """
+        Records the stage the workflow has reached, and any new facts, for the
+        `status` query and, if the case is indexed, its search attributes.
+        """
+        self._status.update(fields, stage=stage, updated_at=workflow.now().isoformat())
+        if self._indexed:
+            workflow.upsert_search_attributes(attribute_updates(self._status))
+
+    def _fail(self, reason: str) -> dict:
+        self._advance("failed", result="FAILED")
+        if workflow.patched(PATCH_FAIL_CASES):
+            # The run closes as failed, so starting the same case again
+            # (ALLOW_DUPLICATE_FAILED_ONLY) processes it once more.
+            raise ApplicationError(reason, type="CaseFailed", non_retryable=True)
+        return {"status": "FAILED", "reason": reason}
+
+    async def _process_item(self, text_input: str) -> dict:
+        """Processes one text, or the chunks of a large document, with the LLM."""
+        if is_blob_ref(text_input) and workflow.patched(PATCH_CHUNKING):
+            return await self._process_chunks(text_input)
+        return await workflow.execute_activity(
+            llm_activity, args=[text_input, self._latency_critical], **activity_options("llm_activity")
+        )
+
+    async def _process_items(self, items: list[str], max_parallel: int) -> dict:
+        """
+        Processes the items of a multi-part case with at most `max_parallel`
+        in flight and combines the results into one.
+        """
+        if not items:
+            raise ValueError("A multi-part case needs at least one item")
+        semaphore = asyncio.Semaphore(max(1, max_parallel))
+
+        async def process_item(item: str) -> dict:
+            async with semaphore:
+                return await self._process_item(item)
+
+        item_results = await asyncio.gather(*(process_item(item) for item in items))
+        return await workflow.execute_activity(
+            combine_items_activity, list(item_results), **activity_options("combine_items_activity")
+        )
+
+    async def _process_chunks(self, document_ref: str) -> dict:
+        """
+        Splits a large document into chunks, processes them with at most
+        `CHUNK_FAN_OUT` LLM activities in flight and reduces the results.
+        Only blob references and per-chunk answers enter the history.
+        """
+        chunks = await workflow.execute_activity(
+            chunk_document_activity, document_ref, **activity_options("chunk_document_activity")
+        )
+        workflow.logger.info(f"Processing a large document in {len(chunks)} chunk(s)")
+
+        semaphore = asyncio.Semaphore(CHUNK_FAN_OUT)
+
+        async def process_chunk(chunk: dict) -> dict:
+            async with semaphore:
+                return await workflow.execute_activity(
+                    llm_activity, args=[chunk["ref"], self._latency_critical], **activity_options("llm_activity")
+                )
+
+        chunk_results = await asyncio.gather(*(process_chunk(chunk) for chunk in chunks))
+        return await workflow.execute_activity(
+            reduce_chunks_activity, list(chunk_results), **activity_options("reduce_chunks_activity")
+        )
+
     @workflow.signal
     def decision(self, user_decision: str):
         """
@@ -100,3 +341,25 @@ class ExampleWorkflow:
         """
         workflow.logger.info(f"Received 'decision' signal: {user_decision}")
         self._human_decision_result = user_decision
+
+    @workflow.signal
+    def update_fields(self, changes: dict):
+        """
+        A signal handler that lets a reviewer correct extracted fields, such as
+        `{"confidence": 0.95}`. The post rules are re-evaluated for the changed
+        fields only.
+        """
+        workflow.logger.info(f"Received 'update_fields' signal: {sorted(changes)}")
+        self._pending_field_updates.update(changes)
+
+    @workflow.query
+    def status(self) -> dict:
+        """
+        Returns a compact summary of the case for status polling: its `stage`,
+        routing `decision`, post rules `action`, `human_decision`, final
+        `result` and timestamps. A worker answers it, replaying the history
+        if the case is not cached, so status lookups only query cases that
+        visibility has not indexed (see `workers/status.py`).
+        """
+        return {**self._status, "human_decision": self._human_decision_result}
+